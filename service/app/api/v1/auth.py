@@ -130,7 +130,7 @@ async def validate_token(
     logger.info(f"使用认证提供商: {provider.get_provider_name()}")
 
     logger.info("开始调用提供商验证token...")
-    auth_result = provider.validate_token(access_token)
+    auth_result = await provider.validate_token(access_token)
     logger.info(
         f"提供商验证结果: success={auth_result.success}, "
         f"error_code={auth_result.error_code}, error_message={auth_result.error_message}"
@@ -184,7 +184,7 @@ async def login_casdoor(request: LoginRequest) -> LoginResponse:
     """Casdoor 授权码登录接口"""
     try:
         logger.info("收到 Casdoor 登录请求")
-        result = authentication_service.login_with_code(request.code, request.state)
+        result = await authentication_service.login_with_code(request.code, request.state)
 
         user_info = None
         if result.get("user_info"):
@@ -12,7 +12,9 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.configs import configs
 from app.core.mcp import async_check_mcp_server_status
+from app.core.mcp_catalog import get_mcp_catalog_cache
 from app.infra.database import get_session
+from app.infra.mcp import get_mcp_client_pool
 from app.middleware.auth import get_current_user
 from app.models.mcp import McpServer, McpServerCreate, McpServerUpdate
 
@@ -240,6 +242,11 @@ async def update_mcp_server(
 
     mcp_data = mcp_server.model_dump(exclude_unset=True)
 
+    # Drop the pooled session and cached tool catalog for the old endpoint/credentials
+    if "url" in mcp_data or "token" in mcp_data:
+        await get_mcp_client_pool().evict(db_mcp_server.url, db_mcp_server.token)
+        await get_mcp_catalog_cache().invalidate(mcp_server_id)
+
     for key, value in mcp_data.items():
         setattr(db_mcp_server, key, value)
 
@@ -263,6 +270,8 @@ async def delete_mcp_server(
             status_code=403, detail="Access denied: You don't have permission to delete this MCP server"
         )
 
+    await get_mcp_client_pool().evict(mcp_server.url, mcp_server.token)
+    await get_mcp_catalog_cache().invalidate(mcp_server_id)
     await session.delete(mcp_server)
     await session.commit()
     return {"ok": True}
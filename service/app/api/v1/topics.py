@@ -5,11 +5,12 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.sessions import get_current_user
+from app.core.attachment_cache import get_attachment_cache
 from app.infra.database import get_session
 from app.models.message import MessageReadWithFilesAndCitations
 from app.models.topic import Topic as TopicModel
 from app.models.topic import TopicCreate, TopicRead, TopicUpdate
-from app.repos import MessageRepository, SessionRepository, TopicRepository
+from app.repos import FileRepository, MessageRepository, SessionRepository, TopicRepository
 
 router = APIRouter(tags=["topics"])
 
@@ -240,7 +241,9 @@ async def delete_topic(
     message_repo = MessageRepository(db)
     topic_repo = TopicRepository(db)
 
+    file_ids = await FileRepository(db).get_file_ids_by_topic(topic.id)
     await message_repo.delete_messages_by_topic(topic.id)
     await topic_repo.delete_topic(topic.id)
     await db.commit()
+    await get_attachment_cache().invalidate_files(file_ids)
     return
@@ -3,11 +3,12 @@ import json
 import logging
 from uuid import UUID
 
-import redis.asyncio as redis
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
 from app.common.code.error_code import ErrCode, ErrCodeError
 from app.configs import configs
+from app.core.chat.publisher import parse_event_id, read_chat_events_since
+from app.core.chat.subscriber import SlowConsumerError, get_chat_event_hub
 from app.core.chat.topic_generator import generate_and_update_topic_title
 from app.core.consume import create_consume_for_chat
 from app.infra.database import AsyncSessionLocal
@@ -44,38 +45,60 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
-async def redis_listener(websocket: WebSocket, connection_id: str):
+async def redis_listener(websocket: WebSocket, connection_id: str, last_event_id: str | None = None):
     """
-    Listens to Redis channel and forwards messages to WebSocket.
-    """
-    r = redis.from_url(configs.Redis.REDIS_URL, decode_responses=True)
-    pubsub = r.pubsub()
-    channel = f"chat:{connection_id}"
-    await pubsub.subscribe(channel)
+    Forwards the connection's chat events from the pod's shared Redis
+    subscriber to the WebSocket.
 
-    logger.info(f"Subscribed to Redis channel: {channel}")
+    If ``last_event_id`` is given, events appended to the connection's replay
+    stream after it are sent first, then live delivery resumes. A WebSocket
+    that falls too far behind is closed so the client reconnects and replays.
+    """
+    hub = get_chat_event_hub()
+    send_timeout = configs.ChatStream.SubscriberSendTimeout
 
     try:
-        async for message in pubsub.listen():
-            if message["type"] == "message":
-                data = message["data"]
+        # Subscribe before reading the replay stream so nothing falls in between
+        async with hub.subscribe(connection_id) as subscription:
+            # Live events already covered by the replay are skipped until the first newer one
+            replayed_up_to: tuple[int, int] | None = None
+            if last_event_id and parse_event_id(last_event_id):
+                replayed = await read_chat_events_since(hub.redis_client, connection_id, last_event_id)
+                for _, data in replayed:
+                    await asyncio.wait_for(websocket.send_text(data), timeout=send_timeout)
+                replayed_up_to = parse_event_id(replayed[-1][0]) if replayed else parse_event_id(last_event_id)
+                logger.info(f"Replayed {len(replayed)} missed events for {connection_id}")
+
+            while True:
+                data = await subscription.get()
+                if replayed_up_to is not None:
+                    event_id = parse_event_id(str(json.loads(data).get("event_id", "")))
+                    if event_id is not None:
+                        if event_id <= replayed_up_to:
+                            continue
+                        replayed_up_to = None
                 try:
                     # Check if connection is still active before sending
                     if websocket.client_state.value == 1:  # WebSocketState.CONNECTED
-                        await websocket.send_text(data)
+                        await asyncio.wait_for(websocket.send_text(data), timeout=send_timeout)
                     else:
                         logger.warning(f"WebSocket closed, stopping listener for {connection_id}")
                         break
+                except TimeoutError:
+                    raise
                 except Exception as e:
                     logger.error(f"Error sending message to WebSocket: {e}")
                     break
+    except (SlowConsumerError, TimeoutError) as e:
+        logger.warning(f"Closing slow chat WebSocket {connection_id}: {e}")
+        try:
+            await websocket.close(code=1013, reason="Client too slow, reconnect to resume")
+        except Exception:
+            pass
     except asyncio.CancelledError:
         logger.info(f"Redis listener cancelled for {connection_id}")
     except Exception as e:
         logger.error(f"Redis listener error: {e}")
-    finally:
-        await pubsub.unsubscribe(channel)
-        await r.close()
 
 
 @router.websocket("/sessions/{session_id}/topics/{topic_id}")
@@ -83,6 +106,7 @@ async def chat_websocket(
     websocket: WebSocket,
     session_id: UUID,
     topic_id: UUID,
+    last_event_id: str | None = None,
     auth_ctx: AuthContext = Depends(get_auth_context_websocket),
 ) -> None:
     connection_id = f"{session_id}:{topic_id}"
@@ -111,7 +135,7 @@ async def chat_websocket(
             return
 
     # Start Redis listener task
-    listener_task = asyncio.create_task(redis_listener(websocket, connection_id))
+    listener_task = asyncio.create_task(redis_listener(websocket, connection_id, last_event_id))
 
     try:
         while True:
@@ -1,18 +1,23 @@
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .attachment import AttachmentConfig
 from .auth import AuthConfig
+from .chat_stream import ChatStreamConfig
 from .database import DatabaseConfig
 from .dynamic_mcp_server import DynamicMCPConfig
 from .image import ImageConfig
+from .knowledge import KnowledgeConfig
 from .lab import LabConfig
 from .llm import LLMConfig
 from .logger import LoggerConfig
 from .mcps import McpProviderConfig
 from .oss import OSSConfig
+from .preview import PreviewConfig
 from .redemption import AdminConfig
 from .redis import RedisConfig
 from .searxng import SearXNGConfig
+from .worker import WorkerConfig
 
 
 class AppConfig(BaseSettings):
@@ -102,6 +107,31 @@ class AppConfig(BaseSettings):
         description="Image generation configuration",
     )
 
+    Worker: WorkerConfig = Field(
+        default_factory=lambda: WorkerConfig(),
+        description="Celery worker configuration",
+    )
+
+    ChatStream: ChatStreamConfig = Field(
+        default_factory=lambda: ChatStreamConfig(),
+        description="Chat event streaming configuration",
+    )
+
+    Attachment: AttachmentConfig = Field(
+        default_factory=lambda: AttachmentConfig(),
+        description="Multimodal attachment processing configuration",
+    )
+
+    Preview: PreviewConfig = Field(
+        default_factory=lambda: PreviewConfig(),
+        description="Office document PDF preview configuration",
+    )
+
+    Knowledge: KnowledgeConfig = Field(
+        default_factory=lambda: KnowledgeConfig(),
+        description="Knowledge base tool configuration",
+    )
+
 
 configs: AppConfig = AppConfig()
 
@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+
+
+class AttachmentConfig(BaseModel):
+    """Multimodal attachment processing configuration"""
+
+    CacheMaxBytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="Size bound of the in-process LRU of rendered attachment content blocks (0 disables it)",
+    )
+    CacheMaxEntryBytes: int = Field(
+        default=32 * 1024 * 1024,
+        ge=0,
+        description="Rendered attachments larger than this are not cached",
+    )
+    CacheStorageTier: bool = Field(
+        default=False,
+        description="Also persist rendered attachments to object storage, shared across processes",
+    )
+    RenderWorkers: int = Field(
+        default=2,
+        ge=0,
+        description="Processes for PDF rasterization and image encoding (0 = run in threads)",
+    )
+    PdfDpi: int = Field(
+        default=144,
+        ge=36,
+        description="Resolution PDF pages are rendered at",
+    )
+    PdfMaxPages: int = Field(
+        default=0,
+        ge=0,
+        description="Only the first N pages of a PDF are sent to the model (0 = all pages)",
+    )
+    PdfPagesPerTask: int = Field(
+        default=4,
+        ge=1,
+        description="PDF pages rendered per pool job; pages are yielded as each job completes",
+    )
+    MaxImageSize: int = Field(
+        default=2048,
+        ge=0,
+        description="Longest side in pixels images and PDF pages are downscaled to (0 = no limit)",
+    )
+    ModelMaxImageSize: dict[str, int] = Field(
+        default_factory=lambda: {"claude": 1568},
+        description="Per-model MaxImageSize overrides, matched as a substring of the model name",
+    )
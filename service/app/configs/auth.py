@@ -144,6 +144,24 @@ class AuthConfig(BaseSettings):
 
     Provider: AuthProvider = Field(default=AuthProvider.CASDOOR, description="Authentication provider")
 
+    HttpTimeout: float = Field(
+        default=10.0,
+        gt=0,
+        description="Timeout in seconds for calls to the authentication provider (userinfo, JWKS)",
+    )
+
+    JwksCacheTTL: int = Field(
+        default=3600,
+        ge=0,
+        description="Seconds a fetched JWKS key set is reused before it is refreshed",
+    )
+
+    JwksMinRefreshInterval: int = Field(
+        default=30,
+        ge=0,
+        description="Minimum seconds between JWKS refreshes triggered by unknown key ids",
+    )
+
     Casdoor: CasdoorAuthConfig = Field(
         default_factory=lambda: CasdoorAuthConfig(),
         description="Casdoor authentication configuration",
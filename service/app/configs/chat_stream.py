@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+
+
+class ChatStreamConfig(BaseModel):
+    """Chat event streaming configuration (worker -> Redis -> WebSocket)"""
+
+    BatchWindowMs: int = Field(
+        default=25,
+        ge=0,
+        description="Window in ms to coalesce consecutive streaming/thinking chunks into one frame (0 disables batching)",
+    )
+    BatchMaxBytes: int = Field(
+        default=2048,
+        ge=1,
+        description="Flush a coalesced chunk frame early once its content reaches this many bytes",
+    )
+    StreamMaxLen: int = Field(
+        default=2000,
+        ge=1,
+        description="Approximate number of recent events kept per chat connection for replay on reconnect",
+    )
+    StreamTTL: int = Field(
+        default=3600,
+        ge=1,
+        description="Seconds an idle chat event stream is kept in Redis",
+    )
+    SubscriberQueueSize: int = Field(
+        default=1000,
+        ge=1,
+        description="Max events buffered per chat WebSocket before the slow consumer is disconnected",
+    )
+    SubscriberSendTimeout: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds a single WebSocket send may take before the consumer is disconnected",
+    )
+    PersistMaxPending: int = Field(
+        default=50,
+        ge=1,
+        description="Flush queued message/tool/timeline/citation writes of a chat stream once this many are pending",
+    )
+    PersistMaxDelay: float = Field(
+        default=3.0,
+        gt=0,
+        description="Seconds a queued chat stream write may wait before the batch is committed",
+    )
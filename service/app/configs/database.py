@@ -10,6 +10,9 @@ class PostgresConfig(BaseModel):
     DBName: str = Field(default="postgres", description="PostgreSQL database name")
     MinConnections: int = Field(default=1, description="Minimum connections in the pool")
     MaxConnections: int = Field(default=10, description="Maximum connections in the pool")
+    WorkerPoolSize: int = Field(default=5, description="Persistent connections per Celery worker process")
+    WorkerMaxOverflow: int = Field(default=10, description="Extra connections a Celery worker process may open")
+    PoolRecycle: int = Field(default=3600, description="Recycle pooled connections after this many seconds")
 
 
 class SQLiteConfig(BaseModel):
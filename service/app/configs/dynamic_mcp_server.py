@@ -1,6 +1,21 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
+class SandboxPoolConfig(BaseModel):
+    """动态工具沙箱池配置 - 复用预热的沙箱，避免每次工具调用都创建容器并安装依赖"""
+
+    Backend: Literal["auto", "docker", "kubernetes", "local"] = Field(
+        default="auto",
+        description="沙箱后端: auto(生产环境用 kubernetes，否则 docker) / docker / kubernetes / local(本地子进程，无隔离，仅用于开发测试)",
+    )
+    MaxUses: int = Field(default=20, description="单个沙箱最多执行的调用次数，之后销毁重建")
+    IdleTimeout: float = Field(default=300.0, description="空闲沙箱的回收时间(秒)")
+    MaxIdlePerKey: int = Field(default=2, description="每组(用户, 依赖)最多保留的空闲沙箱数")
+    MaxConcurrency: int = Field(default=8, description="同时执行的最大工具调用数")
+
+
 class DynamicMCPConfig(BaseModel):
     """Dynamic MCP Server配置"""
 
@@ -16,3 +31,7 @@ class DynamicMCPConfig(BaseModel):
     transport: str = Field(default="sse", description="Dynamic MCP Server传输协议")
     allowed_paths: list[str] = Field(default=["tools"], description="Dynamic MCP Server允许的路径")
     kubeNamespace: str = Field(default="bohrium", description="Kubernetes命名空间")
+    SandboxPool: SandboxPoolConfig = Field(
+        default_factory=lambda: SandboxPoolConfig(),
+        description="动态工具沙箱池配置",
+    )
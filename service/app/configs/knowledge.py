@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+
+class KnowledgeConfig(BaseModel):
+    """Knowledge base tool configuration"""
+
+    ReadCacheMaxBytes: int = Field(
+        default=128 * 1024 * 1024,
+        ge=0,
+        description="Size bound of the in-process LRU of extracted document text (0 disables it)",
+    )
+    ReadCacheStorageTier: bool = Field(
+        default=True,
+        description="Also persist extracted document text to object storage, shared across processes",
+    )
+    ReadMaxChars: int = Field(
+        default=40000,
+        ge=1000,
+        description="Characters returned by one knowledge_read_file call; longer documents are read in pages",
+    )
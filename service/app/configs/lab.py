@@ -6,3 +6,15 @@ class LabConfig(BaseModel):
 
     Api: str = Field(default="", description="实验室API基础URL")
     Timeout: int = Field(default=30, description="API请求超时时间(秒)")
+    MaxConnections: int = Field(default=20, description="连接池最大连接数")
+    MaxRetries: int = Field(
+        default=2, description="请求失败(连接错误、超时、5xx)后的最大重试次数，写请求只在连接失败时重试"
+    )
+    RetryBackoff: float = Field(default=0.5, description="重试退避基数(秒)，每次重试翻倍")
+    CatalogCacheTTL: float = Field(
+        default=30.0, description="实验室、设备、物料、动作等目录类接口的缓存时间(秒)，0 表示不缓存"
+    )
+    WatchMinInterval: float = Field(default=1.0, description="后台轮询任务状态的最短间隔(秒)，状态变化后恢复为该间隔")
+    WatchMaxInterval: float = Field(default=15.0, description="状态不变时轮询间隔逐步增加到的最长间隔(秒)")
+    WatchMaxConcurrency: int = Field(default=8, description="同时进行的任务状态查询数")
+    WaitMaxTimeout: int = Field(default=900, description="等待任务完成的工具最长可阻塞时间(秒)")
@@ -28,6 +28,27 @@ class SmitheryMcpConfig(McpProviderConfigBase):
     )
 
 
+class McpClientPoolConfig(BaseModel):
+    """MCP 客户端会话池配置 - 复用已初始化的 MCP 会话，避免每次工具调用都重新握手"""
+
+    Enabled: bool = Field(default=True, description="是否启用 MCP 客户端会话池")
+    IdleTimeout: float = Field(default=300.0, description="空闲会话的回收时间(秒)")
+    HealthCheckInterval: float = Field(
+        default=60.0,
+        description="会话空闲超过该时间(秒)后，复用前先执行 ping 健康检查",
+    )
+    MaxConcurrencyPerServer: int = Field(default=8, description="单个 MCP 服务器的最大并发调用数")
+    ConnectTimeout: float = Field(default=30.0, description="建立会话(含 initialize 握手)的超时时间(秒)")
+
+
+class McpCatalogCacheConfig(BaseModel):
+    """MCP 工具目录缓存配置 - 聊天时读取缓存的服务器状态和工具列表，过期后在后台刷新"""
+
+    FreshTTL: int = Field(default=120, description="目录被视为新鲜的时间(秒)，过期后后台刷新但仍可使用")
+    StaleTTL: int = Field(default=86400, description="过期目录在 Redis 中保留的最长时间(秒)")
+    LocalTTL: int = Field(default=10, description="进程内 L1 缓存时间(秒)")
+
+
 class McpProviderConfig(BaseSettings):
     model_config = SettingsConfigDict(
         env_nested_delimiter="_",
@@ -41,3 +62,13 @@ class McpProviderConfig(BaseSettings):
         default_factory=lambda: SmitheryMcpConfig(),
         description="Smithery MCP 提供者配置",
     )
+
+    ClientPool: McpClientPoolConfig = Field(
+        default_factory=lambda: McpClientPoolConfig(),
+        description="MCP 客户端会话池配置",
+    )
+
+    CatalogCache: McpCatalogCacheConfig = Field(
+        default_factory=lambda: McpCatalogCacheConfig(),
+        description="MCP 工具目录缓存配置",
+    )
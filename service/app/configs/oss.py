@@ -51,3 +51,33 @@ class OSSConfig(BaseModel):
         default=10000,
         description="Maximum number of files per user",
     )
+    MaxPoolConnections: int = Field(
+        default=50,
+        ge=1,
+        description="Maximum pooled HTTP connections of the shared S3 client",
+    )
+    ConnectTimeout: float = Field(
+        default=5.0,
+        gt=0,
+        description="S3 connection timeout in seconds",
+    )
+    ReadTimeout: float = Field(
+        default=60.0,
+        gt=0,
+        description="S3 read timeout in seconds",
+    )
+    MaxAttempts: int = Field(
+        default=3,
+        ge=1,
+        description="Maximum attempts per S3 request (including retries)",
+    )
+    StreamChunkBytes: int = Field(
+        default=1024 * 1024,  # 1MB default
+        ge=64 * 1024,
+        description="Chunk size for streaming uploads (hashing) and downloads",
+    )
+    MultipartChunkBytes: int = Field(
+        default=8 * 1024 * 1024,  # 8MB default
+        ge=5 * 1024 * 1024,
+        description="Part size for S3 multipart uploads; larger files are uploaded in parts",
+    )
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+
+class PreviewConfig(BaseModel):
+    """Office document PDF preview configuration"""
+
+    EagerConvert: bool = Field(
+        default=False,
+        description="Convert DOCX/XLSX/PPTX previews in a worker task right after upload instead of on first open",
+    )
@@ -0,0 +1,20 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class WorkerConfig(BaseModel):
+    """Celery worker configuration"""
+
+    Pool: Literal["prefork", "threads", "solo"] = Field(
+        default="prefork",
+        description="Celery worker pool. 'threads' runs many chat streams per process on one shared event loop",
+    )
+    Concurrency: int | None = Field(
+        default=None,
+        description="Concurrent tasks per worker (None = Celery default, the number of CPUs)",
+    )
+    DrainTimeout: float = Field(
+        default=30.0,
+        description="Seconds to let in-flight chat streams finish when a worker process shuts down",
+    )
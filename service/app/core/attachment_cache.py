@@ -0,0 +1,177 @@
+"""
+Cache of rendered multimodal attachments.
+
+Chat history is rebuilt on every turn, and each attachment in it would
+otherwise be downloaded, base64-encoded and (for PDFs) rasterized again.
+This caches the processed LLM content blocks of a file, keyed by the file's
+content (hash, or storage key when no hash is recorded) plus the render
+parameters, in a size-bounded in-process LRU and optionally in object
+storage so other processes can reuse them.
+
+Deleted files are never served from the cache because the file record is
+checked before lookup; ``invalidate`` additionally frees the entries of a
+deleted file, and is called once the deletion has been committed.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Iterable
+from io import BytesIO
+from typing import Any
+from uuid import UUID
+
+from app.configs import configs
+from app.models.file import File
+
+logger = logging.getLogger(__name__)
+
+ContentBlocks = list[dict[str, Any]]
+
+
+def attachment_cache_key(file: File, render_params: dict[str, Any]) -> str:
+    """Build the cache key of a file's rendering: ``{file_id}/{digest of content + params}``."""
+    source = file.file_hash or file.storage_key
+    digest = hashlib.sha256(f"{source}|{json.dumps(render_params, sort_keys=True)}".encode()).hexdigest()[:32]
+    return f"{file.id}/{digest}"
+
+
+class RenderedAttachmentCache:
+    """Size-bounded LRU of rendered attachments, with an optional object-storage tier."""
+
+    STORAGE_PREFIX = "cache/rendered/"
+
+    def __init__(
+        self, max_bytes: int = 256 * 1024 * 1024, max_entry_bytes: int = 32 * 1024 * 1024, use_storage: bool = False
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.use_storage = use_storage
+        self._entries: OrderedDict[str, tuple[ContentBlocks, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _get_local(self, key: str) -> ContentBlocks | None:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        self._entries.move_to_end(key)
+        return cached[0]
+
+    def _set_local(self, key: str, blocks: ContentBlocks, size: int) -> None:
+        if size > self.max_entry_bytes or size > self.max_bytes:
+            return
+        self._pop_local(key)
+        self._entries[key] = (blocks, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    def _pop_local(self, key: str) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._size -= cached[1]
+
+    async def get(self, key: str) -> ContentBlocks | None:
+        """Get a copy of the cached content blocks, or None on a miss."""
+        blocks = self._get_local(key)
+        if blocks is None and self.use_storage:
+            blocks = await self._get_storage(key)
+            if blocks is not None:
+                self._set_local(key, blocks, len(json.dumps(blocks)))
+
+        if blocks is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        # Callers build messages from these; keep the cached copy pristine
+        return copy.deepcopy(blocks)
+
+    async def set(self, key: str, blocks: ContentBlocks) -> None:
+        """Cache rendered content blocks."""
+        data = json.dumps(blocks)
+        size = len(data)
+        if size > self.max_entry_bytes:
+            return
+        self._set_local(key, copy.deepcopy(blocks), size)
+        if self.use_storage:
+            await self._set_storage(key, data)
+
+    async def invalidate(self, file_id: UUID | str) -> None:
+        """Drop every cached rendering of a file."""
+        prefix = f"{file_id}/"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._pop_local(key)
+        if not self.use_storage:
+            return
+
+        from app.core.storage import get_storage_service
+
+        try:
+            storage = get_storage_service()
+            objects = await storage.list_files(prefix=f"{self.STORAGE_PREFIX}{prefix}")
+            await storage.delete_files([obj["key"] for obj in objects])
+        except Exception as e:
+            logger.error(f"Failed to invalidate rendered attachments of file {file_id}: {e}")
+
+    async def invalidate_files(self, file_ids: Iterable[UUID | str]) -> None:
+        """Drop every cached rendering of several files."""
+        for file_id in file_ids:
+            await self.invalidate(file_id)
+
+    async def _get_storage(self, key: str) -> ContentBlocks | None:
+        from app.core.storage import get_storage_service
+
+        storage = get_storage_service()
+        storage_key = f"{self.STORAGE_PREFIX}{key}.json"
+        try:
+            if not await storage.file_exists(storage_key):
+                return None
+            buffer = BytesIO()
+            await storage.download_file(storage_key, buffer)
+            return json.loads(buffer.getvalue())
+        except Exception as e:
+            logger.warning(f"Failed to read rendered attachment {key} from storage: {e}")
+            return None
+
+    async def _set_storage(self, key: str, data: str) -> None:
+        from app.core.storage import get_storage_service
+
+        try:
+            await get_storage_service().upload_file(
+                BytesIO(data.encode()), f"{self.STORAGE_PREFIX}{key}.json", content_type="application/json"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write rendered attachment {key} to storage: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "storage_tier": self.use_storage,
+        }
+
+
+# 全局缓存实例
+_attachment_cache: RenderedAttachmentCache | None = None
+
+
+def get_attachment_cache() -> RenderedAttachmentCache:
+    """Get the process-wide rendered attachment cache."""
+    global _attachment_cache
+    if _attachment_cache is None:
+        attachment_config = configs.Attachment
+        _attachment_cache = RenderedAttachmentCache(
+            max_bytes=attachment_config.CacheMaxBytes,
+            max_entry_bytes=attachment_config.CacheMaxEntryBytes,
+            use_storage=attachment_config.CacheStorageTier,
+        )
+    return _attachment_cache
@@ -0,0 +1,171 @@
+"""
+CPU-bound attachment rendering (PDF rasterization, image downscaling, base64).
+
+The functions at module level run inside worker processes of
+``AttachmentRenderPool`` so they never block the event loop that serves chat
+streams. They only import the standard library, PyMuPDF and Pillow, which
+keeps spawned pool workers cheap to start.
+"""
+
+import asyncio
+import base64
+import logging
+import multiprocessing
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, TypeVar
+
+from app.infra.loop_local import LoopLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Formats re-encoded after downscaling; others (e.g. GIF, SVG) are passed through as is
+_RESAMPLE_FORMATS = {"image/png": "PNG", "image/jpeg": "JPEG", "image/jpg": "JPEG", "image/webp": "WEBP"}
+
+
+def write_temp_file(data: bytes, suffix: str = "") -> str:
+    """
+    Write data to a temporary file and return its path; the caller deletes it.
+
+    Large inputs rendered in several jobs (e.g. a PDF split into page batches)
+    are handed to the pool by path, so their bytes aren't pickled into every job.
+    """
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+        temp_file.write(data)
+        return temp_file.name
+
+
+def pdf_page_count(pdf_path: str) -> int:
+    """Count the pages of a PDF file."""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path, filetype="pdf") as document:
+        return len(document)
+
+
+def render_pdf_pages(pdf_path: str, pages: list[int], dpi: int, max_image_size: int) -> list[str]:
+    """
+    Render pages of a PDF file to base64 PNGs.
+
+    Pages are rendered at ``dpi``, scaled down further if needed so that the
+    longest side fits ``max_image_size`` pixels (0 = no limit).
+    """
+    import fitz  # PyMuPDF
+
+    images: list[str] = []
+    with fitz.open(pdf_path, filetype="pdf") as document:
+        for page_index in pages:
+            page = document[page_index]
+            zoom = dpi / 72
+            longest_side = max(page.rect.width, page.rect.height) * zoom
+            if max_image_size and longest_side > max_image_size:
+                zoom *= max_image_size / longest_side
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            images.append(base64.b64encode(pixmap.tobytes("png")).decode("utf-8"))
+    return images
+
+
+def encode_image(image_bytes: bytes, content_type: str, max_image_size: int) -> tuple[str, str]:
+    """
+    Downscale an image so its longest side fits ``max_image_size`` (0 = no
+    limit) and base64-encode it.
+
+    Returns:
+        Tuple of (content_type, base64_data)
+    """
+    image_format = _RESAMPLE_FORMATS.get(content_type.lower())
+    if max_image_size and image_format:
+        from PIL import Image
+
+        try:
+            with Image.open(BytesIO(image_bytes)) as image:
+                if max(image.size) > max_image_size:
+                    image.thumbnail((max_image_size, max_image_size), Image.Resampling.LANCZOS)
+                    buffer = BytesIO()
+                    image.save(buffer, format=image_format)
+                    image_bytes = buffer.getvalue()
+        except Exception as e:
+            logger.warning(f"Could not downscale {content_type} image, sending original: {e}")
+
+    return content_type, base64.b64encode(image_bytes).decode("utf-8")
+
+
+async def _discard(semaphore: asyncio.Semaphore) -> None:
+    """Semaphores hold no resources; finished loops' ones are just dropped."""
+
+
+class AttachmentRenderPool:
+    """
+    Bounded process pool for attachment rendering.
+
+    At most ``max_workers`` jobs run at a time per event loop; further callers
+    wait. With ``max_workers=0``, or if worker processes cannot be started,
+    jobs run in the default thread pool instead.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+        self._semaphores = self._new_semaphores()
+        self._use_processes = max_workers > 0
+
+    def _new_semaphores(self) -> LoopLocal[asyncio.Semaphore]:
+        return LoopLocal(lambda: asyncio.Semaphore(max(self.max_workers, 1)), _discard, "render semaphore")
+
+    def _get_executor(self) -> Executor | None:
+        if not self._use_processes:
+            return None
+        if self._executor is None:
+            try:
+                # spawn: the calling process runs an event loop thread, which fork would not carry over safely
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            except Exception as e:
+                logger.warning(f"Attachment render process pool unavailable, using threads: {e}")
+                self._use_processes = False
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a rendering function off the event loop."""
+        loop = asyncio.get_running_loop()
+        async with self._semaphores.get():
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                logger.warning("Attachment render process pool broke, recreating it")
+                self._executor = None
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphores = self._new_semaphores()
+
+
+_render_pool: AttachmentRenderPool | None = None
+
+
+def get_render_pool() -> AttachmentRenderPool:
+    """Get this process's attachment render pool."""
+    global _render_pool
+    if _render_pool is None:
+        from app.configs import configs
+
+        _render_pool = AttachmentRenderPool(max_workers=configs.Attachment.RenderWorkers)
+    return _render_pool
+
+
+def close_render_pool() -> None:
+    """Shut the attachment render pool down (process shutdown)."""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown()
+        _render_pool = None
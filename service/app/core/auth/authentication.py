@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 class AuthenticationService:
     @staticmethod
-    def login_with_code(code: str, state: Optional[str] = None) -> Dict[str, Any]:
+    async def login_with_code(code: str, state: Optional[str] = None) -> Dict[str, Any]:
         """
         使用授权码进行登录 (Casdoor Authorization Code Flow)
 
@@ -33,12 +33,12 @@ class AuthenticationService:
 
         # 1. Exchange code for access token
         logger.info("Exchanging authorization code for access token...")
-        access_token = provider.exchange_code_for_token(code)
+        access_token = await provider.exchange_code_for_token(code)
         logger.info("Successfully obtained access token")
 
         # 2. Validate token to get user info (optional, but good for verification)
         logger.info("Validating obtained access token...")
-        validation_result = provider.validate_token(access_token)
+        validation_result = await provider.validate_token(access_token)
 
         if not validation_result.success:
             raise Exception(f"Token validation failed: {validation_result.error_message}")
@@ -1,5 +1,8 @@
+from typing import Any
+
 from celery import Celery
-from celery.signals import worker_process_init
+from celery.concurrency import get_implementation  # type: ignore[attr-defined]  # missing from celery-types
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 
 from app.configs import configs
 
@@ -7,7 +10,7 @@ celery_app = Celery(
     "xyzen_worker",
     broker=configs.Redis.REDIS_URL,
     backend=configs.Redis.REDIS_URL,
-    include=["app.tasks.chat"],
+    include=["app.tasks.chat", "app.tasks.knowledge", "app.tasks.preview"],
 )
 
 celery_app.conf.update(
@@ -16,17 +19,58 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Shanghai",
     enable_utc=True,
+    worker_pool=configs.Worker.Pool,
 )
 
+if configs.Worker.Concurrency:
+    celery_app.conf.worker_concurrency = configs.Worker.Concurrency
 
-@worker_process_init.connect
-def init_worker_process(**kwargs: object) -> None:
+
+def _init_worker() -> None:
     """
-    Initialize builtin tools when Celery worker process starts.
+    Initialize builtin tools and the persistent event loop in the process that runs tasks.
 
     This is required because the BuiltinToolRegistry uses class variables
     that are not shared between the FastAPI process and Celery worker process.
     """
+    from app.tasks.loop import init_worker_loop
     from app.tools.registry import register_builtin_tools
 
     register_builtin_tools()
+
+    # One event loop, DB engine and connection pool per worker process, shared by all tasks
+    init_worker_loop()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs: object) -> None:
+    """Initialize each prefork child process when it starts."""
+    _init_worker()
+
+
+@worker_init.connect
+def init_worker(sender: Any = None, **kwargs: object) -> None:
+    """
+    Initialize the main process for the threads/solo pools.
+
+    worker_process_init is only sent to prefork children; with the other pools
+    tasks run in the main process. For prefork, the parent is left alone so no
+    event loop thread exists when it forks.
+    """
+    pool_cls = get_implementation(getattr(sender, "pool_cls", None) or configs.Worker.Pool)
+    if pool_cls.__module__ != "celery.concurrency.prefork":
+        _init_worker()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_process(**kwargs: object) -> None:
+    """
+    Drain in-flight tasks, dispose the worker's DB engine and pooled clients, then stop its event loop.
+
+    worker_process_shutdown covers prefork children; worker_shutdown covers the
+    threads/solo pools, where tasks run in the main process.
+    """
+    from app.tasks.loop import shutdown_worker_loop
+
+    shutdown_worker_loop()
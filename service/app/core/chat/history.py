@@ -23,7 +23,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-async def load_conversation_history(db: AsyncSession, topic: "TopicModel") -> list[BaseMessage]:
+async def load_conversation_history(
+    db: AsyncSession, topic: "TopicModel", model_name: str | None = None
+) -> list[BaseMessage]:
     """
     Load historical messages for the topic and map to LangChain message types.
 
@@ -33,13 +35,17 @@ async def load_conversation_history(db: AsyncSession, topic: "TopicModel") -> li
     Args:
         db: Database session
         topic: Topic model containing the conversation
+        model_name: Model the history is sent to; selects the image size limit for attachments
 
     Returns:
         List of LangChain BaseMessage objects ready for agent consumption
     """
     try:
+        from app.core.chat.multimodal import max_image_size_for_model
         from app.repos.message import MessageRepository
 
+        max_image_size = max_image_size_for_model(model_name)
+
         message_repo = MessageRepository(db)
         messages = await message_repo.get_messages_by_topic(topic.id, order_by_created=True)
 
@@ -51,9 +57,9 @@ async def load_conversation_history(db: AsyncSession, topic: "TopicModel") -> li
             content = message.content or ""
 
             if role == "user":
-                history.append(await _build_user_message(db, message, content))
+                history.append(await _build_user_message(db, message, content, max_image_size))
             elif role == "assistant":
-                history.append(await _build_assistant_message(db, message, content))
+                history.append(await _build_assistant_message(db, message, content, max_image_size))
             elif role == "system":
                 history.append(SystemMessage(content=content))
             elif role == "tool":
@@ -74,13 +80,15 @@ async def load_conversation_history(db: AsyncSession, topic: "TopicModel") -> li
         return []
 
 
-async def _build_user_message(db: AsyncSession, message: Any, content: str) -> HumanMessage:
+async def _build_user_message(
+    db: AsyncSession, message: Any, content: str, max_image_size: int | None = None
+) -> HumanMessage:
     """Build a HumanMessage with optional multimodal content."""
     from app.core.chat.multimodal import process_message_files
 
     try:
         logger.debug(f"Checking files for message {message.id}")
-        file_contents = await process_message_files(db, message.id)
+        file_contents = await process_message_files(db, message.id, max_image_size)
         logger.debug(f"Message {message.id} has {len(file_contents) if file_contents else 0} file contents")
 
         if file_contents:
@@ -111,7 +119,9 @@ async def _build_user_message(db: AsyncSession, message: Any, content: str) -> H
         return HumanMessage(content=content)
 
 
-async def _build_assistant_message(db: AsyncSession, message: Any, content: str) -> AIMessage:
+async def _build_assistant_message(
+    db: AsyncSession, message: Any, content: str, max_image_size: int | None = None
+) -> AIMessage:
     """Build an AIMessage with optional multimodal content (e.g., generated images)."""
     from app.core.chat.multimodal import process_message_files
 
@@ -121,7 +131,7 @@ async def _build_assistant_message(db: AsyncSession, message: Any, content: str)
         additional_kwargs["agent_state"] = message.agent_metadata
 
     try:
-        file_contents = await process_message_files(db, message.id)
+        file_contents = await process_message_files(db, message.id, max_image_size)
         if file_contents:
             logger.debug("Successfully processed files for message")
             # Combine text content with file content
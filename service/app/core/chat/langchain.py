@@ -26,6 +26,11 @@ from app.core.chat.stream_handlers import (
     TokenStreamProcessor,
     ToolEventHandler,
 )
+from app.core.chat.tool_progress import (
+    create_chat_progress_reporter,
+    reset_tool_progress_reporter,
+    set_tool_progress_reporter,
+)
 from app.core.chat.tracer import LangGraphTracer
 from app.core.prompts import build_system_prompt
 from app.core.providers import get_user_provider_manager
@@ -61,8 +66,8 @@ async def get_ai_response_stream_langchain_legacy(
         topic: Topic/conversation context
         user_id: User ID for provider management
         agent: Optional agent configuration
-        connection_manager: WebSocket connection manager (unused, for compatibility)
-        connection_id: WebSocket connection ID (unused, for compatibility)
+        connection_manager: Chat publisher, used to stream tool progress while tools run
+        connection_id: Connection ID the publisher is bound to
         context: Optional additional context
 
     Yields:
@@ -119,11 +124,20 @@ async def get_ai_response_stream_langchain_legacy(
         )
 
         # Load conversation history
-        history_messages = await load_conversation_history(db, topic)
+        history_messages = await load_conversation_history(db, topic, model_name)
+
+        # Forward progress of long-running tools to the client while they run
+        reporter = None
+        if connection_manager is not None and connection_id:
+            reporter = create_chat_progress_reporter(ctx, connection_manager, connection_id)
+        progress_token = set_tool_progress_reporter(reporter)
 
         # Process stream
-        async for event in _process_agent_stream(langchain_agent, history_messages, ctx):
-            yield event
+        try:
+            async for event in _process_agent_stream(langchain_agent, history_messages, ctx):
+                yield event
+        finally:
+            reset_tool_progress_reporter(progress_token)
 
     except Exception as e:
         yield _handle_streaming_error(e, user_id)
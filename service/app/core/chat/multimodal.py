@@ -10,14 +10,29 @@ Handles:
 Designed to be extensible for future file types.
 """
 
+import asyncio
 import base64
+import contextlib
 import logging
+import os
+from collections.abc import AsyncIterator
 from io import BytesIO
 from typing import Any, Literal
 from uuid import UUID
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.configs import configs
+from app.core.attachment_cache import attachment_cache_key, get_attachment_cache
+from app.core.attachment_render import (
+    encode_image,
+    get_render_pool,
+    pdf_page_count,
+    render_pdf_pages,
+    write_temp_file,
+)
+from app.models.file import File
+
 logger = logging.getLogger(__name__)
 
 # File category types
@@ -30,29 +45,31 @@ ContentType = Literal["text", "image_url", "audio_url", "document"]
 class FileProcessor:
     """Process files for multimodal LLM consumption."""
 
-    def __init__(self, db: AsyncSession):
+    # Bump when the rendered output format changes, to stop serving cached renderings
+    RENDER_VERSION = 2
+
+    def __init__(self, db: AsyncSession, max_image_size: int | None = None):
         """
         Initialize file processor.
 
         Args:
             db: Database session for querying file records
+            max_image_size: Longest side images are downscaled to (default: Attachment.MaxImageSize)
         """
         self.db = db
+        attachment_config = configs.Attachment
+        self.max_image_size = attachment_config.MaxImageSize if max_image_size is None else max_image_size
+        self.pdf_dpi = attachment_config.PdfDpi
+        self.pdf_max_pages = attachment_config.PdfMaxPages
+        self.pdf_pages_per_task = attachment_config.PdfPagesPerTask
 
-    async def get_file_content(self, file_id: UUID) -> tuple[bytes, str, str]:
+    async def get_file_record(self, file_id: UUID) -> File:
         """
-        Fetch file content from storage.
-
-        Args:
-            file_id: UUID of the file
-
-        Returns:
-            Tuple of (file_bytes, content_type, category)
+        Fetch a file record that can be processed.
 
         Raises:
-            ValueError: If file not found or cannot be accessed
+            ValueError: If file not found or deleted
         """
-        from app.core.storage import get_storage_service
         from app.repos.file import FileRepository
 
         file_repo = FileRepository(self.db)
@@ -64,15 +81,45 @@ class FileProcessor:
         if file_record.is_deleted:
             raise ValueError(f"File {file_id} is deleted")
 
+        return file_record
+
+    async def download_file(self, file_record: File) -> bytes:
+        """Download a file's content from storage."""
+        from app.core.storage import get_storage_service
+
         # Get storage service and download file to BytesIO
         storage = get_storage_service()
         buffer = BytesIO()
         await storage.download_file(file_record.storage_key, buffer)
         buffer.seek(0)  # Reset position to beginning
-        file_bytes = buffer.read()
+        return buffer.read()
+
+    async def get_file_content(self, file_id: UUID) -> tuple[bytes, str, str]:
+        """
+        Fetch file content from storage.
 
+        Args:
+            file_id: UUID of the file
+
+        Returns:
+            Tuple of (file_bytes, content_type, category)
+
+        Raises:
+            ValueError: If file not found or cannot be accessed
+        """
+        file_record = await self.get_file_record(file_id)
+        file_bytes = await self.download_file(file_record)
         return file_bytes, file_record.content_type, file_record.category
 
+    def render_params(self) -> dict[str, Any]:
+        """Parameters that affect rendered output; part of the attachment cache key."""
+        return {
+            "version": self.RENDER_VERSION,
+            "max_image_size": self.max_image_size,
+            "pdf_dpi": self.pdf_dpi,
+            "pdf_max_pages": self.pdf_max_pages,
+        }
+
     async def process_image(self, file_content: bytes, content_type: str) -> dict[str, Any]:
         """
         Process image file to base64 format.
@@ -85,8 +132,10 @@ class FileProcessor:
             Dict with type and image_url for LLM consumption
         """
         try:
-            # Encode image to base64
-            base64_image = base64.b64encode(file_content).decode("utf-8")
+            # Downscale and encode to base64 off the event loop
+            content_type, base64_image = await get_render_pool().run(
+                encode_image, file_content, content_type, self.max_image_size
+            )
 
             # Return in OpenAI vision format (also compatible with Anthropic, Google)
             return {
@@ -100,51 +149,66 @@ class FileProcessor:
             logger.error(f"Failed to process image: {e}")
             raise ValueError(f"Image processing failed: {e}")
 
-    async def process_pdf(self, file_content: bytes) -> list[dict[str, Any]]:
+    async def iter_pdf_pages(self, file_content: bytes) -> AsyncIterator[dict[str, Any]]:
         """
-        Process PDF by converting pages to images then base64.
-        Uses PyMuPDF (fitz) which has no external dependencies.
+        Render PDF pages to base64 images in the render pool, yielding them in
+        page order as soon as each batch is done.
+
+        If ``pdf_max_pages`` is set, only the first pages are rendered and a
+        text note is yielded last when the PDF was truncated.
 
         Args:
             file_content: Raw PDF bytes
-
-        Returns:
-            List of image_url dicts, one per page
         """
+        pool = get_render_pool()
+        # Pool jobs open the PDF from a temp file instead of each receiving a copy of its bytes
+        pdf_path = await asyncio.to_thread(write_temp_file, file_content, ".pdf")
+        jobs: list[asyncio.Future[list[str]]] = []
         try:
-            # Import PyMuPDF (pure Python, no system dependencies)
-            import fitz  # PyMuPDF
-
-            # Open PDF from bytes
-            pdf_document = fitz.open(stream=file_content, filetype="pdf")
-
-            result = []
-            for page_num in range(len(pdf_document)):
-                # Get page
-                page = pdf_document[page_num]
-
-                # Render page to image (pixmap) at 2x resolution for better quality
-                mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better quality
-                pix = page.get_pixmap(matrix=mat)
-
-                # Convert pixmap to PNG bytes
-                img_bytes = pix.tobytes("png")
-
-                # Encode to base64
-                base64_image = base64.b64encode(img_bytes).decode("utf-8")
-
-                result.append(
-                    {
+            total_pages = await pool.run(pdf_page_count, pdf_path)
+            pages = list(range(min(total_pages, self.pdf_max_pages) if self.pdf_max_pages else total_pages))
+            batches = [pages[i : i + self.pdf_pages_per_task] for i in range(0, len(pages), self.pdf_pages_per_task)]
+
+            # Batches render in parallel (bounded by the pool); results are consumed in order
+            jobs = [
+                asyncio.ensure_future(pool.run(render_pdf_pages, pdf_path, batch, self.pdf_dpi, self.max_image_size))
+                for batch in batches
+            ]
+            for batch, job in zip(batches, jobs):
+                for page_index, base64_image in zip(batch, await job):
+                    yield {
                         "type": "image_url",
                         "image_url": {
                             "url": f"data:image/png;base64,{base64_image}",
                             "detail": "auto",
                         },
-                        "_metadata": {"page": page_num + 1, "total_pages": len(pdf_document)},
+                        "_metadata": {"page": page_index + 1, "total_pages": total_pages},
                     }
-                )
+        finally:
+            for job in jobs:
+                job.cancel()
+            with contextlib.suppress(OSError):
+                os.unlink(pdf_path)
+
+        if total_pages > len(pages):
+            yield {
+                "type": "text",
+                "text": f"[PDF truncated: showing the first {len(pages)} of {total_pages} pages]",
+            }
+
+    async def process_pdf(self, file_content: bytes) -> list[dict[str, Any]]:
+        """
+        Process PDF by converting pages to images then base64.
+        Uses PyMuPDF (fitz) which has no external dependencies.
+
+        Args:
+            file_content: Raw PDF bytes
 
-            pdf_document.close()
+        Returns:
+            List of image_url dicts, one per page
+        """
+        try:
+            result = [page async for page in self.iter_pdf_pages(file_content)]
             logger.info(f"Converted PDF to {len(result)} images using PyMuPDF")
             return result
 
@@ -214,6 +278,29 @@ class FileProcessor:
             logger.error(f"Failed to process document: {e}")
             raise ValueError(f"Document processing failed: {e}")
 
+    async def render_file(self, file_content: bytes, content_type: str, category: str) -> list[dict[str, Any]]:
+        """Convert downloaded file content to LLM content blocks based on its category."""
+        logger.info(f"Processing file: category={category}, type={content_type}")
+
+        # Process based on category
+        if category == "images":
+            return [await self.process_image(file_content, content_type)]
+
+        elif category == "documents":
+            # Special handling for PDFs
+            if content_type == "application/pdf":
+                return await self.process_pdf(file_content)
+            else:
+                return [await self.process_document(file_content, content_type)]
+
+        elif category == "audio":
+            return [await self.process_audio(file_content, content_type)]
+
+        else:
+            # Unknown category - try to handle as text
+            logger.warning(f"Unknown file category: {category}")
+            return [await self.process_document(file_content, content_type)]
+
     async def process_file(self, file_id: UUID) -> list[dict[str, Any]]:
         """
         Process a single file and convert to LLM-compatible format.
@@ -230,29 +317,20 @@ class FileProcessor:
             ValueError: If file cannot be processed
         """
         try:
-            # Get file content
-            file_content, content_type, category = await self.get_file_content(file_id)
-
-            logger.info(f"Processing file {file_id}: category={category}, type={content_type}")
+            file_record = await self.get_file_record(file_id)
 
-            # Process based on category
-            if category == "images":
-                return [await self.process_image(file_content, content_type)]
+            # Rendered attachments are reused across turns of the conversation
+            cache = get_attachment_cache()
+            cache_key = attachment_cache_key(file_record, self.render_params())
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Using cached rendering of file {file_id}")
+                return cached
 
-            elif category == "documents":
-                # Special handling for PDFs
-                if content_type == "application/pdf":
-                    return await self.process_pdf(file_content)
-                else:
-                    return [await self.process_document(file_content, content_type)]
-
-            elif category == "audio":
-                return [await self.process_audio(file_content, content_type)]
-
-            else:
-                # Unknown category - try to handle as text
-                logger.warning(f"Unknown file category: {category}")
-                return [await self.process_document(file_content, content_type)]
+            file_content = await self.download_file(file_record)
+            content = await self.render_file(file_content, file_record.content_type, file_record.category)
+            await cache.set(cache_key, content)
+            return content
 
         except ValueError:
             # Re-raise ValueError (already logged)
@@ -262,7 +340,20 @@ class FileProcessor:
             raise ValueError(f"File processing failed: {e}")
 
 
-async def process_message_files(db: AsyncSession, message_id: UUID) -> list[dict[str, Any]]:
+def max_image_size_for_model(model_name: str | None) -> int:
+    """Resolve the image size limit for a model from Attachment.ModelMaxImageSize."""
+    attachment_config = configs.Attachment
+    if model_name:
+        model = model_name.lower()
+        matches = [pattern for pattern in attachment_config.ModelMaxImageSize if pattern.lower() in model]
+        if matches:
+            return attachment_config.ModelMaxImageSize[max(matches, key=len)]
+    return attachment_config.MaxImageSize
+
+
+async def process_message_files(
+    db: AsyncSession, message_id: UUID, max_image_size: int | None = None
+) -> list[dict[str, Any]]:
     """
     Process all files attached to a message.
 
@@ -272,6 +363,7 @@ async def process_message_files(db: AsyncSession, message_id: UUID) -> list[dict
     Args:
         db: Database session
         message_id: UUID of the message with attachments
+        max_image_size: Longest side images are downscaled to (default: Attachment.MaxImageSize)
 
     Returns:
         List of content dicts for all files (flattened, may include multiple
@@ -293,7 +385,7 @@ async def process_message_files(db: AsyncSession, message_id: UUID) -> list[dict
     if not files:
         return []
 
-    processor = FileProcessor(db)
+    processor = FileProcessor(db, max_image_size)
     all_content = []
 
     for file in files:
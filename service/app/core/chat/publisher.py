@@ -0,0 +1,182 @@
+"""
+Chat event publishing used by the Celery chat worker.
+
+Every event for a connection is appended to a capped Redis Stream
+(``chat:stream:{connection_id}``) and then published on the
+``chat:{connection_id}`` channel that the WebSocket endpoint relays to the
+client. Published frames carry the stream entry id as ``event_id`` so a client
+that reconnects can pass ``last_event_id`` and have the events it missed
+replayed from the stream before live delivery resumes.
+
+Token streams produce thousands of tiny ``streaming_chunk`` /
+``thinking_chunk`` events per answer, so consecutive chunks of the same type
+and stream id are coalesced for a short window (or until a byte threshold)
+into a single frame with the same schema ``{"type", "data": {"id", "content"}}``
+and concatenated content. Any other event flushes the pending frame first and
+is published immediately, so ordering is preserved.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.configs import configs
+from app.schemas.chat_event_types import ChatEventType
+
+logger = logging.getLogger(__name__)
+
+COALESCED_EVENT_TYPES = frozenset({ChatEventType.STREAMING_CHUNK, ChatEventType.THINKING_CHUNK})
+
+
+def chat_channel(connection_id: str) -> str:
+    return f"chat:{connection_id}"
+
+
+def chat_stream_key(connection_id: str) -> str:
+    return f"chat:stream:{connection_id}"
+
+
+def parse_event_id(event_id: str) -> tuple[int, int] | None:
+    """Parse a Redis Stream entry id (``<ms>-<seq>``) into a comparable tuple."""
+    ms, _, seq = event_id.partition("-")
+    try:
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+async def append_chat_event(client: redis.Redis, connection_id: str, event: Mapping[str, Any]) -> str:
+    """
+    Append an event to the connection's replay stream and publish it live.
+
+    Returns the stream entry id, which is also sent to the client as ``event_id``.
+    """
+    stream_key = chat_stream_key(connection_id)
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.xadd(stream_key, {"data": json.dumps(event)}, maxlen=configs.ChatStream.StreamMaxLen, approximate=True)
+        pipe.expire(stream_key, configs.ChatStream.StreamTTL)
+        event_id, _ = await pipe.execute()
+    await client.publish(chat_channel(connection_id), json.dumps({**event, "event_id": event_id}))
+    return event_id
+
+
+async def read_chat_events_since(client: redis.Redis, connection_id: str, last_event_id: str) -> list[tuple[str, str]]:
+    """
+    Read the events appended after ``last_event_id`` from the replay stream.
+
+    Returns ``(event_id, message)`` pairs with ``event_id`` embedded in each message.
+    """
+    entries = await client.xrange(
+        chat_stream_key(connection_id), min=f"({last_event_id}", max="+", count=configs.ChatStream.StreamMaxLen
+    )
+    events: list[tuple[str, str]] = []
+    for entry_id, fields in entries:
+        event = json.loads(fields["data"])
+        event["event_id"] = entry_id
+        events.append((entry_id, json.dumps(event)))
+    return events
+
+
+class RedisPublisher:
+    """Publishes chat events for one connection, coalescing token chunks."""
+
+    def __init__(
+        self,
+        connection_id: str,
+        batch_window_ms: int | None = None,
+        batch_max_bytes: int | None = None,
+        redis_client: redis.Redis | None = None,
+    ):
+        self.connection_id = connection_id
+        self.channel = chat_channel(connection_id)
+        self.redis_client = redis_client or redis.from_url(configs.Redis.REDIS_URL, decode_responses=True)
+        window_ms = configs.ChatStream.BatchWindowMs if batch_window_ms is None else batch_window_ms
+        self.batch_window = window_ms / 1000
+        self.batch_max_bytes = configs.ChatStream.BatchMaxBytes if batch_max_bytes is None else batch_max_bytes
+
+        # Pending coalesced frame: (event type, stream id) and content parts
+        self._pending_key: tuple[str, str] | None = None
+        self._pending_parts: list[str] = []
+        self._pending_bytes = 0
+        self._flush_timer: asyncio.Task[None] | None = None
+        # Serializes Redis publishes so frames go out in the order they were cut
+        self._send_lock = asyncio.Lock()
+
+    async def _send(self, event: Mapping[str, Any]) -> None:
+        async with self._send_lock:
+            try:
+                await append_chat_event(self.redis_client, self.connection_id, event)
+            except Exception as e:
+                logger.error(f"Failed to publish to Redis channel {self.channel}: {e}")
+
+    @staticmethod
+    def _coalesce_key(event: Mapping[str, Any]) -> tuple[str, str] | None:
+        """Return the (type, id) key of a chunk event that can be merged, or None."""
+        if event.get("type") not in COALESCED_EVENT_TYPES:
+            return None
+        data = event.get("data")
+        if not isinstance(data, dict) or set(data) != {"id", "content"} or not isinstance(data["content"], str):
+            return None
+        return str(event["type"]), str(data["id"])
+
+    async def publish_event(self, event: Mapping[str, Any]) -> None:
+        """Publish a chat event, buffering it if it is a coalescable chunk."""
+        key = self._coalesce_key(event) if self.batch_window > 0 else None
+        if key is None:
+            await self.flush()
+            await self._send(event)
+            return
+
+        if self._pending_key is not None and self._pending_key != key:
+            await self.flush()
+
+        content: str = event["data"]["content"]
+        self._pending_key = key
+        self._pending_parts.append(content)
+        self._pending_bytes += len(content.encode())
+
+        if self._pending_bytes >= self.batch_max_bytes:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        self._flush_timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Publish the pending coalesced chunk frame, if any."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._pending_key is None:
+            return
+
+        event_type, stream_id = self._pending_key
+        content = "".join(self._pending_parts)
+        self._pending_key = None
+        self._pending_parts = []
+        self._pending_bytes = 0
+        await self._send({"type": event_type, "data": {"id": stream_id, "content": content}})
+
+    async def publish(self, message: str) -> None:
+        """Publish an already serialized event immediately (after any pending chunks)."""
+        await self.flush()
+        await self._send(json.loads(message))
+
+    async def close(self) -> None:
+        await self.flush()
+        await self.redis_client.aclose()
+
+    # Generic method to mimic ConnectionManager.send_personal_message for compatibility
+    async def send_personal_message(self, message: str, connection_id: str) -> None:
+        # connection_id is ignored here as we bound to it in __init__
+        # but checking it matches is good practice
+        if connection_id != self.connection_id:
+            logger.warning(f"Publisher connection_id mismatch: {self.connection_id} vs {connection_id}")
+        await self.publish(message)
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
 import logging
 import time
 from dataclasses import dataclass, field
@@ -404,7 +405,7 @@ class GeneratedFileHandler:
         Raises:
             ValueError: If image_data format is invalid
         """
-        from app.core.storage import FileCategory, FileScope, generate_storage_key, get_storage_service
+        from app.core.storage import FileCategory, FileScope, get_storage_service, store_blob
         from app.models.file import FileCreate
         from app.repos.file import FileRepository
 
@@ -423,19 +424,16 @@ class GeneratedFileHandler:
 
         image_bytes = base64.b64decode(base64_data)
 
-        # Create storage key and upload
+        # Store content-addressed (identical images are uploaded once)
         storage_service = get_storage_service()
         filename = f"generated_image_{int(asyncio.get_event_loop().time())}.{file_ext}"
-        storage_key = generate_storage_key(
-            user_id,
-            filename,
-            scope=FileScope.GENERATED,
-            category=FileCategory.IMAGE,
-        )
-
-        await storage_service.upload_file(
+        file_hash = hashlib.sha256(image_bytes).hexdigest()
+        storage_key = await store_blob(
+            db,
+            storage_service,
             BytesIO(image_bytes),
-            storage_key,
+            file_hash=file_hash,
+            file_size=len(image_bytes),
             content_type=f"image/{file_ext}",
         )
 
@@ -449,6 +447,7 @@ class GeneratedFileHandler:
             file_size=len(image_bytes),
             scope=FileScope.GENERATED,
             category=FileCategory.IMAGE,
+            file_hash=file_hash,
             status="pending",
         )
 
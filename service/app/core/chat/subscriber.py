@@ -0,0 +1,206 @@
+"""
+Multiplexed Redis subscriber for chat WebSockets.
+
+Each API pod keeps a single Redis pub/sub connection. WebSockets register
+interest in their ``chat:{connection_id}`` channel; the pod subscribes to a
+channel while at least one local WebSocket needs it and fans every message
+out to the per-WebSocket bounded queues. A consumer that cannot keep up
+(its queue overflows) is evicted rather than buffering without limit; the
+client reconnects and catches up through the replay stream.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.configs import configs
+from app.core.chat.publisher import chat_channel
+
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumerError(Exception):
+    """Raised to a subscriber that was evicted because its queue overflowed."""
+
+
+class ChatSubscription:
+    """One WebSocket's view of a chat channel."""
+
+    def __init__(self, channel: str, max_queue_size: int):
+        self.channel = channel
+        self.evicted = False
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=max_queue_size)
+
+    def deliver(self, message: str) -> bool:
+        """Queue a message without blocking; evict on overflow. Returns False if evicted."""
+        if self.evicted:
+            return False
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.evict()
+            return False
+
+    def evict(self) -> None:
+        self.evicted = True
+        # Drop the backlog and wake the consumer up
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> str:
+        message = await self._queue.get()
+        if message is None:
+            raise SlowConsumerError(f"Subscriber on {self.channel} fell behind and was evicted")
+        return message
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class ChatEventHub:
+    """Single pub/sub connection shared by every chat WebSocket of this process."""
+
+    SUBSCRIBE_TIMEOUT = 5.0
+
+    def __init__(self, max_queue_size: int = 1000):
+        self.max_queue_size = max_queue_size
+        self.redis_client = redis.from_url(configs.Redis.REDIS_URL, decode_responses=True)
+        self._pubsub = self.redis_client.pubsub()
+        self._subscribers: dict[str, set[ChatSubscription]] = {}
+        self._confirmed: dict[str, asyncio.Event] = {}
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.Task[None] | None = None
+        self._evictions = 0
+
+    @asynccontextmanager
+    async def subscribe(self, connection_id: str) -> AsyncIterator[ChatSubscription]:
+        """Subscribe to a connection's chat channel for the duration of the context."""
+        channel = chat_channel(connection_id)
+        subscription = ChatSubscription(channel, self.max_queue_size)
+        await self._add(subscription)
+        try:
+            yield subscription
+        finally:
+            await self._remove(subscription)
+
+    async def _add(self, subscription: ChatSubscription) -> None:
+        channel = subscription.channel
+        async with self._lock:
+            subscribers = self._subscribers.setdefault(channel, set())
+            subscribers.add(subscription)
+            confirmed = self._confirmed.get(channel)
+            if confirmed is None:
+                confirmed = self._confirmed[channel] = asyncio.Event()
+                try:
+                    await self._pubsub.subscribe(channel)
+                except BaseException:
+                    # Leave no registration behind, so the next subscriber retries the subscribe
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+                    del self._confirmed[channel]
+                    raise
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read_loop())
+
+        # Wait until Redis confirms, so callers can read the replay stream without gaps
+        try:
+            await asyncio.wait_for(confirmed.wait(), timeout=self.SUBSCRIBE_TIMEOUT)
+        except TimeoutError:
+            logger.warning(f"Timed out waiting for Redis subscription to {channel}")
+
+    async def _remove(self, subscription: ChatSubscription) -> None:
+        channel = subscription.channel
+        async with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if subscribers:
+                return
+            del self._subscribers[channel]
+            self._confirmed.pop(channel, None)
+            try:
+                await self._pubsub.unsubscribe(channel)
+            except Exception as e:
+                logger.error(f"Failed to unsubscribe from {channel}: {e}")
+
+    async def _read_loop(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+                backoff = 0.5
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Chat subscriber connection error, retrying in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+                continue
+
+            if message is None:
+                continue
+            self.dispatch(message)
+
+    def dispatch(self, message: dict[str, Any]) -> None:
+        """Route one pub/sub message to the local subscribers of its channel."""
+        channel = message.get("channel")
+        if message["type"] == "subscribe":
+            confirmed = self._confirmed.get(channel)  # type: ignore[arg-type]
+            if confirmed is not None:
+                confirmed.set()
+            return
+        if message["type"] != "message":
+            return
+
+        for subscription in list(self._subscribers.get(channel, ())):  # type: ignore[arg-type]
+            if not subscription.deliver(message["data"]):
+                self._evictions += 1
+                logger.warning(f"Evicted slow chat consumer on {channel}")
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        await self._pubsub.aclose()
+        await self.redis_client.aclose()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get subscriber statistics."""
+        return {
+            "channels": len(self._subscribers),
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "queued": sum(sub.qsize() for subs in self._subscribers.values() for sub in subs),
+            "evictions": self._evictions,
+        }
+
+
+# 全局订阅实例
+_hub: ChatEventHub | None = None
+
+
+def get_chat_event_hub() -> ChatEventHub:
+    """Get this process's shared chat event subscriber."""
+    global _hub
+    if _hub is None:
+        _hub = ChatEventHub(max_queue_size=configs.ChatStream.SubscriberQueueSize)
+    return _hub
+
+
+async def close_chat_event_hub() -> None:
+    """Close the shared chat event subscriber (application shutdown)."""
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
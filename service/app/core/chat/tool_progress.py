@@ -0,0 +1,80 @@
+"""
+Forward MCP tool progress notifications to the chat stream.
+
+Long-running tools (e.g. waiting for a lab task) report progress over MCP
+instead of making the agent poll. While a chat turn is streamed, a reporter
+bound to its publisher is kept in a ContextVar; ``execute_bound_tool_call``
+turns it into a fastmcp ``progress_handler`` so every notification reaches
+the client as a ``progress_update`` event while the tool is still running.
+"""
+
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING
+
+from app.core.chat.agent_event_handler import AgentEventHandler
+
+if TYPE_CHECKING:
+    from app.core.chat.interfaces import ChatPublisher
+    from app.core.chat.stream_handlers import StreamContext
+
+logger = logging.getLogger(__name__)
+
+# (tool_name, progress, total, message)
+ToolProgressReporter = Callable[[str, float, float | None, str | None], Awaitable[None]]
+# fastmcp progress handler: (progress, total, message)
+ProgressHandler = Callable[[float, float | None, str | None], Awaitable[None]]
+
+_reporter: ContextVar[ToolProgressReporter | None] = ContextVar("tool_progress_reporter", default=None)
+
+
+def set_tool_progress_reporter(reporter: ToolProgressReporter | None) -> Token[ToolProgressReporter | None]:
+    """Route progress of tools called in the current context to ``reporter``."""
+    return _reporter.set(reporter)
+
+
+def reset_tool_progress_reporter(token: Token[ToolProgressReporter | None]) -> None:
+    """Restore the reporter that was active before ``set_tool_progress_reporter``."""
+    try:
+        _reporter.reset(token)
+    except ValueError:
+        # A stream finalized from another context (e.g. by the GC) can't reset its token
+        _reporter.set(None)
+
+
+def get_tool_progress_handler(tool_name: str) -> ProgressHandler | None:
+    """Build a progress handler for one tool call, or None if nothing listens."""
+    reporter = _reporter.get()
+    if reporter is None:
+        return None
+
+    async def handler(progress: float, total: float | None, message: str | None) -> None:
+        try:
+            await reporter(tool_name, progress, total, message)
+        except Exception as e:
+            # Progress is best effort and must never fail the tool call
+            logger.debug(f"Failed to report progress of tool '{tool_name}': {e}")
+
+    return handler
+
+
+def create_chat_progress_reporter(
+    ctx: "StreamContext", publisher: "ChatPublisher", connection_id: str
+) -> ToolProgressReporter:
+    """Create a reporter that publishes tool progress as ``progress_update`` events."""
+
+    async def report(tool_name: str, progress: float, total: float | None, message: str | None) -> None:
+        if ctx.event_ctx is None:
+            return
+        percent = int(progress / total * 100) if total else 0
+        event = AgentEventHandler.emit_progress(
+            ctx.event_ctx,
+            percent,
+            message or f"Running {tool_name}",
+            details={"tool_name": tool_name, "progress": progress, "total": total},
+        )
+        await publisher.send_personal_message(json.dumps(event), connection_id)
+
+    return report
@@ -1,4 +1,3 @@
-import json
 import logging
 from uuid import UUID
 
@@ -82,12 +81,12 @@ async def generate_and_update_topic_title(
                 }
                 # Publish to Redis channel for cross-pod delivery
                 # The redis_listener in chat.py subscribes to this channel
+                from app.core.chat.publisher import append_chat_event
                 from app.infra.redis import get_redis_client
 
                 r = await get_redis_client()
-                channel = f"chat:{connection_id}"
-                await r.publish(channel, json.dumps(event))
-                logger.debug(f"Published topic_updated event to Redis channel: {channel}")
+                await append_chat_event(r, connection_id, event)
+                logger.debug(f"Published topic_updated event for connection: {connection_id}")
 
         except Exception as e:
             logger.error(f"Error in title generation task: {e}")
@@ -37,7 +37,7 @@ class TimelineEntry:
     Single entry in the execution timeline.
 
     Represents an event that occurred during agent execution,
-    stored in AgentRun.node_data["timeline"].
+    stored as an AgentRunTimelineEntry row.
     """
 
     event_type: str
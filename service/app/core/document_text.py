@@ -0,0 +1,210 @@
+"""
+Cache of text extracted from documents (PDF, DOCX, XLSX, PPTX, ...).
+
+Parsing a document — PyMuPDF table detection on every PDF page in
+particular — is far more expensive than reading it, and agents read long
+documents a page range at a time. Extracted pages are therefore cached by
+content (file hash) and ``EXTRACTION_VERSION``, in a size-bounded in-process
+LRU and optionally in object storage so other processes and later sessions
+reuse them. Text of files without a content hash stays in process memory:
+stored extractions are removed with their blob, by hash.
+
+``extract_document_pages`` runs inside the attachment render process pool;
+the storage-facing helpers import their dependencies lazily.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from io import BytesIO
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.core.storage import StorageServiceProto
+    from app.models.file import File
+
+logger = logging.getLogger(__name__)
+
+EXTRACTED_TEXT_PREFIX = "cache/extracted/"
+
+Pages = list[str]
+
+
+def extract_document_pages(filename: str, data: bytes) -> Pages:
+    """Extract the text of a document, one entry per page (sheet, slide)."""
+    from app.tools.utils.documents.handlers import FileHandlerFactory
+
+    return FileHandlerFactory.get_handler(filename).read_pages(data)
+
+
+def extracted_text_prefix(file_hash: str) -> str:
+    """Storage prefix of every cached extraction of some content."""
+    return f"{EXTRACTED_TEXT_PREFIX}{file_hash}/"
+
+
+def document_text_key(file: "File") -> str:
+    """Cache key of a file's extracted text: keyed by content and extractor version, not by file record."""
+    from app.tools.utils.documents.handlers import EXTRACTION_VERSION
+
+    source = file.file_hash or hashlib.sha256(file.storage_key.encode()).hexdigest()
+    # The extension picks the handler, so it is part of what was extracted
+    extension = file.original_filename.lower().rsplit(".", 1)[-1] if "." in file.original_filename else "txt"
+    return f"{source}/{extension}-v{EXTRACTION_VERSION}"
+
+
+class ExtractedTextCache:
+    """Size-bounded LRU of extracted document pages, with an optional object-storage tier."""
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, use_storage: bool = True):
+        self.max_bytes = max_bytes
+        self.use_storage = use_storage
+        self._entries: OrderedDict[str, tuple[Pages, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def _set_local(self, key: str, pages: Pages) -> None:
+        size = sum(len(page) for page in pages)
+        if size > self.max_bytes:
+            return
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._size -= cached[1]
+        self._entries[key] = (pages, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+
+    async def get(self, key: str, use_storage: bool = True) -> Pages | None:
+        """Get the cached pages, or None on a miss; ``use_storage=False`` skips the storage tier."""
+        cached = self._entries.get(key)
+        pages = None
+        if cached is not None:
+            self._entries.move_to_end(key)
+            pages = cached[0]
+        elif self.use_storage and use_storage:
+            pages = await self._get_storage(key)
+            if pages is not None:
+                self._set_local(key, pages)
+
+        if pages is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        # Pages are immutable strings; a shallow copy keeps the cached list intact
+        return list(pages)
+
+    async def set(self, key: str, pages: Pages, use_storage: bool = True) -> None:
+        """Cache extracted pages; ``use_storage=False`` keeps them out of the storage tier."""
+        self._set_local(key, list(pages))
+        if self.use_storage and use_storage:
+            await self._set_storage(key, pages)
+
+    async def _get_storage(self, key: str) -> Pages | None:
+        from app.core.storage import get_storage_service
+
+        storage = get_storage_service()
+        storage_key = f"{EXTRACTED_TEXT_PREFIX}{key}.json"
+        try:
+            if not await storage.file_exists(storage_key):
+                return None
+            buffer = BytesIO()
+            await storage.download_file(storage_key, buffer)
+            return json.loads(buffer.getvalue())
+        except Exception as e:
+            logger.warning(f"Failed to read extracted text {key} from storage: {e}")
+            return None
+
+    async def _set_storage(self, key: str, pages: Pages) -> None:
+        from app.core.storage import get_storage_service
+
+        try:
+            await get_storage_service().upload_file(
+                BytesIO(json.dumps(pages).encode()),
+                f"{EXTRACTED_TEXT_PREFIX}{key}.json",
+                content_type="application/json",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to write extracted text {key} to storage: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "storage_tier": self.use_storage,
+        }
+
+
+_text_cache: ExtractedTextCache | None = None
+
+# Extractions in progress in this process, so concurrent reads of one document parse it once
+_extraction_locks: dict[str, asyncio.Lock] = {}
+
+
+def get_text_cache() -> ExtractedTextCache:
+    """Get the process-wide extracted text cache."""
+    global _text_cache
+    if _text_cache is None:
+        from app.configs import configs
+
+        _text_cache = ExtractedTextCache(
+            max_bytes=configs.Knowledge.ReadCacheMaxBytes,
+            use_storage=configs.Knowledge.ReadCacheStorageTier,
+        )
+    return _text_cache
+
+
+async def get_document_pages(
+    file: "File", storage: "StorageServiceProto | None" = None, data: bytes | None = None
+) -> Pages:
+    """
+    Get the extracted text of a file, parsing it on first use.
+
+    Args:
+        file: The file to read
+        storage: Storage service, the default one if not given
+        data: The file content, downloaded from storage if needed and not given
+
+    Returns:
+        Text of each page of the document.
+    """
+    from app.core.attachment_render import get_render_pool
+
+    cache = get_text_cache()
+    key = document_text_key(file)
+    # Only content-hashed extractions are cleaned up with their blob
+    use_storage = bool(file.file_hash)
+    pages = await cache.get(key, use_storage)
+    if pages is not None:
+        return pages
+
+    lock = _extraction_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            pages = await cache.get(key, use_storage)
+            if pages is not None:
+                return pages
+
+            if data is None:
+                if storage is None:
+                    from app.core.storage import get_storage_service
+
+                    storage = get_storage_service()
+                buffer = BytesIO()
+                await storage.download_file(file.storage_key, buffer)
+                data = buffer.getvalue()
+
+            logger.info(f"Extracting text of file {file.id}")
+            pages = await get_render_pool().run(extract_document_pages, file.original_filename, data)
+            await cache.set(key, pages, use_storage)
+            return pages
+    finally:
+        if not lock.locked():
+            _extraction_locks.pop(key, None)
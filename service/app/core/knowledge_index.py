@@ -0,0 +1,174 @@
+"""
+Full-text content index for knowledge set search.
+
+Files linked to a knowledge set have their text extracted once, split into
+chunks and stored as normalized tokens (``FileContentChunk``). The database's
+full-text index (Postgres tsvector / SQLite FTS5) narrows a query down to the
+chunks containing any query term, keeping the best ranked by the database when
+there are more than ``MAX_CANDIDATES``; those candidates are ranked here with
+BM25, using term document frequencies counted over the whole knowledge set, so
+results stay consistent across database backends.
+
+Files are (re)indexed when they are written and in the background after
+upload. A search schedules background indexing of the files whose content
+hash no longer matches the indexed version, and only searches what is already
+indexed.
+"""
+
+import asyncio
+import logging
+import re
+from collections.abc import Sequence
+from typing import TypedDict
+from uuid import UUID
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.document_text import get_document_pages
+from app.models.file import File
+from app.repos.file_content import FileContentRepository
+from app.utils.text_search import bm25_scores, make_snippet, query_phrases, tokenize
+
+logger = logging.getLogger(__name__)
+
+CHUNK_MAX_CHARS = 1500
+MAX_QUERY_TERMS = 32
+MAX_CANDIDATES = 1000
+SNIPPET_CHARS = 240
+
+# Categories whose files carry no extractable text
+_UNINDEXED_CATEGORIES = {"images", "audio"}
+
+
+class KnowledgeSearchHit(TypedDict):
+    file_id: UUID
+    filename: str
+    chunk_index: int
+    score: float
+    snippet: str
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_MAX_CHARS) -> list[str]:
+    """
+    Split text into chunks of at most ``max_chars``, breaking on paragraph
+    boundaries where possible and on whitespace otherwise.
+    """
+    chunks: list[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 <= max_chars:
+            current = f"{current}\n\n{paragraph}"
+            continue
+        if current:
+            chunks.append(current)
+        current = ""
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            chunks.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        current = paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def build_chunks(text: str) -> list[tuple[str, str, int]]:
+    """Chunk text for the index as (content, tokens, token_count) tuples."""
+    result: list[tuple[str, str, int]] = []
+    for content in chunk_text(text):
+        tokens = tokenize(content)
+        if tokens:
+            result.append((content, " ".join(tokens), len(tokens)))
+    return result
+
+
+async def index_file(db: AsyncSession, file: File, data: bytes | None = None) -> int:
+    """
+    (Re)index the content of a file. This function does NOT commit the transaction.
+
+    Args:
+        db: Database session
+        file: The file to index
+        data: The file content, downloaded from storage if not given
+
+    Returns:
+        Number of chunks indexed.
+    """
+    repo = FileContentRepository(db)
+    if file.category in _UNINDEXED_CATEGORIES:
+        await repo.replace_file_index(file.id, file.file_hash, [], error="no text content")
+        return 0
+
+    try:
+        # Shares the extracted text cache with knowledge_read
+        text = "\n\n".join(await get_document_pages(file, data=data))
+    except Exception as e:
+        logger.warning(f"Could not extract text of file {file.id} for indexing: {e}")
+        await repo.replace_file_index(file.id, file.file_hash, [], error=str(e)[:500])
+        return 0
+
+    chunks = await asyncio.to_thread(build_chunks, text)
+    await repo.replace_file_index(file.id, file.file_hash, chunks)
+    logger.debug(f"Indexed file {file.id} into {len(chunks)} chunks")
+    return len(chunks)
+
+
+async def get_stale_files(db: AsyncSession, files: Sequence[File]) -> list[File]:
+    """Get the files that were never indexed or whose content changed since."""
+    states = await FileContentRepository(db).get_index_states([file.id for file in files])
+    return [
+        file
+        for file in files
+        if file.id not in states or (file.file_hash is not None and states[file.id].file_hash != file.file_hash)
+    ]
+
+
+async def search_knowledge_set(
+    db: AsyncSession, knowledge_set_id: UUID, query: str, limit: int = 10
+) -> list[KnowledgeSearchHit]:
+    """
+    Rank the indexed chunks of a knowledge set against a query.
+
+    Args:
+        db: Database session
+        knowledge_set_id: Knowledge set to search
+        query: Free-text query
+        limit: Maximum number of hits
+
+    Returns:
+        Hits ordered by descending BM25 score.
+    """
+    phrases = query_phrases(query)[:MAX_QUERY_TERMS]
+    terms = list(dict.fromkeys(token for phrase in phrases for token in phrase))
+    if not terms:
+        return []
+
+    repo = FileContentRepository(db)
+    candidates = await repo.search_candidates(knowledge_set_id, phrases, limit=MAX_CANDIDATES)
+    if not candidates:
+        return []
+
+    total_chunks, average_length = await repo.get_corpus_stats(knowledge_set_id)
+    # Counted over the whole knowledge set, since candidates may be capped
+    frequencies = await repo.count_term_documents(knowledge_set_id, terms)
+    scores = bm25_scores(
+        terms, [chunk.tokens.split() for chunk, _ in candidates], total_chunks, average_length, frequencies
+    )
+
+    ranked = sorted(zip(scores, candidates), key=lambda item: item[0], reverse=True)
+    return [
+        KnowledgeSearchHit(
+            file_id=chunk.file_id,
+            filename=filename,
+            chunk_index=chunk.chunk_index,
+            score=round(score, 4),
+            snippet=make_snippet(chunk.content, ["".join(phrase) for phrase in phrases], SNIPPET_CHARS),
+        )
+        for score, (chunk, filename) in ranked[:limit]
+        if score > 0
+    ]
@@ -368,9 +368,10 @@ class AgentMarketplaceService:
 
         # Handle knowledge set: Create empty knowledge set for user
         if snapshot.knowledge_set_config:
+            import hashlib
             import io
 
-            from app.core.storage import generate_storage_key, get_storage_service
+            from app.core.storage import get_storage_service, is_blob_storage_key, store_blob
             from app.models.knowledge_set import KnowledgeSetCreate
 
             kb_config = snapshot.knowledge_set_config
@@ -398,22 +399,32 @@ class AgentMarketplaceService:
 
                         # Strategy:
                         # 1. If user owns the original file, just link it (Efficient).
-                        # 2. If user is different, we MUST physically copy to avoid Unique Constraint on storage_key.
+                        # 2. If user is different, create a new file record sharing the content-addressed blob.
 
                         if original_file.user_id == user_id:
                             # Self-fork or re-fork: Reuse existing file record
                             target_file_id = original_file.id
                         else:
-                            # Cross-fork: Physical Copy required
-                            # Download content
-                            buffer = io.BytesIO()
-                            await storage.download_file(original_file.storage_key, buffer)
-                            content_bytes = buffer.getvalue()
-
-                            # Upload to new key
-                            new_key = generate_storage_key(user_id, original_file.original_filename, FileScope.PRIVATE)
-                            data_stream = io.BytesIO(content_bytes)
-                            await storage.upload_file(data_stream, new_key, content_type=original_file.content_type)
+                            if original_file.file_hash and is_blob_storage_key(original_file.storage_key):
+                                # Content-addressed already: reference the same blob, no copy needed
+                                file_hash = original_file.file_hash
+                                await self.file_repo.get_blob(file_hash)
+                                new_key = original_file.storage_key
+                            else:
+                                # Legacy per-file key: move the content into a blob once
+                                buffer = io.BytesIO()
+                                await storage.download_file(original_file.storage_key, buffer)
+                                content_bytes = buffer.getvalue()
+                                file_hash = hashlib.sha256(content_bytes).hexdigest()
+                                buffer.seek(0)
+                                new_key = await store_blob(
+                                    self.db,
+                                    storage,
+                                    buffer,
+                                    file_hash=file_hash,
+                                    file_size=len(content_bytes),
+                                    content_type=original_file.content_type,
+                                )
 
                             # Create new file record
                             new_file_data = FileCreate(
@@ -421,10 +432,11 @@ class AgentMarketplaceService:
                                 folder_id=None,
                                 original_filename=original_file.original_filename,
                                 storage_key=new_key,
-                                file_size=len(content_bytes),
+                                file_size=original_file.file_size,
                                 content_type=original_file.content_type,
                                 scope=FileScope.PRIVATE,
                                 category=original_file.category,
+                                file_hash=file_hash,
                                 status=original_file.status,
                             )
                             new_file = await self.file_repo.create_file(new_file_data)
@@ -1,14 +1,18 @@
 import asyncio
 import datetime
 import logging
+import time
 from uuid import UUID
 
 import httpx
 from fastmcp import Client
 from fastmcp.client.auth import BearerAuth
 
+from app.configs import configs
+from app.core.mcp_catalog import McpToolCatalog, get_mcp_catalog_cache
 from app.core.websocket import mcp_websocket_manager
 from app.infra.database import get_session
+from app.infra.mcp import get_mcp_client_pool
 from app.models.mcp import McpServer
 
 logger = logging.getLogger(__name__)
@@ -31,16 +35,24 @@ async def async_check_mcp_server_status(server_id: UUID | None) -> None:
             # Use BearerAuth if a token is provided, otherwise no auth
             auth = BearerAuth(server.token) if server.token else None
 
-            # Initialize the client with the server URL, auth helper, and a 10-second timeout
+            # Initialize the client with the server URL, auth helper, and a 30-second timeout
             logger.info(f"Checking MCP server '{server.name}' at {server.url} (Auth: {'Yes' if auth else 'No'})")
-            client = Client(server.url, auth=auth, timeout=30.0)
-
-            async with client:
-                # list_tools() will implicitly check the connection and list tools
-                tools_response = await client.list_tools()
-                server.status = "online"
-                server.tools = [tool.model_dump() for tool in tools_response]
-                logger.info(f"MCP server '{server.name}' ({server.id}) is online with {len(server.tools)} tools.")
+            if configs.MCP.ClientPool.Enabled:
+                # Probe through the pool so later tool calls reuse the same initialized session
+                pool = get_mcp_client_pool()
+                try:
+                    tools_response = await asyncio.wait_for(pool.list_tools(server.url, server.token), timeout=30.0)
+                except asyncio.TimeoutError as e:
+                    await pool.evict(server.url, server.token)
+                    raise httpx.TimeoutException("MCP server status check timed out") from e
+            else:
+                client = Client(server.url, auth=auth, timeout=30.0)
+                async with client:
+                    # list_tools() will implicitly check the connection and list tools
+                    tools_response = await client.list_tools()
+            server.status = "online"
+            server.tools = [tool.model_dump() for tool in tools_response]
+            logger.info(f"MCP server '{server.name}' ({server.id}) is online with {len(server.tools)} tools.")
         except httpx.TimeoutException:
             server.status = "offline"
             server.tools = []
@@ -59,6 +71,15 @@ async def async_check_mcp_server_status(server_id: UUID | None) -> None:
             session.add(server)
             await session.commit()
             await session.refresh(server)
+            # Write the new status/tools through to the catalog cache used by chat turns
+            await get_mcp_catalog_cache().set(
+                McpToolCatalog(
+                    server_id=str(server.id),
+                    status=server.status,
+                    tools=list(server.tools or []),
+                    fetched_at=time.time(),
+                )
+            )
             # Broadcast the update to all connected clients
             await mcp_websocket_manager.broadcast(server.model_dump())
 
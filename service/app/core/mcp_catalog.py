@@ -0,0 +1,237 @@
+"""
+MCP tool catalog cache.
+
+Caches each MCP server's status and tool list so that preparing tools for a
+chat turn never waits on live network probes. Lookups go through an in-process
+L1 and a shared Redis tier, with stale-while-revalidate semantics:
+
+- fresh entry: used as is
+- stale entry: used as is, and a background refresh is scheduled
+- missing entry: the server row's last known status/tools are used, and a
+  background refresh is scheduled
+
+Refreshes go through ``async_check_mcp_server_status``, which writes the new
+catalog back here, and are de-duplicated per server within a process and
+across pods via a short Redis lock.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.configs import configs
+from app.infra.loop_local import LoopLocal
+from app.models.mcp import McpServer
+
+logger = logging.getLogger(__name__)
+
+
+def _create_redis() -> redis.Redis:
+    return redis.from_url(configs.Redis.REDIS_URL, decode_responses=True)
+
+
+@dataclass
+class McpToolCatalog:
+    """Cached status and tool definitions of one MCP server."""
+
+    server_id: str
+    status: str
+    tools: list[dict[str, Any]]
+    fetched_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return time.time() - self.fetched_at < ttl_seconds
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "McpToolCatalog":
+        return cls(**json.loads(data))
+
+    @classmethod
+    def from_server(cls, server: McpServer) -> "McpToolCatalog":
+        """Build a catalog from a server row's last known state."""
+        fetched_at = server.last_checked_at.timestamp() if server.last_checked_at else 0.0
+        return cls(
+            server_id=str(server.id),
+            status=server.status,
+            tools=list(server.tools or []),
+            fetched_at=fetched_at,
+        )
+
+
+class McpCatalogCache:
+    """Two-tier (process + Redis) cache of MCP tool catalogs."""
+
+    CACHE_PREFIX = "mcp:catalog:"
+    LOCK_PREFIX = "mcp:catalog:refresh:"
+    REFRESH_LOCK_SECONDS = 60
+
+    def __init__(self, fresh_ttl: int = 120, stale_ttl: int = 86400, local_ttl: int = 10, use_redis: bool = True):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.local_ttl = local_ttl
+        self.use_redis = use_redis
+        self._local: dict[str, tuple[McpToolCatalog, float]] = {}
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._redis = LoopLocal(_create_redis, redis.Redis.aclose, "MCP catalog Redis client")
+
+    def _get_redis(self) -> redis.Redis:
+        """Get a Redis client bound to the running event loop."""
+        return self._redis.get()
+
+    async def close(self) -> None:
+        """Close the running loop's Redis client and any left by finished loops."""
+        await self._redis.close()
+
+    def _get_local(self, server_id: str) -> McpToolCatalog | None:
+        cached = self._local.get(server_id)
+        if cached is None:
+            return None
+        catalog, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._local[server_id]
+            return None
+        return catalog
+
+    def _set_local(self, catalog: McpToolCatalog) -> None:
+        self._local[catalog.server_id] = (catalog, time.monotonic() + self.local_ttl)
+
+    async def get_many(self, server_ids: Sequence[UUID | str]) -> dict[str, McpToolCatalog]:
+        """Get cached catalogs (fresh or stale) for the given servers."""
+        found: dict[str, McpToolCatalog] = {}
+        missing: list[str] = []
+        for server_id in map(str, server_ids):
+            catalog = self._get_local(server_id)
+            if catalog is not None:
+                found[server_id] = catalog
+            else:
+                missing.append(server_id)
+
+        if missing and self.use_redis:
+            try:
+                values = await self._get_redis().mget([f"{self.CACHE_PREFIX}{sid}" for sid in missing])
+                for server_id, value in zip(missing, values):
+                    if value:
+                        catalog = McpToolCatalog.from_json(value)
+                        found[server_id] = catalog
+                        self._set_local(catalog)
+            except Exception as e:
+                logger.error(f"Redis MCP catalog get error: {e}")
+
+        return found
+
+    async def set(self, catalog: McpToolCatalog) -> None:
+        """Store a freshly fetched catalog in both tiers."""
+        self._set_local(catalog)
+        if not self.use_redis:
+            return
+        try:
+            await self._get_redis().setex(f"{self.CACHE_PREFIX}{catalog.server_id}", self.stale_ttl, catalog.to_json())
+        except Exception as e:
+            logger.error(f"Redis MCP catalog set error: {e}")
+
+    async def invalidate(self, server_id: UUID | str) -> None:
+        """Drop a server's catalog, e.g. after it was edited or deleted."""
+        server_id = str(server_id)
+        self._local.pop(server_id, None)
+        if not self.use_redis:
+            return
+        try:
+            await self._get_redis().delete(f"{self.CACHE_PREFIX}{server_id}")
+        except Exception as e:
+            logger.error(f"Redis MCP catalog invalidate error: {e}")
+
+    async def get_catalogs(self, servers: Sequence[McpServer]) -> list[McpToolCatalog]:
+        """
+        Resolve catalogs for ``servers`` without touching the network.
+
+        Stale or missing catalogs are served from cache / the server row and
+        refreshed in the background.
+        """
+        cached = await self.get_many([server.id for server in servers])
+        catalogs: list[McpToolCatalog] = []
+        for server in servers:
+            catalog = cached.get(str(server.id))
+            if catalog is None:
+                catalog = McpToolCatalog.from_server(server)
+                self.schedule_refresh(server.id)
+            elif not catalog.is_fresh(self.fresh_ttl):
+                self.schedule_refresh(server.id)
+            catalogs.append(catalog)
+        return catalogs
+
+    def schedule_refresh(self, server_id: UUID) -> None:
+        """Refresh a server's catalog in the background, once per process at a time."""
+        key = str(server_id)
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(server_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, server_id: UUID) -> None:
+        from app.core.mcp import async_check_mcp_server_status
+
+        key = str(server_id)
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        locked = False
+        try:
+            if self.use_redis:
+                # Only one pod probes a given server at a time
+                locked = bool(await self._get_redis().set(lock_key, "1", nx=True, ex=self.REFRESH_LOCK_SECONDS))
+                if not locked:
+                    return
+            await async_check_mcp_server_status(server_id)
+        except Exception as e:
+            logger.warning(f"Background MCP catalog refresh failed for {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+            if locked:
+                try:
+                    await self._get_redis().delete(lock_key)
+                except Exception as e:
+                    logger.warning(f"Failed to release MCP catalog refresh lock for {key}: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "local_size": len(self._local),
+            "refreshing": len(self._refreshing),
+            "fresh_ttl": self.fresh_ttl,
+            "backend": "redis" if self.use_redis else "local",
+        }
+
+
+# 全局缓存实例
+_catalog_cache: McpCatalogCache | None = None
+
+
+def get_mcp_catalog_cache() -> McpCatalogCache:
+    """Get the global MCP tool catalog cache."""
+    global _catalog_cache
+    if _catalog_cache is None:
+        cache_config = configs.MCP.CatalogCache
+        _catalog_cache = McpCatalogCache(
+            fresh_ttl=cache_config.FreshTTL,
+            stale_ttl=cache_config.StaleTTL,
+            local_ttl=cache_config.LocalTTL,
+            use_redis=configs.Redis.CacheBackend == "redis",
+        )
+    return _catalog_cache
+
+
+async def close_mcp_catalog_cache() -> None:
+    """Close the global MCP catalog cache's Redis clients (application shutdown)."""
+    if _catalog_cache is not None:
+        await _catalog_cache.close()
@@ -5,6 +5,7 @@ from uuid import UUID
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.common.code import ErrCode
+from app.core.attachment_cache import get_attachment_cache
 from app.models.sessions import (
     SessionCreate,
     SessionRead,
@@ -13,7 +14,7 @@ from app.models.sessions import (
     builtin_agent_id_to_uuid,
 )
 from app.models.topic import TopicCreate, TopicRead
-from app.repos import MessageRepository, SessionRepository, TopicRepository
+from app.repos import FileRepository, MessageRepository, SessionRepository, TopicRepository
 
 
 class SessionService:
@@ -22,6 +23,7 @@ class SessionService:
         self.session_repo = SessionRepository(db)
         self.topic_repo = TopicRepository(db)
         self.message_repo = MessageRepository(db)
+        self.file_repo = FileRepository(db)
 
     async def create_session_with_default_topic(self, session_data: SessionCreate, user_id: str) -> SessionRead:
         agent_uuid = await self._resolve_agent_uuid_for_create(session_data.agent_id)
@@ -87,12 +89,15 @@ class SessionService:
             )
 
         topics = await self.topic_repo.get_topics_by_session(session_id)
+        file_ids: list[UUID] = []
         for topic in topics:
+            file_ids.extend(await self.file_repo.get_file_ids_by_topic(topic.id))
             await self.message_repo.delete_messages_by_topic(topic.id)
             await self.topic_repo.delete_topic(topic.id)
 
         await self.topic_repo.create_topic(TopicCreate(name="新的聊天", session_id=session_id))
         await self.db.commit()
+        await get_attachment_cache().invalidate_files(file_ids)
 
     async def update_session(self, session_id: UUID, session_data: SessionUpdate, user_id: str) -> SessionRead:
         session = await self.session_repo.get_session_by_id(session_id)
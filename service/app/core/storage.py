@@ -2,8 +2,9 @@ import logging
 import uuid
 from datetime import datetime
 from enum import StrEnum
+from collections.abc import AsyncIterator
 from pathlib import Path
-from typing import Any, BinaryIO, Protocol
+from typing import Any, BinaryIO, Protocol, TypedDict
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -25,6 +26,15 @@ class FileCategory(StrEnum):
     OTHER = "others"
 
 
+class ObjectStream(TypedDict):
+    """An open object body from storage, streamed in chunks."""
+
+    body: AsyncIterator[bytes]
+    content_length: int
+    content_type: str | None
+    etag: str | None
+
+
 class StorageServiceProto(Protocol):
     """Abstract interface for storage services."""
 
@@ -50,6 +60,12 @@ class StorageServiceProto(Protocol):
 
     async def download_file_to_path(self, storage_key: str, file_path: str) -> None: ...
 
+    async def open_download_stream(
+        self,
+        storage_key: str,
+        byte_range: tuple[int, int] | None = None,
+    ) -> ObjectStream: ...
+
     async def delete_file(self, storage_key: str) -> None: ...
 
     async def delete_files(self, storage_keys: list[str]) -> None: ...
@@ -77,6 +93,12 @@ class StorageServiceProto(Protocol):
 
     async def copy_file(self, source_key: str, destination_key: str) -> str: ...
 
+    async def connect(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    def get_stats(self) -> dict[str, Any]: ...
+
 
 # Global instance
 _storage_service: StorageServiceProto | None = None
@@ -102,6 +124,12 @@ def get_storage_service() -> StorageServiceProto:
     return _storage_service
 
 
+async def close_storage_service() -> None:
+    """Close the global storage service's client for the current event loop (shutdown)."""
+    if _storage_service is not None:
+        await _storage_service.close()
+
+
 def detect_file_category(filename: str) -> FileCategory:
     """
     Detect file category based on file extension.
@@ -165,6 +193,80 @@ def generate_storage_key(
     return f"{scope}/{category}/{user_id}/{date_path}/{safe_filename}"
 
 
+BLOB_KEY_PREFIX = "blobs/sha256/"
+
+
+def generate_blob_storage_key(file_hash: str) -> str:
+    """
+    Generate the content-addressed storage key for a file hash.
+
+    Args:
+        file_hash: SHA256 hex digest of the content
+
+    Returns:
+        Storage key in format: blobs/sha256/{hash[:2]}/{hash}
+    """
+    return f"{BLOB_KEY_PREFIX}{file_hash[:2]}/{file_hash}"
+
+
+def is_blob_storage_key(storage_key: str) -> bool:
+    """Whether a storage key is content-addressed (possibly shared, removed only by blob GC)."""
+    return storage_key.startswith(BLOB_KEY_PREFIX)
+
+
+async def store_blob(
+    db: AsyncSession,
+    storage: StorageServiceProto,
+    file_data: BinaryIO,
+    file_hash: str,
+    file_size: int,
+    content_type: str,
+) -> str:
+    """
+    Store content under its content-addressed key, skipping the upload if it is already stored.
+
+    The blob is shared by every File row created with the returned storage key;
+    it is garbage-collected by ``app.utils.cleanup`` once no row references it.
+    A new blob's row is inserted before the upload, so the upload happens under
+    the row's lock and garbage collection (which deletes the object under the
+    same lock) can never remove an object a committed row points to.
+    This function does NOT commit the transaction.
+
+    Args:
+        db: Database session
+        storage: Storage service instance
+        file_data: Content to upload if the blob does not exist yet
+        file_hash: SHA256 hex digest of the content
+        file_size: Content size in bytes
+        content_type: MIME type of the content
+
+    Returns:
+        The storage key to reference from File rows
+    """
+    from app.models.file import FileBlob
+    from app.repos.file import FileRepository
+
+    file_repo = FileRepository(db)
+    blob = await file_repo.get_blob(file_hash)
+    if blob is not None:
+        logger.info(f"Deduplicated upload of {file_size} bytes onto existing blob {blob.storage_key}")
+        return blob.storage_key
+
+    new_blob = FileBlob(
+        file_hash=file_hash,
+        storage_key=generate_blob_storage_key(file_hash),
+        file_size=file_size,
+        content_type=content_type,
+    )
+    blob = await file_repo.create_blob(new_blob)
+    if blob is not new_blob:
+        logger.info(f"Deduplicated upload of {file_size} bytes onto concurrently stored blob {blob.storage_key}")
+        return blob.storage_key
+
+    await storage.upload_file(file_data, blob.storage_key, content_type=content_type)
+    return blob.storage_key
+
+
 class StorageQuotaService:
     """
     Service for managing and validating user storage quotas.
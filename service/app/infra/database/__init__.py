@@ -3,9 +3,11 @@ from .connection import (
     AsyncSessionLocal,
     create_db_and_tables,
     create_task_session_factory,
+    dispose_worker_engines,
     engine,
     get_session,
     get_task_db_session,
+    get_worker_session_factory,
 )
 
 __all__ = [
@@ -16,4 +18,6 @@ __all__ = [
     "ASYNC_DATABASE_URL",
     "create_task_session_factory",
     "get_task_db_session",
+    "get_worker_session_factory",
+    "dispose_worker_engines",
 ]
@@ -2,9 +2,10 @@ import asyncio
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.common import ALEMBIC_INI_PATH
@@ -51,7 +52,7 @@ AsyncSessionLocal = async_sessionmaker(
 
 def create_task_session_factory() -> async_sessionmaker[AsyncSession]:
     """
-    Create a fresh async session factory bound to the current event loop.
+    Get an async session factory bound to the current event loop.
 
     This should be used instead of AsyncSessionLocal in contexts where the code
     runs in a different event loop than the main FastAPI application, such as:
@@ -60,17 +61,14 @@ def create_task_session_factory() -> async_sessionmaker[AsyncSession]:
     - Tool executions within agent graphs
 
     The returned session factory creates sessions bound to the current event loop,
-    avoiding "Future attached to a different loop" errors.
+    avoiding "Future attached to a different loop" errors. It shares the worker
+    engine for this loop (see get_worker_session_factory) rather than opening a
+    new connection pool on every call.
 
     Returns:
-        A new async_sessionmaker instance bound to a fresh async engine.
+        The async_sessionmaker for the current process and event loop.
     """
-    task_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, future=True)
-    return async_sessionmaker(
-        bind=task_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    return get_worker_session_factory()
 
 
 async def create_db_and_tables() -> None:
@@ -143,15 +141,31 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-_worker_engines: dict[tuple[int, int], async_sessionmaker[AsyncSession]] = {}
+_worker_engines: dict[tuple[int, int], tuple[AsyncEngine, async_sessionmaker[AsyncSession]]] = {}
 
 
-@asynccontextmanager
-async def get_task_db_session():
+def _create_worker_engine() -> AsyncEngine:
+    """Create an engine sized for a Celery worker process."""
+    engine_kwargs: dict[str, Any] = {
+        "echo": False,
+        "future": True,
+        "pool_pre_ping": True,
+        "pool_recycle": configs.Database.Postgres.PoolRecycle,
+    }
+    if configs.Database.Engine == "postgres":
+        engine_kwargs["pool_size"] = configs.Database.Postgres.WorkerPoolSize
+        engine_kwargs["max_overflow"] = configs.Database.Postgres.WorkerMaxOverflow
+    return create_async_engine(ASYNC_DATABASE_URL, **engine_kwargs)
+
+
+def get_worker_session_factory() -> async_sessionmaker[AsyncSession]:
     """
-    Get a database session suitable for Celery Worker / tool execution contexts.
+    Get the shared session factory for the current process and event loop.
 
-    Each call creates a new engine bound to the current event loop to avoid cross-loop issues.
+    Celery workers run every task on one long-lived event loop per process, so
+    the engine (and its connection pool) created here is reused across tasks
+    instead of paying a new pool, TCP and auth handshake per chat message.
+    Engines left behind by other loops of this process are disposed.
     """
     pid = os.getpid()
     loop_id = id(asyncio.get_running_loop())
@@ -161,15 +175,37 @@ async def get_task_db_session():
         # Clean up old engines from this process but different loops
         old_keys = [k for k in _worker_engines if k[0] == pid and k[1] != loop_id]
         for old_key in old_keys:
-            # Optionally dispose old engines (fire and forget)
-            del _worker_engines[old_key]
-
-        task_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, future=True)
-        _worker_engines[cache_key] = async_sessionmaker(
-            bind=task_engine,
-            class_=AsyncSession,
-            expire_on_commit=False,
+            old_engine, _ = _worker_engines.pop(old_key)
+            # The old loop may be gone; just drop pooled connections without awaiting them
+            old_engine.sync_engine.dispose(close=False)
+
+        task_engine = _create_worker_engine()
+        _worker_engines[cache_key] = (
+            task_engine,
+            async_sessionmaker(
+                bind=task_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            ),
         )
 
-    async with _worker_engines[cache_key]() as session:
+    return _worker_engines[cache_key][1]
+
+
+async def dispose_worker_engines() -> None:
+    """Dispose the worker engines of this process (called at worker shutdown)."""
+    pid = os.getpid()
+    for key in [k for k in _worker_engines if k[0] == pid]:
+        task_engine, _ = _worker_engines.pop(key)
+        await task_engine.dispose()
+
+
+@asynccontextmanager
+async def get_task_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a database session suitable for Celery Worker / tool execution contexts.
+
+    Sessions come from the shared engine bound to the current event loop to avoid cross-loop issues.
+    """
+    async with get_worker_session_factory()() as session:
         yield session
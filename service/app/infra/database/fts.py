@@ -0,0 +1,120 @@
+"""
+Dialect-aware full-text matching over columns of normalized tokens.
+
+Searchable tables keep a text column of tokens produced by
+``app.utils.text_search.tokenize``. On Postgres the column is indexed by a
+GIN expression index on ``to_tsvector('simple', column)``, created by the
+migration adding the column. On SQLite (tests, local development) an
+external-content FTS5 table, kept in sync by triggers, is created on first
+use. Other databases fall back to substring matching.
+"""
+
+from typing import Any
+
+from sqlalchemy import bindparam, column, func, literal, literal_column, or_, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Same expression as the GIN indexes created by migrations, so Postgres uses them
+_TS_CONFIG = "'simple'::regconfig"
+
+
+async def ensure_sqlite_fts(db: AsyncSession, table: str, token_column: str) -> None:
+    """
+    Create the FTS5 index of ``table.token_column`` if the database is SQLite
+    and it does not exist yet. Rows written before are indexed on creation.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+
+    fts = f"{table}_fts"
+    exists = await db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name").bindparams(name=fts)
+    )
+    if exists.first() is not None:
+        return
+
+    for statement in (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({token_column}, content='{table}', content_rowid='rowid')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {token_column}) VALUES (new.rowid, new.{token_column}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {token_column}) VALUES ('delete', old.rowid, old.{token_column}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {token_column} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {token_column}) VALUES ('delete', old.rowid, old.{token_column}); "
+        f"INSERT INTO {fts}(rowid, {token_column}) VALUES (new.rowid, new.{token_column}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ):
+        await db.execute(text(statement))
+
+
+async def full_text_match(db: AsyncSession, table: str, token_column: Any, phrases: list[list[str]]) -> Any:
+    """
+    Build a WHERE clause matching rows whose tokens contain any of the phrases.
+
+    Args:
+        db: Database session
+        table: Name of the table ``token_column`` belongs to
+        token_column: The column of normalized tokens
+        phrases: Query phrases from ``app.utils.text_search.query_phrases``
+
+    Returns:
+        A SQLAlchemy boolean clause.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _tsvector(token_column).op("@@")(_tsquery(phrases))
+
+    if dialect == "sqlite":
+        await ensure_sqlite_fts(db, table, token_column.key)
+        fts = f"{table}_fts"
+        matching = text(f"SELECT rowid FROM {fts} WHERE {fts} MATCH :fts_query").bindparams(
+            bindparam("fts_query", _fts5_query(phrases), unique=True)
+        )
+        return literal_column(f"{table}.rowid").in_(matching.columns(column("rowid")))
+
+    return or_(*(token_column.contains(" ".join(phrase)) for phrase in phrases))
+
+
+async def full_text_rank(db: AsyncSession, table: str, token_column: Any, phrases: list[list[str]]) -> Any:
+    """
+    Build an expression ranking rows matched by ``full_text_match`` with the
+    database's own relevance function (Postgres ``ts_rank``, SQLite FTS5
+    ``bm25``), higher for better matches. Used to keep the best matches when
+    the number of matching rows is capped.
+
+    Args:
+        db: Database session
+        table: Name of the table ``token_column`` belongs to
+        token_column: The column of normalized tokens
+        phrases: Query phrases from ``app.utils.text_search.query_phrases``
+
+    Returns:
+        A SQLAlchemy numeric expression; constant on other databases.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return func.ts_rank(_tsvector(token_column), _tsquery(phrases))
+
+    if dialect == "sqlite":
+        await ensure_sqlite_fts(db, table, token_column.key)
+        fts = f"{table}_fts"
+        # bm25() is only available inside the FTS query and is lower for better matches
+        rank = text(
+            f"SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH :fts_query AND {fts}.rowid = {table}.rowid"
+        ).bindparams(bindparam("fts_query", _fts5_query(phrases), unique=True))
+        return rank.columns(column("rank")).scalar_subquery()
+
+    return literal(0)
+
+
+def _tsvector(token_column: Any) -> Any:
+    return func.to_tsvector(literal_column(_TS_CONFIG), token_column)
+
+
+def _tsquery(phrases: list[list[str]]) -> Any:
+    query = " | ".join(f"({' <-> '.join(phrase)})" for phrase in phrases)
+    return func.to_tsquery(literal_column(_TS_CONFIG), query)
+
+
+def _fts5_query(phrases: list[list[str]]) -> str:
+    return " OR ".join(f'"{" ".join(phrase)}"' for phrase in phrases)
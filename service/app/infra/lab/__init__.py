@@ -0,0 +1,12 @@
+from .client import LabApiClient, close_lab_client, get_lab_client
+from .watcher import LabTaskState, LabTaskWatcher, close_lab_task_watcher, get_lab_task_watcher
+
+__all__ = [
+    "LabApiClient",
+    "get_lab_client",
+    "close_lab_client",
+    "LabTaskState",
+    "LabTaskWatcher",
+    "get_lab_task_watcher",
+    "close_lab_task_watcher",
+]
@@ -0,0 +1,244 @@
+"""
+Async client for the lab API used by the lab and OSDL MCP servers.
+
+All calls share one pooled ``httpx.AsyncClient`` instead of blocking the MCP
+server's event loop with ``requests``. On top of the pool:
+
+- Idempotent reads are retried with exponential backoff on connection
+  errors, timeouts, 429 and 5xx; writes only when the connection failed, so
+  a request the lab may have received is never sent twice.
+- Concurrent identical reads (same URL, params and token) share one call.
+- Catalog endpoints (labs, devices, materials, action schemas) can be
+  cached for ``cache_ttl`` seconds, per token so users never see each
+  other's data.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+import httpx
+
+from app.configs import configs
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+_CACHE_MAX_ENTRIES = 1024
+
+
+class LabApiClient:
+    """Pooled, retrying lab API client with read coalescing and a catalog cache."""
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_retries: int = 2,
+        retry_backoff: float = 0.5,
+        cache_ttl: float = 30.0,
+    ) -> None:
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.cache_ttl = cache_ttl
+        self._http_client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections, max_keepalive_connections=self.max_connections
+                ),
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (application shutdown)"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    @staticmethod
+    def _get_key(url: str, params: Mapping[str, Any] | None, token: str | None) -> str:
+        """Build the coalescing/cache key, hashing the token so it never appears in logs."""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16] if token else "anonymous"
+        return f"{url}?{json.dumps(dict(params or {}), sort_keys=True, default=str)}#{token_hash}"
+
+    @staticmethod
+    def _should_retry(error: Exception, idempotent: bool) -> bool:
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return True
+        if not idempotent:
+            return False
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in _RETRY_STATUS_CODES
+        return isinstance(error, httpx.TransportError)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        token: str | None,
+        params: Mapping[str, Any] | None = None,
+        json_body: Any = None,
+        timeout: float | None = None,
+    ) -> Any:
+        headers = {"Accept": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        # Like requests, leave out params whose value is None
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+        idempotent = method == "GET"
+
+        attempt = 0
+        while True:
+            try:
+                response = await self.get_http_client().request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=query,
+                    json=json_body,
+                    timeout=timeout if timeout is not None else self.timeout,
+                )
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                if attempt >= self.max_retries or not self._should_retry(e, idempotent):
+                    raise
+                delay = self.retry_backoff * (2**attempt) * (1 + random.random() * 0.25)
+                attempt += 1
+                logger.info(
+                    f"Lab API {method} {url} failed ({e!r}), retry {attempt}/{self.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    def _get_cached(self, key: str) -> Any | None:
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        expires_at, result = cached
+        if time.monotonic() >= expires_at:
+            self._cache.pop(key, None)
+            return None
+        self._cache.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def _set_cached(self, key: str, result: Any) -> None:
+        # Only successful responses are worth keeping
+        if not isinstance(result, dict) or result.get("code", 0) != 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > _CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    async def _get_and_cache(
+        self,
+        key: str,
+        url: str,
+        token: str | None,
+        params: Mapping[str, Any] | None,
+        timeout: float | None,
+        cache: bool,
+    ) -> Any:
+        result = await self._send("GET", url, token, params=params, timeout=timeout)
+        if cache and self.cache_ttl > 0:
+            self._set_cached(key, result)
+        return result
+
+    async def get(
+        self,
+        url: str,
+        token: str | None,
+        params: Mapping[str, Any] | None = None,
+        timeout: float | None = None,
+        cache: bool = False,
+    ) -> Any:
+        """
+        GET a lab API endpoint and return its JSON body.
+
+        Args:
+            url: Full endpoint URL
+            token: The caller's access token
+            params: Query parameters; None values are left out
+            timeout: Request timeout in seconds, the configured one if not given
+            cache: Serve and store the response in the catalog cache
+
+        Raises:
+            httpx.HTTPError: If the request still failed after retries.
+        """
+        key = self._get_key(url, params, token)
+        if cache and self.cache_ttl > 0:
+            cached = self._get_cached(key)
+            if cached is not None:
+                return cached
+
+        # Single-flight: concurrent identical reads share one upstream call
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._get_and_cache(key, url, token, params, timeout, cache))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller doesn't cancel the call others wait on
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    async def post(self, url: str, token: str | None, json_body: Any = None, timeout: float | None = None) -> Any:
+        """POST to a lab API endpoint and return its JSON body."""
+        return await self._send("POST", url, token, json_body=json_body, timeout=timeout)
+
+    async def put(self, url: str, token: str | None, json_body: Any = None, timeout: float | None = None) -> Any:
+        """PUT to a lab API endpoint and return its JSON body."""
+        return await self._send("PUT", url, token, json_body=json_body, timeout=timeout)
+
+    async def patch(self, url: str, token: str | None, json_body: Any = None, timeout: float | None = None) -> Any:
+        """PATCH a lab API endpoint and return its JSON body."""
+        return await self._send("PATCH", url, token, json_body=json_body, timeout=timeout)
+
+    def invalidate(self, token: str | None = None) -> None:
+        """Drop cached catalog responses, of one token or of everyone."""
+        if token is None:
+            self._cache.clear()
+            return
+        suffix = self._get_key("", None, token).rsplit("#", 1)[1]
+        for key in [k for k in self._cache if k.endswith(f"#{suffix}")]:
+            del self._cache[key]
+
+
+_lab_client: LabApiClient | None = None
+
+
+def get_lab_client() -> LabApiClient:
+    """Get the process-wide lab API client."""
+    global _lab_client
+    if _lab_client is None:
+        lab_config = configs.Lab
+        _lab_client = LabApiClient(
+            timeout=lab_config.Timeout,
+            max_connections=lab_config.MaxConnections,
+            max_retries=lab_config.MaxRetries,
+            retry_backoff=lab_config.RetryBackoff,
+            cache_ttl=lab_config.CatalogCacheTTL,
+        )
+    return _lab_client
+
+
+async def close_lab_client() -> None:
+    """Close the lab API client's connections, if it was created."""
+    if _lab_client is not None:
+        await _lab_client.aclose()
+        logger.info("Lab API client closed")
@@ -0,0 +1,280 @@
+"""
+Server-side watcher for long-running lab tasks.
+
+Instead of an agent polling a task with repeated tool calls (a model
+round-trip each), ``wait_for_*`` tools block on ``LabTaskWatcher.wait``.
+A single poller per event loop tracks every watched task:
+
+- Each task is polled on its own schedule: every ``min_interval`` seconds
+  after its status changed, backing off towards ``max_interval`` while it
+  stays the same.
+- Waiters on the same task (same URL and token) share its polls.
+- Every status change is passed to the waiters' ``on_update`` callbacks,
+  which the MCP tools forward as progress notifications.
+- The poller stops when no task is watched anymore.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.configs import configs
+from app.infra.loop_local import LoopLocal
+
+from .client import LabApiClient, get_lab_client
+
+logger = logging.getLogger(__name__)
+
+# Statuses (lower-cased) after which a task no longer changes
+TERMINAL_STATUSES = frozenset(
+    {
+        "success",
+        "succeeded",
+        "completed",
+        "complete",
+        "finished",
+        "done",
+        "failed",
+        "failure",
+        "error",
+        "cancelled",
+        "canceled",
+        "aborted",
+        "stopped",
+        "timeout",
+    }
+)
+
+# Consecutive failed polls after which a task is given up on
+MAX_POLL_FAILURES = 5
+
+
+@dataclass
+class LabTaskState:
+    """Latest known state of a watched task."""
+
+    status: str | None = None
+    data: Any = None
+    progress: float | None = None
+    done: bool = False
+    error: str | None = None
+
+    @property
+    def percent(self) -> int | None:
+        """Progress in percent, if the lab reports it (as a 0-1 fraction or a 0-100 percentage)."""
+        if self.progress is None:
+            return None
+        percent = self.progress * 100 if self.progress <= 1 else self.progress
+        return max(0, min(100, int(percent)))
+
+
+@dataclass
+class WatchedTask:
+    url: str
+    token: str | None
+    interval: float
+    next_poll_at: float = 0.0
+    failures: int = 0
+    state: LabTaskState = field(default_factory=LabTaskState)
+    listeners: set[asyncio.Queue[LabTaskState]] = field(default_factory=set)
+
+
+def parse_task_state(result: Any) -> LabTaskState:
+    """Read status and progress from a lab API task response."""
+    if not isinstance(result, dict) or result.get("code", 0) != 0:
+        message = result.get("msg", "Unknown Error") if isinstance(result, dict) else "Malformed response"
+        return LabTaskState(error=f"API returned an error: {message}")
+
+    data = result.get("data")
+    status = None
+    progress = None
+    if isinstance(data, dict):
+        raw_status = data.get("status") or data.get("state")
+        status = str(raw_status) if raw_status is not None else None
+        raw_progress = data.get("progress")
+        if isinstance(raw_progress, (int, float)) and not isinstance(raw_progress, bool):
+            progress = float(raw_progress)
+    done = status is not None and status.lower() in TERMINAL_STATUSES
+    return LabTaskState(status=status, data=data, progress=progress, done=done)
+
+
+class LabTaskWatcher:
+    """Polls watched lab tasks in the background on adaptive intervals."""
+
+    def __init__(
+        self,
+        client: LabApiClient | None = None,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: dict[tuple[str, str | None], WatchedTask] = {}
+        self._wakeup = asyncio.Event()
+        self._poller: asyncio.Task[None] | None = None
+
+        # Counters exposed via get_stats()
+        self._polls = 0
+
+    def _ensure_poller(self) -> None:
+        self._wakeup.set()
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._run())
+
+    async def _poll(self, task: WatchedTask) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            self._polls += 1
+            try:
+                client = self.client or get_lab_client()
+                state = parse_task_state(await client.get(task.url, task.token))
+            except Exception as e:
+                state = LabTaskState(error=f"Network error when calling lab API: {e}")
+
+        if state.error:
+            task.failures += 1
+            if task.failures < MAX_POLL_FAILURES:
+                logger.debug(f"Polling lab task {task.url} failed ({task.failures}): {state.error}")
+                task.interval = min(task.interval * 2, self.max_interval)
+                task.next_poll_at = loop.time() + task.interval
+                return
+            # Keep what was last known, but stop watching
+            state = LabTaskState(
+                status=task.state.status,
+                data=task.state.data,
+                progress=task.state.progress,
+                done=True,
+                error=state.error,
+            )
+        else:
+            task.failures = 0
+
+        previous = task.state
+        changed = (state.status, state.progress, state.done) != (previous.status, previous.progress, previous.done)
+        task.state = state
+        if changed:
+            task.interval = self.min_interval
+            for queue in task.listeners:
+                queue.put_nowait(state)
+        else:
+            task.interval = min(task.interval * 1.5, self.max_interval)
+        task.next_poll_at = loop.time() + task.interval
+
+    async def _run(self) -> None:
+        """Poll due tasks until none is watched anymore."""
+        loop = asyncio.get_running_loop()
+        while self._tasks:
+            self._wakeup.clear()
+            now = loop.time()
+            due = [task for task in self._tasks.values() if not task.state.done and task.next_poll_at <= now]
+            if due:
+                await asyncio.gather(*(self._poll(task) for task in due))
+                continue
+
+            pending = [task.next_poll_at for task in self._tasks.values() if not task.state.done]
+            delay = max(0.0, min(pending) - loop.time()) if pending else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+
+    async def wait(
+        self,
+        url: str,
+        token: str | None,
+        timeout: float,
+        on_update: Callable[[LabTaskState], Awaitable[None]] | None = None,
+    ) -> LabTaskState:
+        """
+        Wait until a task reaches a terminal status, or until ``timeout``.
+
+        Args:
+            url: Lab API endpoint returning the task's status
+            token: The caller's access token
+            timeout: Seconds to wait at most
+            on_update: Called with the new state whenever the status changes
+
+        Returns:
+            The last known state; ``done`` is False if the timeout was reached first.
+        """
+        loop = asyncio.get_running_loop()
+        key = (url, token)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = WatchedTask(url=url, token=token, interval=self.min_interval)
+        queue: asyncio.Queue[LabTaskState] = asyncio.Queue()
+        task.listeners.add(queue)
+        self._ensure_poller()
+
+        deadline = loop.time() + timeout
+        try:
+            while not task.state.done:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    state = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except TimeoutError:
+                    break
+                if on_update is not None:
+                    try:
+                        await on_update(state)
+                    except Exception as e:
+                        logger.debug(f"Lab task update callback failed: {e}")
+            return task.state
+        finally:
+            task.listeners.discard(queue)
+            if not task.listeners:
+                self._tasks.pop(key, None)
+                # Let the poller re-check whether anything is left to watch
+                self._wakeup.set()
+
+    async def close(self) -> None:
+        """Stop the poller; current waiters return at their timeout."""
+        self._tasks.clear()
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._poller = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get watcher statistics."""
+        return {
+            "watched": len(self._tasks),
+            "waiters": sum(len(task.listeners) for task in self._tasks.values()),
+            "polls": self._polls,
+        }
+
+
+def _create_watcher() -> LabTaskWatcher:
+    lab_config = configs.Lab
+    return LabTaskWatcher(
+        min_interval=lab_config.WatchMinInterval,
+        max_interval=lab_config.WatchMaxInterval,
+        max_concurrency=lab_config.WatchMaxConcurrency,
+    )
+
+
+_watchers = LoopLocal(_create_watcher, LabTaskWatcher.close, "lab task watcher")
+
+
+def get_lab_task_watcher() -> LabTaskWatcher:
+    """Get the lab task watcher for the current process and event loop."""
+    return _watchers.get()
+
+
+async def close_lab_task_watcher() -> None:
+    """Close the lab task watcher bound to the current event loop, if any."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    await _watchers.close()
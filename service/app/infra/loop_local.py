@@ -0,0 +1,92 @@
+"""
+Per-event-loop instances of loop-bound resources.
+
+Connection pools, sessions and background tasks belong to the event loop
+that created them, so the API server's loop, a Celery worker's loop thread
+and short-lived ``asyncio.run`` loops each get their own instance.
+
+Instances are keyed by the loop object rather than ``id(loop)``, which can
+be reused once a loop is garbage collected. The loop is held strongly on
+purpose: when it finishes, its instance is still here to be closed from the
+next loop instead of being dropped with its connections (or containers) open.
+Instances of loops that are still running, e.g. in another thread, are left
+alone. After a fork, inherited instances belong to the parent and are
+forgotten without being closed.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """Lazily created instance of a resource per running event loop."""
+
+    def __init__(self, factory: Callable[[], T], close: Callable[[T], Awaitable[Any]], name: str) -> None:
+        self._factory = factory
+        self._close = close
+        self.name = name
+        self._pid = os.getpid()
+        self._instances: dict[asyncio.AbstractEventLoop, T] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def _check_pid(self) -> None:
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._instances.clear()
+            self._closing.clear()
+
+    def get(self) -> T:
+        """Get the instance for the running loop, creating it if needed."""
+        self._check_pid()
+        loop = asyncio.get_running_loop()
+        instance = self._instances.get(loop)
+        if instance is None:
+            self._release_finished(loop)
+            instance = self._instances[loop] = self._factory()
+        return instance
+
+    def peek(self) -> T | None:
+        """Get the instance for the running loop without creating one."""
+        self._check_pid()
+        try:
+            return self._instances.get(asyncio.get_running_loop())
+        except RuntimeError:
+            return None
+
+    def instances(self) -> list[T]:
+        """All live instances of this process."""
+        self._check_pid()
+        return list(self._instances.values())
+
+    async def _close_quietly(self, instance: T) -> None:
+        try:
+            await self._close(instance)
+        except Exception as e:
+            logger.warning(f"Error closing {self.name} left by a finished event loop: {e}")
+
+    def _release_finished(self, current: asyncio.AbstractEventLoop) -> None:
+        """Close, on the current loop, the instances whose loop has been closed."""
+        for loop in [loop for loop in self._instances if loop is not current and loop.is_closed()]:
+            instance = self._instances.pop(loop)
+            task = current.create_task(self._close_quietly(instance))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """Close the running loop's instance and any left by finished loops."""
+        self._check_pid()
+        loop = asyncio.get_running_loop()
+        self._release_finished(loop)
+        instance = self._instances.pop(loop, None)
+        if instance is not None:
+            await self._close(instance)
+        pending = [task for task in self._closing if task.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending)
@@ -0,0 +1,8 @@
+from .pool import McpClientPool, PooledMcpClient, close_mcp_client_pool, get_mcp_client_pool
+
+__all__ = [
+    "McpClientPool",
+    "PooledMcpClient",
+    "get_mcp_client_pool",
+    "close_mcp_client_pool",
+]
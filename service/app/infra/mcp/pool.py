@@ -0,0 +1,267 @@
+"""
+Pooled MCP client sessions.
+
+Opening a ``fastmcp.Client`` costs a new HTTP/SSE connection plus the MCP
+``initialize`` handshake. This module keeps initialized sessions alive and
+hands them out to callers, keyed by server URL + token, so a ReAct loop with
+many tool calls pays the handshake once per server instead of once per call.
+
+Sessions are bound to the event loop that created them, so there is one pool
+per (process, event loop); pools left by finished loops are closed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastmcp import Client
+from fastmcp.client.auth import BearerAuth
+from fastmcp.exceptions import ToolError
+
+from app.configs import configs
+from app.infra.loop_local import LoopLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledMcpClient:
+    """A pooled MCP session for one (url, token) pair."""
+
+    url: str
+    token: str | None
+    semaphore: asyncio.Semaphore
+    client: Client[Any] | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used_at: float = field(default_factory=time.monotonic)
+    last_checked_at: float = field(default_factory=time.monotonic)
+    in_use: int = 0
+    # A call on this session failed; it is re-checked before reuse and closed once idle
+    unhealthy: bool = False
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None and self.client.is_connected()
+
+
+class McpClientPool:
+    """Process-wide pool of initialized MCP client sessions."""
+
+    def __init__(
+        self,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 60.0,
+        max_concurrency_per_server: int = 8,
+        connect_timeout: float = 30.0,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.max_concurrency_per_server = max_concurrency_per_server
+        self.connect_timeout = connect_timeout
+        self._entries: dict[str, PooledMcpClient] = {}
+        self._reaper_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+        # Counters exposed via get_stats()
+        self._connects = 0
+        self._reuses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _get_key(url: str, token: str | None) -> str:
+        """Build the pool key, hashing the token so it never appears in logs."""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()[:16] if token else "anonymous"
+        return f"{url}#{token_hash}"
+
+    def _get_entry(self, url: str, token: str | None) -> PooledMcpClient:
+        key = self._get_key(url, token)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = PooledMcpClient(
+                url=url,
+                token=token,
+                semaphore=asyncio.Semaphore(self.max_concurrency_per_server),
+            )
+            self._entries[key] = entry
+        return entry
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_idle())
+
+    async def _connect(self, entry: PooledMcpClient) -> Client[Any]:
+        auth = BearerAuth(entry.token) if entry.token else None
+        client = Client(entry.url, auth=auth, init_timeout=self.connect_timeout)
+        await client.__aenter__()
+        entry.client = client
+        entry.unhealthy = False
+        entry.last_checked_at = time.monotonic()
+        self._connects += 1
+        logger.info(f"Opened pooled MCP session to {entry.url}")
+        return client
+
+    async def _disconnect(self, entry: PooledMcpClient) -> None:
+        client, entry.client = entry.client, None
+        if client is None:
+            return
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug(f"Error closing MCP session to {entry.url}: {e}")
+
+    async def _get_healthy_client(self, entry: PooledMcpClient) -> Client[Any]:
+        """Return a connected client, pinging stale sessions and reconnecting dead ones."""
+        async with entry.lock:
+            if entry.client is not None and entry.connected:
+                if not entry.unhealthy and time.monotonic() - entry.last_checked_at < self.health_check_interval:
+                    self._reuses += 1
+                    return entry.client
+                try:
+                    await asyncio.wait_for(entry.client.ping(), timeout=self.connect_timeout)
+                    # The failure was the call's own, not the session's
+                    entry.unhealthy = False
+                    entry.last_checked_at = time.monotonic()
+                    self._reuses += 1
+                    return entry.client
+                except Exception as e:
+                    logger.info(f"Pooled MCP session to {entry.url} failed health check, reconnecting: {e}")
+
+            await self._disconnect(entry)
+            return await self._connect(entry)
+
+    @asynccontextmanager
+    async def acquire(self, url: str, token: str | None = None) -> AsyncIterator[Client[Any]]:
+        """
+        Borrow an initialized client for ``url``.
+
+        Concurrent borrowers of the same server are capped by
+        ``max_concurrency_per_server``. If the body raises anything other than a
+        tool-level error, the session is marked unhealthy: other borrowers may
+        still be mid-call on it, so it is only closed once nobody uses it, and
+        the next borrower pings it (and reconnects if it is dead) before reuse.
+        """
+        if self._closed:
+            raise RuntimeError("MCP client pool is closed")
+
+        self._ensure_reaper()
+        entry = self._get_entry(url, token)
+
+        async with entry.semaphore:
+            client = await self._get_healthy_client(entry)
+            entry.in_use += 1
+            try:
+                yield client
+            except ToolError:
+                raise
+            except Exception:
+                if entry.client is client:
+                    entry.unhealthy = True
+                raise
+            finally:
+                entry.in_use -= 1
+                entry.last_used_at = time.monotonic()
+                if entry.unhealthy and entry.in_use == 0:
+                    async with entry.lock:
+                        if entry.unhealthy and entry.in_use == 0 and entry.client is client:
+                            await self._disconnect(entry)
+
+    async def call_tool(
+        self,
+        url: str,
+        token: str | None,
+        tool_name: str,
+        arguments: dict[str, Any],
+        timeout: float | None = None,
+        progress_handler: Any = None,
+    ) -> Any:
+        """Call a tool over a pooled session and return the fastmcp ``CallToolResult``."""
+        async with self.acquire(url, token) as client:
+            return await client.call_tool(tool_name, arguments, timeout=timeout, progress_handler=progress_handler)
+
+    async def list_tools(self, url: str, token: str | None) -> list[Any]:
+        """List tools over a pooled session."""
+        async with self.acquire(url, token) as client:
+            return await client.list_tools()
+
+    async def evict(self, url: str, token: str | None = None) -> None:
+        """Close and forget the session for a server (e.g. after its URL or token changed)."""
+        entry = self._entries.pop(self._get_key(url, token), None)
+        if entry is not None:
+            async with entry.lock:
+                await self._disconnect(entry)
+            self._evictions += 1
+
+    async def _reap_idle(self) -> None:
+        """Close sessions that have been idle longer than ``idle_timeout``."""
+        interval = max(1.0, self.idle_timeout / 2)
+        while not self._closed:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, entry in list(self._entries.items()):
+                if entry.in_use or now - entry.last_used_at < self.idle_timeout:
+                    continue
+                self._entries.pop(key, None)
+                async with entry.lock:
+                    await self._disconnect(entry)
+                self._evictions += 1
+                logger.debug(f"Evicted idle MCP session to {entry.url}")
+
+    async def close(self) -> None:
+        """Close every pooled session and stop the reaper."""
+        self._closed = True
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reaper_task = None
+
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            await self._disconnect(entry)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "sessions": len(self._entries),
+            "connected": sum(1 for e in self._entries.values() if e.connected),
+            "in_use": sum(e.in_use for e in self._entries.values()),
+            "connects": self._connects,
+            "reuses": self._reuses,
+            "evictions": self._evictions,
+        }
+
+
+def _create_pool() -> McpClientPool:
+    pool_config = configs.MCP.ClientPool
+    return McpClientPool(
+        idle_timeout=pool_config.IdleTimeout,
+        health_check_interval=pool_config.HealthCheckInterval,
+        max_concurrency_per_server=pool_config.MaxConcurrencyPerServer,
+        connect_timeout=pool_config.ConnectTimeout,
+    )
+
+
+_pools = LoopLocal(_create_pool, McpClientPool.close, "MCP client pool")
+
+
+def get_mcp_client_pool() -> McpClientPool:
+    """Get the MCP client pool for the current process and event loop."""
+    return _pools.get()
+
+
+async def close_mcp_client_pool() -> None:
+    """Close the MCP client pool bound to the current event loop, and those of finished loops."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    await _pools.close()
+    logger.info("MCP client pool closed")
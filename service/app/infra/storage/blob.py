@@ -1,14 +1,20 @@
+import asyncio
 import logging
 import mimetypes
 import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any, BinaryIO, TypedDict
 
 import aioboto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from app.common.code import ErrCode
 from app.configs import configs
-from app.core.storage import StorageServiceProto
+from app.core.storage import ObjectStream, StorageServiceProto
+from app.infra.loop_local import LoopLocal
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +28,41 @@ class S3Config(TypedDict):
     region_name: str
 
 
+class _LoopS3Client:
+    """The S3 client of one event loop, opened on first use."""
+
+    def __init__(self, open_client: Callable[[], Any], endpoint: str, max_pool_connections: int) -> None:
+        self._open_client = open_client
+        self._endpoint = endpoint
+        self._max_pool_connections = max_pool_connections
+        self._stack = AsyncExitStack()
+        self._client: Any = None
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Any:
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    self._client = await self._stack.enter_async_context(self._open_client())
+                    logger.info(f"Opened S3 client for {self._endpoint} (pool size {self._max_pool_connections})")
+        return self._client
+
+    async def close(self) -> None:
+        self._client = None
+        await self._stack.aclose()
+
+
 class BlobStorageService(StorageServiceProto):
     """
     Blob storage service for managing files in object storage (S3-compatible).
 
     Supports MinIO, AWS S3, Aliyun OSS, and other S3-compatible services.
+
+    One long-lived S3 client (with its own connection pool) is kept per event
+    loop, so requests reuse resolved credentials and open connections instead
+    of building a client per call. Clients are opened on first use or by
+    ``connect()`` at startup and closed by ``close()`` at shutdown. Clients
+    left by event loops that have finished are closed on the next use.
     """
 
     def __init__(self):
@@ -45,6 +81,76 @@ class BlobStorageService(StorageServiceProto):
         self._internal_endpoint = configs.OSS.Endpoint
         self._public_endpoint = configs.OSS.PublicEndpoint
 
+        self.max_pool_connections = configs.OSS.MaxPoolConnections
+        self._client_config = Config(
+            max_pool_connections=self.max_pool_connections,
+            connect_timeout=configs.OSS.ConnectTimeout,
+            read_timeout=configs.OSS.ReadTimeout,
+            retries={"max_attempts": configs.OSS.MaxAttempts, "mode": "standard"},
+            tcp_keepalive=True,
+        )
+        # Files above one part are sent as a multipart upload, so memory stays bounded by the part size
+        self.stream_chunk_bytes = configs.OSS.StreamChunkBytes
+        self._transfer_config = TransferConfig(
+            multipart_threshold=configs.OSS.MultipartChunkBytes,
+            multipart_chunksize=configs.OSS.MultipartChunkBytes,
+        )
+        # S3 clients are bound to the loop they were created on
+        self._clients = LoopLocal(self._new_client, _LoopS3Client.close, "S3 client")
+
+        # Pool saturation metrics
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._operations = 0
+        self._saturated_operations = 0
+
+    def _new_client(self) -> _LoopS3Client:
+        return _LoopS3Client(
+            lambda: self.session.client(**self.s3_config, config=self._client_config),  # type: ignore
+            self._internal_endpoint,
+            self.max_pool_connections,
+        )
+
+    async def _get_client(self) -> Any:
+        return await self._clients.get().get()
+
+    @asynccontextmanager
+    async def _s3(self) -> AsyncIterator[Any]:
+        """Borrow the shared S3 client for one operation, tracking pool usage."""
+        client = await self._get_client()
+        self._operations += 1
+        if self._in_flight >= self.max_pool_connections:
+            # This operation will queue for a pooled connection
+            self._saturated_operations += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            yield client
+        finally:
+            self._in_flight -= 1
+
+    async def connect(self) -> None:
+        """Open the S3 client for the current event loop ahead of the first request."""
+        await self._get_client()
+
+    async def close(self) -> None:
+        """Close the S3 client of the current event loop (application/worker shutdown)."""
+        try:
+            await self._clients.close()
+        except Exception as e:
+            logger.warning(f"Error closing S3 client: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get connection pool usage statistics."""
+        return {
+            "clients": len(self._clients.instances()),
+            "max_pool_connections": self.max_pool_connections,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "operations": self._operations,
+            "saturated_operations": self._saturated_operations,
+        }
+
     async def initialize(self) -> None:
         """
         Initialize the storage service and ensure bucket exists.
@@ -53,7 +159,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If bucket creation or configuration fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 try:
                     await s3.head_bucket(Bucket=self.bucket)
                     logger.info(f"Bucket '{self.bucket}' already exists")
@@ -103,12 +209,13 @@ class BlobStorageService(StorageServiceProto):
             if metadata:
                 extra_args["Metadata"] = metadata
 
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 await s3.upload_fileobj(
                     file_data,
                     self.bucket,
                     storage_key,
                     ExtraArgs=extra_args,
+                    Config=self._transfer_config,
                 )
 
             logger.info(f"File uploaded successfully: {storage_key}")
@@ -169,7 +276,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If download fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 await s3.download_fileobj(self.bucket, storage_key, destination)
 
             logger.info(f"File downloaded successfully: {storage_key}")
@@ -187,6 +294,62 @@ class BlobStorageService(StorageServiceProto):
             else:
                 raise ErrCode.OSS_DOWNLOAD_FAILED.with_errors(e)
 
+    async def open_download_stream(
+        self,
+        storage_key: str,
+        byte_range: tuple[int, int] | None = None,
+    ) -> ObjectStream:
+        """
+        Open a file for streaming download without buffering it in memory.
+
+        Args:
+            storage_key: Storage key of the file
+            byte_range: Optional inclusive (start, end) byte range to fetch
+
+        Returns:
+            ObjectStream whose body yields chunks of at most ``stream_chunk_bytes``
+
+        Raises:
+            ErrCodeError: If the object cannot be opened
+        """
+        params: dict[str, Any] = {"Bucket": self.bucket, "Key": storage_key}
+        if byte_range is not None:
+            params["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+
+        try:
+            async with self._s3() as s3:
+                response = await s3.get_object(**params)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            logger.error(f"Failed to open download stream for {storage_key}: {e}")
+
+            if error_code == "NoSuchKey":
+                raise ErrCode.OSS_OBJECT_NOT_FOUND.with_errors(e)
+            elif error_code == "NoSuchBucket":
+                raise ErrCode.OSS_BUCKET_NOT_FOUND.with_errors(e)
+            elif error_code == "AccessDenied":
+                raise ErrCode.OSS_OBJECT_ACCESS_DENIED.with_errors(e)
+            else:
+                raise ErrCode.OSS_DOWNLOAD_FAILED.with_errors(e)
+
+        body = response["Body"]
+        chunk_size = self.stream_chunk_bytes
+
+        async def iter_body() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in body.iter_chunks(chunk_size):
+                    yield chunk
+            finally:
+                # Return the connection to the pool even if the client disconnects mid-stream
+                body.close()
+
+        return {
+            "body": iter_body(),
+            "content_length": response.get("ContentLength", 0),
+            "content_type": response.get("ContentType"),
+            "etag": response.get("ETag"),
+        }
+
     async def download_file_to_path(self, storage_key: str, file_path: str) -> None:
         """
         Download a file from object storage to local path.
@@ -220,7 +383,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If deletion fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 await s3.delete_object(Bucket=self.bucket, Key=storage_key)
 
             logger.info(f"File deleted successfully: {storage_key}")
@@ -243,7 +406,7 @@ class BlobStorageService(StorageServiceProto):
             return
 
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 objects = [{"Key": key} for key in storage_keys]
                 await s3.delete_objects(
                     Bucket=self.bucket,
@@ -267,7 +430,7 @@ class BlobStorageService(StorageServiceProto):
             True if file exists, False otherwise
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 await s3.head_object(Bucket=self.bucket, Key=storage_key)
             return True
         except ClientError as e:
@@ -291,7 +454,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If operation fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 response = await s3.head_object(Bucket=self.bucket, Key=storage_key)
 
             return {
@@ -338,7 +501,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If URL generation fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 url = await s3.generate_presigned_url(
                     method,
                     Params={"Bucket": self.bucket, "Key": storage_key},
@@ -401,7 +564,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If listing fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 response = await s3.list_objects_v2(
                     Bucket=self.bucket,
                     Prefix=prefix,
@@ -441,7 +604,7 @@ class BlobStorageService(StorageServiceProto):
             ErrCodeError: If copy fails
         """
         try:
-            async with self.session.client(**self.s3_config) as s3:  # type: ignore
+            async with self._s3() as s3:
                 copy_source = {"Bucket": self.bucket, "Key": source_key}
                 await s3.copy_object(
                     CopySource=copy_source,
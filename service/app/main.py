@@ -27,6 +27,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     await initialize_providers_on_startup()
 
+    # Open the shared S3 client so the first file request doesn't pay for client setup
+    from app.core.storage import get_storage_service
+
+    await get_storage_service().connect()
+
     # Register builtin tools (web_search, knowledge_*, etc.)
     from app.tools.registry import register_builtin_tools
 
@@ -101,6 +106,52 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f"Error in MCP lifespan management: {e}")
         yield  # 确保服务能够启动
 
+    # Close pooled MCP client sessions
+    from app.infra.mcp import close_mcp_client_pool
+
+    await close_mcp_client_pool()
+
+    # Close the MCP catalog cache's Redis clients
+    from app.core.mcp_catalog import close_mcp_catalog_cache
+
+    await close_mcp_catalog_cache()
+
+    # Close warm dynamic tool sandboxes
+    from app.tools.dynamic.sandbox import close_sandbox_pool
+
+    await close_sandbox_pool()
+
+    # Stop the lab task watcher, then close the lab API client's pooled connections
+    from app.infra.lab import close_lab_client, close_lab_task_watcher
+
+    await close_lab_task_watcher()
+    await close_lab_client()
+
+    # Close the shared OpenAlex literature clients
+    from app.utils.literature.openalex_client import close_openalex_clients
+
+    await close_openalex_clients()
+
+    # Close the shared chat WebSocket subscriber
+    from app.core.chat.subscriber import close_chat_event_hub
+
+    await close_chat_event_hub()
+
+    # Close the auth provider's pooled HTTP client
+    from app.middleware.auth import AuthProvider
+
+    await AuthProvider.aclose()
+
+    # Close the shared S3 client and its connection pool
+    from app.core.storage import close_storage_service
+
+    await close_storage_service()
+
+    # Stop attachment rendering worker processes
+    from app.core.attachment_render import close_render_pool
+
+    close_render_pool()
+
     # Disconnect from the database, if needed (SQLModel manages sessions)
     pass
 
@@ -12,9 +12,9 @@ This server will:
 import logging
 import subprocess
 from datetime import datetime
-from typing import Callable, List, Optional
+from typing import Callable, List
 
-from fastmcp import Client, FastMCP
+from fastmcp import FastMCP
 from fastmcp.server.auth import JWTVerifier, TokenVerifier
 from fastmcp.server.dependencies import get_access_token
 from fastmcp.server.middleware import Middleware, MiddlewareContext
@@ -24,6 +24,7 @@ from fastmcp.server.middleware.timing import DetailedTimingMiddleware
 from fastmcp.tools.tool import ToolResult
 
 from app.configs import configs
+from app.infra.mcp import get_mcp_client_pool
 from app.middleware.auth import AuthProvider
 from app.middleware.auth import AuthProvider as InternalAuthProvider
 from app.middleware.auth.token_verifier.bohr_app_token_verifier import BohrAppTokenVerifier
@@ -62,18 +63,9 @@ logger = logging.getLogger(__name__)
 class DynamicToolMiddleware(Middleware):
     """Dynamic tool middleware that refreshes tools on every tool call and list tools"""
 
-    browser_mcp_client: Optional[Client] = None
-
     def __init__(self, mcp: FastMCP) -> None:
         self.mcp = mcp
-
-    async def init_client(self) -> None:
-        if self.browser_mcp_client is None:
-            logger.info("Initializing browser MCP client")
-            self.browser_mcp_client = Client(
-                f"http://{dynamic_mcp_config.host}:{dynamic_mcp_config.playwright_port}/mcp"
-            )
-            await self.browser_mcp_client._connect()
+        self.browser_mcp_url = f"http://{dynamic_mcp_config.host}:{dynamic_mcp_config.playwright_port}/mcp"
 
     async def on_call_tool(self, context: MiddlewareContext, call_next: Callable) -> ToolResult:
         """Refresh current tool when calling tool, with user isolation and permission check"""
@@ -102,10 +94,10 @@ class DynamicToolMiddleware(Middleware):
                             )
                             raise PermissionError(f"You don't have permission to call tool '{tool_name}'")
 
-                    # Refresh user's tools
-                    logger.info(f"Refreshing tools for user {user_id} before calling {tool_name}")
+                    # Refresh user's tools (no-op unless their registry version changed)
                     result = await tool_loader.refresh_tools(self.mcp, user_id=user_id)
-                    logger.info(f"Tool refresh completed: {result}")
+                    if not result.get("unchanged"):
+                        logger.info(f"Refreshed tools for user {user_id} before calling {tool_name}: {result}")
 
                 except PermissionError:
                     raise  # Re-raise permission errors
@@ -120,14 +112,10 @@ class DynamicToolMiddleware(Middleware):
         logger.warning(f"🚀 Execute: {tool_name} Arguments: {getattr(context.message, 'arguments', {})}")
         if tool_name.startswith("browser_"):
             try:
-                await self.init_client()
-                if self.browser_mcp_client is None:
-                    logger.error("Browser MCP client failed to initialize")
-                    raise RuntimeError("Browser MCP client failed to initialize")
-
+                # Pooled session: reconnects automatically if the browser server restarted
                 logger.info(f"Calling browser tool: {tool_name}")
-                tool_call_result = await self.browser_mcp_client.call_tool(
-                    tool_name, getattr(context.message, "arguments", {})
+                tool_call_result = await get_mcp_client_pool().call_tool(
+                    self.browser_mcp_url, None, tool_name, getattr(context.message, "arguments", {})
                 )
                 result = ToolResult(tool_call_result.content, tool_call_result.structured_content)
             except Exception as e:
@@ -162,9 +150,9 @@ class DynamicToolMiddleware(Middleware):
                 user_info = AuthProvider.parse_user_info(access_token.claims)
                 user_id = user_info.id
 
-                logger.info(f"Refreshing tools for user {user_id} before list_tools")
                 result = await tool_loader.refresh_tools(self.mcp, user_id=user_id)
-                logger.info(f"Tool refresh result: {result}")
+                if not result.get("unchanged"):
+                    logger.info(f"Refreshed tools for user {user_id} before list_tools: {result}")
             except Exception as e:
                 logger.error(f"Error refreshing tools: {e}")
                 # Continue anyway - built-in tools still available
@@ -2,12 +2,13 @@ import json
 import logging
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
 
-import requests
-from fastmcp import FastMCP
+import httpx
+from fastmcp import Context, FastMCP
 from fastmcp.server.auth import JWTVerifier, TokenVerifier
 from fastmcp.server.dependencies import AccessToken, get_access_token
 
 from app.configs import configs
+from app.infra.lab import LabTaskState, get_lab_client, get_lab_task_watcher
 from app.middleware.auth import AuthProvider
 from app.middleware.auth.token_verifier.bohr_app_token_verifier import BohrAppTokenVerifier
 
@@ -88,19 +89,11 @@ async def list_laboratories() -> dict:
             - error (str): Description of the error.
     """
     try:
-        url = f"{configs.Lab.Api}/api/v1/lab/list?page=1&page_size=1000"
+        url = f"{configs.Lab.Api}/api/v1/lab/list"
         access_token = get_access_token()
         if not access_token:
             raise ValueError("Access token is required for this operation.")
-        logger.info(f"Authorization: Bearer {access_token.token}")
-        resp = requests.get(
-            url,
-            headers={"Authorization": f"Bearer {access_token.token}"},
-            timeout=configs.Lab.Timeout,
-        )
-
-        resp.raise_for_status()
-        result = resp.json()
+        result = await get_lab_client().get(url, access_token.token, params={"page": 1, "page_size": 1000}, cache=True)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -109,7 +102,7 @@ async def list_laboratories() -> dict:
         labs = result.get("data", {}).get("data", [])
         logger.info(f"Successfully retrieved {len(labs)} labs.")
         return {"success": True, "labs": labs}
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -148,21 +141,12 @@ async def list_laboratory_devices(lab_uuid: str, type: str = "device") -> dict:
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = f"{configs.Lab.Api}/api/v1/lab/material/resource"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
 
         params = {"lab_uuid": lab_uuid, "type": type}
 
         logger.info(f"Making request to {url}...")
 
-        response = requests.get(url, headers=headers, params=params, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-
-        result = response.json()
-        print(result)
+        result = await get_lab_client().get(url, access_token.token, params=params, cache=True)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -175,7 +159,7 @@ async def list_laboratory_devices(lab_uuid: str, type: str = "device") -> dict:
 
         return {"success": True, "devices": [d.get("name", "") for d in devices], "device_count": len(devices)}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -215,18 +199,11 @@ async def list_laboratory_resources(lab_uuid: str, type: str = "resources") -> d
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = f"{configs.Lab.Api}/api/v1/lab/material/resource"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
         params = {"lab_uuid": lab_uuid}
 
         logger.info(f"Making request to {url}...")
 
-        response = requests.get(url, headers=headers, params=params, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, params=params, cache=True)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -239,7 +216,7 @@ async def list_laboratory_resources(lab_uuid: str, type: str = "resources") -> d
 
         return {"success": True, "devices": [d.get("name", "") for d in devices], "resources_count": len(devices)}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -284,19 +261,11 @@ async def list_device_actions(
 
         url = f"{configs.Lab.Api}/api/v1/lab/material/device/actions"
 
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
-
         params = {"name": name, "lab_uuid": lab_uuid}
 
         logger.info(f"Making request to {url} for name {name}...")
 
-        response = requests.get(url, headers=headers, params=params, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, params=params, cache=True)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -309,7 +278,7 @@ async def list_device_actions(
 
         return {"success": True, "device_id": data.get("name", ""), "actions": actions, "action_count": len(actions)}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -360,11 +329,6 @@ async def perform_device_action(
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = f"{configs.Lab.Api}/api/v1/lab/mcp/run/action"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
 
         # --- normalize param into a dict (JSON object) ---
         if param is None:
@@ -406,9 +370,7 @@ async def perform_device_action(
             with action {action}, payload keys: {list(payload.keys())}"""
         )
 
-        response = requests.post(url, headers=headers, json=payload, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().post(url, access_token.token, json_body=payload)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -427,22 +389,22 @@ async def perform_device_action(
             "return_info": return_info,
         }
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         error_msg = "Request timed out when calling lab API"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
 
-    except requests.exceptions.ConnectionError as e:
+    except httpx.NetworkError as e:
         error_msg = f"Connection error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
 
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         error_msg = f"HTTP error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"General request error: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -504,7 +466,7 @@ async def perform_device_action(
 
 # 获取工作流模版列表，如有标签就筛选标签✅
 @lab_mcp.tool
-def get_workflow_templates(
+async def get_workflow_templates(
     page: int = 1,
     page_size: int = 30,
     timeout: int = 30,
@@ -546,11 +508,6 @@ def get_workflow_templates(
 
         url = f"{configs.Lab.Api}/api/v1/lab/workflow/template/list"
 
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-        }
-
         params = {
             "page": page,
             "page_size": page_size,
@@ -564,9 +521,7 @@ def get_workflow_templates(
             logger.info("No tag filters applied, retrieving all templates")
 
         logger.info(f"请求工作流模板列表: {url}, 参数: {params}")
-        response = requests.get(url, headers=headers, params=params, timeout=timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, params=params, timeout=timeout)
 
         if result.get("code", 0) != 0:
             error_msg = f"API 返回错误: {result.get('msg', '未知错误')}"
@@ -575,17 +530,17 @@ def get_workflow_templates(
 
         return {"success": True, "data": result.get("data")}
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("请求超时")
         return {"code": -1, "msg": "请求超时", "data": {"count": 0, "next": None, "previous": None, "results": []}}
-    except requests.exceptions.ConnectionError:
+    except httpx.NetworkError:
         logger.error("连接错误")
         return {
             "code": -1,
             "msg": "无法连接到服务器",
             "data": {"count": 0, "next": None, "previous": None, "results": []},
         }
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"请求异常: {str(e)}")
         return {
             "code": -1,
@@ -603,7 +558,7 @@ def get_workflow_templates(
 
 # 获取工作流列表✅
 @lab_mcp.tool
-def get_workflow_list(
+async def get_workflow_list(
     lab_uuid: str,
     page: int = 1,
     page_size: int = 30,
@@ -636,10 +591,6 @@ def get_workflow_list(
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = f"{configs.Lab.Api}/api/v1/lab/workflow/owner/list"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-        }
 
         params: ParamsType = {
             "page": page,
@@ -648,9 +599,7 @@ def get_workflow_list(
         }
 
         logger.info(f"请求工作流列表: {url}, 参数: {params}")
-        response = requests.get(url, headers=headers, params=params, timeout=timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, params=params, timeout=timeout)
 
         if result.get("code", 0) != 0:
             error_msg = f"API 返回错误: {result.get('msg', '未知错误')}"
@@ -660,17 +609,17 @@ def get_workflow_list(
 
         return {"success": True, "data": result.get("data")}
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("请求超时")
         return {"code": -1, "msg": "请求超时", "data": {"count": 0, "next": None, "previous": None, "results": []}}
-    except requests.exceptions.ConnectionError:
+    except httpx.NetworkError:
         logger.error("连接错误")
         return {
             "code": -1,
             "msg": "无法连接到服务器",
             "data": {"count": 0, "next": None, "previous": None, "results": []},
         }
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"请求异常: {str(e)}")
         return {
             "code": -1,
@@ -688,7 +637,9 @@ def get_workflow_list(
 
 # publish工作流模版✅
 @lab_mcp.tool
-def create_workflow_template(uuid: str, description: str, published: bool = True, timeout: int = 30) -> Dict[str, Any]:
+async def create_workflow_template(
+    uuid: str, description: str, published: bool = True, timeout: int = 30
+) -> Dict[str, Any]:
     """
     Create and optionally publish a workflow template using the internal lab API.
     Authentication is handled automatically on the server.
@@ -717,22 +668,14 @@ def create_workflow_template(uuid: str, description: str, published: bool = True
 
         # 构建完整URL
         url = f"{configs.Lab.Api}/api/v1/lab/workflow/owner"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
 
         # 构建请求数据
         data = {"uuid": uuid, "description": description, "published": published}
 
         logger.info(f"创建工作流模板: {url}, 数据: {data}")
 
-        # 发送POST请求
-        response = requests.patch(url, headers=headers, json=data, timeout=timeout)
-        response.raise_for_status()
-
-        result = response.json()
+        # 发送PATCH请求
+        result = await get_lab_client().patch(url, access_token.token, json_body=data, timeout=timeout)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -741,7 +684,7 @@ def create_workflow_template(uuid: str, description: str, published: bool = True
 
         return {"code": 0, "msg": "工作流模板创建成功", "data": result.get("data")}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -753,7 +696,9 @@ def create_workflow_template(uuid: str, description: str, published: bool = True
 
 # fork工作流✅
 @lab_mcp.tool
-def fork_workflow_template(source_uuid: str, target_lab_uuid: str, name: str, timeout: int = 30) -> Dict[str, Any]:
+async def fork_workflow_template(
+    source_uuid: str, target_lab_uuid: str, name: str, timeout: int = 30
+) -> Dict[str, Any]:
     """
     Fork (duplicate) a workflow template into a specified laboratory using the internal lab API.
     Authentication is handled automatically on the server.
@@ -782,11 +727,6 @@ def fork_workflow_template(source_uuid: str, target_lab_uuid: str, name: str, ti
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = f"{configs.Lab.Api}/api/v1/lab/workflow/owner/duplicate"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
 
         # # 使用配置中的实验室UUID
         # if lab_uuid == "default":
@@ -801,10 +741,7 @@ def fork_workflow_template(source_uuid: str, target_lab_uuid: str, name: str, ti
         logger.info(f"Fork工作流模板: {url}, 数据: {data}")
 
         # 发送Put请求
-        response = requests.put(url, headers=headers, json=data, timeout=timeout)
-        response.raise_for_status()
-
-        result = response.json()
+        result = await get_lab_client().put(url, access_token.token, json_body=data, timeout=timeout)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -813,7 +750,7 @@ def fork_workflow_template(source_uuid: str, target_lab_uuid: str, name: str, ti
 
         return {"code": 0, "msg": "工作流模板Fork成功", "data": result.get("data")}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -824,7 +761,7 @@ def fork_workflow_template(source_uuid: str, target_lab_uuid: str, name: str, ti
 
 # 运行指定工作流✅
 @lab_mcp.tool
-def run_workflow(workflow_uuid: str, timeout: int = 30) -> Dict[str, Any]:
+async def run_workflow(workflow_uuid: str, timeout: int = 30) -> Dict[str, Any]:
     """
     Execute a specific workflow using the internal lab API.
     Authentication is handled automatically on the server.
@@ -846,8 +783,8 @@ def run_workflow(workflow_uuid: str, timeout: int = 30) -> Dict[str, Any]:
             - error (str): Description of the error.
 
     Note:
-        After starting the workflow successfully, you should immediately query the task information
-        using the returned `task_id` to monitor the workflow execution.
+        After starting the workflow successfully, use `wait_for_task` with the returned `task_id`
+        to wait for the workflow execution to finish.
     """
     try:
         access_token = get_access_token()
@@ -856,20 +793,12 @@ def run_workflow(workflow_uuid: str, timeout: int = 30) -> Dict[str, Any]:
 
         # 构建请求
         url = f"{configs.Lab.Api}/api/v1/lab/run/workflow"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
         data = {"workflow_uuid": workflow_uuid}
 
         logger.info(f"运行工作流请求: {url}, data={data}")
 
         # 发送 PUT 请求
-        response = requests.put(url, headers=headers, json=data, timeout=timeout)
-        response.raise_for_status()
-
-        result = response.json()
+        result = await get_lab_client().put(url, access_token.token, json_body=data, timeout=timeout)
 
         logger.info(f"运行工作流响应: {result}")
 
@@ -881,13 +810,13 @@ def run_workflow(workflow_uuid: str, timeout: int = 30) -> Dict[str, Any]:
 
         return {"code": 0, "msg": "工作流运行成功", "task_id": result.get("data")}
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("运行工作流超时")
         return {"code": -1, "msg": "请求超时", "data": None}
-    except requests.exceptions.ConnectionError:
+    except httpx.NetworkError:
         logger.error("运行工作流连接错误")
         return {"code": -1, "msg": "无法连接到服务器", "data": None}
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"运行工作流请求异常: {str(e)}")
         return {"code": -1, "msg": f"请求失败: {str(e)}", "data": None}
     except Exception as e:
@@ -897,7 +826,7 @@ def run_workflow(workflow_uuid: str, timeout: int = 30) -> Dict[str, Any]:
 
 # 查询工作流task详细信息
 @lab_mcp.tool
-def get_task(task_id: str, timeout: int = 30) -> Dict[str, Any]:
+async def get_task(task_id: str, timeout: int = 30) -> Dict[str, Any]:
     """
     Retrieve detailed information about a workflow task using the internal lab API.
     Authentication is handled automatically on the server.
@@ -918,7 +847,8 @@ def get_task(task_id: str, timeout: int = 30) -> Dict[str, Any]:
             - error (str): Description of the error.
 
     Notes:
-        Use this function to monitor the status and results of a workflow run using its task ID.
+        This checks the task once. To wait for a workflow run to finish, use `wait_for_task`
+        instead of calling this repeatedly.
     """
 
     try:
@@ -927,16 +857,9 @@ def get_task(task_id: str, timeout: int = 30) -> Dict[str, Any]:
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = f"{configs.Lab.Api}/api/v1/lab/mcp/task/{task_id}"
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
 
         logger.info(f"请求 task 详细信息: {url}")
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, timeout=timeout)
 
         if result.get("code", 0) != 0:
             error_msg = f"API 返回错误: {result.get('msg', '未知错误')}"
@@ -945,15 +868,15 @@ def get_task(task_id: str, timeout: int = 30) -> Dict[str, Any]:
 
         return {"success": True, "data": result.get("data")}
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("请求超时")
         return {"code": -1, "msg": "请求超时", "data": {}}
 
-    except requests.exceptions.ConnectionError:
+    except httpx.NetworkError:
         logger.error("连接错误")
         return {"code": -1, "msg": "无法连接到服务器", "data": {}}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"请求异常: {str(e)}")
         return {"code": -1, "msg": f"请求失败: {str(e)}", "data": {}}
 
@@ -964,3 +887,58 @@ def get_task(task_id: str, timeout: int = 30) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"未知错误: {e}", exc_info=True)
         return {"code": -1, "msg": f"未知错误: {str(e)}", "data": {}}
+
+
+# 等待工作流task执行完成
+@lab_mcp.tool
+async def wait_for_task(task_id: str, ctx: Context, timeout: int = 300) -> Dict[str, Any]:
+    """
+    Wait for a workflow task to finish and return its detailed information.
+    The server tracks the task and reports status changes as progress, so there is no need to poll.
+
+    Args:
+        task_id (str): Unique identifier of the task.
+        timeout (int, optional): Maximum seconds to wait, default is 300.
+
+    Returns:
+        dict: Operation result dictionary.
+
+        Success:
+            - success (bool): True if the task could be tracked.
+            - done (bool): True if the task finished; False if the timeout was reached first,
+              in which case call this tool again to keep waiting.
+            - status (str): Last known status of the task.
+            - data (dict): Detailed information about the task returned by the API.
+
+        Failure:
+            - success (bool): False
+            - error (str): Description of the error.
+    """
+    try:
+        access_token = get_access_token()
+        if not access_token:
+            raise ValueError("API SecretKey is not configured on the server.")
+
+        url = f"{configs.Lab.Api}/api/v1/lab/mcp/task/{task_id}"
+        updates = 0
+
+        async def on_update(state: LabTaskState) -> None:
+            nonlocal updates
+            updates += 1
+            message = f"Task {task_id}: {state.status or 'pending'}"
+            if state.percent is not None:
+                await ctx.report_progress(progress=state.percent, total=100, message=message)
+            else:
+                await ctx.report_progress(progress=updates, message=message)
+
+        timeout = max(1, min(timeout, configs.Lab.WaitMaxTimeout))
+        state = await get_lab_task_watcher().wait(url, access_token.token, timeout, on_update=on_update)
+
+        if state.error:
+            logger.error(f"等待 task 失败: {state.error}")
+            return {"error": state.error, "success": False, "status": state.status, "data": state.data}
+        return {"success": True, "done": state.done, "status": state.status, "data": state.data}
+
+    except Exception as e:
+        logger.error(f"未知错误: {e}", exc_info=True)
+        return {"error": f"未知错误: {str(e)}", "success": False}
@@ -2,12 +2,13 @@ import json
 import logging
 from typing import Any, Iterable, Mapping, Optional, Union
 
-import requests
-from fastmcp import FastMCP
+import httpx
+from fastmcp import Context, FastMCP
 from fastmcp.server.auth import JWTVerifier, TokenVerifier
 from fastmcp.server.dependencies import get_access_token
 
 from app.configs import configs
+from app.infra.lab import LabTaskState, get_lab_client, get_lab_task_watcher
 from app.middleware.auth import AuthProvider
 from app.middleware.auth.token_verifier.bohr_app_token_verifier import BohrAppTokenVerifier
 
@@ -81,11 +82,6 @@ async def run_action(
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = get_lab_api_url("/api/v1/lab/action/run")
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        }
 
         # --- normalize param into a dict (JSON object) ---
         if param is None:
@@ -124,9 +120,7 @@ async def run_action(
 
         logger.info(f"Making POST request to {url} with payload: {payload}")
 
-        response = requests.post(url, headers=headers, json=payload, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().post(url, access_token.token, json_body=payload)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -136,7 +130,7 @@ async def run_action(
         data = result.get("data", {})
         return {"success": True, "data": data}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -151,7 +145,8 @@ async def run_action(
 @osdl_mcp.tool
 async def get_action_result(task_uuid: str) -> dict:
     """
-    Check the status and result of a device action job.
+    Check the status and result of a device action job once.
+    To wait for the action to finish, use `wait_for_action_result` instead of calling this repeatedly.
 
     Args:
         task_uuid (str): The UUID of the task/job to check.
@@ -165,16 +160,10 @@ async def get_action_result(task_uuid: str) -> dict:
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = get_lab_api_url(f"/api/v1/lab/action/result/{task_uuid}")
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-        }
 
         logger.info(f"Making GET request to {url}")
 
-        response = requests.get(url, headers=headers, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -184,7 +173,7 @@ async def get_action_result(task_uuid: str) -> dict:
         data = result.get("data", {})
         return {"success": True, "data": data}
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Network error when calling lab API: {str(e)}"
         logger.error(error_msg)
         return {"error": error_msg, "success": False}
@@ -195,6 +184,53 @@ async def get_action_result(task_uuid: str) -> dict:
         return {"error": error_msg, "success": False}
 
 
+# 等待动作执行完成
+@osdl_mcp.tool
+async def wait_for_action_result(task_uuid: str, ctx: Context, timeout: int = 300) -> dict:
+    """
+    Wait for a device action job to finish and return its result.
+    The server tracks the job and reports status changes as progress, so there is no need to poll.
+
+    Args:
+        task_uuid (str): The UUID of the task/job to wait for.
+        timeout (int, optional): Maximum seconds to wait, default is 300.
+
+    Returns:
+        dict: Result containing the final job status and output.
+            If the job is still running when the timeout is reached, `done` is False;
+            call this tool again to keep waiting.
+    """
+    try:
+        access_token = get_access_token()
+        if not access_token:
+            raise ValueError("API SecretKey is not configured on the server.")
+
+        url = get_lab_api_url(f"/api/v1/lab/action/result/{task_uuid}")
+        updates = 0
+
+        async def on_update(state: LabTaskState) -> None:
+            nonlocal updates
+            updates += 1
+            message = f"Action {task_uuid}: {state.status or 'pending'}"
+            if state.percent is not None:
+                await ctx.report_progress(progress=state.percent, total=100, message=message)
+            else:
+                await ctx.report_progress(progress=updates, message=message)
+
+        timeout = max(1, min(timeout, configs.Lab.WaitMaxTimeout))
+        state = await get_lab_task_watcher().wait(url, access_token.token, timeout, on_update=on_update)
+
+        if state.error:
+            logger.error(f"Waiting for action {task_uuid} failed: {state.error}")
+            return {"error": state.error, "success": False, "status": state.status, "data": state.data}
+        return {"success": True, "done": state.done, "status": state.status, "data": state.data}
+
+    except Exception as e:
+        error_msg = f"An unexpected error occurred: {str(e)}"
+        logger.error(error_msg)
+        return {"error": error_msg, "success": False}
+
+
 # 获取当前用户信息
 @osdl_mcp.tool
 async def show_user_info() -> dict[str, Any]:
@@ -233,19 +269,12 @@ async def list_laboratories() -> dict:
         dict: Operation result containing the list of laboratories.
     """
     try:
-        url = get_lab_api_url("/api/v1/lab/list?page=1&page_size=1000")
+        url = get_lab_api_url("/api/v1/lab/list")
         access_token = get_access_token()
         if not access_token:
             raise ValueError("Access token is required for this operation.")
 
-        resp = requests.get(
-            url,
-            headers={"Authorization": f"Bearer {access_token.token}"},
-            timeout=configs.Lab.Timeout,
-        )
-
-        resp.raise_for_status()
-        result = resp.json()
+        result = await get_lab_client().get(url, access_token.token, params={"page": 1, "page_size": 1000}, cache=True)
 
         if result.get("code") != 0:
             error_msg = f"API returned an error: {result.get('msg', 'Unknown Error')}"
@@ -279,15 +308,9 @@ async def list_materials(lab_uuid: str, type: str = "resources") -> dict:
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = get_lab_api_url("/api/v1/lab/material/resource")
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-        }
         params = {"lab_uuid": lab_uuid, "type": type}
 
-        response = requests.get(url, headers=headers, params=params, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, params=params, cache=True)
 
         if result.get("code") != 0:
             return {"error": result.get("msg", "Unknown Error"), "success": False}
@@ -313,15 +336,9 @@ async def _list_material_actions(lab_uuid: str, material_name: str) -> dict:
             raise ValueError("API SecretKey is not configured on the server.")
 
         url = get_lab_api_url("/api/v1/lab/material/device/actions")
-        headers = {
-            "Authorization": f"Bearer {access_token.token}",
-            "Accept": "application/json",
-        }
         params = {"name": material_name, "lab_uuid": lab_uuid}
 
-        response = requests.get(url, headers=headers, params=params, timeout=configs.Lab.Timeout)
-        response.raise_for_status()
-        result = response.json()
+        result = await get_lab_client().get(url, access_token.token, params=params, cache=True)
 
         if result.get("code") != 0:
             return {"error": result.get("msg", "Unknown Error"), "success": False}
@@ -1,10 +1,13 @@
+import asyncio
+import hashlib
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any
 
+import httpx
 import jwt
-import requests
 from fastapi import Header, HTTPException, Query, status
 
 from app.configs import configs
@@ -47,7 +50,15 @@ class AuthContext:
 
 
 class BaseAuthProvider(ABC):
-    """Abstract base class for authentication providers"""
+    """
+    Abstract base class for authentication providers
+
+    Validation is fully async: upstream calls go through a pooled
+    ``httpx.AsyncClient``, results are cached in the shared token cache
+    (local or Redis), and concurrent validations of the same token share a
+    single upstream call. JWKS signing keys are cached and refreshed when a
+    token presents an unknown ``kid``.
+    """
 
     def __init__(self, config: AuthProviderConfigBase) -> None:
         self.config = config
@@ -57,14 +68,26 @@ class BaseAuthProvider(ABC):
         self.algorithm: str = config.Algorithm
         self.audience: str = config.Audience
 
+        self.http_timeout: float = configs.Auth.HttpTimeout
+        self.jwks_cache_ttl: int = configs.Auth.JwksCacheTTL
+        self.jwks_min_refresh_interval: int = configs.Auth.JwksMinRefreshInterval
+
+        self._http_client: httpx.AsyncClient | None = None
+        self._inflight: dict[str, asyncio.Task[AuthResult]] = {}
+        self._jwks: dict[str, Any] | None = None
+        self._jwks_keys: dict[str | None, Any] = {}
+        self._jwks_fetched_at = float("-inf")
+        self._jwks_checked_at = float("-inf")
+        self._jwks_lock = asyncio.Lock()
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """Get the provider name"""
         pass
 
     @abstractmethod
-    def validate_token(self, access_token: str) -> AuthResult:
-        """Validate the access_token and get user information"""
+    async def _validate_token(self, access_token: str) -> AuthResult:
+        """Validate the access_token against the provider (uncached)"""
         pass
 
     @abstractmethod
@@ -77,39 +100,104 @@ class BaseAuthProvider(ABC):
         """Parse user information from the userinfo API response"""
         pass
 
-    def get_jwks(self) -> dict[str, Any] | None:
-        """Get JWKS public key information"""
+    def get_http_client(self) -> httpx.AsyncClient:
+        """Get the provider's pooled HTTP client"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(timeout=self.http_timeout)
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (application shutdown)"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def validate_token(self, access_token: str) -> AuthResult:
+        """Validate the access_token and get user information"""
+        from .cache import get_token_cache
+
+        cache = get_token_cache()
+        cached_result = await cache.get(access_token, self.get_provider_name())
+        if cached_result:
+            return cached_result
+
+        # Single-flight: concurrent validations of the same token share one upstream call
+        key = hashlib.sha256(access_token.encode()).hexdigest()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._validate_and_cache(access_token))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled request doesn't cancel the call other requests wait on
+        return await asyncio.shield(task)
+
+    async def _validate_and_cache(self, access_token: str) -> AuthResult:
+        result = await self._validate_token(access_token)
+        if result.success:
+            from .cache import get_token_cache
+
+            await get_token_cache().set(access_token, self.get_provider_name(), result)
+        return result
+
+    async def get_jwks(self) -> dict[str, Any] | None:
+        """Get JWKS public key information (cached)"""
+        if self._jwks is None or time.monotonic() - self._jwks_fetched_at >= self.jwks_cache_ttl:
+            await self._refresh_jwks()
+        return self._jwks
+
+    async def _refresh_jwks(self) -> None:
+        """Fetch the JWKS, keeping the previous key set if the fetch fails"""
         if not self.jwks_uri:
             logger.warning("JWKS URI not configured")
-            return None
-
-        logger.debug(f"Getting JWKS information from {self.jwks_uri}...")
-        try:
-            response = requests.get(self.jwks_uri, timeout=10)
-            response.raise_for_status()
-            jwks_data = response.json()
-
-            if isinstance(jwks_data, dict):
-                logger.debug(f"Successfully retrieved JWKS, containing {len(jwks_data.get('keys', []))} keys")
-                return jwks_data
-            else:
+            return
+
+        checked_at = self._jwks_checked_at
+        async with self._jwks_lock:
+            if self._jwks_checked_at != checked_at:
+                # Another request refreshed while we waited
+                return
+            self._jwks_checked_at = time.monotonic()
+
+            logger.debug(f"Getting JWKS information from {self.jwks_uri}...")
+            try:
+                response = await self.get_http_client().get(self.jwks_uri)
+                response.raise_for_status()
+                jwks_data = response.json()
+            except Exception as e:
+                logger.error(f"Failed to get JWKS from {self.jwks_uri}: {e}")
+                return
+
+            if not isinstance(jwks_data, dict):
                 logger.error("Invalid JWKS response format, not a dictionary type")
-                return None
-        except Exception as e:
-            logger.error(f"Failed to get JWKS from {self.jwks_uri}: {e}")
-            return None
-
-    def decode_jwt_token(self, token: str) -> dict[str, Any] | None:
+                return
+
+            keys: dict[str | None, Any] = {}
+            for jwk in jwks_data.get("keys", []):
+                try:
+                    keys[jwk.get("kid")] = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+                except Exception as e:
+                    logger.warning(f"Skipping unusable JWK {jwk.get('kid')}: {e}")
+
+            logger.debug(f"Successfully retrieved JWKS, containing {len(keys)} keys")
+            self._jwks = jwks_data
+            self._jwks_keys = keys
+            self._jwks_fetched_at = time.monotonic()
+
+    async def get_signing_key(self, kid: str | None) -> Any | None:
+        """Get the public key for a token ``kid``, refreshing the JWKS on expiry or an unknown kid"""
+        now = time.monotonic()
+        if kid in self._jwks_keys and now - self._jwks_fetched_at < self.jwks_cache_ttl:
+            return self._jwks_keys[kid]
+
+        # Unknown kid (keys rotated) or expired key set; throttled so bogus kids can't hammer the endpoint
+        if now - self._jwks_checked_at >= self.jwks_min_refresh_interval:
+            await self._refresh_jwks()
+        return self._jwks_keys.get(kid)
+
+    async def decode_jwt_token(self, token: str) -> dict[str, Any] | None:
         """Decode JWT token"""
         logger.debug("Start decoding JWT token")
         try:
-            # Get JWKS
-            logger.debug("Getting JWKS public key information...")
-            jwks = self.get_jwks()
-            if not jwks:
-                logger.error("Unable to get JWKS public key information")
-                return None
-
             # Get kid from token header
             logger.debug("Parsing token header...")
             unverified_header = jwt.get_unverified_header(token)
@@ -117,14 +205,7 @@ class BaseAuthProvider(ABC):
             logger.debug(f"Token header kid: {kid}")
 
             # Find the corresponding public key
-            logger.debug("Finding matching public key...")
-            key = None
-            for jwk in jwks.get("keys", []):
-                if jwk.get("kid") == kid:
-                    logger.debug(f"Found matching public key, kid: {kid}")
-                    key = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
-                    break
-
+            key = await self.get_signing_key(kid)
             if not key:
                 logger.error(f"No matching public key found, token kid: {kid}")
                 return None
@@ -238,7 +319,7 @@ async def get_current_user(authorization: str | None = Header(None)) -> str:
     access_token = authorization[7:]  # Remove "Bearer " prefix
 
     # Validate token
-    auth_result = AuthProvider.validate_token(access_token)
+    auth_result = await AuthProvider.validate_token(access_token)
     if not auth_result.success or not auth_result.user_info:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -256,7 +337,7 @@ async def get_current_user_websocket(token: str | None = Query(None, alias="toke
         raise Exception("Missing authentication token")
 
     # Validate token
-    auth_result = AuthProvider.validate_token(token)
+    auth_result = await AuthProvider.validate_token(token)
     if not auth_result.success or not auth_result.user_info:
         raise Exception(auth_result.error_message or "Token validation failed")
 
@@ -271,7 +352,7 @@ async def get_auth_context_websocket(token: str | None = Query(None, alias="toke
         raise Exception("Missing authentication token")
 
     # Validate token
-    auth_result = AuthProvider.validate_token(token)
+    auth_result = await AuthProvider.validate_token(token)
     if not auth_result.success or not auth_result.user_info:
         raise Exception(auth_result.error_message or "Token validation failed")
 
@@ -1,10 +1,9 @@
 import logging
 from typing import Any
 
-import requests
+import httpx
 
 from . import AuthResult, BaseAuthProvider, UserInfo
-from .simple_cache import cached_token_validation
 
 # 设置日志记录器
 logger = logging.getLogger(__name__)
@@ -25,8 +24,7 @@ class BohrAppAuthProvider(BaseAuthProvider):
         logger.debug(f"BohrApp 配置检查: issuer={self.issuer}, valid={is_valid}")
         return is_valid
 
-    @cached_token_validation
-    def validate_token(self, access_token: str) -> AuthResult:
+    async def _validate_token(self, access_token: str) -> AuthResult:
         """
         验证 accessKey 并获取用户信息
 
@@ -65,7 +63,7 @@ class BohrAppAuthProvider(BaseAuthProvider):
                 "User-Agent": "Xyzen/1.0",
             }
 
-            response = requests.get(userinfo_url, headers=headers, timeout=10)
+            response = await self.get_http_client().get(userinfo_url, headers=headers)
             logger.debug(f"BohrApp: userinfo API 响应状态: {response.status_code}")
 
             if response.status_code == 401:
@@ -74,7 +72,7 @@ class BohrAppAuthProvider(BaseAuthProvider):
                     success=False, error_code="INVALID_TOKEN", error_message="Invalid or expired accessKey"
                 )
 
-            if not response.ok:
+            if not response.is_success:
                 logger.error(f"BohrApp: userinfo API 请求失败: {response.status_code} - {response.text}")
                 return AuthResult(
                     success=False, error_code="API_ERROR", error_message=f"BohrApp API error: {response.status_code}"
@@ -94,7 +92,7 @@ class BohrAppAuthProvider(BaseAuthProvider):
             logger.debug(f"BohrApp: 用户信息解析完成，用户ID: {user_info.id}, 用户名: {user_info.username}")
             return AuthResult(success=True, user_info=user_info)
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"BohrApp: API 请求异常: {str(e)}")
             return AuthResult(success=False, error_code="NETWORK_ERROR", error_message=f"Network error: {str(e)}")
         except Exception as e:
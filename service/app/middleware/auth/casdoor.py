@@ -1,7 +1,7 @@
 import logging
 from typing import Any
 
-import requests
+import httpx
 
 from . import AuthResult, BaseAuthProvider, UserInfo
 
@@ -21,7 +21,7 @@ class CasdoorAuthProvider(BaseAuthProvider):
         logger.debug(f"Casdoor 配置检查: issuer={self.issuer}, valid={is_valid}")
         return is_valid
 
-    def validate_token(self, access_token: str) -> AuthResult:
+    async def _validate_token(self, access_token: str) -> AuthResult:
         """验证 access_token 并获取用户信息"""
         logger.debug(f"Casdoor: 开始验证 token (前20字符): {access_token[:20]}...")
 
@@ -41,14 +41,14 @@ class CasdoorAuthProvider(BaseAuthProvider):
 
             headers = {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
 
-            response = requests.get(userinfo_url, headers=headers, timeout=10)
+            response = await self.get_http_client().get(userinfo_url, headers=headers)
             logger.debug(f"Casdoor: userinfo API 响应状态: {response.status_code}")
 
             if response.status_code == 401:
                 logger.warning("Casdoor: Token 无效或已过期")
                 return AuthResult(success=False, error_code="INVALID_TOKEN", error_message="Invalid or expired token")
 
-            if not response.ok:
+            if not response.is_success:
                 logger.error(f"Casdoor: userinfo API 请求失败: {response.status_code} - {response.text}")
                 return AuthResult(
                     success=False, error_code="API_ERROR", error_message=f"Casdoor API error: {response.status_code}"
@@ -68,7 +68,7 @@ class CasdoorAuthProvider(BaseAuthProvider):
             logger.debug(f"Casdoor: 用户信息解析完成，用户ID: {user_info.id}, 用户名: {user_info.username}")
             return AuthResult(success=True, user_info=user_info)
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Casdoor: API 请求异常: {str(e)}")
             return AuthResult(success=False, error_code="NETWORK_ERROR", error_message=f"Network error: {str(e)}")
         except Exception as e:
@@ -110,7 +110,7 @@ class CasdoorAuthProvider(BaseAuthProvider):
         logger.debug(f"Casdoor: 解析结果 - ID: {user_info.id}, 用户名: {user_info.username}, 邮箱: {user_info.email}")
         return user_info
 
-    def exchange_code_for_token(self, code: str) -> str:
+    async def exchange_code_for_token(self, code: str) -> str:
         """Exchange authorization code for access token"""
         # Ensure Client Secret is configured
         client_secret = getattr(self.config, "ClientSecret", None)
@@ -129,7 +129,7 @@ class CasdoorAuthProvider(BaseAuthProvider):
 
         try:
             logger.debug(f"Exchanging code for token with URL: {url}")
-            response = requests.post(url, data=payload, timeout=10)
+            response = await self.get_http_client().post(url, data=payload)
             response.raise_for_status()
             data = response.json()
 
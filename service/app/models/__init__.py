@@ -2,7 +2,7 @@ import logging
 
 from .agent import Agent, AgentReadWithDetails
 from .agent_like import AgentLike, AgentLikeCreate, AgentLikeRead
-from .agent_run import AgentRun, AgentRunCreate, AgentRunRead, AgentRunUpdate
+from .agent_run import AgentRun, AgentRunCreate, AgentRunRead, AgentRunTimelineEntry, AgentRunUpdate
 from .agent_marketplace import (
     AgentMarketplace,
     AgentMarketplaceCreate,
@@ -14,7 +14,8 @@ from .agent_snapshot import AgentSnapshot, AgentSnapshotCreate, AgentSnapshotRea
 from .checkin import CheckIn, CheckInCreate, CheckInRead
 from .citation import Citation, CitationCreate, CitationRead
 from .consume import ConsumeRecord
-from .file import File, FileCreate, FileRead, FileReadWithUrl, FileUpdate
+from .file import File, FileBlob, FileCreate, FileRead, FileReadWithUrl, FileUpdate
+from .file_content import FileContentChunk, FileContentIndex
 from .file_knowledge_set_link import FileKnowledgeSetLink, FileKnowledgeSetLinkCreate, FileKnowledgeSetLinkRead
 from .folder import Folder, FolderCreate, FolderRead, FolderUpdate
 from .knowledge_set import (
@@ -48,6 +49,7 @@ __all__ = [
     "AgentRun",
     "AgentRunCreate",
     "AgentRunRead",
+    "AgentRunTimelineEntry",
     "AgentRunUpdate",
     "AgentSnapshot",
     "AgentSnapshotCreate",
@@ -68,6 +70,9 @@ __all__ = [
     "CheckInRead",
     "ConsumeRecord",
     "File",
+    "FileBlob",
+    "FileContentChunk",
+    "FileContentIndex",
     "FileCreate",
     "FileRead",
     "FileReadWithUrl",
@@ -3,7 +3,7 @@ from typing import Any
 from uuid import UUID, uuid4
 
 from sqlalchemy import JSON, TIMESTAMP
-from sqlmodel import Column, Field, SQLModel
+from sqlmodel import Column, Field, SQLModel, UniqueConstraint
 
 
 class AgentRunBase(SQLModel):
@@ -25,6 +25,8 @@ class AgentRunBase(SQLModel):
 
     # Node execution data (JSON for flexibility)
     # Structure: { "node_outputs": {...}, "node_order": [...], "node_names": {...} }
+    # Timeline entries are stored append-only in AgentRunTimelineEntry; runs
+    # written before that keep theirs under "timeline" here.
     node_data: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
 
     # Error info
@@ -42,6 +44,23 @@ class AgentRun(AgentRunBase, table=True):
     )
 
 
+class AgentRunTimelineEntry(SQLModel, table=True):
+    """One append-only entry of an agent run's execution timeline"""
+
+    __table_args__ = (UniqueConstraint("agent_run_id", "seq", name="uq_agent_run_timeline_seq"),)
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    agent_run_id: UUID = Field(foreign_key="agentrun.id", ondelete="CASCADE", index=True)
+    seq: int  # Position within the run's timeline
+    event_type: str
+    node_id: str | None = None
+    entry: dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))  # Full TimelineEntryDict
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
 class AgentRunCreate(AgentRunBase):
     """Model for creating an agent run"""
 
@@ -15,8 +15,7 @@ class FileBase(SQLModel):
     )
     storage_key: str = Field(
         index=True,
-        unique=True,
-        description="Unique storage key/path in object storage",
+        description="Storage key/path in object storage (shared by files with identical content)",
     )
     original_filename: str = Field(
         max_length=255,
@@ -101,6 +100,38 @@ class File(FileBase, table=True):
     )
 
 
+class FileBlob(SQLModel, table=True):
+    """Content-addressed object in storage, shared by every File row with the same hash"""
+
+    file_hash: str = Field(
+        primary_key=True,
+        max_length=64,
+        description="SHA256 hash of the content",
+    )
+    storage_key: str = Field(
+        unique=True,
+        description="Content-addressed storage key in object storage",
+    )
+    file_size: int = Field(
+        ge=0,
+        description="Content size in bytes",
+    )
+    content_type: str = Field(
+        max_length=100,
+        description="MIME type of the first upload of this content",
+    )
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="Timestamp when the content was first stored",
+    )
+    last_used_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+        description="Timestamp when a file last referenced this content (guards garbage collection)",
+    )
+
+
 class FileCreate(FileBase):
     """Model for creating a new file record"""
 
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import TIMESTAMP, Column, Text
+from sqlmodel import Field, SQLModel, UniqueConstraint
+
+
+class FileContentChunk(SQLModel, table=True):
+    """One chunk of a file's extracted text in the knowledge search index"""
+
+    __table_args__ = (UniqueConstraint("file_id", "chunk_index", name="uq_file_content_chunk_index"),)
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    file_id: UUID = Field(index=True)
+    chunk_index: int  # Position of the chunk within the file
+    content: str = Field(sa_column=Column(Text, nullable=False))  # Original text, used for snippets
+    tokens: str = Field(sa_column=Column(Text, nullable=False))  # Normalized tokens joined by spaces, full-text indexed
+    token_count: int
+
+
+class FileContentIndex(SQLModel, table=True):
+    """Index state of a file: which content version was indexed and into how many chunks"""
+
+    file_id: UUID = Field(primary_key=True)
+    file_hash: str | None = Field(default=None, max_length=64)  # Content indexed; reindexed when it changes
+    chunk_count: int = 0
+    error: str | None = None  # Why the text could not be extracted, if it failed
+    indexed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
+    )
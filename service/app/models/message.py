@@ -2,9 +2,12 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import TIMESTAMP
+from sqlalchemy import TIMESTAMP, Text, event
+from sqlalchemy.orm import attributes
 from sqlmodel import JSON, Column, Field, SQLModel
 
+from app.utils.text_search import tokenize
+
 if TYPE_CHECKING:
     from .citation import CitationRead
     from .file import FileRead, FileReadWithUrl
@@ -28,6 +31,16 @@ class Message(MessageBase, table=True):
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(TIMESTAMP(timezone=True), nullable=False),
     )
+    # Normalized content tokens for memory search, full-text indexed; maintained on write
+    search_tokens: str | None = Field(default=None, sa_column=Column(Text, nullable=True))
+
+
+@event.listens_for(Message, "before_insert")
+@event.listens_for(Message, "before_update")
+def _update_search_tokens(mapper: Any, connection: Any, target: Message) -> None:
+    """Keep the memory search tokens in step with the message content."""
+    if target.search_tokens is None or attributes.get_history(target, "content").has_changes():
+        target.search_tokens = " ".join(tokenize(target.content or ""))
 
 
 class MessageCreate(MessageBase):
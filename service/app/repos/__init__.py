@@ -6,6 +6,7 @@ from .agent_snapshot import AgentSnapshotRepository
 from .citation import CitationRepository
 from .consume import ConsumeRepository
 from .file import FileRepository
+from .file_content import FileContentRepository
 from .knowledge_set import KnowledgeSetRepository
 from .message import MessageRepository
 from .provider import ProviderRepository
@@ -23,6 +24,7 @@ __all__ = [
     "CitationRepository",
     "ConsumeRepository",
     "FileRepository",
+    "FileContentRepository",
     "MessageRepository",
     "TopicRepository",
     "SessionRepository",
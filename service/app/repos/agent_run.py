@@ -3,11 +3,11 @@ from typing import Any
 from uuid import UUID
 
 from sqlalchemy.orm.attributes import flag_modified
-from sqlmodel import select
+from sqlmodel import col, delete, func, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.agent_run import AgentRun as AgentRunModel
-from app.models.agent_run import AgentRunCreate, AgentRunRead, AgentRunUpdate
+from app.models.agent_run import AgentRunCreate, AgentRunRead, AgentRunTimelineEntry, AgentRunUpdate
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,22 @@ class AgentRunRepository:
         result = await self.db.exec(statement)
         return result.first()
 
+    async def get_by_message_ids(self, message_ids: list[UUID]) -> dict[UUID, AgentRunModel]:
+        """
+        Fetches the agent runs of several messages with a single query.
+
+        Args:
+            message_ids: The UUIDs of the messages.
+
+        Returns:
+            Dictionary mapping message ID to its AgentRunModel; messages without a run are omitted.
+        """
+        if not message_ids:
+            return {}
+        statement = select(AgentRunModel).where(col(AgentRunModel.message_id).in_(message_ids))
+        result = await self.db.exec(statement)
+        return {agent_run.message_id: agent_run for agent_run in result.all()}
+
     async def get_by_execution_id(self, execution_id: str) -> AgentRunModel | None:
         """
         Fetches an agent run by its execution ID.
@@ -104,45 +120,35 @@ class AgentRunRepository:
         await self.db.refresh(agent_run)
         return agent_run
 
+    async def _next_timeline_seq(self, agent_run_id: UUID) -> int:
+        statement = select(func.max(AgentRunTimelineEntry.seq)).where(
+            AgentRunTimelineEntry.agent_run_id == agent_run_id
+        )
+        result = await self.db.exec(statement)
+        current = result.one()
+        return 0 if current is None else current + 1
+
+    def _add_timeline_rows(self, agent_run_id: UUID, entries: list[dict[str, Any]], first_seq: int) -> None:
+        for offset, entry in enumerate(entries):
+            self.db.add(
+                AgentRunTimelineEntry(
+                    agent_run_id=agent_run_id,
+                    seq=first_seq + offset,
+                    event_type=entry.get("event_type", ""),
+                    node_id=entry.get("node_id"),
+                    entry=entry,
+                )
+            )
+
     async def append_timeline_entry(self, agent_run_id: UUID, entry: dict[str, Any]) -> None:
         """
-        Append a single entry to the timeline in node_data.
-
-        This method atomically adds a timeline entry and updates convenience maps
-        for node_end events.
+        Append a single entry to the run's timeline.
 
         Args:
             agent_run_id: The UUID of the agent run to update.
             entry: A timeline entry dictionary with event_type, timestamp, etc.
         """
-        agent_run = await self.db.get(AgentRunModel, agent_run_id)
-        if not agent_run:
-            logger.warning(f"AgentRun {agent_run_id} not found for timeline append")
-            return
-
-        # Initialize node_data if needed
-        node_data = agent_run.node_data or {"timeline": [], "node_outputs": {}, "node_order": [], "node_names": {}}
-        node_data.setdefault("timeline", []).append(entry)
-
-        # For node_end events, also update convenience maps
-        if entry.get("event_type") == "node_end":
-            node_id = entry.get("node_id")
-            if node_id:
-                # Store output
-                if "output" in entry:
-                    node_data.setdefault("node_outputs", {})[node_id] = entry["output"]
-                # Track order
-                if node_id not in node_data.get("node_order", []):
-                    node_data.setdefault("node_order", []).append(node_id)
-                # Store name
-                if entry.get("node_name"):
-                    node_data.setdefault("node_names", {})[node_id] = entry["node_name"]
-
-        agent_run.node_data = node_data
-        flag_modified(agent_run, "node_data")  # Force SQLAlchemy to detect JSON change
-        self.db.add(agent_run)
-        await self.db.flush()
-        logger.debug(f"Appended timeline entry to AgentRun {agent_run_id}: {entry.get('event_type')}")
+        await self.append_timeline_entries(agent_run_id, [entry])
 
     async def append_timeline_entries(
         self,
@@ -151,7 +157,12 @@ class AgentRunRepository:
         node_outputs: dict[str, Any] | None = None,
     ) -> None:
         """
-        Append multiple entries to the timeline atomically.
+        Append multiple entries to the run's timeline.
+
+        Entries are inserted as new AgentRunTimelineEntry rows, so earlier
+        entries are never rewritten. The node_outputs/node_order/node_names
+        maps are derived from the timeline when the run is read.
+        This function does NOT commit the transaction.
 
         Args:
             agent_run_id: The UUID of the agent run to update.
@@ -163,18 +174,116 @@ class AgentRunRepository:
             logger.warning(f"AgentRun {agent_run_id} not found for timeline append")
             return
 
-        node_data = agent_run.node_data or {"timeline": [], "node_outputs": {}, "node_order": [], "node_names": {}}
-        node_data.setdefault("timeline", []).extend(new_entries)
+        if new_entries:
+            self._add_timeline_rows(agent_run_id, new_entries, await self._next_timeline_seq(agent_run_id))
 
         if node_outputs:
+            node_data = agent_run.node_data or {}
             node_data.setdefault("node_outputs", {}).update(node_outputs)
+            agent_run.node_data = node_data
+            flag_modified(agent_run, "node_data")  # Force SQLAlchemy to detect JSON change
+            self.db.add(agent_run)
 
-        agent_run.node_data = node_data
-        flag_modified(agent_run, "node_data")  # Force SQLAlchemy to detect JSON change
-        self.db.add(agent_run)
         await self.db.flush()
         logger.debug(f"Appended {len(new_entries)} timeline entries to AgentRun {agent_run_id}")
 
+    async def get_timeline(self, agent_run: AgentRunModel) -> list[dict[str, Any]]:
+        """
+        Get a run's full timeline in order.
+
+        Args:
+            agent_run: The agent run.
+
+        Returns:
+            Legacy entries stored in node_data followed by the appended entries.
+        """
+        return (await self.get_timelines([agent_run]))[agent_run.id]
+
+    async def get_timelines(self, agent_runs: list[AgentRunModel]) -> dict[UUID, list[dict[str, Any]]]:
+        """
+        Get the full timelines of several runs with a single query.
+
+        Args:
+            agent_runs: The agent runs.
+
+        Returns:
+            Dictionary mapping each run ID to its timeline, as returned by ``get_timeline``.
+        """
+        timelines: dict[UUID, list[dict[str, Any]]] = {
+            agent_run.id: list((agent_run.node_data or {}).get("timeline") or []) for agent_run in agent_runs
+        }
+        if not timelines:
+            return timelines
+
+        statement = (
+            select(AgentRunTimelineEntry)
+            .where(col(AgentRunTimelineEntry.agent_run_id).in_(list(timelines)))
+            .order_by(col(AgentRunTimelineEntry.agent_run_id), col(AgentRunTimelineEntry.seq))
+        )
+        result = await self.db.exec(statement)
+        for row in result.all():
+            timelines[row.agent_run_id].append(row.entry)
+        return timelines
+
+    async def get_node_data(self, agent_run: AgentRunModel) -> dict[str, Any]:
+        """
+        Materialize a run's node data: its timeline plus the node_outputs,
+        node_order and node_names maps derived from node_end entries.
+
+        Values stored on the run (e.g. final outputs written by ``finalize``)
+        take precedence over the ones derived from the timeline.
+
+        Args:
+            agent_run: The agent run.
+
+        Returns:
+            A NodeDataDict-shaped dictionary.
+        """
+        return self._build_node_data(agent_run, await self.get_timeline(agent_run))
+
+    async def get_node_data_for_runs(self, agent_runs: list[AgentRunModel]) -> dict[UUID, dict[str, Any]]:
+        """
+        Materialize the node data of several runs, loading their timelines in one query.
+
+        Args:
+            agent_runs: The agent runs.
+
+        Returns:
+            Dictionary mapping each run ID to its node data, as returned by ``get_node_data``.
+        """
+        timelines = await self.get_timelines(agent_runs)
+        return {agent_run.id: self._build_node_data(agent_run, timelines[agent_run.id]) for agent_run in agent_runs}
+
+    @staticmethod
+    def _build_node_data(agent_run: AgentRunModel, timeline: list[dict[str, Any]]) -> dict[str, Any]:
+        stored = agent_run.node_data or {}
+
+        node_outputs: dict[str, Any] = {}
+        node_order: list[str] = []
+        node_names: dict[str, str] = {}
+        for entry in timeline:
+            node_id = entry.get("node_id")
+            if entry.get("event_type") != "node_end" or not node_id:
+                continue
+            if "output" in entry:
+                node_outputs[node_id] = entry["output"]
+            if node_id not in node_order:
+                node_order.append(node_id)
+            if entry.get("node_name"):
+                node_names[node_id] = entry["node_name"]
+
+        node_outputs.update(stored.get("node_outputs") or {})
+        node_order.extend(node_id for node_id in stored.get("node_order") or [] if node_id not in node_order)
+        node_names.update(stored.get("node_names") or {})
+
+        return {
+            **stored,
+            "timeline": timeline,
+            "node_outputs": node_outputs,
+            "node_order": node_order,
+            "node_names": node_names,
+        }
+
     async def finalize(
         self,
         agent_run_id: UUID,
@@ -208,9 +317,10 @@ class AgentRunRepository:
             node_data = agent_run.node_data or {}
             # Merge final_node_data into existing node_data
             for key, value in final_node_data.items():
-                if key == "timeline" and "timeline" in node_data:
-                    # Extend timeline rather than replace
-                    node_data["timeline"].extend(value)
+                if key == "timeline":
+                    # Append to the timeline rather than replace
+                    if value:
+                        self._add_timeline_rows(agent_run_id, value, await self._next_timeline_seq(agent_run_id))
                 elif key in ("node_outputs", "node_names") and key in node_data:
                     # Merge dictionaries
                     node_data[key].update(value)
@@ -230,6 +340,10 @@ class AgentRunRepository:
         logger.debug(f"Finalized AgentRun {agent_run_id} with status={status}")
         return agent_run
 
+    async def _delete_timeline(self, agent_run_id: UUID) -> None:
+        # The foreign key cascades too, but SQLite only enforces it with PRAGMA foreign_keys
+        await self.db.exec(delete(AgentRunTimelineEntry).where(col(AgentRunTimelineEntry.agent_run_id) == agent_run_id))
+
     async def delete(self, agent_run_id: UUID) -> bool:
         """
         Deletes an agent run by its ID.
@@ -246,6 +360,7 @@ class AgentRunRepository:
         if not agent_run:
             return False
 
+        await self._delete_timeline(agent_run.id)
         await self.db.delete(agent_run)
         await self.db.flush()
         return True
@@ -266,6 +381,7 @@ class AgentRunRepository:
         if not agent_run:
             return False
 
+        await self._delete_timeline(agent_run.id)
         await self.db.delete(agent_run)
         await self.db.flush()
         return True
@@ -283,4 +399,6 @@ class AgentRunRepository:
         agent_run = await self.get_by_message_id(message_id)
         if not agent_run:
             return None
-        return AgentRunRead.model_validate(agent_run)
+        agent_run_read = AgentRunRead.model_validate(agent_run)
+        agent_run_read.node_data = await self.get_node_data(agent_run)
+        return agent_run_read
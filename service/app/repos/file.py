@@ -2,10 +2,14 @@ import logging
 from datetime import datetime, timezone
 from uuid import UUID
 
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
-from app.models.file import File, FileCreate, FileUpdate
+from app.models.file import File, FileBlob, FileCreate, FileUpdate
+from app.models.message import Message
+from app.repos.file_content import FileContentRepository
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +52,26 @@ class FileRepository:
         logger.debug(f"Fetching file with id: {file_id}")
         return await self.db.get(File, file_id)
 
+    async def get_files_by_ids(self, file_ids: list[UUID], include_deleted: bool = False) -> list[File]:
+        """
+        Fetches several files by their IDs in one query.
+
+        Args:
+            file_ids: The UUIDs of the files to fetch.
+            include_deleted: Whether to include soft-deleted files.
+
+        Returns:
+            List of the File instances found, in no particular order.
+        """
+        logger.debug(f"Fetching {len(file_ids)} files by id")
+        if not file_ids:
+            return []
+        statement = select(File).where(col(File.id).in_(file_ids))
+        if not include_deleted:
+            statement = statement.where(col(File.is_deleted).is_(False))
+        result = await self.db.exec(statement)
+        return list(result.all())
+
     async def get_file_by_storage_key(self, storage_key: str) -> File | None:
         """
         Fetches a file by its storage key.
@@ -177,6 +201,7 @@ class FileRepository:
             return False
 
         await self.db.delete(file)
+        await FileContentRepository(self.db).delete_file_index([file_id])
         await self.db.flush()
         return True
 
@@ -317,6 +342,7 @@ class FileRepository:
             count += 1
 
         if count > 0:
+            await FileContentRepository(self.db).delete_file_index([file.id for file in files])
             await self.db.flush()
 
         return count
@@ -379,6 +405,127 @@ class FileRepository:
         result = await self.db.exec(statement)
         return list(result.all())
 
+    async def get_file_ids_by_topic(self, topic_id: UUID) -> list[UUID]:
+        """
+        Fetches the IDs of the files attached to the messages of a topic.
+
+        Args:
+            topic_id: The UUID of the topic.
+
+        Returns:
+            List of file UUIDs, excluding soft-deleted files.
+        """
+        logger.debug(f"Fetching file ids for topic_id: {topic_id}")
+        statement = (
+            select(File.id)
+            .join(Message, col(File.message_id) == col(Message.id))
+            .where(Message.topic_id == topic_id, col(File.is_deleted).is_(False))
+        )
+        result = await self.db.exec(statement)
+        return list(result.all())
+
+    async def get_blob(self, file_hash: str) -> FileBlob | None:
+        """
+        Fetches the content-addressed blob for a hash and marks it as just used,
+        so garbage collection leaves it alone while a new reference is created.
+        This function does NOT commit the transaction.
+
+        Args:
+            file_hash: The SHA256 hash of the content.
+
+        Returns:
+            The FileBlob, or None if this content has not been stored yet.
+        """
+        logger.debug(f"Fetching blob with hash: {file_hash}")
+        blob = await self.db.get(FileBlob, file_hash, with_for_update=True)
+        if blob:
+            blob.last_used_at = datetime.now(timezone.utc)
+            self.db.add(blob)
+            await self.db.flush()
+        return blob
+
+    async def create_blob(self, blob: FileBlob) -> FileBlob:
+        """
+        Records a newly stored blob, tolerating a concurrent upload of the same content.
+        This function does NOT commit the transaction.
+
+        Args:
+            blob: The FileBlob to record.
+
+        Returns:
+            The recorded FileBlob (the concurrent one if it won the race).
+        """
+        logger.debug(f"Creating blob record for hash: {blob.file_hash}")
+        try:
+            async with self.db.begin_nested():
+                self.db.add(blob)
+        except IntegrityError:
+            existing = await self.get_blob(blob.file_hash)
+            if existing is None:
+                raise
+            return existing
+        return blob
+
+    @staticmethod
+    def _unreferenced_blobs_statement(unused_since: datetime) -> SelectOfScalar[FileBlob]:
+        referenced = select(File.storage_key).where(File.storage_key == FileBlob.storage_key)
+        return select(FileBlob).where(
+            col(FileBlob.last_used_at) <= unused_since,
+            ~referenced.exists(),
+        )
+
+    async def get_unreferenced_blobs(self, unused_since: datetime) -> list[FileBlob]:
+        """
+        Fetches blobs no file record references anymore and that have not been used since a cutoff.
+
+        The result is only a list of candidates: lock each one with ``lock_unreferenced_blob``
+        before deleting it.
+
+        Args:
+            unused_since: Only blobs last used before this time are returned.
+
+        Returns:
+            List of unreferenced FileBlob instances.
+        """
+        logger.debug(f"Fetching blobs unreferenced since {unused_since}")
+        result = await self.db.exec(self._unreferenced_blobs_statement(unused_since))
+        return list(result.all())
+
+    async def lock_unreferenced_blob(self, file_hash: str, unused_since: datetime) -> FileBlob | None:
+        """
+        Locks a blob for deletion if it is still unreferenced and unused since the cutoff.
+
+        The row is selected FOR UPDATE SKIP LOCKED, so a blob an upload is reusing
+        right now (``get_blob`` holds its lock) is skipped, and one it has reused
+        since fails the recheck. This function does NOT commit the transaction.
+
+        Args:
+            file_hash: The SHA256 hash of the blob.
+            unused_since: Only a blob last used before this time is locked.
+
+        Returns:
+            The locked FileBlob, or None if it is in use (again) or gone.
+        """
+        statement = (
+            self._unreferenced_blobs_statement(unused_since)
+            .where(FileBlob.file_hash == file_hash)
+            .with_for_update(skip_locked=True)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.exec(statement)
+        return result.first()
+
+    async def delete_blob(self, blob: FileBlob) -> None:
+        """
+        Deletes a blob record. This function does NOT commit the transaction.
+
+        Args:
+            blob: The FileBlob to delete.
+        """
+        logger.debug(f"Deleting blob record for hash: {blob.file_hash}")
+        await self.db.delete(blob)
+        await self.db.flush()
+
     async def validate_user_quota(
         self,
         user_id: str,
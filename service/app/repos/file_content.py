@@ -0,0 +1,174 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import case
+from sqlmodel import col, delete, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.infra.database.fts import ensure_sqlite_fts, full_text_match, full_text_rank
+from app.models.file import File
+from app.models.file_content import FileContentChunk, FileContentIndex
+from app.models.file_knowledge_set_link import FileKnowledgeSetLink
+
+logger = logging.getLogger(__name__)
+
+
+class FileContentRepository:
+    """Knowledge search index (extracted file text chunks) data access layer"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_index_states(self, file_ids: list[UUID]) -> dict[UUID, FileContentIndex]:
+        """
+        Fetches the index state of several files.
+
+        Args:
+            file_ids: The UUIDs of the files.
+
+        Returns:
+            Mapping of file ID to its FileContentIndex, for files that have been indexed.
+        """
+        if not file_ids:
+            return {}
+        statement = select(FileContentIndex).where(col(FileContentIndex.file_id).in_(file_ids))
+        result = await self.db.exec(statement)
+        return {state.file_id: state for state in result.all()}
+
+    async def replace_file_index(
+        self,
+        file_id: UUID,
+        file_hash: str | None,
+        chunks: list[tuple[str, str, int]],
+        error: str | None = None,
+    ) -> FileContentIndex:
+        """
+        Replaces the indexed chunks of a file.
+        This function does NOT commit the transaction.
+
+        Args:
+            file_id: The UUID of the file.
+            file_hash: The hash of the indexed content version.
+            chunks: (content, tokens, token_count) of each chunk, in order.
+            error: Why text extraction failed, if it did.
+
+        Returns:
+            The file's updated FileContentIndex.
+        """
+        logger.debug(f"Indexing {len(chunks)} chunks for file_id: {file_id}")
+        await ensure_sqlite_fts(self.db, "filecontentchunk", "tokens")
+        await self.db.exec(delete(FileContentChunk).where(col(FileContentChunk.file_id) == file_id))  # type: ignore[call-overload]
+
+        self.db.add_all(
+            FileContentChunk(file_id=file_id, chunk_index=index, content=content, tokens=tokens, token_count=count)
+            for index, (content, tokens, count) in enumerate(chunks)
+        )
+
+        state = await self.db.get(FileContentIndex, file_id)
+        if state is None:
+            state = FileContentIndex(file_id=file_id)
+        state.file_hash = file_hash
+        state.chunk_count = len(chunks)
+        state.error = error
+        state.indexed_at = datetime.now(timezone.utc)
+        self.db.add(state)
+        await self.db.flush()
+        return state
+
+    async def delete_file_index(self, file_ids: list[UUID]) -> None:
+        """
+        Removes files from the index. This function does NOT commit the transaction.
+
+        Args:
+            file_ids: The UUIDs of the files to remove.
+        """
+        if not file_ids:
+            return
+        logger.debug(f"Removing {len(file_ids)} files from the content index")
+        await ensure_sqlite_fts(self.db, "filecontentchunk", "tokens")
+        await self.db.exec(delete(FileContentChunk).where(col(FileContentChunk.file_id).in_(file_ids)))  # type: ignore[call-overload]
+        await self.db.exec(delete(FileContentIndex).where(col(FileContentIndex.file_id).in_(file_ids)))  # type: ignore[call-overload]
+        await self.db.flush()
+
+    def _knowledge_set_chunks(self, statement: Any, knowledge_set_id: UUID) -> Any:
+        return (
+            statement.join(FileKnowledgeSetLink, col(FileKnowledgeSetLink.file_id) == col(FileContentChunk.file_id))
+            .join(File, col(File.id) == col(FileContentChunk.file_id))
+            .where(FileKnowledgeSetLink.knowledge_set_id == knowledge_set_id, col(File.is_deleted).is_(False))
+        )
+
+    async def get_corpus_stats(self, knowledge_set_id: UUID) -> tuple[int, float]:
+        """
+        Counts the indexed chunks of a knowledge set and their average length.
+
+        Args:
+            knowledge_set_id: The UUID of the knowledge set.
+
+        Returns:
+            Tuple of (chunk count, average token count per chunk).
+        """
+        statement = self._knowledge_set_chunks(
+            select(func.count(), func.avg(FileContentChunk.token_count)).select_from(FileContentChunk),
+            knowledge_set_id,
+        )
+        result = await self.db.exec(statement)
+        count, average = result.one()
+        return int(count or 0), float(average or 0.0)
+
+    async def count_term_documents(self, knowledge_set_id: UUID, terms: list[str]) -> dict[str, int]:
+        """
+        Counts the indexed chunks of a knowledge set containing each term.
+
+        Args:
+            knowledge_set_id: The UUID of the knowledge set.
+            terms: Normalized query tokens.
+
+        Returns:
+            Mapping of term to the number of chunks containing it.
+        """
+        if not terms:
+            return {}
+
+        counts: list[Any] = []
+        for term in terms:
+            match = await full_text_match(self.db, "filecontentchunk", col(FileContentChunk.tokens), [[term]])
+            counts.append(func.coalesce(func.sum(case((match, 1), else_=0)), 0))
+        statement = self._knowledge_set_chunks(select(*counts).select_from(FileContentChunk), knowledge_set_id)
+        # execute() keeps rows as tuples even with a single term
+        result = await self.db.execute(statement)
+        return {term: int(count) for term, count in zip(terms, result.one())}
+
+    async def search_candidates(
+        self, knowledge_set_id: UUID, phrases: list[list[str]], limit: int = 1000
+    ) -> list[tuple[FileContentChunk, str]]:
+        """
+        Fetches the chunks of a knowledge set containing any of the query phrases,
+        using the database's full-text index (Postgres tsvector, SQLite FTS5).
+        When more chunks match than ``limit``, the best ranked by the database
+        (``ts_rank`` / FTS5 ``bm25``) are kept.
+
+        Args:
+            knowledge_set_id: The UUID of the knowledge set.
+            phrases: Query phrases of normalized tokens.
+            limit: Maximum number of candidate chunks.
+
+        Returns:
+            List of (chunk, original filename) pairs.
+        """
+        if not phrases:
+            return []
+
+        match = await full_text_match(self.db, "filecontentchunk", col(FileContentChunk.tokens), phrases)
+        rank = await full_text_rank(self.db, "filecontentchunk", col(FileContentChunk.tokens), phrases)
+        statement = (
+            self._knowledge_set_chunks(
+                select(FileContentChunk, File.original_filename).select_from(FileContentChunk), knowledge_set_id
+            )
+            .where(match)
+            .order_by(rank.desc(), col(FileContentChunk.file_id), col(FileContentChunk.chunk_index))
+        )
+
+        result = await self.db.exec(statement.limit(limit))
+        return [(chunk, filename) for chunk, filename in result.all()]
@@ -230,6 +230,24 @@ class KnowledgeSetRepository:
         result = await self.db.exec(statement)
         return list(result.all())
 
+    async def get_file_by_name(self, knowledge_set_id: UUID, filename: str) -> File | None:
+        """
+        Gets the non-deleted file with the given name linked to a knowledge set.
+        """
+        logger.debug(f"Fetching file {filename!r} in knowledge set {knowledge_set_id}")
+        statement = (
+            select(File)
+            .join(FileKnowledgeSetLink, col(FileKnowledgeSetLink.file_id) == col(File.id))
+            .where(
+                FileKnowledgeSetLink.knowledge_set_id == knowledge_set_id,
+                File.original_filename == filename,
+                col(File.is_deleted).is_(False),
+            )
+            .limit(1)
+        )
+        result = await self.db.exec(statement)
+        return result.first()
+
     async def get_knowledge_sets_for_file(self, file_id: UUID) -> list[UUID]:
         """
         Gets all knowledge set IDs that a file is linked to.
@@ -1,12 +1,10 @@
 import logging
-from typing import Any
 from uuid import UUID
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.infra.database import AsyncSessionLocal
+from app.infra.database.fts import full_text_match
 from app.models.file import FileRead, FileReadWithUrl
 from app.models.message import Message as MessageModel
 from app.models.message import (
@@ -15,6 +13,7 @@ from app.models.message import (
     MessageReadWithFiles,
     MessageReadWithFilesAndCitations,
 )
+from app.utils.text_search import query_phrases
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +77,23 @@ class MessageRepository:
         await self.db.refresh(message)
         return message
 
+    def add_messages(self, messages_data: list[MessageCreate]) -> list[MessageModel]:
+        """
+        Adds new messages to the session without flushing.
+        The rows are written with the session's next flush or commit, so a
+        batch of messages costs a single round trip.
+
+        Args:
+            messages_data: List of MessageCreate models.
+
+        Returns:
+            List of the pending MessageModel instances.
+        """
+        logger.debug(f"Adding {len(messages_data)} messages")
+        messages = [MessageModel.model_validate(data) for data in messages_data]
+        self.db.add_all(messages)
+        return messages
+
     async def delete_message(self, message_id: UUID, cascade_files: bool = True) -> bool:
         """
         Deletes a message by its ID with optional cascade deletion of associated files and citations.
@@ -112,7 +128,7 @@ class MessageRepository:
 
         # Delete associated files if cascade is enabled
         if cascade_files:
-            from app.core.storage import get_storage_service
+            from app.core.storage import get_storage_service, is_blob_storage_key
             from app.repos.file import FileRepository
 
             file_repo = FileRepository(self.db)
@@ -120,7 +136,8 @@ class MessageRepository:
 
             if files:
                 storage = get_storage_service()
-                storage_keys = [file.storage_key for file in files]
+                # Shared content-addressed blobs are left to blob garbage collection
+                storage_keys = [file.storage_key for file in files if not is_blob_storage_key(file.storage_key)]
 
                 # Delete from object storage
                 try:
@@ -184,32 +201,6 @@ class MessageRepository:
                 count += 1
         return count
 
-    async def create_message_in_isolated_transaction(
-        self,
-        message_data: MessageCreate,
-        session_factory: async_sessionmaker[Any] | None = None,
-    ) -> None:
-        """
-        Creates and commits a tool event message in a separate, short-lived session.
-
-        This is used to persist tool call/response events immediately without
-        interfering with the main chat session's transaction state.
-
-        Args:
-            message_data: The Pydantic model containing the data for the new message.
-            session_factory: Optional session factory to use. If not provided, uses the
-                global AsyncSessionLocal. Callers in Celery tasks should pass their
-                task-scoped session factory to avoid event loop issues.
-        """
-        logger.debug(f"Creating isolated tool event message for topic_id: {message_data.topic_id}")
-        # Use provided session factory or fall back to global AsyncSessionLocal
-        # Celery tasks must provide their own session factory bound to their event loop
-        factory = session_factory or AsyncSessionLocal
-        async with factory() as db:
-            isolated_repo = MessageRepository(db)
-            await isolated_repo.create_message(message_data=message_data)
-            await db.commit()
-
     async def get_messages_with_files(
         self, topic_id: UUID, order_by_created: bool = True, limit: int | None = None
     ) -> list[MessageReadWithFiles]:
@@ -389,6 +380,12 @@ class MessageRepository:
         agent_run_repo = AgentRunRepository(self.db)
         messages_with_files_and_citations = []
 
+        # Load agent runs and their timelines for all assistant messages up front
+        agent_runs = await agent_run_repo.get_by_message_ids(
+            [message.id for message in messages if message.role == "assistant"]
+        )
+        node_data_by_run = await agent_run_repo.get_node_data_for_runs(list(agent_runs.values()))
+
         for message in messages:
             # Get files
             files = await file_repo.get_files_by_message(message.id)
@@ -411,7 +408,7 @@ class MessageRepository:
             # Get agent metadata from AgentRun table
             agent_metadata = None
             if message.role == "assistant":
-                agent_run = await agent_run_repo.get_by_message_id(message.id)
+                agent_run = agent_runs.get(message.id)
                 if agent_run:
                     # Build agent_metadata from AgentRun record
                     agent_metadata = {
@@ -423,7 +420,7 @@ class MessageRepository:
                         "started_at": agent_run.started_at,
                         "ended_at": agent_run.ended_at,
                         "duration_ms": agent_run.duration_ms,
-                        **(agent_run.node_data or {}),
+                        **node_data_by_run[agent_run.id],
                     }
 
             message_with_files_and_citations = MessageReadWithFilesAndCitations(
@@ -486,7 +483,8 @@ class MessageRepository:
         """
         Search messages across all sessions for a specific agent.
 
-        Searches message content using case-insensitive ILIKE matching.
+        Matches the query words (CJK words as phrases) against the full-text index
+        of message content: a GIN tsvector index in Postgres, FTS5 in SQLite.
         Results are scoped to sessions where:
         - The session belongs to the specified user
         - The session has the specified agent assigned
@@ -494,22 +492,28 @@ class MessageRepository:
         Args:
             user_id: User ID for access control
             agent_id: Agent ID to scope the search
-            query: Search query string (will be wrapped with % for ILIKE)
-            limit: Maximum number of results to return
+            query: Search query string
+            limit: Maximum number of results to return, most recent first
             exclude_topic_id: Optional topic ID to exclude (e.g., current conversation)
 
         Returns:
-            List of dicts with message content, role, topic_name, and created_at
+            List of dicts with message content, search tokens, role, topic_name and created_at
         """
         from app.models.sessions import Session as SessionModel
         from app.models.topic import Topic as TopicModel
 
         logger.debug(f"Searching messages for agent {agent_id}, user {user_id}, query: {query}")
 
+        phrases = query_phrases(query)
+        if not phrases:
+            return []
+        match = await full_text_match(self.db, "message", col(MessageModel.search_tokens), phrases)
+
         # Build the query with joins: Message -> Topic -> Session
         statement = (
             select(
                 MessageModel.content,
+                MessageModel.search_tokens,
                 MessageModel.role,
                 MessageModel.created_at,
                 TopicModel.name.label("topic_name"),  # type: ignore[union-attr]
@@ -519,7 +523,7 @@ class MessageRepository:
             .where(
                 SessionModel.user_id == user_id,
                 SessionModel.agent_id == agent_id,
-                MessageModel.content.ilike(f"%{query}%"),  # type: ignore[union-attr]
+                match,
             )
         )
 
@@ -536,6 +540,7 @@ class MessageRepository:
         return [
             {
                 "content": row.content,  # type: ignore[attr-defined]
+                "search_tokens": row.search_tokens or "",  # type: ignore[attr-defined]
                 "role": row.role,  # type: ignore[attr-defined]
                 "topic_name": row.topic_name,  # type: ignore[attr-defined]
                 "created_at": row.created_at,  # type: ignore[attr-defined]
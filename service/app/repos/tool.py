@@ -457,6 +457,46 @@ class ToolRepository:
         logger.debug(f"Found {len(tools)} ready tools for user {user_id}")
         return tools
 
+    async def list_ready_functions_by_user(
+        self, user_id: str, tool_name: str | None = None
+    ) -> list[tuple[Tool, ToolVersion, ToolFunction]]:
+        """
+        Get the functions of the latest READY version of each active tool of a user, in one query.
+
+        Args:
+            user_id: The user ID to fetch tools for.
+            tool_name: Only fetch this tool, if given.
+
+        Returns:
+            List of (tool, latest ready version, function) rows.
+        """
+        logger.debug(f"Fetching ready tool functions for user_id: {user_id}, tool_name: {tool_name}")
+
+        latest = (
+            select(ToolVersion.tool_id, func.max(ToolVersion.version).label("version"))
+            .where(ToolVersion.user_id == user_id, ToolVersion.status == ToolStatus.READY)
+            .group_by(col(ToolVersion.tool_id))
+            .subquery()
+        )
+        query = (
+            select(Tool, ToolVersion, ToolFunction)
+            .join(latest, latest.c.tool_id == Tool.id)
+            .join(
+                ToolVersion,
+                (col(ToolVersion.tool_id) == Tool.id)
+                & (col(ToolVersion.version) == latest.c.version)
+                & (col(ToolVersion.status) == ToolStatus.READY),
+            )
+            .join(ToolFunction, col(ToolFunction.tool_version_id) == ToolVersion.id)
+            .where(Tool.user_id == user_id, col(Tool.is_active).is_(True))
+            .order_by(col(Tool.name), col(ToolFunction.function_name))
+        )
+        if tool_name is not None:
+            query = query.where(Tool.name == tool_name)
+
+        result = await self.db.exec(query)
+        return [(tool, version, function) for tool, version, function in result.all()]
+
     async def get_tool_function_by_version_and_name(
         self, tool_version_id: uuid.UUID, function_name: str
     ) -> ToolFunction | None:
@@ -21,7 +21,7 @@ class TimelineEntryDict(TypedDict, total=False):
     """
     Single entry in the AgentRun execution timeline.
 
-    Stored in AgentRun.node_data["timeline"] for execution replay.
+    Stored as one AgentRunTimelineEntry row per entry for execution replay.
     """
 
     event_type: str  # "agent_start", "node_start", "node_end", "agent_end"
@@ -45,9 +45,11 @@ class TimelineEntryDict(TypedDict, total=False):
 
 class NodeDataDict(TypedDict, total=False):
     """
-    Complete node execution data stored in AgentRun.node_data.
+    Complete node execution data, as materialized by AgentRunRepository.get_node_data.
 
     Contains both timeline (for replay) and convenience maps (for quick access).
+    Only the maps are stored in AgentRun.node_data; the timeline is read from
+    AgentRunTimelineEntry rows.
     """
 
     # Full execution timeline
@@ -1,58 +1,32 @@
-import asyncio
 import json
 import logging
+import time
 from typing import Any
 from uuid import UUID
 
-import redis.asyncio as redis
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlmodel.ext.asyncio.session import AsyncSession
-
 from app.common.code.error_code import ErrCode, ErrCodeError
 from app.configs import configs
 from app.core.celery_app import celery_app
 from app.core.chat import get_ai_response_stream
+from app.core.chat.publisher import RedisPublisher
 from app.core.consume import create_consume_for_chat
 from app.core.consume_calculator import ConsumptionCalculator
 from app.core.consume_strategy import ConsumptionContext
-from app.infra.database import ASYNC_DATABASE_URL
+from app.infra.database import get_worker_session_factory
 from app.models.agent_run import AgentRunCreate
 from app.models.citation import CitationCreate
 from app.models.message import Message, MessageCreate
-from app.repos import AgentRunRepository, CitationRepository, FileRepository, MessageRepository, TopicRepository
+from app.repos import AgentRunRepository, FileRepository, MessageRepository, TopicRepository
 from app.repos.session import SessionRepository
 from app.schemas.chat_event_payloads import CitationData
 from app.schemas.chat_event_types import ChatEventType
+from app.tasks.loop import run_in_worker_loop
+from app.tasks.persistence import ChatWriteBuffer
 from app.tools.cost import calculate_tool_cost
 
 logger = logging.getLogger(__name__)
 
 
-# Helper to publish to Redis
-class RedisPublisher:
-    def __init__(self, connection_id: str):
-        self.connection_id = connection_id
-        self.redis_client = redis.from_url(configs.Redis.REDIS_URL, decode_responses=True)
-        self.channel = f"chat:{connection_id}"
-
-    async def publish(self, message: str) -> None:
-        try:
-            await self.redis_client.publish(self.channel, message)
-        except Exception as e:
-            logger.error(f"Failed to publish to Redis channel {self.channel}: {e}")
-
-    async def close(self) -> None:
-        await self.redis_client.aclose()
-
-    # Generic method to mimic ConnectionManager.send_personal_message for compatibility
-    async def send_personal_message(self, message: str, connection_id: str) -> None:
-        # connection_id is ignored here as we bound to it in __init__
-        # but checking it matches is good practice
-        if connection_id != self.connection_id:
-            logger.warning(f"Publisher connection_id mismatch: {self.connection_id} vs {connection_id}")
-        await self.publish(message)
-
-
 def extract_content_text(content: Any) -> str:
     """Same extraction logic as in chat.py"""
     if content is None:
@@ -82,44 +56,20 @@ def process_chat_message(
     """
     Celery task wrapper to run the async chat processing loop.
     """
-    # Create a new event loop for this task since Celery tasks are synchronous by default
-    loop = asyncio.new_event_loop()
-    try:
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(
-            _process_chat_message_async(
-                session_id_str,
-                topic_id_str,
-                user_id_str,
-                auth_provider,
-                message_text,
-                context,
-                pre_deducted_amount,
-                access_token,
-            )
+    # Run on the worker process's persistent event loop so the DB engine, Redis
+    # connections and pooled MCP sessions survive across tasks
+    run_in_worker_loop(
+        _process_chat_message_async(
+            session_id_str,
+            topic_id_str,
+            user_id_str,
+            auth_provider,
+            message_text,
+            context,
+            pre_deducted_amount,
+            access_token,
         )
-    finally:
-        try:
-            # Give libraries a chance to schedule cleanup callbacks (e.g. httpx client close).
-            loop.run_until_complete(asyncio.sleep(0))
-
-            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
-            if pending:
-                done, still_pending = loop.run_until_complete(asyncio.wait(pending, timeout=1.0))
-                # Cancel anything still pending to avoid hanging the worker.
-                for task in still_pending:
-                    task.cancel()
-                if still_pending:
-                    loop.run_until_complete(asyncio.gather(*still_pending, return_exceptions=True))
-                # Retrieve exceptions from tasks that finished during the wait.
-                if done:
-                    loop.run_until_complete(asyncio.gather(*done, return_exceptions=True))
-
-            loop.run_until_complete(loop.shutdown_asyncgens())
-            loop.run_until_complete(loop.shutdown_default_executor())
-        finally:
-            asyncio.set_event_loop(None)
-            loop.close()
+    )
 
 
 async def _process_chat_message_async(
@@ -144,14 +94,8 @@ async def _process_chat_message_async(
 
     logger.info(f"Starting async chat processing for {connection_id}")
 
-    # Create a fresh engine and session factory for this event loop
-    # This avoids the "Future attached to a different loop" error
-    task_engine = create_async_engine(ASYNC_DATABASE_URL, echo=False, future=True)
-    TaskSessionLocal = async_sessionmaker(
-        bind=task_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    # Shared engine and session factory of this worker process's event loop
+    TaskSessionLocal = get_worker_session_factory()
 
     try:
         async with TaskSessionLocal() as db:
@@ -186,11 +130,32 @@ async def _process_chat_message_async(
             agent_run_id: UUID | None = None
             agent_run_start_time: float | None = None
 
-            # Incremental save tracking - save content every 3 seconds during streaming
-            import time
+            async def report_persistence_error(error: Exception) -> None:
+                await publisher.publish(
+                    json.dumps(
+                        {"type": ChatEventType.ERROR, "data": {"error": f"Failed to save the response: {error}"}}
+                    )
+                )
 
-            last_save_time = time.time()
-            INCREMENTAL_SAVE_INTERVAL = 3.0  # seconds
+            # Write-behind buffer: partial content, tool messages, timeline entries and
+            # citations are committed in batches instead of one transaction per event.
+            # Failed flushes are rolled back and reported once without aborting the stream.
+            write_buffer = ChatWriteBuffer(
+                db,
+                max_pending=configs.ChatStream.PersistMaxPending,
+                max_delay=configs.ChatStream.PersistMaxDelay,
+                on_error=report_persistence_error,
+            )
+
+            async def create_ai_message(content: str) -> Message:
+                # Committed right away: a later failed flush must not roll back the row
+                # that tool messages, citations and the agent run point to
+                message = await message_repo.create_message(
+                    MessageCreate(role="assistant", content=content, topic_id=topic_id)
+                )
+                write_buffer.track(message)
+                await write_buffer.flush("message_created")
+                return message
 
             # Stream response
             async for stream_event in get_ai_response_stream(
@@ -203,30 +168,26 @@ async def _process_chat_message_async(
                 # Debug: Log ALL events received
                 logger.info(f"[EVENT] Received event type: {event_type} (repr: {repr(event_type)})")
 
+                await write_buffer.flush_if_due()
+
                 if stream_event["type"] == ChatEventType.STREAMING_START:
                     ai_message_id = stream_event["data"]["id"]
                     agent_run_start_time = time.time()  # Track agent run start time
                     if not ai_message_obj:
-                        ai_message_create = MessageCreate(role="assistant", content="", topic_id=topic_id)
-                        ai_message_obj = await message_repo.create_message(ai_message_create)
+                        ai_message_obj = await create_ai_message("")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.STREAMING_CHUNK and ai_message_id:
                     chunk_content = stream_event["data"]["content"]
                     text_content = extract_content_text(chunk_content)
                     full_content += text_content
                     stream_event["data"]["content"] = text_content
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
-                    # Incremental save: periodically update DB with partial content
-                    current_time = time.time()
-                    if ai_message_obj and (current_time - last_save_time) >= INCREMENTAL_SAVE_INTERVAL:
-                        ai_message_obj.content = full_content
-                        db.add(ai_message_obj)
-                        await db.commit()
-                        last_save_time = current_time
-                        logger.debug(f"Incremental save: {len(full_content)} chars")
+                    # Incremental save: partial content is written with the next batch
+                    if ai_message_obj:
+                        write_buffer.update_message(ai_message_obj, content=full_content)
 
                 elif stream_event["type"] == ChatEventType.STREAMING_END:
                     full_content = stream_event["data"].get("content", full_content)
@@ -276,13 +237,14 @@ async def _process_chat_message_async(
                                     "node_names": agent_state_data.get("node_names"),
                                 },
                             )
-                            await agent_run_repo.create(agent_run_create)
+                            write_buffer.track(await agent_run_repo.create(agent_run_create))
                             logger.debug(f"Saved AgentRun for message {ai_message_obj.id} (via streaming_end fallback)")
                         except Exception as e:
                             logger.error(f"Failed to save AgentRun: {e}")
                     elif agent_state_data and ai_message_obj and agent_run_id:
                         # AgentRun was already created via AGENT_START, update with final node_outputs
                         try:
+                            await write_buffer.stage()
                             agent_run_repo = AgentRunRepository(db)
                             await agent_run_repo.finalize(
                                 agent_run_id=agent_run_id,
@@ -300,14 +262,17 @@ async def _process_chat_message_async(
                         except Exception as e:
                             logger.warning(f"Failed to update AgentRun with final data: {e}")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    if ai_message_obj:
+                        write_buffer.update_message(ai_message_obj, content=full_content)
+                    await write_buffer.flush("streaming_end")
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.TOKEN_USAGE:
                     token_data = stream_event["data"]
                     input_tokens = token_data.get("input_tokens", 0)
                     output_tokens = token_data.get("output_tokens", 0)
                     total_tokens = token_data.get("total_tokens", 0)
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.TOOL_CALL_REQUEST:
                     # Store tool call data for cost calculation
@@ -326,7 +291,7 @@ async def _process_chat_message_async(
                             parsed_args = raw_args or {}
                         tool_call_data[tool_call_id] = {"name": tool_name, "args": parsed_args}
 
-                    # Persist tool call request
+                    # Persist tool call request; flushed right away since the tool runs next
                     try:
                         tool_message = MessageCreate(
                             role="tool",
@@ -343,12 +308,11 @@ async def _process_chat_message_async(
                             ),
                             topic_id=topic_id,
                         )
-                        await message_repo.create_message_in_isolated_transaction(
-                            tool_message, session_factory=TaskSessionLocal
-                        )
+                        write_buffer.add_message(tool_message)
                     except Exception as e:
                         logger.warning(f"Failed to persist tool call request message: {e}")
-                    await publisher.publish(json.dumps(stream_event))
+                    await write_buffer.flush("tool_call")
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.TOOL_CALL_RESPONSE:
                     resp = stream_event["data"]
@@ -392,7 +356,7 @@ async def _process_chat_message_async(
                             logger.warning(
                                 f"Skipping persistence of tool response with invalid toolCallId: {tool_call_id!r}"
                             )
-                            await publisher.publish(json.dumps(stream_event))
+                            await publisher.publish_event(stream_event)
                             continue  # Skip to next event, but still publish to frontend
 
                         tool_message = MessageCreate(
@@ -408,29 +372,25 @@ async def _process_chat_message_async(
                             ),
                             topic_id=topic_id,
                         )
-                        await message_repo.create_message_in_isolated_transaction(
-                            tool_message, session_factory=TaskSessionLocal
-                        )
+                        write_buffer.add_message(tool_message)
                     except Exception as e:
                         logger.warning(f"Failed to persist tool call response message: {e}")
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.MESSAGE:
                     ai_message_id = stream_event["data"]["id"]
                     full_content = stream_event["data"]["content"]
                     if not ai_message_obj:
-                        ai_message_create = MessageCreate(role="assistant", content=full_content, topic_id=topic_id)
-                        ai_message_obj = await message_repo.create_message(ai_message_create)
+                        ai_message_obj = await create_ai_message(full_content)
                     else:
-                        ai_message_obj.content = full_content
-                        db.add(ai_message_obj)
-                    await publisher.publish(json.dumps(stream_event))
+                        write_buffer.update_message(ai_message_obj, content=full_content)
+                    await publisher.publish_event(stream_event)
 
                 elif event_type == ChatEventType.SEARCH_CITATIONS:
                     citations = stream_event["data"].get("citations", [])
                     if citations:
                         citations_data.extend(citations)
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.GENERATED_FILES:
                     files_data = stream_event["data"].get("files", [])
@@ -438,8 +398,7 @@ async def _process_chat_message_async(
                     generated_files_count += len(file_ids)
 
                     if not ai_message_obj:
-                        ai_message_create = MessageCreate(role="assistant", content="", topic_id=topic_id)
-                        ai_message_obj = await message_repo.create_message(ai_message_create)
+                        ai_message_obj = await create_ai_message("")
 
                     if file_ids:
                         try:
@@ -449,27 +408,26 @@ async def _process_chat_message_async(
                         except Exception as e:
                             logger.error(f"Failed to link generated files: {e}")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.ERROR:
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
                     break
 
                 # Handle thinking events
                 elif stream_event["type"] == ChatEventType.THINKING_START:
                     # Create message object if not exists
                     if not ai_message_obj:
-                        ai_message_create = MessageCreate(role="assistant", content="", topic_id=topic_id)
-                        ai_message_obj = await message_repo.create_message(ai_message_create)
-                    await publisher.publish(json.dumps(stream_event))
+                        ai_message_obj = await create_ai_message("")
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.THINKING_CHUNK:
                     chunk_content = stream_event["data"].get("content", "")
                     full_thinking_content += chunk_content
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 elif stream_event["type"] == ChatEventType.THINKING_END:
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 # Handle AGENT_START - Create AgentRun record early
                 elif stream_event["type"] == ChatEventType.AGENT_START:
@@ -478,24 +436,12 @@ async def _process_chat_message_async(
 
                     # Ensure we have a message object to link to
                     if not ai_message_obj:
-                        ai_message_create = MessageCreate(role="assistant", content="", topic_id=topic_id)
-                        ai_message_obj = await message_repo.create_message(ai_message_create)
+                        ai_message_obj = await create_ai_message("")
 
                     # Create AgentRun record with status="running"
                     # Include agent_start as the first timeline entry
                     try:
                         agent_run_repo = AgentRunRepository(db)
-                        initial_timeline = [
-                            {
-                                "event_type": "agent_start",
-                                "timestamp": agent_run_start_time,
-                                "metadata": {
-                                    "agent_id": context_data.get("agent_id", ""),
-                                    "agent_name": context_data.get("agent_name", ""),
-                                    "agent_type": context_data.get("agent_type", "react"),
-                                },
-                            }
-                        ]
                         agent_run_create = AgentRunCreate(
                             message_id=ai_message_obj.id,
                             execution_id=context_data.get("execution_id", f"exec_{int(time.time())}"),
@@ -505,7 +451,6 @@ async def _process_chat_message_async(
                             status="running",
                             started_at=agent_run_start_time,
                             node_data={
-                                "timeline": initial_timeline,
                                 "node_outputs": {},
                                 "node_order": [],
                                 "node_names": {},
@@ -513,17 +458,31 @@ async def _process_chat_message_async(
                         )
                         agent_run = await agent_run_repo.create(agent_run_create)
                         agent_run_id = agent_run.id
+                        write_buffer.track(agent_run)
+                        write_buffer.add_timeline_entry(
+                            agent_run_id,
+                            {
+                                "event_type": "agent_start",
+                                "timestamp": agent_run_start_time,
+                                "metadata": {
+                                    "agent_id": context_data.get("agent_id", ""),
+                                    "agent_name": context_data.get("agent_name", ""),
+                                    "agent_type": context_data.get("agent_type", "react"),
+                                },
+                            },
+                        )
+                        # Committed right away, like the message: timeline entries point to it
+                        await write_buffer.flush("agent_start")
                         logger.debug(f"Created AgentRun {agent_run_id} for message {ai_message_obj.id}")
                     except Exception as e:
                         logger.error(f"Failed to create AgentRun: {e}")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 # Handle NODE_END - Append to timeline incrementally
                 elif stream_event["type"] == ChatEventType.NODE_END:
                     if agent_run_id:
                         try:
-                            agent_run_repo = AgentRunRepository(db)
                             node_data = stream_event["data"]
                             timeline_entry: dict[str, Any] = {
                                 "event_type": "node_end",
@@ -538,18 +497,17 @@ async def _process_chat_message_async(
                             component_key = node_data.get("component_key")
                             if component_key:
                                 timeline_entry["metadata"] = {"component_key": component_key}
-                            await agent_run_repo.append_timeline_entry(agent_run_id, timeline_entry)
+                            write_buffer.add_timeline_entry(agent_run_id, timeline_entry)
                         except Exception as e:
                             logger.warning(f"Failed to append timeline entry: {e}")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 # Handle NODE_START - Track node start in timeline
                 elif stream_event["type"] == ChatEventType.NODE_START:
                     logger.info(f"[NODE_START] Received node_start event, agent_run_id={agent_run_id}")
                     if agent_run_id:
                         try:
-                            agent_run_repo = AgentRunRepository(db)
                             node_data = stream_event["data"]
                             timeline_entry: dict[str, Any] = {
                                 "event_type": "node_start",
@@ -562,13 +520,12 @@ async def _process_chat_message_async(
                             component_key = node_data.get("component_key")
                             if component_key:
                                 timeline_entry["metadata"] = {"component_key": component_key}
-                            logger.info(f"[NODE_START] Appending timeline entry: {timeline_entry}")
-                            await agent_run_repo.append_timeline_entry(agent_run_id, timeline_entry)
-                            logger.info("[NODE_START] Successfully appended timeline entry")
+                            logger.info(f"[NODE_START] Buffering timeline entry: {timeline_entry}")
+                            write_buffer.add_timeline_entry(agent_run_id, timeline_entry)
                         except Exception as e:
                             logger.warning(f"Failed to append timeline entry: {e}")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
                 # Handle AGENT_END - Finalize AgentRun
                 elif stream_event["type"] == ChatEventType.AGENT_END:
@@ -585,7 +542,8 @@ async def _process_chat_message_async(
                                 "status": status,
                                 "duration_ms": end_data.get("duration_ms", 0),
                             }
-                            await agent_run_repo.append_timeline_entry(agent_run_id, timeline_entry)
+                            write_buffer.add_timeline_entry(agent_run_id, timeline_entry)
+                            await write_buffer.stage()
 
                             # Finalize the AgentRun
                             await agent_run_repo.finalize(
@@ -598,47 +556,42 @@ async def _process_chat_message_async(
                         except Exception as e:
                             logger.error(f"Failed to finalize AgentRun: {e}")
 
-                    await publisher.publish(json.dumps(stream_event))
+                    await write_buffer.flush("agent_end")
+                    await publisher.publish_event(stream_event)
 
                 else:
-                    await publisher.publish(json.dumps(stream_event))
+                    await publisher.publish_event(stream_event)
 
             # --- Finalization (DB Updates & Settlement) ---
             if ai_message_obj:
                 # Update content
-                if full_content and ai_message_obj.content != full_content:
-                    ai_message_obj.content = full_content
-                    db.add(ai_message_obj)
+                if full_content:
+                    write_buffer.update_message(ai_message_obj, content=full_content)
 
                 # Update thinking content
                 if full_thinking_content:
-                    ai_message_obj.thinking_content = full_thinking_content
-                    db.add(ai_message_obj)
+                    write_buffer.update_message(ai_message_obj, thinking_content=full_thinking_content)
 
                 # Save citations
-                if citations_data:
-                    try:
-                        citation_repo = CitationRepository(db)
-                        citation_creates: list[CitationCreate] = []
-                        for citation in citations_data:
-                            citation_create = CitationCreate(
-                                message_id=ai_message_obj.id,
-                                url=citation.get("url", ""),
-                                title=citation.get("title"),
-                                cited_text=citation.get("cited_text"),
-                                start_index=citation.get("start_index"),
-                                end_index=citation.get("end_index"),
-                                search_queries=citation.get("search_queries"),
-                            )
-                            citation_creates.append(citation_create)
-                        await citation_repo.bulk_create_citations(citation_creates)
-                    except Exception as e:
-                        logger.error(f"Failed to save citations: {e}")
+                write_buffer.add_citations(
+                    [
+                        CitationCreate(
+                            message_id=ai_message_obj.id,
+                            url=citation.get("url", ""),
+                            title=citation.get("title"),
+                            cited_text=citation.get("cited_text"),
+                            start_index=citation.get("start_index"),
+                            end_index=citation.get("end_index"),
+                            search_queries=citation.get("search_queries"),
+                        )
+                        for citation in citations_data
+                    ]
+                )
 
                 # Update timestamp
                 await topic_repo.update_topic_timestamp(topic.id)
 
-                # Settlement
+                # Settlement, in a transaction of its own so billing never depends on the write buffer
                 try:
                     # Get session to retrieve model_tier
                     session_repo = SessionRepository(db)
@@ -660,23 +613,28 @@ async def _process_chat_message_async(
                     remaining_amount = total_cost - pre_deducted_amount
 
                     if remaining_amount > 0:
-                        await create_consume_for_chat(
-                            db=db,
-                            user_id=user_id,
-                            auth_provider=auth_provider,
-                            amount=int(remaining_amount),
-                            access_key=access_token,
-                            session_id=session_id,
-                            topic_id=topic_id,
-                            message_id=ai_message_obj.id,
-                            description=f"Chat message consume (settlement): {remaining_amount} points",
-                            input_tokens=input_tokens if total_tokens > 0 else None,
-                            output_tokens=output_tokens if total_tokens > 0 else None,
-                            total_tokens=total_tokens if total_tokens > 0 else None,
-                            model_tier=model_tier.value if model_tier else None,
-                            tier_rate=result.breakdown.get("tier_rate"),
-                            calculation_breakdown=json.dumps(result.breakdown),
-                        )
+                        async with TaskSessionLocal() as billing_db:
+                            try:
+                                await create_consume_for_chat(
+                                    db=billing_db,
+                                    user_id=user_id,
+                                    auth_provider=auth_provider,
+                                    amount=int(remaining_amount),
+                                    access_key=access_token,
+                                    session_id=session_id,
+                                    topic_id=topic_id,
+                                    message_id=ai_message_obj.id,
+                                    description=f"Chat message consume (settlement): {remaining_amount} points",
+                                    input_tokens=input_tokens if total_tokens > 0 else None,
+                                    output_tokens=output_tokens if total_tokens > 0 else None,
+                                    total_tokens=total_tokens if total_tokens > 0 else None,
+                                    model_tier=model_tier.value if model_tier else None,
+                                    tier_rate=result.breakdown.get("tier_rate"),
+                                    calculation_breakdown=json.dumps(result.breakdown),
+                                )
+                            finally:
+                                # Failed remote billing is recorded on the consume record before raising
+                                await billing_db.commit()
                 except ErrCodeError as e:
                     if e.code == ErrCode.INSUFFICIENT_BALANCE:
                         await publisher.publish(
@@ -694,24 +652,30 @@ async def _process_chat_message_async(
                 except Exception as e:
                     logger.error(f"Settlement failed: {e}")
 
-                # Commit all changes before sending confirmation
-                await db.commit()
+                # Commit all changes before sending confirmation; a failed flush keeps its writes queued
+                saved = await write_buffer.flush("final") or await write_buffer.flush("final_retry")
+                logger.info(f"Chat persistence stats for {connection_id}: {write_buffer.get_stats()}")
 
                 # Send final saved confirmation
-                await publisher.publish(
-                    json.dumps(
-                        {
-                            "type": ChatEventType.MESSAGE_SAVED,
-                            "data": {
-                                "stream_id": ai_message_id,
-                                "db_id": str(ai_message_obj.id),
-                                "created_at": ai_message_obj.created_at.isoformat()
-                                if ai_message_obj.created_at
-                                else None,
-                            },
-                        }
+                if saved:
+                    await publisher.publish(
+                        json.dumps(
+                            {
+                                "type": ChatEventType.MESSAGE_SAVED,
+                                "data": {
+                                    "stream_id": ai_message_id,
+                                    "db_id": str(ai_message_obj.id),
+                                    "created_at": ai_message_obj.created_at.isoformat()
+                                    if ai_message_obj.created_at
+                                    else None,
+                                },
+                            }
+                        )
                     )
-                )
+            elif write_buffer.pending:
+                # No assistant message (e.g. early error), still persist queued tool events
+                if not await write_buffer.flush("final"):
+                    await write_buffer.flush("final_retry")
 
     except Exception as e:
         logger.error(f"Unhandled error in process_chat_message: {e}", exc_info=True)
@@ -720,4 +684,3 @@ async def _process_chat_message_async(
         )
     finally:
         await publisher.close()
-        await task_engine.dispose()
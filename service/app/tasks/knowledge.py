@@ -0,0 +1,32 @@
+"""Background indexing of knowledge set file contents."""
+
+import logging
+from uuid import UUID
+
+from app.core.celery_app import celery_app
+from app.core.knowledge_index import index_file
+from app.infra.database import get_worker_session_factory
+from app.repos.file import FileRepository
+from app.tasks.loop import run_in_worker_loop
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="index_knowledge_file")
+def index_knowledge_file(file_id_str: str) -> None:
+    """Extract and index the text of a file added to a knowledge set."""
+    run_in_worker_loop(_index_knowledge_file_async(UUID(file_id_str)))
+
+
+async def _index_knowledge_file_async(file_id: UUID) -> None:
+    TaskSessionLocal = get_worker_session_factory()
+    async with TaskSessionLocal() as db:
+        file = await FileRepository(db).get_file_by_id(file_id)
+        if file is None or file.is_deleted:
+            return
+
+        try:
+            await index_file(db, file)
+            await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to index file {file_id}, the next search schedules it again: {e}")
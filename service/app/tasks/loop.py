@@ -0,0 +1,171 @@
+"""
+Persistent asyncio event loop for Celery worker processes.
+
+Celery tasks are synchronous, so async work has to be driven by an event loop.
+Creating and tearing down a loop per task destroys every loop-bound resource
+(DB connection pools, Redis connections, pooled MCP sessions, httpx clients).
+Instead each worker process runs one loop for its whole lifetime in a
+dedicated thread, and tasks submit coroutines to it and block on the result.
+
+Because tasks only block their own Celery thread, running the worker with the
+threads pool (``Worker.Pool=threads``) lets a single process serve many chat
+streams concurrently on the same loop and shared connection pools.
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Coroutine
+from concurrent.futures import Future, wait
+from typing import Any, TypeVar
+
+from app.configs import configs
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerLoopRunner:
+    """An event loop running forever in a background thread."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="worker-event-loop", daemon=True)
+        self._inflight: set[Future[Any]] = set()
+        self._lock = threading.Lock()
+        self._accepting = True
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule a coroutine on the loop and return a concurrent future."""
+        with self._lock:
+            if not self._accepting:
+                coro.close()
+                raise RuntimeError("Worker event loop is shutting down")
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            self._inflight.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future[Any]) -> None:
+        with self._lock:
+            self._inflight.discard(future)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the loop and block the calling thread until it finishes."""
+        return self.submit(coro).result()
+
+    def inflight_count(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def shutdown(self, drain_timeout: float) -> None:
+        """
+        Stop accepting work, let in-flight coroutines finish (up to
+        ``drain_timeout`` seconds), close shared resources and stop the loop.
+        """
+        with self._lock:
+            self._accepting = False
+            inflight = list(self._inflight)
+
+        if inflight:
+            logger.info(f"Draining {len(inflight)} in-flight worker coroutines (timeout {drain_timeout}s)")
+            _, not_done = wait(inflight, timeout=drain_timeout)
+            for future in not_done:
+                future.cancel()
+            if not_done:
+                logger.warning(f"Cancelled {len(not_done)} worker coroutines that did not finish draining")
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout=drain_timeout + 10)
+        except Exception as e:
+            logger.error(f"Error while shutting down worker event loop: {e}")
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=10)
+        if not self._thread.is_alive():
+            self.loop.close()
+
+    async def _close(self) -> None:
+        await _close_resources()
+
+        current = asyncio.current_task()
+        pending = [t for t in asyncio.all_tasks() if t is not current and not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        await self.loop.shutdown_asyncgens()
+        await self.loop.shutdown_default_executor()
+
+
+_runner: WorkerLoopRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def get_worker_runner() -> WorkerLoopRunner:
+    """Get (or lazily start) this process's worker loop runner."""
+    global _runner
+    with _runner_lock:
+        if _runner is None or not _runner.running:
+            _runner = WorkerLoopRunner()
+            logger.info("Started persistent worker event loop thread")
+        return _runner
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get this process's worker event loop."""
+    return get_worker_runner().loop
+
+
+def run_in_worker_loop(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on this process's worker event loop, blocking until it completes."""
+    return get_worker_runner().run(coro)
+
+
+async def _init_resources() -> None:
+    from app.core.storage import get_storage_service
+    from app.infra.database import get_worker_session_factory
+
+    # Create the shared engine and S3 client up front so the first task doesn't pay for them
+    get_worker_session_factory()
+    await get_storage_service().connect()
+
+
+async def _close_resources() -> None:
+    from app.core.attachment_render import close_render_pool
+    from app.core.storage import close_storage_service
+    from app.infra.database import dispose_worker_engines
+    from app.infra.mcp import close_mcp_client_pool
+
+    await close_mcp_client_pool()
+    await dispose_worker_engines()
+    await close_storage_service()
+    close_render_pool()
+
+
+def init_worker_loop() -> None:
+    """Start the worker loop and create its shared resources (worker process init)."""
+    run_in_worker_loop(_init_resources())
+
+
+def shutdown_worker_loop() -> None:
+    """Drain in-flight tasks, close shared resources and stop the worker loop (worker shutdown)."""
+    global _runner
+    with _runner_lock:
+        runner, _runner = _runner, None
+    if runner is None or not runner.running:
+        return
+
+    runner.shutdown(configs.Worker.DrainTimeout)
+    logger.info("Stopped persistent worker event loop")
@@ -0,0 +1,255 @@
+"""
+Write-behind persistence for a streaming chat response.
+
+A single answer produces a burst of small writes: partial assistant content,
+tool call request/response messages, agent run timeline entries and finally
+citations. Committing each of them separately costs a round trip (and, for
+tool messages, a whole extra session) per event. ``ChatWriteBuffer`` queues
+them on the task's session instead and writes them out in one transaction:
+
+- repeated updates of the same message row are coalesced, only the latest
+  field values are written;
+- new rows (tool messages, citations, timeline entries) are appended in
+  batches without a flush per row;
+- a flush happens once ``max_pending`` writes are queued, once the oldest one
+  has waited ``max_delay`` seconds, or when the caller reaches a terminal point
+  (end of stream/agent, error, before a tool runs, finalization).
+
+Flush latency is recorded so slow commits show up in the worker logs. A
+failed flush is rolled back and logged instead of aborting the stream: every
+write it carried is queued again for the next flush, rows registered with
+``track`` are reloaded (or re-inserted if their insert was rolled back), and
+the first failure is reported through ``on_error``.
+"""
+
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.citation import CitationCreate
+from app.models.message import Message, MessageCreate
+from app.repos import AgentRunRepository, CitationRepository, MessageRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Writes:
+    """A set of buffered writes; message updates are coalesced per message."""
+
+    message_updates: dict[UUID, tuple[Message, dict[str, Any]]] = field(default_factory=dict)
+    new_messages: list[MessageCreate] = field(default_factory=list)
+    citations: list[CitationCreate] = field(default_factory=list)
+    timeline: dict[UUID, list[dict[str, Any]]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return (
+            len(self.message_updates)
+            + len(self.new_messages)
+            + len(self.citations)
+            + sum(len(entries) for entries in self.timeline.values())
+        )
+
+    def merge(self, newer: "_Writes") -> None:
+        """Append writes queued after these ones; newer field values win."""
+        for message_id, (message, fields) in newer.message_updates.items():
+            _, pending_fields = self.message_updates.setdefault(message_id, (message, {}))
+            pending_fields.update(fields)
+        self.new_messages.extend(newer.new_messages)
+        self.citations.extend(newer.citations)
+        for agent_run_id, entries in newer.timeline.items():
+            self.timeline.setdefault(agent_run_id, []).extend(entries)
+
+
+class ChatWriteBuffer:
+    """Batches the database writes of one chat stream onto its session."""
+
+    SLOW_FLUSH_MS = 500.0
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        max_pending: int = 50,
+        max_delay: float = 3.0,
+        on_error: Callable[[Exception], Awaitable[None]] | None = None,
+    ):
+        self.db = db
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.on_error = on_error
+        self._error_reported = False
+
+        # Queued writes, and writes staged into the session but not committed yet
+        self._queued = _Writes()
+        self._staged = _Writes()
+        # Rows the caller created directly on the session and keeps using
+        self._rows: list[SQLModel] = []
+        self._oldest_at: float | None = None
+
+        self._flush_count = 0
+        self._flush_writes = 0
+        self._flush_total_ms = 0.0
+        self._flush_max_ms = 0.0
+        self._flush_last_ms = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Number of uncommitted writes (a coalesced message update counts once)."""
+        return len(self._queued) + len(self._staged)
+
+    def _touch(self) -> None:
+        if self._oldest_at is None:
+            self._oldest_at = time.monotonic()
+
+    def update_message(self, message: Message, **fields: Any) -> None:
+        """Queue field updates for a message; later values replace earlier ones."""
+        _, pending_fields = self._queued.message_updates.setdefault(message.id, (message, {}))
+        pending_fields.update(fields)
+        self._touch()
+
+    def add_message(self, message_data: MessageCreate) -> None:
+        """Queue a new message row (e.g. a tool call event)."""
+        self._queued.new_messages.append(message_data)
+        self._touch()
+
+    def add_citations(self, citations: list[CitationCreate]) -> None:
+        if citations:
+            self._queued.citations.extend(citations)
+            self._touch()
+
+    def add_timeline_entry(self, agent_run_id: UUID, entry: dict[str, Any]) -> None:
+        self._queued.timeline.setdefault(agent_run_id, []).append(entry)
+        self._touch()
+
+    def track(self, row: SQLModel) -> None:
+        """Register a row created on the session, so a failed flush reloads or re-inserts it."""
+        self._rows.append(row)
+        self._touch()
+
+    def should_flush(self) -> bool:
+        if self._oldest_at is None:
+            return False
+        return self.pending >= self.max_pending or time.monotonic() - self._oldest_at >= self.max_delay
+
+    async def stage(self) -> int:
+        """
+        Write the queued changes into the session without committing.
+
+        Staged writes are kept until the next commit, so a failed flush can
+        queue them again.
+
+        Returns:
+            The number of writes staged.
+        """
+        writes, self._queued = self._queued, _Writes()
+        self._staged.merge(writes)
+        self._oldest_at = None
+
+        for message, fields in writes.message_updates.values():
+            for name, value in fields.items():
+                setattr(message, name, value)
+            self.db.add(message)
+
+        if writes.new_messages:
+            try:
+                MessageRepository(self.db).add_messages(writes.new_messages)
+            except Exception as e:
+                logger.warning(f"Failed to persist {len(writes.new_messages)} tool event messages: {e}")
+
+        for agent_run_id, entries in writes.timeline.items():
+            try:
+                await AgentRunRepository(self.db).append_timeline_entries(agent_run_id, entries)
+            except Exception as e:
+                logger.warning(f"Failed to append {len(entries)} timeline entries: {e}")
+
+        if writes.citations:
+            try:
+                await CitationRepository(self.db).bulk_create_citations(writes.citations)
+            except Exception as e:
+                logger.error(f"Failed to save citations: {e}")
+
+        return len(writes)
+
+    async def flush(self, reason: str) -> bool:
+        """
+        Stage the queued writes and commit the session in one transaction.
+
+        Returns:
+            True if the writes were committed, False if the flush failed and was rolled back.
+        """
+        start = time.perf_counter()
+        try:
+            await self.stage()
+            await self.db.commit()
+        except Exception as e:
+            logger.error(f"Chat persistence flush ({reason}) failed, rolling back: {e}", exc_info=True)
+            await self._recover()
+            await self._report_error(e)
+            return False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        staged = len(self._staged)
+        self._staged = _Writes()
+
+        self._flush_count += 1
+        self._flush_writes += staged
+        self._flush_total_ms += elapsed_ms
+        self._flush_max_ms = max(self._flush_max_ms, elapsed_ms)
+        self._flush_last_ms = elapsed_ms
+
+        message = f"Chat persistence flush ({reason}): {staged} writes in {elapsed_ms:.1f}ms"
+        if elapsed_ms >= self.SLOW_FLUSH_MS:
+            logger.warning(message)
+        else:
+            logger.debug(message)
+        return True
+
+    async def _recover(self) -> None:
+        """Roll back a failed flush and queue everything it carried again."""
+        await self.db.rollback()
+        writes, self._staged = self._staged, _Writes()
+        rows = list(self._rows)
+        rows += [message for message, _ in writes.message_updates.values() if all(message is not row for row in rows)]
+        for row in rows:
+            # Rows committed earlier were expired by the rollback; rows first
+            # inserted by the failed flush are transient again and get re-added
+            if row in self.db:
+                try:
+                    await self.db.refresh(row)
+                except Exception as e:
+                    logger.warning(f"Failed to reload {type(row).__name__} after rollback: {e}")
+            else:
+                self.db.add(row)
+        writes.merge(self._queued)
+        self._queued = writes
+        if self._queued or self.db.new:
+            self._touch()
+
+    async def _report_error(self, error: Exception) -> None:
+        if self._error_reported or self.on_error is None:
+            return
+        self._error_reported = True
+        try:
+            await self.on_error(error)
+        except Exception as e:
+            logger.warning(f"Failed to report chat persistence error: {e}")
+
+    async def flush_if_due(self) -> None:
+        if self.should_flush():
+            await self.flush("threshold")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get flush statistics for this stream."""
+        return {
+            "flushes": self._flush_count,
+            "writes": self._flush_writes,
+            "pending": self.pending,
+            "last_ms": round(self._flush_last_ms, 1),
+            "avg_ms": round(self._flush_total_ms / self._flush_count, 1) if self._flush_count else 0.0,
+            "max_ms": round(self._flush_max_ms, 1),
+        }
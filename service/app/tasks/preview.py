@@ -0,0 +1,37 @@
+"""Background generation of office document PDF previews."""
+
+import logging
+from uuid import UUID
+
+from app.core.celery_app import celery_app
+from app.core.office_preview import ensure_office_preview, office_preview_kind
+from app.core.storage import get_storage_service
+from app.infra.database import get_worker_session_factory
+from app.repos.file import FileRepository
+from app.tasks.loop import run_in_worker_loop
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="generate_office_preview")
+def generate_office_preview(file_id_str: str) -> None:
+    """Convert and cache the PDF preview of an uploaded office file."""
+    run_in_worker_loop(_generate_office_preview_async(UUID(file_id_str)))
+
+
+async def _generate_office_preview_async(file_id: UUID) -> None:
+    TaskSessionLocal = get_worker_session_factory()
+    async with TaskSessionLocal() as db:
+        file = await FileRepository(db).get_file_by_id(file_id)
+
+    # Previews of files without a content hash are not cached, so there is nothing to pre-generate
+    if file is None or file.is_deleted or not file.file_hash:
+        return
+    kind = office_preview_kind(file.original_filename)
+    if kind is None:
+        return
+
+    try:
+        await ensure_office_preview(file, kind, get_storage_service())
+    except Exception as e:
+        logger.warning(f"Failed to pre-generate {kind} preview of file {file_id}: {e}")
@@ -8,6 +8,7 @@ These tools require runtime context (user_id) to function for storage access.
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
 import logging
 from typing import Any, Literal
@@ -17,7 +18,7 @@ from langchain_core.tools import BaseTool, StructuredTool
 from pydantic import BaseModel, Field, model_validator
 
 from app.configs import configs
-from app.core.storage import FileScope, generate_storage_key, get_storage_service
+from app.core.storage import get_storage_service, store_blob
 
 logger = logging.getLogger(__name__)
 
@@ -295,30 +296,31 @@ async def _generate_image(
         ext = ext_map.get(mime_type, ".png")
         filename = f"generated_{uuid4().hex}{ext}"
 
-        # Generate storage key
-        storage_key = generate_storage_key(
-            user_id=user_id,
-            filename=filename,
-            scope=FileScope.GENERATED,
-        )
-
-        # Upload to storage
-        storage = get_storage_service()
-        data = io.BytesIO(image_bytes)
-        await storage.upload_file(data, storage_key, content_type=mime_type)
-
-        # Generate accessible URL
-        url = await storage.generate_download_url(storage_key, expires_in=3600 * 24 * 7)  # 7 days
-
-        # Register file in database so it appears in knowledge base
+        # Store the image and register it in database so it appears in knowledge base
         from app.infra.database import create_task_session_factory
         from app.models.file import FileCreate
         from app.repos.file import FileRepository
 
+        storage = get_storage_service()
+        file_hash = hashlib.sha256(image_bytes).hexdigest()
+
         # Create a fresh session factory for the current event loop (Celery worker)
         TaskSessionLocal = create_task_session_factory()
 
         async with TaskSessionLocal() as db:
+            # Store content-addressed (identical images are uploaded once)
+            storage_key = await store_blob(
+                db,
+                storage,
+                io.BytesIO(image_bytes),
+                file_hash=file_hash,
+                file_size=len(image_bytes),
+                content_type=mime_type,
+            )
+
+            # Generate accessible URL
+            url = await storage.generate_download_url(storage_key, expires_in=3600 * 24 * 7)  # 7 days
+
             file_repo = FileRepository(db)
             file_data = FileCreate(
                 user_id=user_id,
@@ -328,6 +330,7 @@ async def _generate_image(
                 file_size=len(image_bytes),
                 scope="generated",
                 category="images",
+                file_hash=file_hash,
                 status="confirmed",
                 metainfo={
                     "prompt": prompt,
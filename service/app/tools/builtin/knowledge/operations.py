@@ -6,24 +6,66 @@ Core operations for knowledge base file management.
 
 from __future__ import annotations
 
+import hashlib
 import io
 import json
 import logging
 import mimetypes
+import time
 from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.storage import FileCategory, FileScope, generate_storage_key, get_storage_service
+from app.configs import configs
+from app.core.document_text import get_document_pages
+from app.core.knowledge_index import get_stale_files, index_file, search_knowledge_set
+from app.core.storage import FileCategory, FileScope, get_storage_service, store_blob
 from app.infra.database import get_task_db_session
-from app.models.file import FileCreate
+from app.models.file import File, FileCreate
 from app.repos.file import FileRepository
 from app.repos.knowledge_set import KnowledgeSetRepository
 
 logger = logging.getLogger(__name__)
 
+# Passages returned by knowledge_search
+MAX_SEARCH_PASSAGES = 8
+# A stale file is scheduled for indexing again only after this many seconds
+INDEX_RESCHEDULE_SECONDS = 300.0
+
+# file_id -> monotonic time its indexing was last scheduled by a search
+_index_scheduled_at: dict[UUID, float] = {}
+
+
+def _schedule_indexing(files: list[File]) -> None:
+    """Index stale files in the background instead of holding up the search."""
+    from app.tasks.knowledge import index_knowledge_file
+
+    now = time.monotonic()
+    for file_id, scheduled_at in list(_index_scheduled_at.items()):
+        if now - scheduled_at >= INDEX_RESCHEDULE_SECONDS:
+            del _index_scheduled_at[file_id]
+
+    for file in files:
+        if file.id in _index_scheduled_at:
+            continue
+        try:
+            index_knowledge_file.delay(str(file.id))
+            _index_scheduled_at[file.id] = now
+        except Exception as e:
+            logger.warning(f"Failed to schedule content indexing for file {file.id}: {e}")
+
+
+async def _index_written_file(db: AsyncSession, file: File, content: bytes) -> None:
+    """Index a file written by the agent so the next search finds it; failures only delay indexing."""
+    try:
+        await index_file(db, file, content)
+        await db.commit()
+    except Exception as e:
+        logger.warning(f"Could not index file {file.id}, it will be indexed on the next search: {e}")
+        await db.rollback()
+
 
 async def _resolve_image_ids_to_storage_urls(
     content: str,
@@ -170,53 +212,67 @@ async def list_files(user_id: str, knowledge_set_id: UUID) -> dict[str, Any]:
         return {"error": f"Internal error: {e!s}", "success": False}
 
 
-async def read_file(user_id: str, knowledge_set_id: UUID, filename: str) -> dict[str, Any]:
-    """Read content of a file from the knowledge set."""
-    from app.tools.utils.documents.handlers import FileHandlerFactory
-
+async def read_file(
+    user_id: str,
+    knowledge_set_id: UUID,
+    filename: str,
+    start_page: int = 1,
+    end_page: int | None = None,
+    offset: int = 0,
+) -> dict[str, Any]:
+    """Read content of a file from the knowledge set, a page range and character window at a time."""
     try:
         # Normalize filename
         filename = filename.strip("/").split("/")[-1]
 
         async with get_task_db_session() as db:
-            file_repo = FileRepository(db)
-            target_file = None
+            knowledge_set_repo = KnowledgeSetRepository(db)
 
             try:
-                file_ids = await get_files_in_knowledge_set(db, user_id, knowledge_set_id)
+                await knowledge_set_repo.validate_access(user_id, knowledge_set_id)
             except ValueError as e:
-                return {"error": str(e), "success": False}
-
-            # Find file by name
-            for file_id in file_ids:
-                file = await file_repo.get_file_by_id(file_id)
-                if file and file.original_filename == filename and not file.is_deleted:
-                    target_file = file
-                    break
+                return {"error": f"Access denied: {e}", "success": False}
 
+            target_file = await knowledge_set_repo.get_file_by_name(knowledge_set_id, filename)
             if not target_file:
                 return {"error": f"File '{filename}' not found in knowledge set.", "success": False}
 
-            # Download content
-            storage = get_storage_service()
-            buffer = io.BytesIO()
-            await storage.download_file(target_file.storage_key, buffer)
-            file_bytes = buffer.getvalue()
-
-            # Use handler to process content (text mode only for LangChain tools)
-            handler = FileHandlerFactory.get_handler(target_file.original_filename)
-
+            # Parsed once per content version; later reads and pages come from the cache
             try:
-                result = handler.read_content(file_bytes, mode="text")
-                return {
-                    "success": True,
-                    "filename": target_file.original_filename,
-                    "content": result,
-                    "size_bytes": target_file.file_size,
-                }
+                pages = await get_document_pages(target_file, get_storage_service())
             except Exception as e:
                 return {"error": f"Error parsing file: {e!s}", "success": False}
 
+            total_pages = len(pages)
+            if total_pages and not 1 <= start_page <= total_pages:
+                return {"error": f"start_page must be between 1 and {total_pages}.", "success": False}
+            last_page = min(end_page or total_pages, total_pages)
+            if last_page < start_page:
+                return {"error": "end_page must not be before start_page.", "success": False}
+
+            text = "\n\n".join(pages[start_page - 1 : last_page])
+            if offset < 0 or (offset and offset >= len(text)):
+                return {"error": f"offset must be between 0 and {max(len(text) - 1, 0)}.", "success": False}
+
+            max_chars = configs.Knowledge.ReadMaxChars
+            result: dict[str, Any] = {
+                "success": True,
+                "filename": target_file.original_filename,
+                "content": text[offset : offset + max_chars],
+                "size_bytes": target_file.file_size,
+                "total_pages": total_pages,
+                "start_page": start_page,
+                "end_page": last_page,
+            }
+            if offset + max_chars < len(text):
+                result["truncated"] = True
+                result["next_offset"] = offset + max_chars
+                result["hint"] = (
+                    f"Content truncated at {max_chars} characters. Call again with offset={offset + max_chars} "
+                    "and the same pages to continue, or request fewer pages."
+                )
+            return result
+
     except Exception as e:
         logger.error(f"Error reading file: {e}")
         return {"error": f"Internal error: {e!s}", "success": False}
@@ -235,17 +291,12 @@ async def write_file(user_id: str, knowledge_set_id: UUID, filename: str, conten
             storage = get_storage_service()
 
             try:
-                file_ids = await get_files_in_knowledge_set(db, user_id, knowledge_set_id)
+                await knowledge_set_repo.validate_access(user_id, knowledge_set_id)
             except ValueError as e:
-                return {"error": str(e), "success": False}
+                return {"error": f"Access denied: {e}", "success": False}
 
             # Check if file exists
-            existing_file = None
-            for file_id in file_ids:
-                file = await file_repo.get_file_by_id(file_id)
-                if file and file.original_filename == filename and not file.is_deleted:
-                    existing_file = file
-                    break
+            existing_file = await knowledge_set_repo.get_file_by_name(knowledge_set_id, filename)
 
             # Determine content type
             content_type, _ = mimetypes.guess_type(filename)
@@ -269,20 +320,28 @@ async def write_file(user_id: str, knowledge_set_id: UUID, filename: str, conten
             handler = FileHandlerFactory.get_handler(filename)
             encoded_content = handler.create_content(content)
 
-            new_key = generate_storage_key(user_id, filename, FileScope.PRIVATE)
-            data = io.BytesIO(encoded_content)
+            # Store content-addressed (rewriting identical content uploads nothing)
+            file_hash = hashlib.sha256(encoded_content).hexdigest()
             file_size_bytes = len(encoded_content)
-
-            await storage.upload_file(data, new_key, content_type=content_type)
+            new_key = await store_blob(
+                db,
+                storage,
+                io.BytesIO(encoded_content),
+                file_hash=file_hash,
+                file_size=file_size_bytes,
+                content_type=content_type,
+            )
 
             if existing_file:
                 # Update existing
                 existing_file.storage_key = new_key
+                existing_file.file_hash = file_hash
                 existing_file.file_size = file_size_bytes
                 existing_file.content_type = content_type
                 existing_file.updated_at = datetime.now(timezone.utc)
                 db.add(existing_file)
                 await db.commit()
+                await _index_written_file(db, existing_file, encoded_content)
                 return {"success": True, "message": f"Updated file: {filename}"}
             else:
                 # Create new and link
@@ -295,10 +354,12 @@ async def write_file(user_id: str, knowledge_set_id: UUID, filename: str, conten
                     content_type=content_type,
                     scope=FileScope.PRIVATE,
                     category=FileCategory.DOCUMENT,
+                    file_hash=file_hash,
                 )
                 created_file = await file_repo.create_file(new_file)
                 await knowledge_set_repo.link_file_to_knowledge_set(created_file.id, knowledge_set_id)
                 await db.commit()
+                await _index_written_file(db, created_file, encoded_content)
                 return {"success": True, "message": f"Created file: {filename}"}
 
     except Exception as e:
@@ -307,28 +368,52 @@ async def write_file(user_id: str, knowledge_set_id: UUID, filename: str, conten
 
 
 async def search_files(user_id: str, knowledge_set_id: UUID, query: str) -> dict[str, Any]:
-    """Search for files by name in the knowledge set."""
+    """Search the knowledge set by file name and, ranked by relevance, file content."""
     try:
         async with get_task_db_session() as db:
             file_repo = FileRepository(db)
-            matches: list[str] = []
 
             try:
                 file_ids = await get_files_in_knowledge_set(db, user_id, knowledge_set_id)
             except ValueError as e:
                 return {"error": str(e), "success": False}
 
-            for file_id in file_ids:
-                file = await file_repo.get_file_by_id(file_id)
-                if file and not file.is_deleted and query.lower() in file.original_filename.lower():
-                    matches.append(f"{file.original_filename} (ID: {file.id})")
+            files = await file_repo.get_files_by_ids(file_ids)
+            matches = [
+                f"{file.original_filename} (ID: {file.id})"
+                for file in files
+                if query.lower() in file.original_filename.lower()
+            ]
+
+            # Files uploaded before indexing, or changed since, are indexed in the background
+            stale = await get_stale_files(db, files)
+            if stale:
+                _schedule_indexing(stale)
+
+            hits = await search_knowledge_set(db, knowledge_set_id, query, limit=MAX_SEARCH_PASSAGES)
+            passages = [
+                {
+                    "filename": hit["filename"],
+                    "file_id": str(hit["file_id"]),
+                    "score": hit["score"],
+                    "snippet": hit["snippet"],
+                }
+                for hit in hits
+            ]
 
-            return {
+            result: dict[str, Any] = {
                 "success": True,
                 "query": query,
                 "matches": matches,
                 "count": len(matches),
+                "passages": passages,
             }
+            if stale:
+                result["note"] = (
+                    f"{len(stale)} file(s) are still being indexed and their content was not searched yet: "
+                    f"{', '.join(file.original_filename for file in stale)}. Search again shortly or read them directly."
+                )
+            return result
 
     except Exception as e:
         logger.error(f"Error searching files: {e}")
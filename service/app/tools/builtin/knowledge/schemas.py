@@ -25,6 +25,21 @@ class KnowledgeReadFileInput(BaseModel):
             "images (PNG/JPG/GIF/WEBP with OCR), and plain text files."
         )
     )
+    start_page: int = Field(
+        default=1,
+        ge=1,
+        description="First page to read (PDF page, XLSX sheet or PPTX slide; other files have a single page).",
+    )
+    end_page: int | None = Field(
+        default=None,
+        ge=1,
+        description="Last page to read, inclusive. Defaults to the last page of the file.",
+    )
+    offset: int = Field(
+        default=0,
+        ge=0,
+        description="Character offset into the selected pages; use the next_offset of a truncated result.",
+    )
 
 
 class KnowledgeWriteFileInput(BaseModel):
@@ -71,7 +86,7 @@ class KnowledgeWriteFileInput(BaseModel):
 class KnowledgeSearchFilesInput(BaseModel):
     """Input schema for search_files tool."""
 
-    query: str = Field(description="Search term to find files by name.")
+    query: str = Field(description="Words to look for in file names and file contents.")
 
 
 class KnowledgeHelpInput(BaseModel):
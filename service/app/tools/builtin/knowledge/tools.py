@@ -53,7 +53,9 @@ def create_knowledge_tools() -> dict[str, BaseTool]:
     )
 
     # Read file tool
-    async def read_file_placeholder(filename: str) -> dict[str, Any]:
+    async def read_file_placeholder(
+        filename: str, start_page: int = 1, end_page: int | None = None, offset: int = 0
+    ) -> dict[str, Any]:
         return {"error": "Knowledge tools require agent context binding", "success": False}
 
     tools["knowledge_read"] = StructuredTool(
@@ -63,6 +65,8 @@ def create_knowledge_tools() -> dict[str, BaseTool]:
             "Supports: PDF (text + tables), DOCX (text + tables), XLSX (all sheets), "
             "PPTX (text + speaker notes), HTML (text extraction), JSON/YAML/XML (formatted), "
             "images (OCR text extraction from PNG/JPG/GIF/WEBP), and plain text files. "
+            "Long files are returned in parts: read a page range with start_page/end_page, "
+            "and continue a truncated result with its next_offset. "
             "Use knowledge_list first to see available files."
         ),
         args_schema=KnowledgeReadFileInput,
@@ -95,7 +99,8 @@ def create_knowledge_tools() -> dict[str, BaseTool]:
     tools["knowledge_search"] = StructuredTool(
         name="knowledge_search",
         description=(
-            "Search for files by name in the agent's knowledge base. Returns matching filenames that can then be read."
+            "Search the agent's knowledge base by file name and file content. Returns matching filenames "
+            "and the most relevant passages, ranked by relevance, with the file each one comes from."
         ),
         args_schema=KnowledgeSearchFilesInput,
         coroutine=search_files_placeholder,
@@ -152,8 +157,10 @@ def create_knowledge_tools_for_agent(user_id: str, knowledge_set_id: UUID) -> li
     )
 
     # Read file tool
-    async def read_file_bound(filename: str) -> dict[str, Any]:
-        return await read_file(user_id, knowledge_set_id, filename)
+    async def read_file_bound(
+        filename: str, start_page: int = 1, end_page: int | None = None, offset: int = 0
+    ) -> dict[str, Any]:
+        return await read_file(user_id, knowledge_set_id, filename, start_page, end_page, offset)
 
     tools.append(
         StructuredTool(
@@ -163,6 +170,8 @@ def create_knowledge_tools_for_agent(user_id: str, knowledge_set_id: UUID) -> li
                 "Supports: PDF (text + tables), DOCX (text + tables), XLSX (all sheets), "
                 "PPTX (text + speaker notes), HTML (text extraction), JSON/YAML/XML (formatted), "
                 "images (OCR text extraction from PNG/JPG/GIF/WEBP), and plain text files. "
+                "Long files are returned in parts: read a page range with start_page/end_page, "
+                "and continue a truncated result with its next_offset. "
                 "Use knowledge_list first to see available files."
             ),
             args_schema=KnowledgeReadFileInput,
@@ -199,7 +208,8 @@ def create_knowledge_tools_for_agent(user_id: str, knowledge_set_id: UUID) -> li
         StructuredTool(
             name="knowledge_search",
             description=(
-                "Search for files by name in your knowledge base. Returns matching filenames that can then be read."
+                "Search your knowledge base by file name and file content. Returns matching filenames "
+                "and the most relevant passages, ranked by relevance, with the file each one comes from."
             ),
             args_schema=KnowledgeSearchFilesInput,
             coroutine=search_files_bound,
@@ -6,12 +6,16 @@ Allows agents to search their own conversation history across all topics/session
 
 Each agent can only access messages from sessions where it was the assigned agent,
 scoped by user_id for security.
+
+The full-text index returns the most recent matching messages as candidates;
+they are ranked here by BM25 relevance weighted by a recency decay, so recent
+discussions win over old ones of similar relevance without hiding the latter.
 """
 
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
@@ -19,6 +23,7 @@ from langchain_core.tools import BaseTool, StructuredTool
 from pydantic import BaseModel, Field
 
 from app.infra.database import AsyncSessionLocal
+from app.utils.text_search import bm25_scores, highlight, make_snippet, query_phrases
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +36,8 @@ class MemorySearchInput(BaseModel):
 
     query: str = Field(
         description=(
-            "Search query to find in message history. "
-            "The search will match against message content using case-insensitive partial matching."
+            "Words to search for in message history. "
+            "Results are ranked by relevance and recency; matched words are highlighted with **."
         )
     )
     max_results: int = Field(
@@ -43,7 +48,44 @@ class MemorySearchInput(BaseModel):
     )
 
 
-# --- Result Formatting ---
+# --- Ranking and Result Formatting ---
+
+# Candidates fetched from the full-text index per requested result
+CANDIDATES_PER_RESULT = 20
+MIN_CANDIDATES = 200
+
+# Relevance is weighted by RECENCY_FLOOR + (1 - RECENCY_FLOOR) * 0.5 ** (age / half-life)
+RECENCY_HALF_LIFE_DAYS = 30.0
+RECENCY_FLOOR = 0.3
+
+
+def _recency_weight(created_at: datetime, now: datetime) -> float:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    age_days = max((now - created_at).total_seconds(), 0) / 86400
+    return RECENCY_FLOOR + (1 - RECENCY_FLOOR) * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def _rank_memory_results(
+    query: str, candidates: list[dict[str, Any]], limit: int, now: datetime | None = None
+) -> list[tuple[float, dict[str, Any]]]:
+    """Rank candidate messages by BM25 relevance times recency weight."""
+    terms = list(dict.fromkeys(token for phrase in query_phrases(query) for token in phrase))
+    if not terms or not candidates:
+        return []
+
+    now = now or datetime.now(timezone.utc)
+    documents = [str(candidate["search_tokens"]).split() for candidate in candidates]
+    average_length = sum(len(document) for document in documents) / len(documents)
+    relevance = bm25_scores(terms, documents, len(documents), average_length)
+
+    scored = [
+        (score * _recency_weight(candidate["created_at"], now), candidate)
+        for score, candidate in zip(relevance, candidates)
+        if score > 0
+    ]
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored[:limit]
 
 
 def _format_memory_result(
@@ -51,17 +93,20 @@ def _format_memory_result(
     role: str,
     topic_name: str,
     created_at: datetime,
+    query: str,
+    score: float,
     max_snippet_length: int = 500,
 ) -> dict[str, Any]:
-    """Format a single memory search result."""
-    # Truncate content if too long
-    snippet = content[:max_snippet_length] + "..." if len(content) > max_snippet_length else content
+    """Format a single memory search result with the matched words highlighted."""
+    words = ["".join(phrase) for phrase in query_phrases(query)]
+    snippet = highlight(make_snippet(content, words, max_snippet_length), words)
 
     return {
         "role": role,
         "content_snippet": snippet,
         "topic": topic_name,
         "timestamp": created_at.isoformat(),
+        "score": round(score, 4),
     }
 
 
@@ -97,13 +142,14 @@ async def _search_memory(
 
             message_repo = MessageRepository(db)
 
-            results: list[dict[str, Any]] = await message_repo.search_messages_by_agent(
+            candidates: list[dict[str, Any]] = await message_repo.search_messages_by_agent(
                 user_id=user_id,
                 agent_id=agent_id,
                 query=query,
-                limit=max_results,
+                limit=max(max_results * CANDIDATES_PER_RESULT, MIN_CANDIDATES),
                 exclude_topic_id=current_topic_id,
             )
+            results = _rank_memory_results(query, candidates, max_results)
 
             if not results:
                 return {
@@ -119,8 +165,10 @@ async def _search_memory(
                     role=str(msg["role"]),
                     topic_name=str(msg["topic_name"]),
                     created_at=msg["created_at"],
+                    query=query,
+                    score=score,
                 )
-                for msg in results
+                for score, msg in results
             ]
 
             return {
@@ -167,8 +215,8 @@ def create_memory_tools() -> dict[str, BaseTool]:
             "Search your conversation history for relevant past messages. "
             "Use this to recall previous discussions, find information mentioned before, "
             "or understand context from past conversations. "
-            "Returns matching messages with their role (user/assistant), content snippet, "
-            "topic name, and timestamp."
+            "Returns the most relevant messages, favoring recent ones, with their role (user/assistant), "
+            "a content snippet with matched words highlighted, topic name, and timestamp."
         ),
         args_schema=MemorySearchInput,
         coroutine=memory_search_placeholder,
@@ -212,8 +260,8 @@ def create_memory_tools_for_agent(
                 "Search your conversation history for relevant past messages. "
                 "Use this to recall previous discussions, find information mentioned before, "
                 "or understand context from past conversations. "
-                "Returns matching messages with their role (user/assistant), content snippet, "
-                "topic name, and timestamp."
+                "Returns the most relevant messages, favoring recent ones, with their role (user/assistant), "
+                "a content snippet with matched words highlighted, topic name, and timestamp."
             ),
             args_schema=MemorySearchInput,
             coroutine=search_memory_bound,
@@ -8,6 +8,7 @@ Database Tool Loader - Loads user-created dynamic tools from database.
     Do not build new features on this module.
 """
 
+import asyncio
 import json
 import logging
 import warnings
@@ -22,8 +23,9 @@ warnings.warn(
 from fastmcp import FastMCP  # noqa: E402
 from fastmcp.tools import FunctionTool  # noqa: E402
 
+from app.configs import configs  # noqa: E402
 from app.infra.database import AsyncSessionLocal  # noqa: E402
-from app.models.tool import ToolFunction, ToolStatus, ToolVersion  # noqa: E402
+from app.models.tool import ToolFunction, ToolVersion  # noqa: E402
 from app.repos.tool import ToolRepository  # noqa: E402
 from app.tools.dynamic.proxy import ContainerToolProxy, ToolProxyManager  # noqa: E402
 from app.utils.parser import parse_requirements  # noqa: E402
@@ -31,12 +33,60 @@ from app.utils.parser import parse_requirements  # noqa: E402
 logger = logging.getLogger(__name__)
 
 
+class ToolRegistryVersions:
+    """
+    Per-user version stamps of the dynamic tool registry.
+
+    Every change to a user's tools bumps the stamp; a loader whose tools were
+    loaded at the current stamp has nothing to refresh. With the Redis cache
+    backend the stamps are shared, so a change made through one pod is seen by
+    all of them; with the local backend they only cover this process.
+    """
+
+    KEY_PREFIX = "dynamic_tools:version:"
+
+    def __init__(self, use_redis: bool) -> None:
+        self.use_redis = use_redis
+        self._local: Dict[str, int] = {}
+
+    async def get(self, user_id: str) -> int | None:
+        """Get the current stamp of a user's tools, or None if it cannot be read."""
+        if not self.use_redis:
+            return self._local.get(user_id, 0)
+        try:
+            from app.infra.redis import get_redis_client
+
+            value = await (await get_redis_client()).get(f"{self.KEY_PREFIX}{user_id}")
+            return int(value or 0)
+        except Exception as e:
+            logger.warning(f"Failed to read dynamic tool version for user {user_id}: {e}")
+            return None
+
+    async def bump(self, user_id: str) -> None:
+        """Mark a user's tools as changed."""
+        self._local[user_id] = self._local.get(user_id, 0) + 1
+        if not self.use_redis:
+            return
+        try:
+            from app.infra.redis import get_redis_client
+
+            await (await get_redis_client()).incr(f"{self.KEY_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"Failed to bump dynamic tool version for user {user_id}: {e}")
+
+
 class DatabaseToolLoader:
     def __init__(self) -> None:
         logger.info("Initializing DatabaseToolLoader")
         self.proxy_manager = ToolProxyManager()
+        self.versions = ToolRegistryVersions(use_redis=configs.Redis.CacheBackend == "redis")
         # Track which tools belong to which user for ownership verification
         self._tool_ownership: Dict[str, str] = {}  # {tool_name: user_id}
+        # Registry stamp each user's tools were last loaded at
+        self._loaded_versions: Dict[str, int] = {}
+        # (version id, function id) each registered tool was built from; unchanged tools are not re-registered
+        self._tool_fingerprints: Dict[str, tuple[Any, Any]] = {}
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
 
     def _get_requirements(self, tool_version: ToolVersion) -> list[str]:
         """Get requirements for a tool version, parsing from database or materialized file."""
@@ -87,39 +137,23 @@ class DatabaseToolLoader:
             return result
 
         async with AsyncSessionLocal() as session:
-            repo = ToolRepository(session)
-
-            if request_tool_name:
-                tool = await repo.get_tool_by_user_and_name(user_id, request_tool_name)
-                tools = [tool] if tool and tool.is_active else []
-            else:
-                tools = await repo.list_tools_by_user(user_id, is_active=True)
-
-            for tool in tools:
-                ready_versions = await repo.list_tool_versions_by_tool(tool.id, status=ToolStatus.READY)
-                if not ready_versions:
-                    continue
-
-                # Get the latest ready version
-                latest_version = max(ready_versions, key=lambda v: v.version)
+            rows = await ToolRepository(session).list_ready_functions_by_user(user_id, tool_name=request_tool_name)
 
-                # Get functions for this version
-                functions = await repo.list_tool_functions_by_version(latest_version.id)
+        for tool, latest_version, tf in rows:
+            tool_data = self._build_tool_data(tf, tool.name)
+            tool_name = tool_data["name"]
 
-                for tf in functions:
-                    tool_data = self._build_tool_data(tf, tool.name)
-                    tool_name = tool_data["name"]
+            # Use container proxy
+            requirements = self._get_requirements(latest_version)
 
-                    # Use container proxy
-                    requirements = self._get_requirements(latest_version)
-
-                    proxy = ContainerToolProxy(tool_data, latest_version.code_content or "", requirements)
-                    result[tool_name] = {
-                        "tool_data": tool_data,
-                        "proxy": proxy,
-                        "execution_mode": "container",
-                    }
-                    logger.debug(f"Prepared DB container tool: {tool_name} for user {user_id}")
+            proxy = ContainerToolProxy(tool_data, latest_version.code_content or "", requirements, owner=user_id)
+            result[tool_name] = {
+                "tool_data": tool_data,
+                "proxy": proxy,
+                "execution_mode": "container",
+                "fingerprint": (latest_version.id, tf.id),
+            }
+            logger.debug(f"Prepared DB container tool: {tool_name} for user {user_id}")
 
         logger.info(f"Loaded {len(result)} tools from database for user {user_id}")
         return result
@@ -161,6 +195,7 @@ class DatabaseToolLoader:
 
             # Track ownership
             self._tool_ownership[tool_name] = user_id
+            self._tool_fingerprints[tool_name] = tool_info.get("fingerprint")
 
             execution_mode = tool_info.get("execution_mode", "unknown")
             logger.info(f"Registered DB {execution_mode} tool: {tool_name} for user {user_id}")
@@ -169,64 +204,97 @@ class DatabaseToolLoader:
     def register_tools(self, mcp: FastMCP, tools: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         return self.register_tools_to_mcp(mcp, tools, user_id)
 
+    async def notify_changed(self, mcp: FastMCP, user_id: str) -> Dict[str, Any]:
+        """
+        Bump a user's registry version after their tools changed, then refresh them here.
+        Other processes pick the change up on their next refresh.
+        """
+        await self.versions.bump(user_id)
+        return await self.refresh_tools(mcp, user_id=user_id)
+
     async def refresh_tools(self, mcp: FastMCP, user_id: str) -> Dict[str, Any]:
         """
         Refresh database tools for a specific user only.
         Preserves built-in tools and other users' tools.
 
+        Does nothing when the user's registry version is the one the tools were
+        last loaded at; otherwise reloads them in one query and re-registers
+        only the tools that were added or changed.
+
         Args:
             mcp: FastMCP instance
             user_id: User whose tools to refresh
 
         Returns:
-            Dict with 'removed', 'added', 'updated' lists
+            Dict with 'removed', 'added', 'updated' lists and 'unchanged' flag
         """
-        logger.info(f"Refreshing database tools for user {user_id}...")
+        result: Dict[str, Any] = {"removed": [], "added": [], "updated": [], "unchanged": False}
 
-        # Get currently registered tools from MCP server
-        existing_tools: Dict[str, FunctionTool] = mcp._tool_manager._tools  # type: ignore
+        version = await self.versions.get(user_id)
+        if version is not None and self._loaded_versions.get(user_id) == version:
+            result["unchanged"] = True
+            return result
 
-        # Scan database for this user's current tools
-        new_tools = await self.scan_and_load_tools(user_id=user_id)
-        new_tool_names = set(new_tools.keys())
+        lock = self._refresh_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            # Another refresh may have loaded this version while we waited
+            if version is not None and self._loaded_versions.get(user_id) == version:
+                result["unchanged"] = True
+                return result
 
-        # Identify which existing tools belong to this user using ownership registry
-        current_user_tools = {name for name, owner in self._tool_ownership.items() if owner == user_id}
+            logger.info(f"Refreshing database tools for user {user_id} (registry version {version})...")
 
-        # Find this user's tools to remove (in MCP but not in database)
-        tools_to_remove = current_user_tools - new_tool_names
+            # Get currently registered tools from MCP server
+            existing_tools: Dict[str, FunctionTool] = mcp._tool_manager._tools  # type: ignore
 
-        # Find this user's tools to add (in database but not in MCP)
-        tools_to_add = new_tool_names - current_user_tools
+            # Scan database for this user's current tools
+            new_tools = await self.scan_and_load_tools(user_id=user_id)
+            new_tool_names = set(new_tools.keys())
 
-        # Find this user's tools to update (in both but may have changed)
-        tools_to_update = current_user_tools & new_tool_names
+            # Identify which existing tools belong to this user using ownership registry
+            current_user_tools = {name for name, owner in self._tool_ownership.items() if owner == user_id}
 
-        result: Dict[str, Any] = {"removed": [], "added": [], "updated": []}
+            # Find this user's tools to remove (in MCP but not in database)
+            tools_to_remove = current_user_tools - new_tool_names
 
-        # Remove deleted tools from MCP server
-        for tool_name in tools_to_remove:
-            if tool_name in existing_tools:
-                mcp.remove_tool(tool_name)
-                # Remove from ownership tracking
-                if tool_name in self._tool_ownership:
-                    del self._tool_ownership[tool_name]
+            # Find this user's tools to add (in database but not in MCP)
+            tools_to_add = new_tool_names - current_user_tools
+
+            # Find this user's tools to update (in both, built from another version or function)
+            tools_to_update = {
+                name
+                for name in current_user_tools & new_tool_names
+                if self._tool_fingerprints.get(name) != new_tools[name]["fingerprint"] or name not in existing_tools
+            }
+
+            # Remove deleted tools from MCP server
+            for tool_name in tools_to_remove:
+                if tool_name in existing_tools:
+                    mcp.remove_tool(tool_name)
+                self._tool_ownership.pop(tool_name, None)
+                self._tool_fingerprints.pop(tool_name, None)
                 result["removed"].append(tool_name)
                 logger.info(f"Removed tool: {tool_name}")
 
-        # Add new tools to MCP server
-        if tools_to_add:
-            tools_to_register = {name: new_tools[name] for name in tools_to_add}
-            self.register_tools_to_mcp(mcp, tools_to_register, user_id)
-            result["added"] = list(tools_to_add)
-            logger.info(f"Added tools to MCP: {tools_to_add}")
-
-        # Update existing tools (re-register to pick up changes)
-        if tools_to_update:
-            tools_to_reregister = {name: new_tools[name] for name in tools_to_update}
-            self.register_tools_to_mcp(mcp, tools_to_reregister, user_id)
-            result["updated"] = list(tools_to_update)
-            logger.info(f"Updated tools in MCP: {tools_to_update}")
+            # Add new tools to MCP server
+            if tools_to_add:
+                tools_to_register = {name: new_tools[name] for name in tools_to_add}
+                self.register_tools_to_mcp(mcp, tools_to_register, user_id)
+                result["added"] = list(tools_to_add)
+                logger.info(f"Added tools to MCP: {tools_to_add}")
+
+            # Update changed tools (re-register to pick up changes)
+            if tools_to_update:
+                tools_to_reregister = {name: new_tools[name] for name in tools_to_update}
+                self.register_tools_to_mcp(mcp, tools_to_reregister, user_id)
+                result["updated"] = list(tools_to_update)
+                logger.info(f"Updated tools in MCP: {tools_to_update}")
+
+            if version is not None:
+                self._loaded_versions[user_id] = version
+            else:
+                # Version unknown (Redis unavailable): reload again next time
+                self._loaded_versions.pop(user_id, None)
 
         logger.info(f"Tool refresh for user {user_id} completed: {result}")
         return result
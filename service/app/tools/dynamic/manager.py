@@ -146,8 +146,7 @@ def register_manage_tools(mcp: FastMCP) -> None:
 
                 # Refresh tools in the loader
                 try:
-                    tools = await tool_loader.scan_and_load_tools(user_id=user_info.id)
-                    tool_loader.register_tools_to_mcp(mcp, tools, user_id=user_info.id)
+                    await tool_loader.notify_changed(mcp, user_id=user_info.id)
                     logger.info(f"Refreshed tools after creating {name}")
                 except Exception as e:
                     logger.warning(f"Failed to refresh tools after creating {name}: {e}")
@@ -257,8 +256,7 @@ def register_manage_tools(mcp: FastMCP) -> None:
 
                 # Refresh tools in the loader
                 try:
-                    tools = await tool_loader.scan_and_load_tools(user_id=user_info.id)
-                    tool_loader.register_tools_to_mcp(mcp, tools, user_id=user_info.id)
+                    await tool_loader.notify_changed(mcp, user_id=user_info.id)
                     logger.info(f"Refreshed tools after adding functions {created_functions} to {tool.name}")
                 except Exception as e:
                     logger.warning(f"Failed to refresh tools after adding function: {e}")
@@ -380,8 +378,7 @@ def register_manage_tools(mcp: FastMCP) -> None:
 
                 # Refresh tools in the loader
                 try:
-                    tools = await tool_loader.scan_and_load_tools(user_id=user_info.id)
-                    tool_loader.register_tools_to_mcp(mcp, tools, user_id=user_info.id)
+                    await tool_loader.notify_changed(mcp, user_id=user_info.id)
                     logger.info(f"Refreshed tools after updating {tool.name}")
                 except Exception as e:
                     logger.warning(f"Failed to refresh tools after updating {tool.name}: {e}")
@@ -508,8 +505,7 @@ def register_manage_tools(mcp: FastMCP) -> None:
 
                 # Refresh tools in the loader
                 try:
-                    tools = await tool_loader.scan_and_load_tools(user_id=user_info.id)
-                    tool_loader.register_tools_to_mcp(mcp, tools, user_id=user_info.id)
+                    await tool_loader.notify_changed(mcp, user_id=user_info.id)
                     logger.info(f"Refreshed tools after updating function {function_name} in {tool.name}")
                 except Exception as e:
                     logger.warning(f"Failed to refresh tools after updating function: {e}")
@@ -563,9 +559,9 @@ def register_manage_tools(mcp: FastMCP) -> None:
 
                 await session.commit()
 
-                # Refresh tools in the loader using the new refresh method
+                # Refresh tools in the loader
                 try:
-                    result = await tool_loader.refresh_tools(mcp, user_id=user_info.id)
+                    result = await tool_loader.notify_changed(mcp, user_id=user_info.id)
                     logger.info(f"Refreshed tools after deleting {tool_name}: {result}")
                 except Exception as e:
                     logger.warning(f"Failed to refresh tools after deleting {tool_name}: {e}")
@@ -629,8 +625,7 @@ def register_manage_tools(mcp: FastMCP) -> None:
 
                 # Refresh tools in the loader
                 try:
-                    tools = await tool_loader.scan_and_load_tools(user_id=user_info.id)
-                    tool_loader.register_tools_to_mcp(mcp, tools, user_id=user_info.id)
+                    await tool_loader.notify_changed(mcp, user_id=user_info.id)
                     logger.info(f"Refreshed tools after deleting function {function_name} from {tool.name}")
                 except Exception as e:
                     logger.warning(f"Failed to refresh tools after deleting function: {e}")
@@ -4,7 +4,7 @@ Tool Proxy - Container-based tool execution proxy.
 
 Provides proxy functionality for tools in isolated environments:
 - Create tool proxies in main process
-- Execute actual tool calls via subprocess
+- Execute actual tool calls in warm sandboxes (see ``sandbox``)
 - Handle argument serialization and result deserialization
 
 .. deprecated::
@@ -25,33 +25,9 @@ warnings.warn(
     stacklevel=2,
 )
 
-from llm_sandbox import SandboxBackend, SandboxSession  # noqa: E402
-from llm_sandbox.exceptions import SandboxTimeoutError  # noqa: E402
-from llm_sandbox.security import (  # noqa: E402
-    SecurityIssueSeverity,
-    SecurityPattern,
-    SecurityPolicy,
-)
-
-from app.configs import configs  # noqa: E402
+from app.tools.dynamic.sandbox import get_sandbox_pool  # noqa: E402
 
 logger = logging.getLogger(__name__)
-policy = SecurityPolicy(
-    severity_threshold=SecurityIssueSeverity.MEDIUM,
-    patterns=[
-        SecurityPattern(
-            pattern=r"os\.system",
-            description="System command execution",
-            severity=SecurityIssueSeverity.HIGH,
-        ),
-        SecurityPattern(
-            pattern=r"eval\s*\(",
-            description="Dynamic code evaluation",
-            severity=SecurityIssueSeverity.MEDIUM,
-        ),
-    ],
-)
-dynamic_mcp_config = configs.DynamicMCP
 
 
 class ContainerToolProxy:
@@ -62,10 +38,12 @@ class ContainerToolProxy:
         tool_data: dict[str, Any],
         code_content: str,
         requirements: list[str] | None = None,
+        owner: str | None = None,
     ) -> None:
         self.tool_data = tool_data  # FunctionTool序列化数据
         self.code_content = code_content  # 从数据库获取的原始代码
         self.requirements = requirements or []  # 依赖库列表
+        self.owner = owner  # 工具所属用户，沙箱不在用户之间共享
         self.tool_name = tool_data["name"]
 
         # 从tool_data中获取function_name
@@ -114,81 +92,46 @@ except Exception as e:
     }}, ensure_ascii=False))
 """
 
-    def __call__(self, *args: Any, **kwargs: Any) -> Any:
-        """代理函数调用 - 使用 llm-sandbox 在容器中直接执行代码"""
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """代理函数调用 - 在预热的沙箱池中执行代码"""
         try:
-            logger.debug(f"Executing tool {self.tool_name} in container")
+            logger.debug(f"Executing tool {self.tool_name} in sandbox")
             logger.debug(f"Function: {self.function_name}, Args: {args}, Kwargs: {kwargs}")
             logger.debug(f"Requirements: {self.requirements}")
 
             # Build execution code: original code + function call + result serialization
             execution_code = self._build_execution_code(args, kwargs)
 
-            if configs.Env == "prod":
-                from kubernetes import client as k8s_client
-                from kubernetes import config as k8s_config
-
-                k8s_config.load_incluster_config()
-                k8s_api = k8s_client.CoreV1Api()
-                session_kwargs: dict[str, Any] = {
-                    "backend": SandboxBackend.KUBERNETES,
-                    "lang": "python",
-                    "kube_namespace": configs.DynamicMCP.kubeNamespace,
-                    "libraries": self.requirements,
-                    "security_policy": policy,
-                    "in_cluster": True,
-                    "client": k8s_api,
-                }
+            try:
+                result = await get_sandbox_pool().execute(execution_code, self.requirements, owner=self.owner)
+            except PermissionError as e:
+                logger.error(f"Tool {self.tool_name} is not safe: {e}")
+                raise RuntimeError(f"Tool {self.tool_name} is not safe")
+
+            # 解析结果
+            if result.exit_code != 0:
+                error_msg = result.stderr or "Unknown container execution error"
+                raise RuntimeError(f"Container execution failed: {error_msg}")
+
+            # 解析JSON输出
+            try:
+                output = json.loads(result.stdout)
+            except json.JSONDecodeError as e:
+                raise RuntimeError(f"Failed to parse container output: {e}\nOutput: {result.stdout}")
+
+            # 检查工具执行结果
+            if output.get("success"):
+                tool_result = output["result"]
+                # Wrap non-dict results according to MCP protocol requirements
+                if not isinstance(tool_result, dict):
+                    return {"result": tool_result}
+                return tool_result
             else:
-                session_kwargs: dict[str, Any] = {
-                    "backend": SandboxBackend.DOCKER,
-                    "lang": "python",
-                    "libraries": self.requirements,
-                    "keep_template": True,
-                    "runtime_configs": {
-                        "cpu_count": dynamic_mcp_config.cpu_count,
-                        "mem_limit": dynamic_mcp_config.mem_limit,
-                    },
-                    "default_timeout": dynamic_mcp_config.default_timeout,
-                    "security_policy": policy,
-                }
-
-            # 使用 llm-sandbox 执行
-            with SandboxSession(**session_kwargs) as session:
-                is_safe, violations = session.is_safe(execution_code)
-
-                if is_safe:
-                    result = session.run(execution_code)
-
-                    # 解析结果
-                    if result.exit_code != 0:
-                        error_msg = result.stderr or "Unknown container execution error"
-                        raise RuntimeError(f"Container execution failed: {error_msg}")
-
-                    # 解析JSON输出
-                    try:
-                        output = json.loads(result.stdout)
-                    except json.JSONDecodeError as e:
-                        raise RuntimeError(f"Failed to parse container output: {e}\nOutput: {result.stdout}")
-
-                    # 检查工具执行结果
-                    if output.get("success"):
-                        result = output["result"]
-                        # Wrap non-dict results according to MCP protocol requirements
-                        if not isinstance(result, dict):
-                            return {"result": result}
-                        return result
-                    else:
-                        error_msg = output.get("error", "Unknown tool execution error")
-                        traceback_msg = output.get("traceback", "")
-                        raise RuntimeError(f"Tool execution error: {error_msg}\n{traceback_msg}")
-                else:
-                    logger.error(f"Tool {self.tool_name} is not safe")
-                    for violation in violations:
-                        logger.error(f"Violation: {violation.description}")
-                    raise RuntimeError(f"Tool {self.tool_name} is not safe")
-
-        except SandboxTimeoutError as e:
+                error_msg = output.get("error", "Unknown tool execution error")
+                traceback_msg = output.get("traceback", "")
+                raise RuntimeError(f"Tool execution error: {error_msg}\n{traceback_msg}")
+
+        except TimeoutError as e:
             logger.error(f"Container tool execution timed out for {self.tool_name}: {e}")
             raise RuntimeError(f"Container tool execution timed out for {self.tool_name}: {e}")
 
@@ -208,10 +151,11 @@ class ToolProxyManager:
         tool_data: dict[str, Any],
         code_content: str,
         requirements: list[str] | None = None,
+        owner: str | None = None,
     ) -> ContainerToolProxy:
         """创建工具代理"""
         tool_name = tool_data["name"]
-        proxy = ContainerToolProxy(tool_data, code_content, requirements)
+        proxy = ContainerToolProxy(tool_data, code_content, requirements, owner)
         self.proxies[tool_name] = proxy
         return proxy
 
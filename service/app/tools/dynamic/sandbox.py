@@ -0,0 +1,458 @@
+"""
+Warm sandbox pool for dynamic tool execution.
+
+Starting a sandbox (a Docker container or Kubernetes pod) and installing a
+tool's requirements takes seconds, far longer than most tool calls. This
+module keeps started sandboxes around and hands them to later calls with the
+same owner and requirements:
+
+- Sandboxes are keyed by (owner, requirements hash); code of one user never
+  runs in a sandbox that ran another user's code.
+- Each sandbox serves at most ``max_uses`` calls, and is discarded after a
+  timeout or a failure; a replacement is warmed in the background.
+- Idle sandboxes are closed after ``idle_timeout``; at most
+  ``max_idle_per_key`` are kept per key.
+- At most ``max_concurrency`` calls run at a time, each bounded by a timeout.
+
+Backends: llm-sandbox (Docker / Kubernetes) and a local subprocess backend,
+which has no isolation and is meant for development and tests only.
+
+Like ``app.infra.mcp.pool``, there is one pool per (process, event loop).
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from app.configs import configs
+from app.infra.loop_local import LoopLocal
+
+logger = logging.getLogger(__name__)
+
+# (pattern, description, severity) of code that is refused before execution
+UNSAFE_PATTERNS: list[tuple[str, str, str]] = [
+    (r"os\.system", "System command execution", "HIGH"),
+    (r"eval\s*\(", "Dynamic code evaluation", "MEDIUM"),
+]
+
+
+@dataclass
+class SandboxResult:
+    exit_code: int
+    stdout: str
+    stderr: str
+
+
+class Sandbox(Protocol):
+    def check_safety(self, code: str) -> list[str]:
+        """Return descriptions of the policy violations in ``code``."""
+        ...
+
+    async def run(self, code: str) -> SandboxResult: ...
+
+    async def close(self) -> None: ...
+
+
+class SandboxBackend(Protocol):
+    name: str
+
+    async def create(self, requirements: list[str]) -> Sandbox:
+        """Start a sandbox with ``requirements`` installed."""
+        ...
+
+
+class LlmSandbox:
+    """A started llm-sandbox session; its blocking calls run in worker threads."""
+
+    def __init__(self, session: Any) -> None:
+        self._session = session
+
+    def check_safety(self, code: str) -> list[str]:
+        is_safe, violations = self._session.is_safe(code)
+        return [] if is_safe else [violation.description for violation in violations]
+
+    async def run(self, code: str) -> SandboxResult:
+        result = await asyncio.to_thread(self._session.run, code)
+        return SandboxResult(result.exit_code, result.stdout or "", result.stderr or "")
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._session.close)
+
+
+class LlmSandboxBackend:
+    """Docker or Kubernetes sandboxes managed by llm-sandbox."""
+
+    def __init__(self, kubernetes: bool) -> None:
+        self.kubernetes = kubernetes
+        self.name = "kubernetes" if kubernetes else "docker"
+        self._policy: Any = None
+        self._k8s_api: Any = None
+
+    def _get_policy(self) -> Any:
+        if self._policy is None:
+            from llm_sandbox.security import SecurityIssueSeverity, SecurityPattern, SecurityPolicy
+
+            self._policy = SecurityPolicy(
+                severity_threshold=SecurityIssueSeverity.MEDIUM,
+                patterns=[
+                    SecurityPattern(
+                        pattern=pattern, description=description, severity=getattr(SecurityIssueSeverity, severity)
+                    )
+                    for pattern, description, severity in UNSAFE_PATTERNS
+                ],
+            )
+        return self._policy
+
+    def _session_kwargs(self) -> dict[str, Any]:
+        from llm_sandbox import SandboxBackend as LlmSandboxBackendType
+
+        dynamic_mcp_config = configs.DynamicMCP
+        if self.kubernetes:
+            if self._k8s_api is None:
+                from kubernetes import client as k8s_client
+                from kubernetes import config as k8s_config
+
+                k8s_config.load_incluster_config()
+                self._k8s_api = k8s_client.CoreV1Api()
+            return {
+                "backend": LlmSandboxBackendType.KUBERNETES,
+                "lang": "python",
+                "kube_namespace": dynamic_mcp_config.kubeNamespace,
+                "security_policy": self._get_policy(),
+                "in_cluster": True,
+                "client": self._k8s_api,
+            }
+        return {
+            "backend": LlmSandboxBackendType.DOCKER,
+            "lang": "python",
+            "keep_template": True,
+            "runtime_configs": {
+                "cpu_count": dynamic_mcp_config.cpu_count,
+                "mem_limit": dynamic_mcp_config.mem_limit,
+            },
+            "default_timeout": dynamic_mcp_config.default_timeout,
+            "security_policy": self._get_policy(),
+        }
+
+    async def create(self, requirements: list[str]) -> Sandbox:
+        from llm_sandbox import SandboxSession
+
+        session = SandboxSession(**self._session_kwargs())
+        await asyncio.to_thread(session.open)
+        try:
+            if requirements:
+                # Install once; every later run in this sandbox reuses the packages
+                result = await asyncio.to_thread(session.run, "pass", requirements)
+                if result.exit_code != 0:
+                    raise RuntimeError(f"Failed to install requirements {requirements}: {result.stderr}")
+        except BaseException:
+            await asyncio.to_thread(session.close)
+            raise
+        return LlmSandbox(session)
+
+
+class LocalSandbox:
+    """A working directory whose code runs in a plain Python subprocess."""
+
+    def __init__(self, workdir: Path) -> None:
+        self.workdir = workdir
+        self._process: asyncio.subprocess.Process | None = None
+
+    def check_safety(self, code: str) -> list[str]:
+        return [description for pattern, description, _ in UNSAFE_PATTERNS if re.search(pattern, code)]
+
+    async def run(self, code: str) -> SandboxResult:
+        script = self.workdir / "main.py"
+        script.write_text(code, encoding="utf-8")
+        env = {**os.environ, "PYTHONPATH": str(self.workdir / "site-packages")}
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(script),
+            cwd=self.workdir,
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await self._process.communicate()
+        exit_code = self._process.returncode or 0
+        self._process = None
+        return SandboxResult(exit_code, stdout.decode(errors="replace"), stderr.decode(errors="replace"))
+
+    async def close(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        await asyncio.to_thread(shutil.rmtree, self.workdir, True)
+
+
+class LocalSubprocessBackend:
+    """Sandboxes as local subprocesses. No isolation: for development and tests only."""
+
+    name = "local"
+
+    async def create(self, requirements: list[str]) -> Sandbox:
+        workdir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix="xyzen-sandbox-"))
+        sandbox = LocalSandbox(workdir)
+        if requirements:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "pip",
+                "install",
+                "--quiet",
+                "--target",
+                str(workdir / "site-packages"),
+                *requirements,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                await sandbox.close()
+                raise RuntimeError(f"Failed to install requirements {requirements}: {stderr.decode(errors='replace')}")
+        return sandbox
+
+
+@dataclass
+class PooledSandbox:
+    key: str
+    sandbox: Sandbox
+    uses: int = 0
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class SandboxPool:
+    """Pool of warm sandboxes keyed by owner and requirements."""
+
+    def __init__(
+        self,
+        backend: SandboxBackend,
+        max_uses: int = 20,
+        idle_timeout: float = 300.0,
+        max_idle_per_key: int = 2,
+        max_concurrency: int = 8,
+        call_timeout: float = 30.0,
+    ) -> None:
+        self.backend = backend
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_key = max_idle_per_key
+        self.call_timeout = call_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._idle: dict[str, deque[PooledSandbox]] = {}
+        self._warming: dict[str, int] = {}
+        self._background: set[asyncio.Task[None]] = set()
+        self._reaper_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+        # Counters exposed via get_stats()
+        self._creates = 0
+        self._reuses = 0
+        self._retired = 0
+
+    @staticmethod
+    def get_key(owner: str | None, requirements: list[str]) -> str:
+        """Build the pool key of an owner and a set of requirements."""
+        normalized = "\n".join(sorted({requirement.strip().lower() for requirement in requirements if requirement}))
+        digest = hashlib.sha256(normalized.encode()).hexdigest()[:16]
+        return f"{owner or 'anonymous'}#{digest}"
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_idle())
+
+    async def _create(self, key: str, requirements: list[str]) -> PooledSandbox:
+        started_at = time.monotonic()
+        sandbox = await self.backend.create(requirements)
+        self._creates += 1
+        logger.info(f"Started {self.backend.name} sandbox for {key} in {time.monotonic() - started_at:.2f}s")
+        return PooledSandbox(key=key, sandbox=sandbox)
+
+    async def _acquire(self, key: str, requirements: list[str]) -> PooledSandbox:
+        idle = self._idle.get(key)
+        if idle:
+            self._reuses += 1
+            return idle.pop()
+        return await self._create(key, requirements)
+
+    async def _discard(self, pooled: PooledSandbox) -> None:
+        self._retired += 1
+        try:
+            await pooled.sandbox.close()
+        except Exception as e:
+            logger.debug(f"Error closing sandbox for {pooled.key}: {e}")
+
+    async def _release(self, pooled: PooledSandbox, requirements: list[str]) -> None:
+        pooled.last_used_at = time.monotonic()
+        if pooled.uses >= self.max_uses:
+            await self._discard(pooled)
+            self._warm_in_background(pooled.key, requirements)
+            return
+        idle = self._idle.setdefault(pooled.key, deque())
+        if self._closed or len(idle) >= self.max_idle_per_key:
+            await self._discard(pooled)
+            return
+        idle.append(pooled)
+
+    def _warm_in_background(self, key: str, requirements: list[str]) -> None:
+        """Start a replacement sandbox unless the key already has enough warm ones."""
+        if self._closed or len(self._idle.get(key, ())) + self._warming.get(key, 0) >= self.max_idle_per_key:
+            return
+        self._warming[key] = self._warming.get(key, 0) + 1
+
+        async def warm() -> None:
+            try:
+                pooled = await self._create(key, requirements)
+                await self._release(pooled, requirements)
+            except Exception as e:
+                logger.warning(f"Failed to warm sandbox for {key}: {e}")
+            finally:
+                self._warming[key] -= 1
+                if not self._warming[key]:
+                    del self._warming[key]
+
+        task = asyncio.create_task(warm())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def warm(self, owner: str | None, requirements: list[str]) -> None:
+        """Start a sandbox for an owner and requirements ahead of their first call."""
+        self._ensure_reaper()
+        self._warm_in_background(self.get_key(owner, requirements), requirements)
+
+    async def execute(
+        self, code: str, requirements: list[str], owner: str | None = None, timeout: float | None = None
+    ) -> SandboxResult:
+        """
+        Run code in a warm sandbox.
+
+        Args:
+            code: Python code to run
+            requirements: Packages the code needs
+            owner: Whose code it is; sandboxes are never shared between owners
+            timeout: Seconds the call may take, ``call_timeout`` if not given
+
+        Returns:
+            Exit code and output of the run.
+
+        Raises:
+            PermissionError: If the code violates the security policy.
+            TimeoutError: If the call took longer than the timeout.
+        """
+        if self._closed:
+            raise RuntimeError("Sandbox pool is closed")
+
+        self._ensure_reaper()
+        key = self.get_key(owner, requirements)
+        timeout = timeout or self.call_timeout
+
+        async with self._semaphore:
+            pooled = await self._acquire(key, requirements)
+            violations = pooled.sandbox.check_safety(code)
+            if violations:
+                await self._release(pooled, requirements)
+                raise PermissionError(f"Code violates the sandbox security policy: {'; '.join(violations)}")
+
+            pooled.uses += 1
+            try:
+                result = await asyncio.wait_for(pooled.sandbox.run(code), timeout=timeout)
+            except BaseException:
+                # A timed out or broken sandbox may still be busy or in a bad state
+                await self._discard(pooled)
+                self._warm_in_background(key, requirements)
+                raise
+            await self._release(pooled, requirements)
+            return result
+
+    async def _reap_idle(self) -> None:
+        """Close sandboxes that have been idle longer than ``idle_timeout``."""
+        interval = max(1.0, self.idle_timeout / 2)
+        while not self._closed:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, idle in list(self._idle.items()):
+                expired = [pooled for pooled in idle if now - pooled.last_used_at >= self.idle_timeout]
+                for pooled in expired:
+                    idle.remove(pooled)
+                    await self._discard(pooled)
+                    logger.debug(f"Closed idle sandbox for {key}")
+                if not idle:
+                    self._idle.pop(key, None)
+
+    async def close(self) -> None:
+        """Close every idle sandbox and stop background tasks."""
+        self._closed = True
+        # Tasks of a finished loop are already done; only pending ones (of this loop) are awaited
+        tasks = [task for task in (self._reaper_task, *self._background) if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._reaper_task = None
+
+        idle = [pooled for pooled_list in self._idle.values() for pooled in pooled_list]
+        self._idle.clear()
+        for pooled in idle:
+            await self._discard(pooled)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            "backend": self.backend.name,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "warming": sum(self._warming.values()),
+            "creates": self._creates,
+            "reuses": self._reuses,
+            "retired": self._retired,
+        }
+
+
+def create_sandbox_backend(name: str) -> SandboxBackend:
+    """Create the sandbox backend configured by name ("auto" picks Kubernetes in prod, Docker otherwise)."""
+    if name == "auto":
+        name = "kubernetes" if configs.Env == "prod" else "docker"
+    if name == "local":
+        logger.warning("Dynamic tools run in local subprocesses without isolation; use only for development")
+        return LocalSubprocessBackend()
+    return LlmSandboxBackend(kubernetes=name == "kubernetes")
+
+
+def _create_pool() -> SandboxPool:
+    pool_config = configs.DynamicMCP.SandboxPool
+    return SandboxPool(
+        create_sandbox_backend(pool_config.Backend),
+        max_uses=pool_config.MaxUses,
+        idle_timeout=pool_config.IdleTimeout,
+        max_idle_per_key=pool_config.MaxIdlePerKey,
+        max_concurrency=pool_config.MaxConcurrency,
+        call_timeout=configs.DynamicMCP.default_timeout,
+    )
+
+
+# Pools of finished loops are closed on the next use, so their idle sandboxes don't outlive them
+_pools = LoopLocal(_create_pool, SandboxPool.close, "sandbox pool")
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Get the sandbox pool for the current process and event loop."""
+    return _pools.get()
+
+
+async def close_sandbox_pool() -> None:
+    """Close the sandbox pool bound to the current event loop, and those of finished loops."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    await _pools.close()
+    logger.info("Sandbox pool closed")
@@ -2,28 +2,89 @@
 MCP Tool Operations - Preparation, execution, and formatting of MCP tools.
 
 This module handles the client-side consumption of MCP tools:
-- prepare_mcp_tools: Load tool definitions from MCP servers
-- execute_tool_call: Execute a tool via MCP client
-- call_mcp_tool: Low-level MCP client call
+- load_mcp_tool_index: Resolve tool names to their MCP servers from cached catalogs
+- prepare_mcp_tools: Load tool definitions from cached MCP server catalogs
+- execute_bound_tool_call: Execute an already-resolved tool via MCP client
+- execute_tool_call: Resolve and execute a tool via MCP client
+- call_mcp_tool: Low-level MCP client call (over pooled sessions, see app.infra.mcp)
 - format_tool_result: Format results for display/logging
 """
 
 import asyncio
 import json
 import logging
+from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.mcp import async_check_mcp_server_status
+from app.core.mcp_catalog import get_mcp_catalog_cache
 from app.models.agent import Agent
 from app.models.mcp import McpServer
-from app.repos.mcp import McpRepository
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class McpToolBinding:
+    """An MCP tool resolved to the server that provides it."""
+
+    name: str
+    description: str
+    input_schema: dict[str, Any]
+    server_id: UUID
+    server_url: str
+    server_token: str | None
+
+
+async def load_mcp_tool_index(
+    db: AsyncSession, agent: Agent | None, session_id: UUID | None = None
+) -> dict[str, McpToolBinding]:
+    """
+    Resolve every MCP tool available to an agent/session to its server.
+
+    Agent-level servers take precedence over session-level ones when tool
+    names collide, matching the lookup order of ``execute_tool_call``.
+
+    Args:
+        db: Database session
+        agent: Agent instance (optional)
+        session_id: Session UUID (optional)
+
+    Returns:
+        Mapping of tool name to McpToolBinding
+    """
+    index: dict[str, McpToolBinding] = {}
+    all_mcp_servers = await _load_mcp_servers(db, agent, session_id)
+    if not all_mcp_servers:
+        return index
+
+    # Extract tools from cached catalogs (stale entries are refreshed in the background)
+    unique_servers = list({server.id: server for server in all_mcp_servers}.values())
+    catalogs = await get_mcp_catalog_cache().get_catalogs(unique_servers)
+
+    for server, catalog in zip(unique_servers, catalogs):
+        if not catalog.tools or catalog.status != "online":
+            continue
+        for tool in catalog.tools:
+            tool_name = tool.get("name", "")
+            if tool_name in index:
+                continue
+            index[tool_name] = McpToolBinding(
+                name=tool_name,
+                description=tool.get("description", ""),
+                input_schema=tool.get("inputSchema", {}),
+                server_id=server.id,
+                server_url=server.url,
+                server_token=server.token,
+            )
+    if index:
+        logger.info(f"Using {len(index)} tools from {len(unique_servers)} MCP servers")
+
+    return index
+
+
 async def prepare_mcp_tools(
     db: AsyncSession, agent: Agent | None, session_id: UUID | None = None
 ) -> list[dict[str, Any]]:
@@ -38,8 +99,16 @@ async def prepare_mcp_tools(
     Returns:
         List of Tool definitions
     """
-    tools: list[dict[str, Any]] = []
-    all_mcp_servers = []
+    index = await load_mcp_tool_index(db, agent, session_id)
+    return [
+        {"name": binding.name, "description": binding.description, "parameters": binding.input_schema}
+        for binding in index.values()
+    ]
+
+
+async def _load_mcp_servers(db: AsyncSession, agent: Any, session_id: Any) -> list[McpServer]:
+    """Load agent-level servers followed by session-level servers."""
+    all_mcp_servers: list[McpServer] = []
 
     # 1. Load agent-level MCP servers
     if agent:
@@ -53,8 +122,6 @@ async def prepare_mcp_tools(
 
     # 2. Load session-level MCP servers (e.g., search engines)
     if session_id:
-        from uuid import UUID
-
         from app.repos.session import SessionRepository
 
         # Convert session_id to UUID if it's a string
@@ -67,41 +134,57 @@ async def prepare_mcp_tools(
             all_mcp_servers.extend(session_mcp_servers)
             logger.info(f"Loaded {len(session_mcp_servers)} session-level MCP servers")
 
-    # 3. Update status and extract tools from all MCP servers
-    if all_mcp_servers:
-        logger.info(f"Updating {len(all_mcp_servers)} MCP server tools before generating response...")
-        mcp_repo = McpRepository(db)
-
-        # Update server status for all servers
-        update_tasks = []
-        for server in all_mcp_servers:
-            update_tasks.append(async_check_mcp_server_status(server.id))
-        await asyncio.gather(*update_tasks, return_exceptions=True)
-        logger.info("MCP server tools updated")
-
-        # Get refreshed servers using repository
-        refreshed_servers = []
-        for server in all_mcp_servers:
-            refreshed_server = await mcp_repo.get_mcp_server_by_id(server.id)
-            if refreshed_server:
-                refreshed_servers.append(refreshed_server)
-
-        # Extract tools from online servers
-        for server in refreshed_servers:
-            if server.tools and server.status == "online":
-                for tool in server.tools:
-                    schema = tool.get("inputSchema", {})
-
-                    standard_tool = {
-                        "name": tool.get("name", ""),
-                        "description": tool.get("description", ""),
-                        "parameters": schema,
-                    }
-                    tools.append(standard_tool)
-        if tools:
-            logger.info(f"Using {len(tools)} tools from {len(refreshed_servers)} MCP servers")
-
-    return tools
+    return all_mcp_servers
+
+
+def _inject_knowledge_set_id(binding: McpToolBinding, args_dict: dict[str, Any], agent: Any) -> None:
+    """Inject the agent's knowledge_set_id into args for tools whose schema declares it."""
+    # TODO: Add better logic for knowledge_set_id filtering
+    if "knowledge_set_id" not in binding.input_schema.get("properties", {}):
+        return
+
+    if not agent:
+        logger.warning("No agent context available for injection!")
+        return
+
+    ks_id = getattr(agent, "knowledge_set_id", None)
+    if ks_id:
+        args_dict["knowledge_set_id"] = str(ks_id)
+        logger.info(f"Injected knowledge_set_id: {ks_id} into args for tool '{binding.name}'")
+    else:
+        logger.warning(f"Agent {agent.id} has NO knowledge_set_id bound!")
+
+
+async def execute_bound_tool_call(binding: McpToolBinding, args_dict: dict[str, Any], agent: Any = None) -> Any:
+    """
+    Execute a tool whose server was already resolved by ``load_mcp_tool_index``.
+
+    This is the hot path used by prepared agent tools: no database access.
+
+    Args:
+        binding: Resolved tool binding
+        args_dict: Tool arguments
+        agent: Agent instance (optional, for knowledge_set_id injection)
+
+    Returns:
+        Tool execution result (Any type, preserving structure)
+    """
+    from app.core.chat.tool_progress import get_tool_progress_handler
+
+    logger.info(f"Executing tool '{binding.name}' with arguments: {args_dict}")
+    _inject_knowledge_set_id(binding, args_dict, agent)
+    try:
+        # Return raw result (could be dict, list, str) to preserve structure
+        return await call_mcp_tool_at(
+            binding.server_url,
+            binding.server_token,
+            binding.name,
+            args_dict,
+            progress_handler=get_tool_progress_handler(binding.name),
+        )
+    except Exception as exec_error:
+        logger.error(f"MCP tool execution failed: {exec_error}")
+        return f"Error executing tool '{binding.name}': {exec_error}"
 
 
 async def execute_tool_call(
@@ -110,6 +193,9 @@ async def execute_tool_call(
     """
     Execute a tool call by searching in both agent-level and session-level MCP servers.
 
+    Prefer ``execute_bound_tool_call`` with an index built once per turn; this
+    resolves the tool from scratch on every call.
+
     Args:
         db: Database session
         tool_name: Name of the tool to execute
@@ -125,91 +211,55 @@ async def execute_tool_call(
             args_dict = json.loads(tool_args) if tool_args else {}
         except json.JSONDecodeError:
             return f"Error: Invalid JSON arguments for tool '{tool_name}'"
-        logger.info(f"Executing tool '{tool_name}' with arguments: {args_dict}")
-
-        all_mcp_servers: list[McpServer] = []
-
-        # 1. Load agent-level MCP servers
-        if agent:
-            from app.repos.agent import AgentRepository
-
-            agent_repo = AgentRepository(db)
-            agent_mcp_servers = await agent_repo.get_agent_mcp_servers(agent.id)
-            if agent_mcp_servers:
-                all_mcp_servers.extend(agent_mcp_servers)
-
-        # 2. Load session-level MCP servers
-        if session_id:
-            from uuid import UUID
-
-            from app.repos.session import SessionRepository
-
-            # Convert session_id to UUID if it's a string
-            if isinstance(session_id, str):
-                session_id = UUID(session_id)
-
-            session_repo = SessionRepository(db)
-            session_mcp_servers = await session_repo.get_session_mcp_servers(session_id)
-            if session_mcp_servers:
-                all_mcp_servers.extend(session_mcp_servers)
-
-        # 3. Search for the tool in all MCP servers
-        if all_mcp_servers:
-            mcp_repo = McpRepository(db)
-
-            for server in all_mcp_servers:
-                refreshed_server = await mcp_repo.get_mcp_server_by_id(server.id)
-                if refreshed_server and refreshed_server.tools and refreshed_server.status == "online":
-                    for tool in refreshed_server.tools:
-                        if tool.get("name") == tool_name:
-                            # TODO: Add better logic for knowledge_set_id filtering
-                            input_schema = tool.get("inputSchema", {})
-
-                            # Debug logging
-                            logger.info(
-                                f"Checking tool '{tool_name}' for injection. Schema props: {list(input_schema.get('properties', {}).keys())}"
-                            )
-
-                            if "knowledge_set_id" in input_schema.get("properties", {}):
-                                logger.info(f"Tool '{tool_name}' requires knowledge_set_id.")
-                                if agent:
-                                    ks_id = getattr(agent, "knowledge_set_id", None)
-                                    logger.info(f"Agent found. Knowledge Set ID: {ks_id}")
-                                    if ks_id:
-                                        args_dict["knowledge_set_id"] = str(ks_id)
-                                        logger.info(f"Injected knowledge_set_id: {ks_id} into args")
-                                    else:
-                                        logger.warning(f"Agent {agent.id} has NO knowledge_set_id bound!")
-                                else:
-                                    logger.warning("No agent context available for injection!")
-                            else:
-                                logger.info(f"Tool '{tool_name}' does NOT require knowledge_set_id.")
-
-                            try:
-                                result = await call_mcp_tool(refreshed_server, tool_name, args_dict)
-                                # Return raw result (could be dict, list, str) to preserve structure
-                                return result
-                            except Exception as exec_error:
-                                logger.error(f"MCP tool execution failed: {exec_error}")
-                                return f"Error executing tool '{tool_name}': {exec_error}"
-        return f"Tool '{tool_name}' not found or server not available"
+
+        index = await load_mcp_tool_index(db, agent, session_id)
+        binding = index.get(tool_name)
+        if binding is None:
+            return f"Tool '{tool_name}' not found or server not available"
+        return await execute_bound_tool_call(binding, args_dict, agent)
     except Exception as e:
         logger.error(f"Tool execution error: {e}")
         return f"Error: {e}"
 
 
 async def call_mcp_tool(server: McpServer, tool_name: str, args_dict: dict[str, Any]) -> Any:
+    """Call a tool on an MCP server."""
+    return await call_mcp_tool_at(server.url, server.token, tool_name, args_dict)
+
+
+async def call_mcp_tool_at(
+    url: str,
+    token: str | None,
+    tool_name: str,
+    args_dict: dict[str, Any],
+    progress_handler: Any = None,
+) -> Any:
+    """
+    Call a tool on the MCP server at ``url``.
+
+    Uses a pooled, already-initialized session for the server when the client
+    pool is enabled, so repeated calls skip the connect + initialize handshake.
+    ``progress_handler`` receives the tool's progress notifications, if any.
+    """
     try:
         from fastmcp import Client
         from fastmcp.client.auth import BearerAuth
 
-        logger.info(f"Calling MCP tool '{tool_name}' on server {server.url}")
-        auth = BearerAuth(server.token) if server.token else None
-        client = Client(server.url, auth=auth)
-        async with client:
-            result = await client.call_tool(tool_name, args_dict)
-            logger.info(f"MCP tool '{tool_name}' returned: {result}")
-            return result.content
+        from app.configs import configs
+        from app.infra.mcp import get_mcp_client_pool
+
+        logger.info(f"Calling MCP tool '{tool_name}' on server {url}")
+        if configs.MCP.ClientPool.Enabled:
+            result = await get_mcp_client_pool().call_tool(
+                url, token, tool_name, args_dict, progress_handler=progress_handler
+            )
+        else:
+            auth = BearerAuth(token) if token else None
+            client = Client(url, auth=auth)
+            async with client:
+                result = await client.call_tool(tool_name, args_dict, progress_handler=progress_handler)
+        logger.info(f"MCP tool '{tool_name}' returned: {result}")
+        return result.content
     except ImportError:
         logger.warning(f"MCP integration not available, mocking tool '{tool_name}' result")
         return f"Mock result for tool '{tool_name}' with args {args_dict}"
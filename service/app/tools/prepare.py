@@ -10,7 +10,6 @@ Single entry point for assembling tools based on:
 from __future__ import annotations
 
 import base64
-import json
 import logging
 from typing import TYPE_CHECKING, Any
 
@@ -22,6 +21,7 @@ if TYPE_CHECKING:
     from uuid import UUID
 
     from app.models.agent import Agent
+    from app.tools.mcp import McpToolBinding
 
 logger = logging.getLogger(__name__)
 
@@ -161,6 +161,9 @@ async def _load_mcp_tools(
     """
     Load MCP tools from agent configuration.
 
+    The tool-to-server index is resolved once here; the resulting tools call
+    their server directly without touching the database.
+
     Args:
         db: Database session
         agent: Agent instance
@@ -169,67 +172,48 @@ async def _load_mcp_tools(
     Returns:
         List of MCP tools as LangChain BaseTool instances
     """
-    from app.tools.mcp import prepare_mcp_tools
+    from app.tools.mcp import load_mcp_tool_index
 
     langchain_tools: list[BaseTool] = []
 
-    mcp_tools = await prepare_mcp_tools(db, agent, session_id)
-
-    for tool in mcp_tools:
-        tool_name = tool.get("name", "")
-        tool_description = tool.get("description", "")
-        tool_parameters = tool.get("parameters", {})
+    tool_index = await load_mcp_tool_index(db, agent, session_id)
 
-        structured_tool = await _create_structured_tool(
-            tool_name=tool_name,
-            tool_description=tool_description,
-            tool_parameters=tool_parameters,
-            db=db,
-            agent=agent,
-            session_id=session_id,
-        )
+    for binding in tool_index.values():
+        structured_tool = await _create_structured_tool(binding=binding, agent=agent)
         langchain_tools.append(structured_tool)
 
     return langchain_tools
 
 
 async def _create_structured_tool(
-    tool_name: str,
-    tool_description: str,
-    tool_parameters: dict[str, Any],
-    db: AsyncSession,
+    binding: "McpToolBinding",
     agent: "Agent | None",
-    session_id: Any,
 ) -> StructuredTool:
     """
     Create a LangChain StructuredTool from MCP tool definition.
 
     Args:
-        tool_name: Name of the tool
-        tool_description: Tool description for the LLM
-        tool_parameters: JSON schema defining tool parameters
-        db: Database session
+        binding: MCP tool resolved to its server
         agent: Agent instance
-        session_id: Session UUID
 
     Returns:
         StructuredTool instance
     """
-    properties = tool_parameters.get("properties", {})
-    required = tool_parameters.get("required", [])
+    properties = binding.input_schema.get("properties", {})
+    required = binding.input_schema.get("required", [])
 
     # Build Pydantic field definitions for create_model
     field_definitions = _build_field_definitions(properties, required)
 
     # Create dynamic Pydantic model
-    ArgsSchema = create_model(f"{tool_name}Args", **field_definitions)
+    ArgsSchema = create_model(f"{binding.name}Args", **field_definitions)
 
     # Create tool execution function
-    tool_func = await _make_tool_executor(tool_name, db, agent, session_id)
+    tool_func = await _make_tool_executor(binding, agent)
 
     return StructuredTool(
-        name=tool_name,
-        description=tool_description,
+        name=binding.name,
+        description=binding.description,
         args_schema=ArgsSchema,
         coroutine=tool_func,
     )
@@ -283,30 +267,25 @@ def _build_field_definitions(
 
 
 async def _make_tool_executor(
-    tool_name: str,
-    db: AsyncSession,
+    binding: "McpToolBinding",
     agent: "Agent | None",
-    session_id: Any,
 ) -> Any:
     """
     Create an async tool execution function with closure over tool context.
 
     Args:
-        tool_name: Name of the tool
-        db: Database session
+        binding: MCP tool resolved to its server
         agent: Agent instance
-        session_id: Session UUID
 
     Returns:
         Async function that executes the tool
     """
-    from app.tools.mcp import execute_tool_call
+    from app.tools.mcp import execute_bound_tool_call
 
     async def tool_func(**kwargs: Any) -> Any:
         """Execute the tool with given arguments."""
         try:
-            args_json = json.dumps(kwargs)
-            result = await execute_tool_call(db, tool_name, args_json, agent, session_id)
+            result = await execute_bound_tool_call(binding, dict(kwargs), agent)
 
             # Format result for AI consumption
             if isinstance(result, list):
@@ -315,7 +294,7 @@ async def _make_tool_executor(
             return result
 
         except Exception as e:
-            logger.error(f"Tool {tool_name} execution failed: {e}")
+            logger.error(f"Tool {binding.name} execution failed: {e}")
             return f"Error: {e}"
 
     return tool_func
@@ -26,6 +26,9 @@ logger = logging.getLogger(__name__)
 
 ReadMode = Literal["text", "image"]
 
+# Bump when text extraction output changes, so cached extractions are rebuilt
+EXTRACTION_VERSION = 1
+
 
 class BaseFileHandler(abc.ABC):
     """Abstract base handler for file operations."""
@@ -44,6 +47,19 @@ class BaseFileHandler(abc.ABC):
         """
         pass
 
+    def read_pages(self, file_bytes: bytes) -> list[str]:
+        """
+        Reads the text of a file split into pages (PDF pages, sheets, slides).
+
+        Args:
+            file_bytes: The raw file content.
+
+        Returns:
+            Text of each page; formats without pages are a single page.
+        """
+        content = self.read_content(file_bytes, mode="text")
+        return [content] if isinstance(content, str) else []
+
     @abc.abstractmethod
     def create_content(self, text_content: str) -> bytes:
         """
@@ -338,23 +354,37 @@ class PdfFileHandler(BaseFileHandler):
             return images
 
         # Text mode with table extraction
-        text_parts: list[str] = []
-        for page in doc:
-            # Try table extraction first
-            try:
-                tables = page.find_tables()  # type: ignore[attr-defined]
-                if tables and tables.tables:
-                    for table in tables.tables:
-                        text_parts.append(self._format_table(table))
-            except Exception:
-                pass  # Table extraction not available or failed
-
-            # Get text with layout preservation
-            text: str = page.get_text("text", sort=True)  # type: ignore[attr-defined]
-            if text.strip():
-                text_parts.append(text)
+        return "\n\n".join(part for page in doc for part in self._page_text_parts(page))
 
-        return "\n\n".join(text_parts)
+    def read_pages(self, file_bytes: bytes) -> list[str]:
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            raise ImportError("PyMuPDF (fitz) is required for PDF handling. Please install 'pymupdf'.")
+
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            return [
+                "\n\n".join([f"--- Page {i + 1} ---", *self._page_text_parts(doc.load_page(i))])
+                for i in range(doc.page_count)
+            ]
+
+    def _page_text_parts(self, page: Any) -> list[str]:
+        """Extract the tables and text of a PDF page."""
+        text_parts: list[str] = []
+        # Try table extraction first
+        try:
+            tables = page.find_tables()
+            if tables and tables.tables:
+                for table in tables.tables:
+                    text_parts.append(self._format_table(table))
+        except Exception:
+            pass  # Table extraction not available or failed
+
+        # Get text with layout preservation
+        text: str = page.get_text("text", sort=True)
+        if text.strip():
+            text_parts.append(text)
+        return text_parts
 
     def _format_table(self, table: Any) -> str:
         """Format a PyMuPDF table as text."""
@@ -639,6 +669,9 @@ class ExcelFileHandler(BaseFileHandler):
         if mode == "image":
             raise ValueError("Excel files cannot be read as images.")
 
+        return "\n".join(self.read_pages(file_bytes))
+
+    def read_pages(self, file_bytes: bytes) -> list[str]:
         try:
             import openpyxl
         except ImportError:
@@ -647,16 +680,17 @@ class ExcelFileHandler(BaseFileHandler):
         buffer = io.BytesIO(file_bytes)
         wb = openpyxl.load_workbook(buffer, read_only=True, data_only=True)
 
-        text_parts: list[str] = []
+        pages: list[str] = []
         for sheet_name in wb.sheetnames:
             ws = wb[sheet_name]
-            text_parts.append(f"--- Sheet: {sheet_name} ---")
+            text_parts = [f"--- Sheet: {sheet_name} ---"]
             for row in ws.iter_rows(values_only=True):
                 row_text = "\t".join([str(cell) for cell in row if cell is not None])
                 if row_text:
                     text_parts.append(row_text)
+            pages.append("\n".join(text_parts))
 
-        return "\n".join(text_parts)
+        return pages
 
     def create_content(self, text_content: str) -> bytes:
         """Create XLSX from text or SpreadsheetSpec JSON."""
@@ -760,6 +794,9 @@ class PptxFileHandler(BaseFileHandler):
         if mode == "image":
             raise ValueError("PPTX files cannot be read as images.")
 
+        return "\n".join(self.read_pages(file_bytes))
+
+    def read_pages(self, file_bytes: bytes) -> list[str]:
         try:
             from pptx import Presentation
         except ImportError:
@@ -768,9 +805,9 @@ class PptxFileHandler(BaseFileHandler):
         buffer = io.BytesIO(file_bytes)
         prs = Presentation(buffer)
 
-        text_parts: list[str] = []
+        pages: list[str] = []
         for i, slide in enumerate(prs.slides):
-            text_parts.append(f"--- Slide {i + 1} ---")
+            text_parts = [f"--- Slide {i + 1} ---"]
             for shape in slide.shapes:
                 if hasattr(shape, "text") and shape.text:  # type: ignore[union-attr]
                     text_parts.append(str(shape.text))  # type: ignore[union-attr]
@@ -780,8 +817,9 @@ class PptxFileHandler(BaseFileHandler):
                 notes = slide.notes_slide.notes_text_frame.text
                 if notes and notes.strip():
                     text_parts.append(f"[Notes: {notes.strip()}]")
+            pages.append("\n".join(text_parts))
 
-        return "\n".join(text_parts)
+        return pages
 
     def create_content(self, text_content: str) -> bytes:
         """Create PPTX from text or PresentationSpec JSON."""
@@ -183,8 +183,15 @@ class ImageFetcher:
             storage = get_storage_service()
             buffer = io.BytesIO()
 
+            async def download() -> None:
+                try:
+                    await storage.download_file(storage_key, buffer)
+                finally:
+                    # The loop ends with this call, so don't leave its S3 client open
+                    await storage.close()
+
             # Run async download in sync context
-            _run_async(storage.download_file(storage_key, buffer))
+            _run_async(download())
 
             data = buffer.getvalue()
             if len(data) > self.max_size_bytes:
@@ -2,11 +2,15 @@
 
 import logging
 from datetime import datetime, timezone
+from uuid import UUID
 
 from sqlmodel import col, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.storage import StorageServiceProto, get_storage_service
+from app.core.attachment_cache import get_attachment_cache
+from app.core.document_text import extracted_text_prefix
+from app.core.office_preview import preview_storage_prefix
+from app.core.storage import StorageServiceProto, get_storage_service, is_blob_storage_key
 from app.models.file import File
 from app.models.message import Message
 from app.repos.file import FileRepository
@@ -79,7 +83,8 @@ async def cleanup_orphaned_files(
 
     # Delete orphaned files
     if orphaned_files:
-        storage_keys = [file.storage_key for file in orphaned_files]
+        # Shared content-addressed blobs are removed by cleanup_unreferenced_blobs
+        storage_keys = [file.storage_key for file in orphaned_files if not is_blob_storage_key(file.storage_key)]
 
         # Delete from object storage
         try:
@@ -91,15 +96,18 @@ async def cleanup_orphaned_files(
             stats["failed"] = len(storage_keys)
 
         # Delete from database
+        deleted_ids: list[UUID] = []
         for file in orphaned_files:
             try:
                 await file_repo.hard_delete_file(file.id)
+                deleted_ids.append(file.id)
                 stats["deleted_from_db"] += 1
             except Exception as e:
                 logger.error(f"Failed to delete file record {file.id}: {e}")
                 stats["failed"] += 1
 
         await db.commit()
+        await get_attachment_cache().invalidate_files(deleted_ids)
 
     logger.info(f"Orphaned files cleanup completed: {stats}")
     return stats
@@ -169,7 +177,8 @@ async def cleanup_expired_pending_files(
 
     # Delete expired files
     if expired_files:
-        storage_keys = [file.storage_key for file in expired_files]
+        # Shared content-addressed blobs are removed by cleanup_unreferenced_blobs
+        storage_keys = [file.storage_key for file in expired_files if not is_blob_storage_key(file.storage_key)]
 
         # Delete from object storage
         try:
@@ -181,15 +190,18 @@ async def cleanup_expired_pending_files(
             stats["failed"] = len(storage_keys)
 
         # Delete from database
+        deleted_ids: list[UUID] = []
         for file in expired_files:
             try:
                 await file_repo.hard_delete_file(file.id)
+                deleted_ids.append(file.id)
                 stats["deleted_from_db"] += 1
             except Exception as e:
                 logger.error(f"Failed to delete file record {file.id}: {e}")
                 stats["failed"] += 1
 
         await db.commit()
+        await get_attachment_cache().invalidate_files(deleted_ids)
 
     logger.info(f"Expired pending files cleanup completed: {stats}")
     return stats
@@ -256,7 +268,8 @@ async def cleanup_old_soft_deleted_files(
         stats["old_deleted_count"] = len(old_files)
 
         if old_files:
-            storage_keys = [file.storage_key for file in old_files]
+            # Shared content-addressed blobs are removed by cleanup_unreferenced_blobs
+            storage_keys = [file.storage_key for file in old_files if not is_blob_storage_key(file.storage_key)]
 
             # Delete from object storage
             try:
@@ -277,11 +290,121 @@ async def cleanup_old_soft_deleted_files(
     return stats
 
 
+async def cleanup_unreferenced_blobs(
+    db: AsyncSession,
+    storage: StorageServiceProto | None = None,
+    grace_hours: int = 24,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """
+    Garbage-collect content-addressed blobs that no file record references anymore.
+
+    A blob's references are the file records (including soft-deleted ones, which
+    can still be restored) sharing its storage key. Blobs used within the grace
+    period are kept so an upload that is just reusing one is not raced. Each
+    blob is locked and rechecked, and its object is deleted while the lock is
+    held, before its record deletion is committed; uploads insert the record
+    before uploading, so they wait for the collection to finish. Cached office
+    previews of a collected blob's content are deleted with it.
+
+    Args:
+        db: Database session
+        storage: Storage service instance (will create one if not provided)
+        grace_hours: Hours a blob must have been unused before it can be collected
+        dry_run: If True, only count unreferenced blobs without deleting them
+
+    Returns:
+        Dictionary with statistics:
+        - unreferenced_count: Number of unreferenced blobs found
+        - deleted_from_storage: Number of blobs deleted from object storage
+        - deleted_from_db: Number of blob records deleted from database
+        - skipped: Number of blobs reused or locked by an upload since they were found
+        - failed: Number of blobs that failed to delete
+    """
+    logger.info(f"Starting unreferenced blobs cleanup (grace_hours={grace_hours}, dry_run={dry_run})")
+
+    stats = {
+        "unreferenced_count": 0,
+        "deleted_from_storage": 0,
+        "deleted_from_db": 0,
+        "skipped": 0,
+        "failed": 0,
+    }
+
+    # Get storage service
+    if storage is None:
+        storage = get_storage_service()
+
+    file_repo = FileRepository(db)
+
+    cutoff_time = datetime.now(timezone.utc).timestamp() - (grace_hours * 3600)
+    cutoff_datetime = datetime.fromtimestamp(cutoff_time, tz=timezone.utc)
+
+    blobs = await file_repo.get_unreferenced_blobs(cutoff_datetime)
+    stats["unreferenced_count"] = len(blobs)
+    logger.info(f"Found {len(blobs)} unreferenced blobs")
+
+    if dry_run:
+        logger.info("Dry run mode - not deleting blobs")
+        return stats
+
+    # Read before the per-blob commits expire the instances
+    candidates = [(blob.file_hash, blob.storage_key) for blob in blobs]
+    for file_hash, storage_key in candidates:
+        # Lock the row and recheck it: an upload may have reused the blob since it was listed.
+        # The object is deleted while the row lock is held and before the deletion commits, so
+        # an upload of the same content (which locks or inserts the row first) waits for it and
+        # then stores the content again.
+        try:
+            blob = await file_repo.lock_unreferenced_blob(file_hash, cutoff_datetime)
+            if blob is None:
+                await db.rollback()
+                stats["skipped"] += 1
+                continue
+            await file_repo.delete_blob(blob)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Failed to delete blob record {file_hash}: {e}")
+            stats["failed"] += 1
+            continue
+
+        try:
+            await storage.delete_file(storage_key)
+        except Exception as e:
+            # Keep the record, so the blob is retried on the next run
+            await db.rollback()
+            logger.error(f"Failed to delete blob {storage_key} from storage: {e}")
+            stats["failed"] += 1
+            continue
+        stats["deleted_from_storage"] += 1
+
+        try:
+            await db.commit()
+            stats["deleted_from_db"] += 1
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Failed to commit deletion of blob record {file_hash} after deleting its object: {e}")
+            stats["failed"] += 1
+            continue
+
+        # Cached office previews and extracted text are keyed by content hash; they go with the blob
+        for prefix in (preview_storage_prefix(file_hash), extracted_text_prefix(file_hash)):
+            try:
+                cached = await storage.list_files(prefix=prefix)
+                await storage.delete_files([obj["key"] for obj in cached])
+            except Exception as e:
+                logger.warning(f"Failed to delete cached {prefix} of blob {file_hash}: {e}")
+
+    logger.info(f"Unreferenced blobs cleanup completed: {stats}")
+    return stats
+
+
 async def run_full_cleanup(
     db: AsyncSession,
     storage: StorageServiceProto | None = None,
     expiration_hours: int = 24,
     retention_days: int = 30,
+    blob_grace_hours: int = 24,
     dry_run: bool = False,
 ) -> dict[str, dict[str, int]]:
     """
@@ -292,6 +415,7 @@ async def run_full_cleanup(
         storage: Storage service instance (will create one if not provided)
         expiration_hours: Hours after which pending files expire
         retention_days: Days to keep soft-deleted files
+        blob_grace_hours: Hours an unreferenced blob must have been unused before collection
         dry_run: If True, only report without deleting
 
     Returns:
@@ -310,5 +434,8 @@ async def run_full_cleanup(
     # Cleanup old soft-deleted files
     results["old_soft_deleted_files"] = await cleanup_old_soft_deleted_files(db, storage, retention_days, dry_run)
 
+    # Garbage-collect content-addressed blobs released by the steps above
+    results["unreferenced_blobs"] = await cleanup_unreferenced_blobs(db, storage, blob_grace_hours, dry_run)
+
     logger.info(f"Full cleanup completed: {results}")
     return results
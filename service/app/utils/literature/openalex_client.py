@@ -6,17 +6,26 @@ Implements the best practices from OpenAlex API guide:
 - Rate limiting with mailto parameter (10 req/s)
 - Exponential backoff retry for errors
 - Batch queries with pipe separator (up to 50 IDs)
-- Maximum page size (200 per page)
+- Maximum page size (200 per page), remaining pages fetched concurrently
+- Cursor paging beyond the page-number limit
+- TTL caches for name -> ID resolution and for repeated searches
 - Abstract reconstruction from inverted index
 """
 
 import asyncio
+import dataclasses
+import json
 import logging
+import math
 import random
+import time
+from collections import OrderedDict
 from typing import Any
 
 import httpx
 
+from app.infra.loop_local import LoopLocal
+
 from .base_client import BaseLiteratureClient
 from .doi_cleaner import normalize_doi
 from .models import LiteratureWork, SearchRequest
@@ -61,6 +70,42 @@ class _RateLimiter:
             self._last_request = asyncio.get_running_loop().time()
 
 
+class _TTLCache:
+    """Small LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a name or query, used in cache keys."""
+    return " ".join(text.casefold().split())
+
+
 class OpenAlexClient(BaseLiteratureClient):
     """
     OpenAlex API client
@@ -73,8 +118,21 @@ class OpenAlexClient(BaseLiteratureClient):
     MAX_PER_PAGE = 200
     MAX_RETRIES = 5
     TIMEOUT = 30.0
-
-    def __init__(self, email: str | None, rate_limit: int | None = None, timeout: float = 30.0) -> None:
+    # OpenAlex serves page-number paging only for the first 10,000 results
+    PAGE_PAGING_LIMIT = 10_000
+    # Author/institution/source IDs are stable, so name lookups can be kept long
+    ENTITY_CACHE_TTL = 24 * 3600.0
+    SEARCH_CACHE_TTL = 600.0
+    CACHE_MAX_ENTRIES = 512
+
+    def __init__(
+        self,
+        email: str | None,
+        rate_limit: int | None = None,
+        timeout: float = 30.0,
+        entity_cache_ttl: float = ENTITY_CACHE_TTL,
+        search_cache_ttl: float = SEARCH_CACHE_TTL,
+    ) -> None:
         """
         Initialize OpenAlex client
 
@@ -82,12 +140,17 @@ class OpenAlexClient(BaseLiteratureClient):
             email: Email for polite pool (10x rate limit increase). If None, use default pool.
             rate_limit: Requests per second (default: 10 with email, 1 without email)
             timeout: Request timeout in seconds (default: 30.0)
+            entity_cache_ttl: Seconds to keep name -> ID resolutions (0 disables)
+            search_cache_ttl: Seconds to keep search results (0 disables)
         """
         self.email = email
         self.rate_limit = rate_limit or (10 if self.email else 1)
         max_concurrency = 10 if self.email else 1
         self.rate_limiter = _RateLimiter(rate_per_second=self.rate_limit, max_concurrency=max_concurrency)
         self.client = httpx.AsyncClient(timeout=timeout)
+        self._entity_cache = _TTLCache(entity_cache_ttl, self.CACHE_MAX_ENTRIES)
+        self._search_cache = _TTLCache(search_cache_ttl, self.CACHE_MAX_ENTRIES)
+        self._inflight: dict[str, asyncio.Task[tuple[list[LiteratureWork], list[str]]]] = {}
         pool_type = "polite" if self.email else "default"
         logger.info(
             "OpenAlex client initialized with pool=%s, email=%s, rate_limit=%s/s",
@@ -105,6 +168,9 @@ class OpenAlexClient(BaseLiteratureClient):
         """
         Execute search and return results in standard format
 
+        Repeated searches (same normalized query and filters) are served from
+        a TTL cache, and concurrent identical searches share one execution.
+
         Implementation steps:
         1. Convert author name -> author ID (if specified)
         2. Convert institution name -> institution ID (if specified)
@@ -121,6 +187,34 @@ class OpenAlexClient(BaseLiteratureClient):
             - works: List of literature works in standard format
             - warnings: List of warning/info messages for LLM feedback
         """
+        key = self._get_search_key(request)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            logger.info("OpenAlex search served from cache: query=%r", request.query)
+            works, warnings = cached
+            return list(works), list(warnings)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search_and_cache(key, request))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller doesn't cancel the search others wait on
+        works, warnings = await asyncio.shield(task)
+        return list(works), list(warnings)
+
+    @staticmethod
+    def _get_search_key(request: SearchRequest) -> str:
+        """Cache key of a request: its fields with names and query normalized."""
+        fields = dataclasses.asdict(request)
+        # The data source selection is the distributor's concern, not this client's
+        fields.pop("data_sources", None)
+        for name in ("query", "author", "institution", "source"):
+            if isinstance(fields.get(name), str):
+                fields[name] = _normalize_text(fields[name])
+        return json.dumps(fields, sort_keys=True, default=str)
+
+    async def _search_and_cache(self, key: str, request: SearchRequest) -> tuple[list[LiteratureWork], list[str]]:
         logger.info(
             "OpenAlex search [%s @ %s/s]: query=%r, max_results=%d",
             self.pool_type,
@@ -130,31 +224,40 @@ class OpenAlexClient(BaseLiteratureClient):
         )
 
         warnings: list[str] = []
+        resolved = True
 
         # Step 1-3: Resolve IDs for names (two-step lookup pattern)
         author_id = None
         if request.author:
-            author_id, _success, msg = await self._resolve_author_id(request.author)
+            author_id, success, msg = await self._resolve_author_id(request.author)
+            resolved = resolved and success
             warnings.append(msg)
 
         institution_id = None
         if request.institution:
-            institution_id, _success, msg = await self._resolve_institution_id(request.institution)
+            institution_id, success, msg = await self._resolve_institution_id(request.institution)
+            resolved = resolved and success
             warnings.append(msg)
 
         source_id = None
         if request.source:
-            source_id, _success, msg = await self._resolve_source_id(request.source)
+            source_id, success, msg = await self._resolve_source_id(request.source)
+            resolved = resolved and success
             warnings.append(msg)
 
         # Step 4: Build query parameters
         params = self._build_query_params(request, author_id, institution_id, source_id)
 
         # Step 5: Fetch all pages
-        works = await self._fetch_all_pages(params, request.max_results)
+        works, complete = await self._fetch_all_pages(params, request.max_results)
 
         # Step 6: Transform to standard format
-        return [self._transform_work(w) for w in works], warnings
+        results = [self._transform_work(w) for w in works]
+
+        # Only cache full answers, so a transient failure isn't repeated for the cache TTL
+        if resolved and complete:
+            self._search_cache.set(key, (results, warnings))
+        return results, warnings
 
     def _build_query_params(
         self,
@@ -257,32 +360,25 @@ class OpenAlexClient(BaseLiteratureClient):
             - success: Whether resolution was successful
             - message: Status message for LLM feedback
         """
-        async with self.rate_limiter:
-            try:
-                url = f"{self.BASE_URL}/authors"
-                params: dict[str, str] = {"search": author_name}
-                if self.email:
-                    params["mailto"] = self.email
-                response = await self._request_with_retry(url, params)
-
-                if results := response.get("results", []):
-                    # Return first result's ID in short format
-                    author_id = results[0]["id"].split("/")[-1]
-                    author_display = results[0].get("display_name", author_name)
-                    logger.info("Resolved author %r -> %s", author_name, author_id)
-                    return author_id, True, f"✓ Author resolved: '{author_name}' -> '{author_display}'"
-                else:
-                    msg = (
-                        f"⚠️ Author '{author_name}' not found. "
-                        f"Suggestions: (1) Try full name format like 'Smith, John' or 'John Smith', "
-                        f"(2) Check spelling, (3) Try removing middle name/initial."
-                    )
-                    logger.warning(msg)
-                    return None, False, msg
-            except Exception as e:
-                msg = f"⚠️ Failed to resolve author '{author_name}': {e}"
+        try:
+            if match := await self._lookup_entity("authors", author_name):
+                # Return first result's ID in short format
+                author_id = match["id"].split("/")[-1]
+                author_display = match.get("display_name", author_name)
+                logger.info("Resolved author %r -> %s", author_name, author_id)
+                return author_id, True, f"✓ Author resolved: '{author_name}' -> '{author_display}'"
+            else:
+                msg = (
+                    f"⚠️ Author '{author_name}' not found. "
+                    f"Suggestions: (1) Try full name format like 'Smith, John' or 'John Smith', "
+                    f"(2) Check spelling, (3) Try removing middle name/initial."
+                )
                 logger.warning(msg)
                 return None, False, msg
+        except Exception as e:
+            msg = f"⚠️ Failed to resolve author '{author_name}': {e}"
+            logger.warning(msg)
+            return None, False, msg
 
     async def _resolve_institution_id(self, institution_name: str) -> tuple[str | None, bool, str]:
         """
@@ -297,32 +393,25 @@ class OpenAlexClient(BaseLiteratureClient):
             - success: Whether resolution was successful
             - message: Status message for LLM feedback
         """
-        async with self.rate_limiter:
-            try:
-                url = f"{self.BASE_URL}/institutions"
-                params: dict[str, str] = {"search": institution_name}
-                if self.email:
-                    params["mailto"] = self.email
-                response = await self._request_with_retry(url, params)
-
-                if results := response.get("results", []):
-                    institution_id = results[0]["id"].split("/")[-1]
-                    inst_display = results[0].get("display_name", institution_name)
-                    logger.info("Resolved institution %r -> %s", institution_name, institution_id)
-                    return institution_id, True, f"✓ Institution resolved: '{institution_name}' -> '{inst_display}'"
-                else:
-                    msg = (
-                        f"⚠️ Institution '{institution_name}' not found. "
-                        f"Suggestions: (1) Use full official name (e.g., 'Harvard University' not 'Harvard'), "
-                        f"(2) Try variations (e.g., 'MIT' vs 'Massachusetts Institute of Technology'), "
-                        f"(3) Check spelling."
-                    )
-                    logger.warning(msg)
-                    return None, False, msg
-            except Exception as e:
-                msg = f"⚠️ Failed to resolve institution '{institution_name}': {e}"
+        try:
+            if match := await self._lookup_entity("institutions", institution_name):
+                institution_id = match["id"].split("/")[-1]
+                inst_display = match.get("display_name", institution_name)
+                logger.info("Resolved institution %r -> %s", institution_name, institution_id)
+                return institution_id, True, f"✓ Institution resolved: '{institution_name}' -> '{inst_display}'"
+            else:
+                msg = (
+                    f"⚠️ Institution '{institution_name}' not found. "
+                    f"Suggestions: (1) Use full official name (e.g., 'Harvard University' not 'Harvard'), "
+                    f"(2) Try variations (e.g., 'MIT' vs 'Massachusetts Institute of Technology'), "
+                    f"(3) Check spelling."
+                )
                 logger.warning(msg)
                 return None, False, msg
+        except Exception as e:
+            msg = f"⚠️ Failed to resolve institution '{institution_name}': {e}"
+            logger.warning(msg)
+            return None, False, msg
 
     async def _resolve_source_id(self, source_name: str) -> tuple[str | None, bool, str]:
         """
@@ -337,74 +426,144 @@ class OpenAlexClient(BaseLiteratureClient):
             - success: Whether resolution was successful
             - message: Status message for LLM feedback
         """
-        async with self.rate_limiter:
-            try:
-                url = f"{self.BASE_URL}/sources"
-                params: dict[str, str] = {"search": source_name}
-                if self.email:
-                    params["mailto"] = self.email
-                response = await self._request_with_retry(url, params)
-
-                if results := response.get("results", []):
-                    source_id = results[0]["id"].split("/")[-1]
-                    source_display = results[0].get("display_name", source_name)
-                    logger.info("Resolved source %r -> %s", source_name, source_id)
-                    return source_id, True, f"✓ Source resolved: '{source_name}' -> '{source_display}'"
-                else:
-                    msg = (
-                        f"⚠️ Source/Journal '{source_name}' not found. "
-                        f"Suggestions: (1) Use full journal name (e.g., 'Nature' or 'Science'), "
-                        f"(2) Try alternative names (e.g., 'JAMA' vs 'Journal of the American Medical Association'), "
-                        f"(3) Check spelling."
-                    )
-                    logger.warning(msg)
-                    return None, False, msg
-            except Exception as e:
-                msg = f"⚠️ Failed to resolve source '{source_name}': {e}"
+        try:
+            if match := await self._lookup_entity("sources", source_name):
+                source_id = match["id"].split("/")[-1]
+                source_display = match.get("display_name", source_name)
+                logger.info("Resolved source %r -> %s", source_name, source_id)
+                return source_id, True, f"✓ Source resolved: '{source_name}' -> '{source_display}'"
+            else:
+                msg = (
+                    f"⚠️ Source/Journal '{source_name}' not found. "
+                    f"Suggestions: (1) Use full journal name (e.g., 'Nature' or 'Science'), "
+                    f"(2) Try alternative names (e.g., 'JAMA' vs 'Journal of the American Medical Association'), "
+                    f"(3) Check spelling."
+                )
                 logger.warning(msg)
                 return None, False, msg
+        except Exception as e:
+            msg = f"⚠️ Failed to resolve source '{source_name}': {e}"
+            logger.warning(msg)
+            return None, False, msg
+
+    async def _lookup_entity(self, entity: str, name: str) -> dict[str, Any] | None:
+        """
+        Best match for a name from an entity endpoint, cached by normalized name
 
-    async def _fetch_all_pages(self, params: dict[str, str], max_results: int) -> list[dict[str, Any]]:
+        Args:
+            entity: Endpoint name ("authors", "institutions" or "sources")
+            name: Name to search
+
+        Returns:
+            First result from the API, or None if nothing matched
+
+        Raises:
+            Exception: If the request fails (failures are not cached)
+        """
+        key = f"{entity}:{_normalize_text(name)}"
+        cached = self._entity_cache.get(key)
+        if cached is not None:
+            # An empty dict records that nothing matched
+            return cached or None
+
+        params: dict[str, str] = {"search": name}
+        if self.email:
+            params["mailto"] = self.email
+        async with self.rate_limiter:
+            response = await self._request_with_retry(f"{self.BASE_URL}/{entity}", params)
+
+        results = response.get("results", [])
+        match = results[0] if results else None
+        self._entity_cache.set(key, match or {})
+        return match
+
+    async def _fetch_page(self, params: dict[str, str]) -> dict[str, Any]:
+        """Fetch one page of works within the rate budget"""
+        async with self.rate_limiter:
+            return await self._request_with_retry(f"{self.BASE_URL}/works", params)
+
+    async def _fetch_all_pages(self, params: dict[str, str], max_results: int) -> tuple[list[dict[str, Any]], bool]:
         """
-        Paginate through all results up to max_results
+        Fetch results up to max_results
+
+        The first page tells how many results there are; the remaining pages
+        are then requested concurrently, throttled by the rate limiter. Beyond
+        the page-number limit, cursor paging is used instead.
 
         Args:
             params: Base query parameters
             max_results: Maximum number of results to fetch
 
         Returns:
-            List of work objects from API
+            Tuple of (works, complete)
+            - works: List of work objects from API
+            - complete: False if a page failed and the results are partial
         """
-        all_works: list[dict[str, Any]] = []
-        page = 1
-
-        while len(all_works) < max_results:
-            async with self.rate_limiter:
-                try:
-                    url = f"{self.BASE_URL}/works"
-                    page_params = {**params, "page": str(page)}
-                    response = await self._request_with_retry(url, page_params)
+        if max_results <= 0:
+            return [], True
 
-                    works = response.get("results", [])
-                    if not works:
-                        break
+        # Don't download 200 works when only a few are wanted
+        per_page = min(self.MAX_PER_PAGE, max_results)
+        params = {**params, "per-page": str(per_page)}
+        if max_results > self.PAGE_PAGING_LIMIT:
+            return await self._fetch_pages_by_cursor(params, max_results)
 
-                    all_works.extend(works)
-                    logger.info("Fetched page %d: %d works", page, len(works))
+        try:
+            first = await self._fetch_page({**params, "page": "1"})
+        except Exception as e:
+            logger.error(f"Error fetching page 1: {e}")
+            return [], False
+
+        all_works: list[dict[str, Any]] = list(first.get("results", []))
+        logger.info("Fetched page 1: %d works", len(all_works))
+        total_count = first.get("meta", {}).get("count", 0)
+        last_page = math.ceil(min(max_results, total_count) / per_page)
+        if not all_works or last_page <= 1:
+            return all_works[:max_results], True
+
+        responses = await asyncio.gather(
+            *(self._fetch_page({**params, "page": str(page)}) for page in range(2, last_page + 1)),
+            return_exceptions=True,
+        )
+        for page, response in enumerate(responses, start=2):
+            if isinstance(response, BaseException):
+                logger.error(f"Error fetching page {page}: {response}")
+                return all_works[:max_results], False
+            works = response.get("results", [])
+            if not works:
+                break
+            all_works.extend(works)
+            logger.info("Fetched page %d: %d works", page, len(works))
+
+        return all_works[:max_results], True
+
+    async def _fetch_pages_by_cursor(
+        self, params: dict[str, str], max_results: int
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Cursor paging for result sets beyond the page-number limit
 
-                    # Check if there are more pages
-                    meta = response.get("meta", {})
-                    total_count = meta.get("count", 0)
-                    if len(all_works) >= total_count:
-                        break
+        Each page's cursor comes with the previous page, so these pages are
+        fetched one after another.
+        """
+        all_works: list[dict[str, Any]] = []
+        cursor: str | None = "*"
 
-                    page += 1
+        while cursor and len(all_works) < max_results:
+            try:
+                response = await self._fetch_page({**params, "cursor": cursor})
+            except Exception as e:
+                logger.error(f"Error fetching cursor page after {len(all_works)} works: {e}")
+                return all_works[:max_results], False
 
-                except Exception as e:
-                    logger.error(f"Error fetching page {page}: {e}")
-                    break
+            works = response.get("results", [])
+            if not works:
+                break
+            all_works.extend(works)
+            logger.info("Fetched cursor page: %d works (%d total)", len(works), len(all_works))
+            cursor = response.get("meta", {}).get("next_cursor")
 
-        return all_works[:max_results]
+        return all_works[:max_results], True
 
     async def _request_with_retry(self, url: str, params: dict[str, str]) -> dict[str, Any]:
         """
@@ -609,3 +768,58 @@ class OpenAlexClient(BaseLiteratureClient):
         tb: Any | None,
     ) -> None:
         await self.close()
+
+
+# Long-lived clients per event loop, one per email (each email has its own polite-pool rate budget)
+_MAX_SHARED_CLIENTS = 16
+
+
+async def _close_clients(clients: OrderedDict[str | None, OpenAlexClient]) -> None:
+    while clients:
+        await clients.popitem(last=False)[1].close()
+
+
+_clients: LoopLocal[OrderedDict[str | None, OpenAlexClient]] = LoopLocal(
+    OrderedDict, _close_clients, "OpenAlex clients"
+)
+_evicted: set[asyncio.Task[None]] = set()
+
+
+async def _close_evicted(client: OpenAlexClient) -> None:
+    try:
+        await client.close()
+    except Exception as e:
+        logger.warning(f"Error closing evicted OpenAlex client: {e}")
+
+
+def get_openalex_client(email: str | None) -> OpenAlexClient:
+    """
+    Get the shared OpenAlex client for an email on the running event loop.
+
+    Sharing keeps the HTTP connection pool, rate limiter and caches across
+    searches instead of rebuilding them for every tool call. Beyond
+    ``_MAX_SHARED_CLIENTS`` emails the least recently used client is closed.
+
+    Raises:
+        RuntimeError: If no event loop is running
+    """
+    clients = _clients.get()
+    client = clients.get(email)
+    if client is not None:
+        clients.move_to_end(email)
+        return client
+    if len(clients) >= _MAX_SHARED_CLIENTS:
+        task = asyncio.get_running_loop().create_task(_close_evicted(clients.popitem(last=False)[1]))
+        _evicted.add(task)
+        task.add_done_callback(_evicted.discard)
+    client = clients[email] = OpenAlexClient(email=email)
+    return client
+
+
+async def close_openalex_clients() -> None:
+    """Close the shared OpenAlex clients of this process (application shutdown)."""
+    await _clients.close()
+    loop = asyncio.get_running_loop()
+    pending = [task for task in _evicted if task.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending)
@@ -18,24 +18,37 @@ class WorkDistributor:
     and aggregate results
     """
 
-    def __init__(self, openalex_email: str | None = None) -> None:
+    # Whether close() closes the OpenAlex client; shared long-lived ones are left open
+    owns_client: bool = True
+
+    def __init__(self, openalex_email: str | None = None, owns_client: bool = False) -> None:
         """
         Initialize distributor with available clients
 
         Args:
             openalex_email: Email for OpenAlex polite pool (required for OpenAlex)
+            owns_client: Use a private OpenAlex client closed by close() instead of
+                the shared long-lived one of the running event loop
         """
         self.clients: dict[str, Any] = {}
         self.openalex_email = openalex_email
+        self.owns_client = owns_client
         self._register_clients()
 
     def _register_clients(self) -> None:
         """Register available data source clients"""
         # Import here to avoid circular dependencies
         try:
-            from .openalex_client import OpenAlexClient
+            from .openalex_client import OpenAlexClient, get_openalex_client
 
-            self.clients["openalex"] = OpenAlexClient(email=self.openalex_email)
+            if not self.owns_client:
+                try:
+                    self.clients["openalex"] = get_openalex_client(self.openalex_email)
+                except RuntimeError:
+                    # Shared clients live on an event loop; without a running one use a private client
+                    self.owns_client = True
+            if self.owns_client:
+                self.clients["openalex"] = OpenAlexClient(email=self.openalex_email)
             logger.info("Registered OpenAlex client")
         except ImportError as e:
             logger.warning(f"Failed to register OpenAlex client: {e}")
@@ -45,8 +58,10 @@ class WorkDistributor:
         # self.clients["semantic_scholar"] = SemanticScholarClient()
 
     async def close(self) -> None:
-        """Close any underlying HTTP clients"""
-        for client in self.clients.values():
+        """Close any underlying HTTP clients, except shared long-lived ones"""
+        for name, client in self.clients.items():
+            if name == "openalex" and not self.owns_client:
+                continue
             close_method = getattr(client, "close", None)
             if callable(close_method):
                 result = close_method()
@@ -0,0 +1,106 @@
+"""
+Text normalization and ranking for full-text search.
+
+Searchable rows store their text as lowercase tokens joined by spaces, so one
+tokenizer serves every database backend: Postgres indexes the tokens with the
+``simple`` text search configuration, SQLite with FTS5. CJK text has no spaces
+between words, so each CJK character is a token and multi-character CJK query
+words are matched as phrases.
+"""
+
+import math
+import re
+from collections import Counter
+from collections.abc import Mapping, Sequence
+
+# Ideographs, kana and hangul syllables
+_CJK = r"[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]"
+_CJK_RE = re.compile(_CJK)
+_TOKEN_RE = re.compile(rf"{_CJK}|(?:(?!{_CJK})[^\W_])+")
+_WORD_RE = re.compile(rf"{_CJK}+|(?:(?!{_CJK})[^\W_])+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens (single characters for CJK)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def query_phrases(query: str) -> list[list[str]]:
+    """
+    Split a query into phrases of tokens: one token per word, one token per
+    character for runs of CJK text. Duplicate phrases are dropped.
+    """
+    phrases: dict[str, list[str]] = {}
+    for word in _WORD_RE.findall(query.lower()):
+        phrases.setdefault(word, list(word) if _CJK_RE.match(word) else [word])
+    return list(phrases.values())
+
+
+def bm25_scores(
+    terms: Sequence[str],
+    documents: Sequence[Sequence[str]],
+    total_documents: int,
+    average_length: float,
+    document_frequencies: Mapping[str, int] | None = None,
+    k1: float = BM25_K1,
+    b: float = BM25_B,
+) -> list[float]:
+    """
+    Score token lists against query terms with BM25.
+
+    ``documents`` are the candidates to score, while ``total_documents``,
+    ``average_length`` and ``document_frequencies`` (number of documents
+    containing each term) describe the whole corpus. Without
+    ``document_frequencies``, they are counted over ``documents``, which is
+    only exact when every document containing a term is among them.
+    """
+    frequencies = [Counter(document) for document in documents]
+    total_documents = max(total_documents, len(documents))
+    average_length = average_length or 1.0
+
+    idf: dict[str, float] = {}
+    for term in set(terms):
+        if document_frequencies is not None and term in document_frequencies:
+            df = document_frequencies[term]
+        else:
+            df = sum(1 for counts in frequencies if term in counts)
+        idf[term] = math.log(1 + (total_documents - df + 0.5) / (df + 0.5))
+
+    scores: list[float] = []
+    for document, counts in zip(documents, frequencies):
+        norm = k1 * (1 - b + b * len(document) / average_length)
+        score = 0.0
+        for term, weight in idf.items():
+            tf = counts.get(term, 0)
+            if tf:
+                score += weight * tf * (k1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def make_snippet(content: str, terms: Sequence[str], width: int = 240) -> str:
+    """Cut the part of a text around the first occurrence of a query term."""
+    lowered = content.lower()
+    positions = [pos for pos in (lowered.find(term) for term in terms) if pos >= 0]
+    start = max(min(positions) - width // 4, 0) if positions else 0
+    snippet = content[start : start + width].strip()
+    if start > 0:
+        snippet = f"…{snippet}"
+    if start + width < len(content):
+        snippet = f"{snippet}…"
+    return " ".join(snippet.split())
+
+
+def highlight(text: str, terms: Sequence[str], marker: str = "**") -> str:
+    """Wrap the occurrences of query terms in ``marker``; non-CJK terms only match whole words."""
+    patterns = [
+        re.escape(term) if _CJK_RE.match(term) else rf"\b{re.escape(term)}\b"
+        for term in sorted(set(terms), key=len, reverse=True)
+        if term
+    ]
+    if not patterns:
+        return text
+    return re.sub("|".join(patterns), lambda match: f"{marker}{match.group(0)}{marker}", text, flags=re.IGNORECASE)
@@ -0,0 +1,71 @@
+"""Add full-text indexed search tokens to message for memory search
+
+Revision ID: 5a8c1f3e9b72
+Revises: 9e2f4c7a1d38
+Create Date: 2026-10-16 18:42:05.118374
+
+"""
+
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a8c1f3e9b72"
+down_revision: Union[str, Sequence[str], None] = "9e2f4c7a1d38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of app.utils.text_search.tokenize as of this revision
+_CJK = r"[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]"
+_TOKEN_RE = re.compile(rf"{_CJK}|(?:(?!{_CJK})[^\W_])+")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("message", sa.Column("search_tokens", sa.Text(), nullable=True))
+
+    # Backfill existing messages; new and updated messages are tokenized on write
+    bind = op.get_bind()
+    message = sa.table(
+        "message",
+        sa.column("id", sa.Uuid()),
+        sa.column("content", sa.Text()),
+        sa.column("search_tokens", sa.Text()),
+    )
+    update = (
+        message.update().where(message.c.id == sa.bindparam("message_id")).values(search_tokens=sa.bindparam("tokens"))
+    )
+    last_id = None
+    while True:
+        statement = sa.select(message.c.id, message.c.content).order_by(message.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            statement = statement.where(message.c.id > last_id)
+        rows = bind.execute(statement).all()
+        if not rows:
+            break
+        bind.execute(update, [{"message_id": row.id, "tokens": " ".join(_tokenize(row.content or ""))} for row in rows])
+        last_id = rows[-1].id
+
+    # Full-text index; the expression must match app.infra.database.fts.full_text_match
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_message_search_tokens_fts ON message "
+            "USING gin (to_tsvector('simple'::regconfig, search_tokens))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_message_search_tokens_fts")
+    op.drop_column("message", "search_tokens")
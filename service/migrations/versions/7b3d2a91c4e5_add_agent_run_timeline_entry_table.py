@@ -0,0 +1,45 @@
+"""Add agentruntimelineentry table
+
+Revision ID: 7b3d2a91c4e5
+Revises: 90e892e60144
+Create Date: 2026-10-16 10:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3d2a91c4e5"
+down_revision: Union[str, Sequence[str], None] = "90e892e60144"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "agentruntimelineentry",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("agent_run_id", sa.Uuid(), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("event_type", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("node_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("entry", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("agent_run_id", "seq", name="uq_agent_run_timeline_seq"),
+    )
+    op.create_index(
+        op.f("ix_agentruntimelineentry_agent_run_id"), "agentruntimelineentry", ["agent_run_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_agentruntimelineentry_agent_run_id"), table_name="agentruntimelineentry")
+    op.drop_table("agentruntimelineentry")
@@ -0,0 +1,61 @@
+"""Add file content index tables for knowledge set full-text search
+
+Revision ID: 9e2f4c7a1d38
+Revises: c41e8d27b9f3
+Create Date: 2026-10-16 16:21:47.503112
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e2f4c7a1d38"
+down_revision: Union[str, Sequence[str], None] = "c41e8d27b9f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "filecontentchunk",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("file_id", sa.Uuid(), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("tokens", sa.Text(), nullable=False),
+        sa.Column("token_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("file_id", "chunk_index", name="uq_file_content_chunk_index"),
+    )
+    op.create_index(op.f("ix_filecontentchunk_file_id"), "filecontentchunk", ["file_id"], unique=False)
+    op.create_table(
+        "filecontentindex",
+        sa.Column("file_id", sa.Uuid(), nullable=False),
+        sa.Column("file_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("indexed_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("file_id"),
+    )
+    # Full-text index; the expression must match FileContentRepository.search_candidates
+    # (SQLite databases get an FTS5 table created by the repository instead)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_filecontentchunk_tokens_fts ON filecontentchunk "
+            "USING gin (to_tsvector('simple'::regconfig, tokens))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_filecontentchunk_tokens_fts")
+    op.drop_table("filecontentindex")
+    op.drop_index(op.f("ix_filecontentchunk_file_id"), table_name="filecontentchunk")
+    op.drop_table("filecontentchunk")
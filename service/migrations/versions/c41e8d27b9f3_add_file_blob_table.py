@@ -0,0 +1,45 @@
+"""Add fileblob table for content-addressed file deduplication
+
+Revision ID: c41e8d27b9f3
+Revises: 7b3d2a91c4e5
+Create Date: 2026-10-16 14:03:18.226410
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e8d27b9f3"
+down_revision: Union[str, Sequence[str], None] = "7b3d2a91c4e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "fileblob",
+        sa.Column("file_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column("storage_key", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("file_size", sa.Integer(), nullable=False),
+        sa.Column("content_type", sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("file_hash"),
+        sa.UniqueConstraint("storage_key"),
+    )
+    # Deduplicated files share one storage key
+    op.drop_index(op.f("ix_file_storage_key"), table_name="file")
+    op.create_index(op.f("ix_file_storage_key"), "file", ["storage_key"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_file_storage_key"), table_name="file")
+    op.create_index(op.f("ix_file_storage_key"), "file", ["storage_key"], unique=True)
+    op.drop_table("fileblob")
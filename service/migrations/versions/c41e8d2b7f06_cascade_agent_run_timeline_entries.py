@@ -0,0 +1,32 @@
+"""Cascade agentruntimelineentry rows on agentrun delete
+
+Revision ID: c41e8d2b7f06
+Revises: 5a8c1f3e9b72
+Create Date: 2026-10-16 22:31:17.402915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e8d2b7f06"
+down_revision: Union[str, Sequence[str], None] = "5a8c1f3e9b72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FK_NAME = "agentruntimelineentry_agent_run_id_fkey"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Entries of runs deleted before the constraint existed would block it
+    op.execute("DELETE FROM agentruntimelineentry WHERE agent_run_id NOT IN (SELECT id FROM agentrun)")
+    op.create_foreign_key(FK_NAME, "agentruntimelineentry", "agentrun", ["agent_run_id"], ["id"], ondelete="CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(FK_NAME, "agentruntimelineentry", type_="foreignkey")
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from typing import Any, BinaryIO
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.storage import generate_blob_storage_key, store_blob
+from app.models.file import FileBlob
+from app.utils.cleanup import cleanup_unreferenced_blobs
+
+
+class FakeStorage:
+    """Records uploads and deletions; ``on_call`` runs inside each of them."""
+
+    def __init__(self, on_call: Any = None, fail_delete: bool = False) -> None:
+        self.on_call = on_call
+        self.fail_delete = fail_delete
+        self.uploaded: list[str] = []
+        self.deleted: list[str] = []
+
+    async def upload_file(self, file_data: BinaryIO, storage_key: str, content_type: str | None = None) -> None:
+        if self.on_call:
+            await self.on_call(storage_key)
+        self.uploaded.append(storage_key)
+
+    async def delete_file(self, storage_key: str) -> None:
+        if self.on_call:
+            await self.on_call(storage_key)
+        if self.fail_delete:
+            raise RuntimeError("storage unavailable")
+        self.deleted.append(storage_key)
+
+    async def list_files(self, prefix: str) -> list[dict[str, Any]]:
+        return []
+
+    async def delete_files(self, storage_keys: list[str]) -> None:
+        pass
+
+
+@pytest.mark.integration
+class TestBlobStorage:
+    """Ordering of blob uploads and garbage collection around the blob row lock."""
+
+    async def test_store_blob_records_the_row_before_uploading(self, db_session: AsyncSession):
+        file_hash = uuid4().hex * 2
+        rows_at_upload: list[FileBlob | None] = []
+
+        async def check_row(storage_key: str) -> None:
+            rows_at_upload.append(await db_session.get(FileBlob, file_hash))
+
+        storage = FakeStorage(on_call=check_row)
+        storage_key = await store_blob(db_session, storage, BytesIO(b"hello"), file_hash, 5, "text/plain")  # type: ignore[arg-type]
+        again = await store_blob(db_session, storage, BytesIO(b"hello"), file_hash, 5, "text/plain")  # type: ignore[arg-type]
+
+        assert storage_key == again == generate_blob_storage_key(file_hash)
+        assert storage.uploaded == [storage_key]
+        assert rows_at_upload[0] is not None
+
+    async def test_gc_deletes_the_object_before_committing(
+        self, async_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ):
+        # A session of its own: the collection commits and rolls back per blob
+        db_session = AsyncSession(async_engine, expire_on_commit=False)
+        file_hash = uuid4().hex * 2
+        storage_key = generate_blob_storage_key(file_hash)
+        db_session.add(
+            FileBlob(
+                file_hash=file_hash,
+                storage_key=storage_key,
+                file_size=5,
+                content_type="text/plain",
+                last_used_at=datetime.now(timezone.utc) - timedelta(days=2),
+            )
+        )
+        await db_session.commit()
+
+        # A failed object deletion keeps the record for the next run
+        stats = await cleanup_unreferenced_blobs(db_session, FakeStorage(fail_delete=True))  # type: ignore[arg-type]
+        assert stats["failed"] == 1
+        assert await db_session.get(FileBlob, file_hash) is not None
+
+        events: list[str] = []
+        commit = db_session.commit
+
+        async def recording_commit() -> None:
+            events.append("commit")
+            await commit()
+
+        async def record_delete(storage_key: str) -> None:
+            events.append("delete")
+
+        monkeypatch.setattr(db_session, "commit", recording_commit)
+        storage = FakeStorage(on_call=record_delete)
+        stats = await cleanup_unreferenced_blobs(db_session, storage)  # type: ignore[arg-type]
+
+        assert storage.deleted == [storage_key]
+        assert events == ["delete", "commit"]
+        assert stats["deleted_from_db"] == 1
+        assert await db_session.get(FileBlob, file_hash) is None
+        await db_session.close()
@@ -0,0 +1,152 @@
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.agent_run import AgentRunCreate
+from app.models.citation import CitationCreate
+from app.models.message import MessageCreate
+from app.repos.agent_run import AgentRunRepository
+from app.repos.citation import CitationRepository
+from app.repos.message import MessageRepository
+from app.tasks.persistence import ChatWriteBuffer
+
+
+@pytest.mark.integration
+class TestChatWriteBuffer:
+    """Integration tests for the chat stream write-behind buffer."""
+
+    async def test_flush_writes_batch_and_coalesces_updates(self, db_session: AsyncSession):
+        message_repo = MessageRepository(db_session)
+        topic_id = uuid4()
+        message = await message_repo.create_message(MessageCreate(role="assistant", content="", topic_id=topic_id))
+        agent_run = await AgentRunRepository(db_session).create(
+            AgentRunCreate(
+                message_id=message.id,
+                execution_id="exec_test",
+                agent_id="agent",
+                agent_name="Agent",
+                agent_type="react",
+                started_at=time.time(),
+            )
+        )
+
+        buffer = ChatWriteBuffer(db_session, max_pending=100, max_delay=60)
+        buffer.update_message(message, content="Hel")
+        buffer.update_message(message, content="Hello")
+        buffer.update_message(message, thinking_content="hmm")
+        buffer.add_message(MessageCreate(role="tool", content='{"event": "tool_call_request"}', topic_id=topic_id))
+        buffer.add_timeline_entry(agent_run.id, {"event_type": "node_start", "node_id": "a"})
+        buffer.add_citations([CitationCreate(message_id=message.id, url="https://example.com")])
+
+        # The three message updates coalesce into one write
+        assert buffer.pending == 4
+        assert not buffer.should_flush()
+
+        await buffer.flush("final")
+
+        assert buffer.pending == 0
+        stats = buffer.get_stats()
+        assert stats["flushes"] == 1
+        assert stats["writes"] == 4
+
+        stored = await message_repo.get_message_by_id(message.id)
+        assert stored is not None
+        assert stored.content == "Hello"
+        assert stored.thinking_content == "hmm"
+        roles = [m.role for m in await message_repo.get_messages_by_topic(topic_id)]
+        assert sorted(roles) == ["assistant", "tool"]
+        assert len(await CitationRepository(db_session).get_citations_by_message(message.id)) == 1
+        timeline = await AgentRunRepository(db_session).get_timeline(agent_run)
+        assert [entry["node_id"] for entry in timeline] == ["a"]
+
+    async def test_should_flush_on_size_and_age(self, db_session: AsyncSession):
+        buffer = ChatWriteBuffer(db_session, max_pending=2, max_delay=60)
+        buffer.add_message(MessageCreate(role="tool", content="{}", topic_id=uuid4()))
+        assert not buffer.should_flush()
+        buffer.add_message(MessageCreate(role="tool", content="{}", topic_id=uuid4()))
+        assert buffer.should_flush()
+
+        aged = ChatWriteBuffer(db_session, max_pending=100, max_delay=0.01)
+        aged.add_message(MessageCreate(role="tool", content="{}", topic_id=uuid4()))
+        time.sleep(0.02)
+        assert aged.should_flush()
+
+        await aged.flush_if_due()
+        assert aged.pending == 0
+        assert aged.get_stats()["flushes"] == 1
+
+    async def test_failed_flush_rolls_back_and_reports_once(
+        self, async_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ):
+        # A session of its own: rolling back must not undo the fixture's outer transaction
+        db_session = AsyncSession(async_engine, expire_on_commit=False)
+        message_repo = MessageRepository(db_session)
+        message = await message_repo.create_message(MessageCreate(role="assistant", content="", topic_id=uuid4()))
+        await db_session.commit()
+
+        errors: list[Exception] = []
+
+        async def on_error(error: Exception) -> None:
+            errors.append(error)
+
+        async def failing_commit() -> None:
+            raise RuntimeError("database is gone")
+
+        buffer = ChatWriteBuffer(db_session, max_pending=100, max_delay=60, on_error=on_error)
+        commit = db_session.commit
+        monkeypatch.setattr(db_session, "commit", failing_commit)
+
+        buffer.update_message(message, content="Hello")
+        assert not await buffer.flush("tool_call")
+        assert not await buffer.flush("final")
+
+        # Reported once, and the update is kept for the next flush
+        assert [str(error) for error in errors] == ["database is gone"]
+        assert buffer.pending == 1
+
+        monkeypatch.setattr(db_session, "commit", commit)
+        assert await buffer.flush("final")
+        stored = await message_repo.get_message_by_id(message.id)
+        assert stored is not None
+        assert stored.content == "Hello"
+
+        await message_repo.delete_message(message.id)
+        await db_session.commit()
+        await db_session.close()
+
+    async def test_failed_flush_keeps_inserts_and_tracked_rows(
+        self, async_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ):
+        db_session = AsyncSession(async_engine, expire_on_commit=False)
+        message_repo = MessageRepository(db_session)
+        topic_id = uuid4()
+        buffer = ChatWriteBuffer(db_session, max_pending=100, max_delay=60)
+
+        async def failing_commit() -> None:
+            raise RuntimeError("database is gone")
+
+        commit = db_session.commit
+        monkeypatch.setattr(db_session, "commit", failing_commit)
+
+        # Created but never committed: the failed flush rolls its insert back
+        message = await message_repo.create_message(MessageCreate(role="assistant", content="", topic_id=topic_id))
+        buffer.track(message)
+        buffer.add_message(MessageCreate(role="tool", content="{}", topic_id=topic_id))
+        buffer.add_citations([CitationCreate(message_id=message.id, url="https://example.com")])
+        assert not await buffer.flush("tool_call")
+
+        assert buffer.pending == 2
+        assert message in db_session.new
+
+        monkeypatch.setattr(db_session, "commit", commit)
+        assert await buffer.flush("final")
+        roles = [m.role for m in await message_repo.get_messages_by_topic(topic_id)]
+        assert sorted(roles) == ["assistant", "tool"]
+        assert len(await CitationRepository(db_session).get_citations_by_message(message.id)) == 1
+
+        await message_repo.delete_messages_by_topic(topic_id)
+        await db_session.commit()
+        await db_session.close()
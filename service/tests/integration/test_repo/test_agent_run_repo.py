@@ -0,0 +1,92 @@
+import time
+from uuid import uuid4
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.agent_run import AgentRun, AgentRunCreate
+from app.repos.agent_run import AgentRunRepository
+
+
+@pytest.mark.integration
+class TestAgentRunRepository:
+    """Integration tests for AgentRunRepository timeline storage."""
+
+    @pytest.fixture
+    def agent_run_repo(self, db_session: AsyncSession) -> AgentRunRepository:
+        return AgentRunRepository(db_session)
+
+    async def _create_run(self, repo: AgentRunRepository, node_data: dict | None = None) -> AgentRun:
+        return await repo.create(
+            AgentRunCreate(
+                message_id=uuid4(),
+                execution_id="exec_test",
+                agent_id="agent",
+                agent_name="Agent",
+                agent_type="graph",
+                started_at=time.time(),
+                node_data=node_data,
+            )
+        )
+
+    async def test_timeline_appended_and_materialized(self, agent_run_repo: AgentRunRepository):
+        """Appended entries are stored in order and node maps are derived on read."""
+        run = await self._create_run(agent_run_repo, {"node_outputs": {}, "node_order": [], "node_names": {}})
+
+        await agent_run_repo.append_timeline_entry(run.id, {"event_type": "node_start", "node_id": "a"})
+        await agent_run_repo.append_timeline_entries(
+            run.id,
+            [
+                {"event_type": "node_end", "node_id": "a", "node_name": "Plan", "output": "plan"},
+                {"event_type": "node_end", "node_id": "b", "output": "draft"},
+            ],
+        )
+        await agent_run_repo.finalize(
+            run.id, "completed", time.time(), 10, final_node_data={"node_outputs": {"b": "final"}}
+        )
+
+        agent_run_read = await agent_run_repo.get_as_read(run.message_id)
+        assert agent_run_read is not None
+        node_data = agent_run_read.node_data
+        assert node_data is not None
+        assert [entry["event_type"] for entry in node_data["timeline"]] == ["node_start", "node_end", "node_end"]
+        assert node_data["node_order"] == ["a", "b"]
+        assert node_data["node_outputs"] == {"a": "plan", "b": "final"}
+        assert node_data["node_names"] == {"a": "Plan"}
+
+    async def test_legacy_json_timeline_is_kept_first(self, agent_run_repo: AgentRunRepository):
+        """Runs whose timeline was stored in node_data still read back in order."""
+        legacy_entry = {"event_type": "agent_start"}
+        run = await self._create_run(agent_run_repo, {"timeline": [legacy_entry], "node_order": ["x"]})
+
+        await agent_run_repo.append_timeline_entry(run.id, {"event_type": "agent_end"})
+        node_data = await agent_run_repo.get_node_data(run)
+
+        assert node_data["timeline"] == [legacy_entry, {"event_type": "agent_end"}]
+        assert node_data["node_order"] == ["x"]
+
+    async def test_delete_removes_timeline(self, agent_run_repo: AgentRunRepository):
+        """Deleting a run also deletes its timeline entries."""
+        run = await self._create_run(agent_run_repo)
+        await agent_run_repo.append_timeline_entry(run.id, {"event_type": "agent_start"})
+
+        assert await agent_run_repo.delete_by_message_id(run.message_id)
+        assert await agent_run_repo.get_timeline(run) == []
+
+    async def test_node_data_for_runs_batched(self, agent_run_repo: AgentRunRepository):
+        """Several runs are loaded by message ID and get their own timelines."""
+        first = await self._create_run(agent_run_repo, {"timeline": [{"event_type": "agent_start"}]})
+        second = await self._create_run(agent_run_repo)
+        await agent_run_repo.append_timeline_entries(first.id, [{"event_type": "node_end", "node_id": "a"}])
+        await agent_run_repo.append_timeline_entries(second.id, [{"event_type": "node_end", "node_id": "b"}])
+
+        runs = await agent_run_repo.get_by_message_ids([first.message_id, second.message_id, uuid4()])
+        node_data = await agent_run_repo.get_node_data_for_runs(list(runs.values()))
+
+        assert set(runs) == {first.message_id, second.message_id}
+        assert node_data[first.id]["timeline"] == [
+            {"event_type": "agent_start"},
+            {"event_type": "node_end", "node_id": "a"},
+        ]
+        assert node_data[first.id]["node_order"] == ["a"]
+        assert node_data[second.id]["node_order"] == ["b"]
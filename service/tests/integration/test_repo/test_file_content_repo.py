@@ -0,0 +1,97 @@
+from uuid import UUID, uuid4
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.knowledge_index import build_chunks, get_stale_files, search_knowledge_set
+from app.models.file import File
+from app.models.file_knowledge_set_link import FileKnowledgeSetLink
+from app.repos.file import FileRepository
+from app.repos.file_content import FileContentRepository
+from tests.factories.file import FileCreateFactory
+
+
+@pytest.mark.integration
+class TestFileContentRepository:
+    """Integration tests for FileContentRepository and knowledge set search."""
+
+    async def _indexed_file(self, db_session: AsyncSession, knowledge_set_id: UUID, text: str) -> File:
+        file = await FileRepository(db_session).create_file(
+            FileCreateFactory.build(
+                user_id="test-user-content-index",
+                storage_key=f"test/{uuid4().hex[:8]}/doc.txt",
+                original_filename=f"{uuid4().hex[:8]}.txt",
+                content_type="text/plain",
+                is_deleted=False,
+            )
+        )
+        db_session.add(FileKnowledgeSetLink(file_id=file.id, knowledge_set_id=knowledge_set_id))
+        await FileContentRepository(db_session).replace_file_index(file.id, file.file_hash, build_chunks(text))
+        return file
+
+    async def test_search_ranks_matching_chunks(self, db_session: AsyncSession):
+        knowledge_set_id = uuid4()
+        relevant = await self._indexed_file(db_session, knowledge_set_id, "Perovskite solar cells and perovskite films")
+        await self._indexed_file(db_session, knowledge_set_id, "Notes about solar panels on roofs")
+        await self._indexed_file(db_session, uuid4(), "Perovskite in another knowledge set")
+
+        hits = await search_knowledge_set(db_session, knowledge_set_id, "perovskite solar")
+
+        assert [hit["file_id"] for hit in hits][0] == relevant.id
+        assert len(hits) == 2
+        assert "Perovskite" in hits[0]["snippet"]
+
+    async def test_capped_candidates_keep_best_matches(self, db_session: AsyncSession):
+        knowledge_set_id = uuid4()
+        for index in range(5):
+            await self._indexed_file(db_session, knowledge_set_id, f"solar panel number {index} with filler words")
+        best = await self._indexed_file(db_session, knowledge_set_id, "perovskite solar perovskite")
+        repo = FileContentRepository(db_session)
+
+        candidates = await repo.search_candidates(knowledge_set_id, [["perovskite"], ["solar"]], limit=1)
+
+        assert [chunk.file_id for chunk, _ in candidates] == [best.id]
+
+    async def test_count_term_documents_covers_whole_knowledge_set(self, db_session: AsyncSession):
+        knowledge_set_id = uuid4()
+        await self._indexed_file(db_session, knowledge_set_id, "solar cells")
+        await self._indexed_file(db_session, knowledge_set_id, "solar panels")
+        await self._indexed_file(db_session, uuid4(), "solar elsewhere")
+
+        counts = await FileContentRepository(db_session).count_term_documents(knowledge_set_id, ["solar", "cells", "x"])
+
+        assert counts == {"solar": 2, "cells": 1, "x": 0}
+
+    async def test_reindex_replaces_chunks(self, db_session: AsyncSession):
+        knowledge_set_id = uuid4()
+        file = await self._indexed_file(db_session, knowledge_set_id, "old content")
+        repo = FileContentRepository(db_session)
+
+        state = await repo.replace_file_index(file.id, "new-hash", build_chunks("fresh content"))
+
+        assert state.chunk_count == 1
+        assert await search_knowledge_set(db_session, knowledge_set_id, "old") == []
+        assert len(await search_knowledge_set(db_session, knowledge_set_id, "fresh")) == 1
+
+    async def test_deleted_files_are_not_searched(self, db_session: AsyncSession):
+        knowledge_set_id = uuid4()
+        file = await self._indexed_file(db_session, knowledge_set_id, "ephemeral content")
+
+        await FileRepository(db_session).hard_delete_file(file.id)
+
+        assert await search_knowledge_set(db_session, knowledge_set_id, "ephemeral") == []
+        assert await FileContentRepository(db_session).get_index_states([file.id]) == {}
+
+    async def test_stale_files_are_unindexed_or_changed(self, db_session: AsyncSession):
+        knowledge_set_id = uuid4()
+        fresh = await self._indexed_file(db_session, knowledge_set_id, "indexed content")
+        changed = await self._indexed_file(db_session, knowledge_set_id, "old content")
+        await FileContentRepository(db_session).replace_file_index(changed.id, "previous-hash", [])
+        changed.file_hash = "current-hash"
+        unindexed = await FileRepository(db_session).create_file(
+            FileCreateFactory.build(user_id="test-user-content-index", storage_key=f"test/{uuid4().hex[:8]}/new.txt")
+        )
+
+        stale = await get_stale_files(db_session, [fresh, changed, unindexed])
+
+        assert [file.id for file in stale] == [changed.id, unindexed.id]
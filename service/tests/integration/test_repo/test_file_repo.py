@@ -1,10 +1,15 @@
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import pytest
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.storage import generate_blob_storage_key
+from app.models.file import FileBlob
 from app.repos.file import FileRepository
+from app.repos.message import MessageRepository
 from tests.factories.file import FileCreateFactory
+from tests.factories.message import MessageCreateFactory
 
 
 @pytest.mark.integration
@@ -299,3 +304,93 @@ class TestFileRepository:
         assert fetched1 is not None
         assert fetched1.message_id == message_id
         assert fetched1.status == "confirmed"
+
+    async def test_get_file_ids_by_topic(self, file_repo: FileRepository):
+        """Test listing the live files attached to a topic's messages."""
+        user_id = "test-user-file-topic"
+        topic_id = uuid4()
+        message = await MessageRepository(file_repo.db).create_message(
+            MessageCreateFactory.build(topic_id=topic_id, content="with files")
+        )
+        other = await MessageRepository(file_repo.db).create_message(MessageCreateFactory.build(content="elsewhere"))
+
+        attached = await file_repo.create_file(
+            FileCreateFactory.build(user_id=user_id, storage_key=self._make_unique_storage_key("topic1"))
+        )
+        deleted = await file_repo.create_file(
+            FileCreateFactory.build(user_id=user_id, storage_key=self._make_unique_storage_key("topic2"))
+        )
+        unrelated = await file_repo.create_file(
+            FileCreateFactory.build(user_id=user_id, storage_key=self._make_unique_storage_key("topic3"))
+        )
+        await file_repo.update_files_message_id([attached.id, deleted.id], message.id, user_id)
+        await file_repo.update_files_message_id([unrelated.id], other.id, user_id)
+        await file_repo.soft_delete_file(deleted.id)
+
+        assert await file_repo.get_file_ids_by_topic(topic_id) == [attached.id]
+
+    async def test_blob_shared_by_files_and_collected_when_unreferenced(self, file_repo: FileRepository):
+        """Test that a content-addressed blob is reused and only unreferenced once no file points at it."""
+        file_hash = uuid4().hex * 2
+        storage_key = generate_blob_storage_key(file_hash)
+
+        created = await file_repo.create_blob(
+            FileBlob(file_hash=file_hash, storage_key=storage_key, file_size=10, content_type="text/plain")
+        )
+        # A concurrent upload of the same content resolves to the existing blob
+        duplicate = await file_repo.create_blob(
+            FileBlob(file_hash=file_hash, storage_key=storage_key, file_size=10, content_type="text/plain")
+        )
+        assert duplicate.storage_key == created.storage_key
+
+        file1 = await file_repo.create_file(
+            FileCreateFactory.build(user_id="test-user-blob-a", storage_key=storage_key, file_hash=file_hash)
+        )
+        file2 = await file_repo.create_file(
+            FileCreateFactory.build(user_id="test-user-blob-b", storage_key=storage_key, file_hash=file_hash)
+        )
+
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+        assert await file_repo.get_unreferenced_blobs(future) == []
+
+        await file_repo.hard_delete_file(file1.id)
+        assert await file_repo.get_unreferenced_blobs(future) == []
+
+        await file_repo.hard_delete_file(file2.id)
+        unreferenced = await file_repo.get_unreferenced_blobs(future)
+        assert [blob.file_hash for blob in unreferenced] == [file_hash]
+
+        # Recently used blobs are kept through the grace period
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        assert await file_repo.get_unreferenced_blobs(past) == []
+
+    async def test_lock_unreferenced_blob_rechecks_references(self, file_repo: FileRepository):
+        """Test that a blob listed for collection is not locked once it is referenced again."""
+        file_hash = uuid4().hex * 2
+        storage_key = generate_blob_storage_key(file_hash)
+        await file_repo.create_blob(
+            FileBlob(file_hash=file_hash, storage_key=storage_key, file_size=10, content_type="text/plain")
+        )
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+
+        locked = await file_repo.lock_unreferenced_blob(file_hash, future)
+        assert locked is not None and locked.file_hash == file_hash
+
+        # An upload reuses the blob after it was listed
+        await file_repo.create_file(
+            FileCreateFactory.build(user_id="test-user-blob-lock", storage_key=storage_key, file_hash=file_hash)
+        )
+        assert await file_repo.lock_unreferenced_blob(file_hash, future) is None
+        # Blobs used within the grace period are not locked either
+        recent_hash = uuid4().hex * 2
+        await file_repo.create_blob(
+            FileBlob(
+                file_hash=recent_hash,
+                storage_key=generate_blob_storage_key(recent_hash),
+                file_size=10,
+                content_type="text/plain",
+            )
+        )
+        past = datetime.now(timezone.utc) - timedelta(hours=1)
+        assert await file_repo.lock_unreferenced_blob(recent_hash, past) is None
+        assert await file_repo.lock_unreferenced_blob(recent_hash, future) is not None
@@ -1,3 +1,5 @@
+from uuid import uuid4
+
 import pytest
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -144,3 +146,37 @@ class TestMessageRepository:
             )
         )
         assert created.thinking_content == "Let me think about this..."
+
+    async def test_search_messages_by_agent(
+        self, message_repo: MessageRepository, session_repo: SessionRepository, topic_repo: TopicRepository
+    ):
+        """Test full-text memory search, including content updated after creation."""
+        agent_id = uuid4()
+        session = await session_repo.create_session(
+            SessionCreateFactory.build(agent_id=agent_id), "test-user-message-search"
+        )
+        topic = await topic_repo.create_topic(TopicCreateFactory.build(session_id=session.id))
+        await message_repo.create_message(
+            MessageCreateFactory.build(topic_id=topic.id, role="user", content="How do perovskite cells degrade?")
+        )
+        await message_repo.create_message(
+            MessageCreateFactory.build(topic_id=topic.id, role="user", content="我们讨论了知识库的设计")
+        )
+        streamed = await message_repo.create_message(
+            MessageCreateFactory.build(topic_id=topic.id, role="assistant", content="")
+        )
+        streamed.content = "Moisture degrades perovskite layers"
+        message_repo.db.add(streamed)
+        await message_repo.db.flush()
+
+        results = await message_repo.search_messages_by_agent("test-user-message-search", agent_id, "Perovskite")
+        assert {r["content"] for r in results} == {
+            "How do perovskite cells degrade?",
+            "Moisture degrades perovskite layers",
+        }
+        assert "perovskite" in results[0]["search_tokens"].split()
+
+        cjk = await message_repo.search_messages_by_agent("test-user-message-search", agent_id, "知识库")
+        assert [r["content"] for r in cjk] == ["我们讨论了知识库的设计"]
+
+        assert await message_repo.search_messages_by_agent("other-user", agent_id, "perovskite") == []
@@ -0,0 +1,96 @@
+"""Tests for the long-lived S3 client of BlobStorageService."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from app.infra.storage.blob import BlobStorageService
+
+
+class FakeS3Client:
+    def __init__(self) -> None:
+        self.head_calls = 0
+
+    async def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        self.head_calls += 1
+        await asyncio.sleep(0.01)
+        return {"ContentType": "text/plain", "ContentLength": 1}
+
+
+@pytest.fixture
+def storage() -> tuple[BlobStorageService, dict[str, Any]]:
+    service = BlobStorageService()
+    state: dict[str, Any] = {"opened": 0, "closed": 0, "config": None, "client": FakeS3Client()}
+
+    @asynccontextmanager
+    async def client(**kwargs: Any):
+        state["opened"] += 1
+        state["config"] = kwargs.get("config")
+        try:
+            yield state["client"]
+        finally:
+            state["closed"] += 1
+
+    service.session.client = client  # type: ignore[method-assign]
+    return service, state
+
+
+class TestBlobStorageClient:
+    async def test_client_is_reused_across_operations(self, storage: tuple[BlobStorageService, dict[str, Any]]):
+        service, state = storage
+
+        await service.connect()
+        results = await asyncio.gather(*(service.file_exists(f"k{i}") for i in range(5)))
+        await service.get_file_metadata("k0")
+
+        assert all(results)
+        assert state["opened"] == 1
+        assert state["client"].head_calls == 6
+        assert state["config"].max_pool_connections == service.max_pool_connections
+
+        await service.close()
+        assert state["closed"] == 1
+        assert service.get_stats()["clients"] == 0
+
+    async def test_stats_report_saturation(self, storage: tuple[BlobStorageService, dict[str, Any]]):
+        service, _ = storage
+        service.max_pool_connections = 2
+
+        await asyncio.gather(*(service.file_exists(f"k{i}") for i in range(4)))
+
+        stats = service.get_stats()
+        assert stats["operations"] == 4
+        assert stats["in_flight"] == 0
+        assert stats["peak_in_flight"] == 4
+        assert stats["saturated_operations"] == 2
+        await service.close()
+
+    def test_client_of_finished_loop_is_closed(self, storage: tuple[BlobStorageService, dict[str, Any]]):
+        service, state = storage
+
+        class ClientContext:
+            # Unlike a generator-based context manager, not finalized when asyncio.run ends
+            async def __aenter__(self) -> FakeS3Client:
+                state["opened"] += 1
+                return state["client"]
+
+            async def __aexit__(self, *exc_info: object) -> None:
+                state["closed"] += 1
+
+        service.session.client = lambda **kwargs: ClientContext()  # type: ignore[method-assign]
+
+        # e.g. a sync caller going through asyncio.run without closing the client
+        asyncio.run(service.file_exists("k0"))
+        assert state["opened"] == 1
+        assert state["closed"] == 0
+
+        async def next_loop() -> None:
+            await service.file_exists("k1")
+            await service.close()
+
+        asyncio.run(next_loop())
+        assert state["opened"] == 2
+        assert state["closed"] == 2
+        assert service.get_stats()["clients"] == 0
@@ -0,0 +1,106 @@
+"""Tests for the async lab API client."""
+
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from app.infra.lab import LabApiClient
+
+URL = "http://lab.test/api/v1/lab/list"
+
+
+def _client(handler: Callable[[httpx.Request], httpx.Response], **kwargs: float) -> LabApiClient:
+    client = LabApiClient(retry_backoff=0.0, **kwargs)  # type: ignore[arg-type]
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestLabApiClient:
+    async def test_sends_token_and_drops_none_params(self) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"code": 0, "data": {}})
+
+        client = _client(handler)
+        await client.get(URL, "tok", params={"page": 1, "tag": None})
+
+        assert requests[0].headers["Authorization"] == "Bearer tok"
+        assert requests[0].url.params == httpx.QueryParams({"page": "1"})
+
+    async def test_retries_reads_on_server_errors(self) -> None:
+        statuses = [503, 502, 200]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(statuses.pop(0), json={"code": 0})
+
+        result = await _client(handler, max_retries=2).get(URL, "tok")
+
+        assert result == {"code": 0}
+        assert statuses == []
+
+    async def test_does_not_retry_writes_after_they_were_sent(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await _client(handler).post(URL, "tok", json_body={"a": 1})
+        assert calls == 1
+
+    async def test_coalesces_concurrent_identical_reads(self) -> None:
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            data = request.headers["Authorization"]
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"code": 0, "data": data})
+
+        client = _client(handler)  # type: ignore[arg-type]
+        results = await asyncio.gather(*(client.get(URL, "tok") for _ in range(3)), client.get(URL, "other"))
+
+        assert calls == 2
+        assert [r["data"] for r in results] == ["Bearer tok"] * 3 + ["Bearer other"]
+
+    async def test_caches_catalog_reads_per_token(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json={"code": 0, "data": {"data": [calls]}})
+
+        client = _client(handler, cache_ttl=60)
+        first = await client.get(URL, "tok", cache=True)
+        first["data"]["data"].append("mutated")
+        second = await client.get(URL, "tok", cache=True)
+        await client.get(URL, "other", cache=True)
+
+        assert second == {"code": 0, "data": {"data": [1]}}
+        assert calls == 2
+
+        client.invalidate("tok")
+        await client.get(URL, "tok", cache=True)
+        assert calls == 3
+
+    async def test_does_not_cache_api_errors(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json={"code": 1, "msg": "busy"})
+
+        client = _client(handler, cache_ttl=60)
+        await client.get(URL, "tok", cache=True)
+        await client.get(URL, "tok", cache=True)
+
+        assert calls == 2
@@ -0,0 +1,88 @@
+"""Tests for the server-side lab task watcher."""
+
+import asyncio
+from typing import Any
+
+from app.infra.lab import LabTaskState, LabTaskWatcher
+
+URL = "http://lab.test/api/v1/lab/mcp/task/1"
+
+
+class FakeClient:
+    """Returns scripted task responses; the last one repeats."""
+
+    def __init__(self, responses: list[Any]) -> None:
+        self.responses = responses
+        self.calls = 0
+
+    async def get(self, url: str, token: str | None) -> Any:
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _task(status: str, progress: float | None = None) -> dict[str, Any]:
+    return {"code": 0, "data": {"status": status, "progress": progress}}
+
+
+def _watcher(client: FakeClient, **kwargs: float) -> LabTaskWatcher:
+    return LabTaskWatcher(client=client, min_interval=0.01, max_interval=0.05, **kwargs)  # type: ignore[arg-type]
+
+
+class TestLabTaskWatcher:
+    async def test_waits_until_terminal_and_reports_changes(self) -> None:
+        client = FakeClient([_task("running", 0.2), _task("running", 0.2), _task("running", 0.6), _task("success")])
+        watcher = _watcher(client)
+        updates: list[LabTaskState] = []
+
+        async def on_update(state: LabTaskState) -> None:
+            updates.append(state)
+
+        state = await watcher.wait(URL, "tok", timeout=5, on_update=on_update)
+        await watcher.close()
+
+        assert state.done
+        assert state.status == "success"
+        # The unchanged poll is not reported
+        assert [(u.status, u.percent) for u in updates] == [("running", 20), ("running", 60), ("success", None)]
+
+    async def test_returns_not_done_on_timeout(self) -> None:
+        watcher = _watcher(FakeClient([_task("running")]))
+
+        state = await watcher.wait(URL, "tok", timeout=0.1)
+        await watcher.close()
+
+        assert not state.done
+        assert state.status == "running"
+        assert watcher.get_stats()["watched"] == 0
+
+    async def test_waiters_on_the_same_task_share_polls(self) -> None:
+        client = FakeClient([_task("running"), _task("done")])
+        watcher = _watcher(client)
+
+        states = await asyncio.gather(watcher.wait(URL, "tok", timeout=5), watcher.wait(URL, "tok", timeout=5))
+        await watcher.close()
+
+        assert all(state.done for state in states)
+        assert client.calls == 2
+
+    async def test_gives_up_after_repeated_failures(self) -> None:
+        watcher = _watcher(FakeClient([RuntimeError("boom")]))
+
+        state = await watcher.wait(URL, "tok", timeout=5)
+        await watcher.close()
+
+        assert state.done
+        assert state.error is not None and "boom" in state.error
+
+    async def test_api_errors_are_retried(self) -> None:
+        client = FakeClient([{"code": 1, "msg": "busy"}, _task("completed")])
+        watcher = _watcher(client)
+
+        state = await watcher.wait(URL, "tok", timeout=5)
+        await watcher.close()
+
+        assert state.done
+        assert state.error is None
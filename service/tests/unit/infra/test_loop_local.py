@@ -0,0 +1,68 @@
+"""Tests for per-event-loop resource instances."""
+
+import asyncio
+import threading
+
+from app.infra.loop_local import LoopLocal
+
+
+class Resource:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class TestLoopLocal:
+    def test_one_instance_per_loop(self) -> None:
+        local = LoopLocal(Resource, Resource.close, "resource")
+
+        async def get_twice() -> tuple[Resource, Resource]:
+            return local.get(), local.get()
+
+        first, again = asyncio.run(get_twice())
+        second, _ = asyncio.run(get_twice())
+
+        assert first is again
+        assert second is not first
+
+    def test_closes_instances_left_by_finished_loops(self) -> None:
+        local = LoopLocal(Resource, Resource.close, "resource")
+
+        async def get() -> Resource:
+            return local.get()
+
+        async def get_then_close() -> Resource:
+            resource = local.get()
+            await local.close()
+            return resource
+
+        old = asyncio.run(get())
+        assert not old.closed
+
+        current = asyncio.run(get_then_close())
+        assert old.closed
+        assert current.closed
+        assert local.instances() == []
+
+    def test_leaves_instances_of_running_loops_alone(self) -> None:
+        local = LoopLocal(Resource, Resource.close, "resource")
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+
+            async def get() -> Resource:
+                return local.get()
+
+            theirs = asyncio.run_coroutine_threadsafe(get(), loop).result()
+            mine = asyncio.run(get())
+
+            assert mine is not theirs
+            assert not theirs.closed
+            assert theirs in local.instances()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -0,0 +1,219 @@
+"""Tests for the pooled MCP client sessions."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from app.infra.mcp import pool as pool_module
+from app.infra.mcp.pool import McpClientPool
+
+
+class FakeClient:
+    """Stand-in for fastmcp.Client that records connects and calls."""
+
+    instances: list["FakeClient"] = []
+
+    def __init__(self, url: str, auth: Any = None, init_timeout: float | None = None) -> None:
+        self.url = url
+        self.auth = auth
+        self.connected = False
+        self.closed = False
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.progress_handlers: list[Any] = []
+        self.ping_ok = True
+        self.fail_with: Exception | None = None
+        FakeClient.instances.append(self)
+
+    async def __aenter__(self) -> "FakeClient":
+        self.connected = True
+        return self
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def ping(self) -> bool:
+        if not self.ping_ok:
+            raise RuntimeError("ping failed")
+        return True
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any], timeout: float | None = None, progress_handler: Any = None
+    ) -> str:
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.calls.append((name, arguments))
+        self.progress_handlers.append(progress_handler)
+        return f"{name}:ok"
+
+    async def list_tools(self) -> list[str]:
+        return ["a", "b"]
+
+    async def close(self) -> None:
+        self.connected = False
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    FakeClient.instances = []
+    monkeypatch.setattr(pool_module, "Client", FakeClient)
+
+
+class TestMcpClientPool:
+    """Tests for McpClientPool."""
+
+    async def test_reuses_session_for_same_server(self) -> None:
+        pool = McpClientPool()
+        try:
+            await pool.call_tool("http://mcp/a", "tok", "t1", {})
+            await pool.call_tool("http://mcp/a", "tok", "t2", {"x": 1})
+            assert len(FakeClient.instances) == 1
+            assert FakeClient.instances[0].calls == [("t1", {}), ("t2", {"x": 1})]
+            assert pool.get_stats()["connects"] == 1
+        finally:
+            await pool.close()
+
+    async def test_passes_progress_handler_to_client(self) -> None:
+        async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+            pass
+
+        pool = McpClientPool()
+        try:
+            await pool.call_tool("http://mcp/a", None, "t", {}, progress_handler=on_progress)
+            assert FakeClient.instances[0].progress_handlers == [on_progress]
+        finally:
+            await pool.close()
+
+    async def test_separate_sessions_per_token(self) -> None:
+        pool = McpClientPool()
+        try:
+            await pool.call_tool("http://mcp/a", "tok1", "t", {})
+            await pool.call_tool("http://mcp/a", "tok2", "t", {})
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            assert len(FakeClient.instances) == 3
+        finally:
+            await pool.close()
+
+    async def test_reconnects_after_transport_failure(self) -> None:
+        pool = McpClientPool()
+        try:
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            FakeClient.instances[0].fail_with = RuntimeError("connection reset")
+            with pytest.raises(RuntimeError):
+                await pool.call_tool("http://mcp/a", None, "t", {})
+            assert FakeClient.instances[0].closed
+
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            assert len(FakeClient.instances) == 2
+        finally:
+            await pool.close()
+
+    async def test_failure_does_not_close_session_under_other_borrowers(self) -> None:
+        pool = McpClientPool()
+        release = asyncio.Event()
+
+        async def long_call() -> None:
+            async with pool.acquire("http://mcp/a") as client:
+                await release.wait()
+                await client.call_tool("t", {})
+
+        try:
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            other = asyncio.create_task(long_call())
+            await asyncio.sleep(0)
+
+            FakeClient.instances[0].fail_with = RuntimeError("call failed")
+            with pytest.raises(RuntimeError):
+                await pool.call_tool("http://mcp/a", None, "t", {})
+            # Still in use by the other borrower
+            assert not FakeClient.instances[0].closed
+
+            FakeClient.instances[0].fail_with = None
+            release.set()
+            await other
+            # Closed once the last borrower returned it
+            assert FakeClient.instances[0].closed
+        finally:
+            await pool.close()
+
+    async def test_unhealthy_session_is_reused_if_ping_succeeds(self) -> None:
+        pool = McpClientPool()
+        release = asyncio.Event()
+
+        async def long_borrow() -> None:
+            async with pool.acquire("http://mcp/a"):
+                await release.wait()
+
+        try:
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            other = asyncio.create_task(long_borrow())
+            await asyncio.sleep(0)
+            FakeClient.instances[0].fail_with = RuntimeError("call failed")
+            with pytest.raises(RuntimeError):
+                await pool.call_tool("http://mcp/a", None, "t", {})
+
+            FakeClient.instances[0].fail_with = None
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            assert len(FakeClient.instances) == 1
+            release.set()
+            await other
+            assert not FakeClient.instances[0].closed
+        finally:
+            await pool.close()
+
+    async def test_tool_error_keeps_session(self) -> None:
+        pool = McpClientPool()
+        try:
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            FakeClient.instances[0].fail_with = ToolError("bad args")
+            with pytest.raises(ToolError):
+                await pool.call_tool("http://mcp/a", None, "t", {})
+            assert not FakeClient.instances[0].closed
+        finally:
+            await pool.close()
+
+    async def test_health_check_failure_reconnects(self) -> None:
+        pool = McpClientPool(health_check_interval=0.0)
+        try:
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            FakeClient.instances[0].ping_ok = False
+            await pool.call_tool("http://mcp/a", None, "t", {})
+            assert len(FakeClient.instances) == 2
+            assert FakeClient.instances[0].closed
+        finally:
+            await pool.close()
+
+    async def test_concurrency_limit_per_server(self) -> None:
+        pool = McpClientPool(max_concurrency_per_server=2)
+        active = 0
+        peak = 0
+
+        async def borrow() -> None:
+            nonlocal active, peak
+            async with pool.acquire("http://mcp/a"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        try:
+            await asyncio.gather(*(borrow() for _ in range(6)))
+            assert peak == 2
+        finally:
+            await pool.close()
+
+    async def test_evict_and_close(self) -> None:
+        pool = McpClientPool()
+        await pool.list_tools("http://mcp/a", None)
+        await pool.evict("http://mcp/a", None)
+        assert FakeClient.instances[0].closed
+        assert pool.get_stats()["sessions"] == 0
+
+        await pool.list_tools("http://mcp/b", None)
+        await pool.close()
+        assert FakeClient.instances[1].closed
+        with pytest.raises(RuntimeError):
+            async with pool.acquire("http://mcp/b"):
+                pass
@@ -0,0 +1,93 @@
+"""Tests for the per-process worker engine and event loop."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import celery_app as celery_app_module
+from app.infra.database import connection
+from app.infra.database.connection import dispose_worker_engines, get_worker_session_factory
+from app.tasks import loop as worker_loop
+
+
+class TestWorkerSessionFactory:
+    """Tests for get_worker_session_factory."""
+
+    async def test_reused_within_loop(self) -> None:
+        try:
+            assert get_worker_session_factory() is get_worker_session_factory()
+        finally:
+            await dispose_worker_engines()
+
+    async def test_dispose_clears_engines(self) -> None:
+        get_worker_session_factory()
+        await dispose_worker_engines()
+        assert connection._worker_engines == {}
+
+
+class TestWorkerLoop:
+    """Tests for the persistent worker event loop."""
+
+    def test_tasks_share_one_loop(self) -> None:
+        async def current_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        try:
+            first = worker_loop.run_in_worker_loop(current_loop())
+            second = worker_loop.run_in_worker_loop(current_loop())
+            assert first is second
+            assert not first.is_closed()
+        finally:
+            worker_loop.shutdown_worker_loop()
+
+        assert first.is_closed()
+
+    def test_concurrent_submissions_share_loop(self) -> None:
+        runner = worker_loop.WorkerLoopRunner()
+        arrived = 0
+        all_arrived = asyncio.Event()
+
+        async def rendezvous() -> asyncio.AbstractEventLoop:
+            # Only returns once every submission is running at the same time
+            nonlocal arrived
+            arrived += 1
+            if arrived == 4:
+                all_arrived.set()
+            await asyncio.wait_for(all_arrived.wait(), timeout=5)
+            return asyncio.get_running_loop()
+
+        def submit(_: int) -> asyncio.AbstractEventLoop:
+            return runner.run(rendezvous())
+
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                loops = list(pool.map(submit, range(4)))
+            assert all(loop is runner.loop for loop in loops)
+        finally:
+            runner.shutdown(drain_timeout=1.0)
+
+    def test_shutdown_drains_then_rejects(self) -> None:
+        runner = worker_loop.WorkerLoopRunner()
+        future = runner.submit(asyncio.sleep(0.05, result="done"))
+        runner.shutdown(drain_timeout=1.0)
+
+        assert future.result() == "done"
+        with pytest.raises(RuntimeError):
+            runner.submit(asyncio.sleep(0))
+
+
+class TestCeleryWorkerInit:
+    """Tests for the Celery worker init signal handlers."""
+
+    @pytest.mark.parametrize(("pool", "initialized"), [("threads", True), ("solo", True), ("prefork", False)])
+    def test_main_process_is_initialized_for_non_prefork_pools(
+        self, monkeypatch: pytest.MonkeyPatch, pool: str, initialized: bool
+    ) -> None:
+        calls: list[bool] = []
+        monkeypatch.setattr(celery_app_module, "_init_worker", lambda: calls.append(True))
+
+        celery_app_module.init_worker(sender=SimpleNamespace(pool_cls=pool))
+
+        assert calls == ([True] if initialized else [])
@@ -0,0 +1,45 @@
+"""Tests for streaming upload hashing and Range parsing in the files API."""
+
+import hashlib
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.api.v1.files import hash_upload_stream, parse_range_header
+
+
+class TestParseRangeHeader:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("bytes=0-99", (0, 99)),
+            ("bytes=100-", (100, 999)),
+            ("bytes=-100", (900, 999)),
+            ("bytes=900-5000", (900, 999)),
+            ("bytes=-5000", (0, 999)),
+        ],
+    )
+    def test_satisfiable_ranges(self, header: str, expected: tuple[int, int]):
+        assert parse_range_header(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["items=0-1", "bytes=0-1,5-6", "bytes=abc", "bytes=5-1", "bytes=-"])
+    def test_ignored_ranges(self, header: str):
+        assert parse_range_header(header, 1000) is None
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+    def test_unsatisfiable_ranges(self, header: str):
+        with pytest.raises(ValueError):
+            parse_range_header(header, 1000)
+
+
+class TestHashUploadStream:
+    async def test_hashes_in_chunks_and_rewinds(self):
+        data = b"xyzen" * 1000
+        upload = UploadFile(file=BytesIO(data), filename="a.txt")
+
+        file_hash, file_size = await hash_upload_stream(upload, chunk_size=64)
+
+        assert file_hash == hashlib.sha256(data).hexdigest()
+        assert file_size == len(data)
+        assert await upload.read() == data
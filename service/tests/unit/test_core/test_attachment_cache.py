@@ -0,0 +1,103 @@
+"""Tests for the rendered attachment cache."""
+
+import json
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.core import attachment_cache as attachment_cache_module
+from app.core.attachment_cache import RenderedAttachmentCache, attachment_cache_key
+from app.core.chat.multimodal import FileProcessor
+from app.models.file import File
+
+
+def _file(file_hash: str | None = "abc") -> File:
+    return File(
+        id=uuid4(),
+        user_id="u1",
+        storage_key="private/documents/u1/x.txt",
+        original_filename="x.txt",
+        content_type="text/plain",
+        file_size=5,
+        scope="private",
+        category="documents",
+        file_hash=file_hash,
+    )
+
+
+def _blocks(text: str) -> list[dict[str, Any]]:
+    return [{"type": "text", "text": text}]
+
+
+class TestRenderedAttachmentCache:
+    """Tests for RenderedAttachmentCache."""
+
+    async def test_lru_is_bounded_by_size(self) -> None:
+        entry_size = len(json.dumps(_blocks("a" * 10)))
+        cache = RenderedAttachmentCache(max_bytes=entry_size * 2)
+
+        await cache.set("f1/k", _blocks("a" * 10))
+        await cache.set("f2/k", _blocks("b" * 10))
+        await cache.get("f1/k")
+        await cache.set("f3/k", _blocks("c" * 10))
+
+        assert await cache.get("f1/k") == _blocks("a" * 10)
+        assert await cache.get("f2/k") is None
+        assert cache.get_stats()["size_bytes"] == entry_size * 2
+
+    async def test_returned_blocks_are_copies(self) -> None:
+        cache = RenderedAttachmentCache()
+        await cache.set("f1/k", _blocks("a"))
+
+        blocks = await cache.get("f1/k")
+        assert blocks is not None
+        blocks[0]["text"] = "changed"
+
+        assert await cache.get("f1/k") == _blocks("a")
+
+    async def test_invalidate_drops_all_renderings_of_file(self) -> None:
+        cache = RenderedAttachmentCache()
+        file_id = uuid4()
+        await cache.set(f"{file_id}/one", _blocks("a"))
+        await cache.set(f"{file_id}/two", _blocks("b"))
+        await cache.set("other/one", _blocks("c"))
+
+        await cache.invalidate(file_id)
+
+        assert cache.get_stats()["entries"] == 1
+        assert cache.get_stats()["size_bytes"] == len(json.dumps(_blocks("c")))
+
+    def test_key_depends_on_content_and_render_params(self) -> None:
+        file = _file()
+        key = attachment_cache_key(file, {"pdf_zoom": 2.0})
+
+        assert key.startswith(f"{file.id}/")
+        assert key == attachment_cache_key(file, {"pdf_zoom": 2.0})
+        assert key != attachment_cache_key(file, {"pdf_zoom": 1.0})
+        file.file_hash = "def"
+        assert key != attachment_cache_key(file, {"pdf_zoom": 2.0})
+
+
+class TestFileProcessorCaching:
+    """Tests for FileProcessor.process_file reusing cached renderings."""
+
+    async def test_second_process_skips_download(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(attachment_cache_module, "_attachment_cache", RenderedAttachmentCache())
+        file = _file()
+        downloads: list[File] = []
+
+        async def fake_get_record(self: FileProcessor, file_id: Any) -> File:
+            return file
+
+        async def fake_download(self: FileProcessor, file_record: File) -> bytes:
+            downloads.append(file_record)
+            return b"hello"
+
+        monkeypatch.setattr(FileProcessor, "get_file_record", fake_get_record)
+        monkeypatch.setattr(FileProcessor, "download_file", fake_download)
+        processor = FileProcessor(None)  # type: ignore[arg-type]
+
+        assert await processor.process_file(file.id) == _blocks("hello")
+        assert await processor.process_file(file.id) == _blocks("hello")
+        assert len(downloads) == 1
@@ -0,0 +1,120 @@
+"""Tests for off-loop attachment rendering."""
+
+import base64
+from io import BytesIO
+from pathlib import Path
+
+import fitz
+import pytest
+from PIL import Image
+
+from app.core import attachment_render
+from app.core.attachment_render import AttachmentRenderPool, encode_image, render_pdf_pages
+from app.core.chat import multimodal
+from app.core.chat.multimodal import FileProcessor, max_image_size_for_model
+
+
+def _pdf_file(tmp_path: Path, pages: int) -> str:
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(_pdf(pages))
+    return str(path)
+
+
+def _pdf(pages: int) -> bytes:
+    document = fitz.open()
+    for i in range(pages):
+        document.new_page(width=612, height=792).insert_text((72, 72), f"Page {i + 1}")
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _size(base64_png: str) -> tuple[int, int]:
+    with Image.open(BytesIO(base64.b64decode(base64_png))) as image:
+        return image.size
+
+
+class TestRenderFunctions:
+    """Tests for the functions run inside the render pool."""
+
+    def test_pdf_pages_fit_max_image_size(self, tmp_path: Path) -> None:
+        images = render_pdf_pages(_pdf_file(tmp_path, 2), [0, 1], dpi=144, max_image_size=500)
+
+        assert len(images) == 2
+        assert max(_size(images[0])) <= 500
+
+    def test_image_downscaled(self) -> None:
+        content_type, data = encode_image(_png(4000, 1000), "image/png", 1000)
+
+        assert content_type == "image/png"
+        assert _size(data) == (1000, 250)
+
+    def test_small_image_passed_through(self) -> None:
+        original = _png(10, 10)
+        _, data = encode_image(original, "image/png", 1000)
+
+        assert base64.b64decode(data) == original
+
+
+class TestAttachmentRenderPool:
+    """Tests for AttachmentRenderPool."""
+
+    async def test_runs_in_process_pool(self, tmp_path: Path) -> None:
+        pool = AttachmentRenderPool(max_workers=1)
+        try:
+            images = await pool.run(render_pdf_pages, _pdf_file(tmp_path, 1), [0], 72, 0)
+            assert _size(images[0]) == (612, 792)
+        finally:
+            pool.shutdown()
+
+
+class TestFileProcessorPdf:
+    """Tests for FileProcessor PDF rendering through the pool."""
+
+    async def test_pages_capped_and_ordered(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(attachment_render, "_render_pool", AttachmentRenderPool(max_workers=0))
+        processor = FileProcessor(None, max_image_size=200)  # type: ignore[arg-type]
+        processor.pdf_max_pages = 3
+        processor.pdf_pages_per_task = 2
+
+        blocks = await processor.process_pdf(_pdf(5))
+
+        assert [block["_metadata"]["page"] for block in blocks[:-1]] == [1, 2, 3]
+        assert blocks[-1] == {"type": "text", "text": "[PDF truncated: showing the first 3 of 5 pages]"}
+
+    async def test_all_pages_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(attachment_render, "_render_pool", AttachmentRenderPool(max_workers=0))
+        processor = FileProcessor(None, max_image_size=200)  # type: ignore[arg-type]
+        processor.pdf_max_pages = 0
+
+        blocks = await processor.process_pdf(_pdf(5))
+
+        assert [block["_metadata"]["page"] for block in blocks] == [1, 2, 3, 4, 5]
+
+    async def test_temp_file_removed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(attachment_render, "_render_pool", AttachmentRenderPool(max_workers=0))
+        paths: list[str] = []
+
+        def write_temp_file(data: bytes, suffix: str = "") -> str:
+            paths.append(attachment_render.write_temp_file(data, suffix))
+            return paths[-1]
+
+        monkeypatch.setattr(multimodal, "write_temp_file", write_temp_file)
+        processor = FileProcessor(None, max_image_size=200)  # type: ignore[arg-type]
+
+        await processor.process_pdf(_pdf(2))
+
+        assert len(paths) == 1
+        assert not Path(paths[0]).exists()
+
+
+def test_max_image_size_for_model() -> None:
+    assert max_image_size_for_model("claude-sonnet-4") == 1568
+    assert max_image_size_for_model("gpt-4o") == 2048
+    assert max_image_size_for_model(None) == 2048
@@ -0,0 +1,125 @@
+"""Tests for the coalescing chat event publisher."""
+
+import asyncio
+import json
+from typing import Any
+
+from app.core.chat.publisher import RedisPublisher, parse_event_id, read_chat_events_since
+from app.schemas.chat_event_types import ChatEventType
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.results: list[Any] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    def xadd(self, key: str, fields: dict[str, str], **kwargs: Any) -> None:
+        self.results.append(self.redis.xadd(key, fields))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self.results.append(True)
+
+    async def execute(self) -> list[Any]:
+        return self.results
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, dict[str, Any]]] = []
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def xadd(self, key: str, fields: dict[str, str]) -> str:
+        entries = self.streams.setdefault(key, [])
+        entry_id = f"1-{len(entries)}"
+        entries.append((entry_id, fields))
+        return entry_id
+
+    async def xrange(self, key: str, min: str, max: str, count: int) -> list[tuple[str, dict[str, str]]]:
+        after = parse_event_id(min.lstrip("("))
+        return [(eid, f) for eid, f in self.streams.get(key, []) if after is None or parse_event_id(eid) > after]  # type: ignore[operator]
+
+    async def publish(self, channel: str, message: str) -> None:
+        event = json.loads(message)
+        event.pop("event_id")
+        self.published.append((channel, event))
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _chunk(content: str, stream_id: str = "s1", event_type: str = ChatEventType.STREAMING_CHUNK) -> dict[str, Any]:
+    return {"type": event_type, "data": {"id": stream_id, "content": content}}
+
+
+class TestRedisPublisher:
+    """Tests for chunk coalescing in RedisPublisher."""
+
+    async def test_chunks_coalesced_within_window(self) -> None:
+        fake = FakeRedis()
+        publisher = RedisPublisher("c1", batch_window_ms=20, redis_client=fake)  # type: ignore[arg-type]
+
+        for token in ["Hel", "lo", " world"]:
+            await publisher.publish_event(_chunk(token))
+        assert fake.published == []
+
+        await asyncio.sleep(0.05)
+        assert fake.published == [("chat:c1", _chunk("Hello world"))]
+
+    async def test_control_event_flushes_pending_chunks_first(self) -> None:
+        fake = FakeRedis()
+        publisher = RedisPublisher("c1", batch_window_ms=1000, redis_client=fake)  # type: ignore[arg-type]
+
+        await publisher.publish_event(_chunk("think", event_type=ChatEventType.THINKING_CHUNK))
+        await publisher.publish_event(_chunk("a"))
+        await publisher.publish_event(_chunk("b"))
+        await publisher.publish_event({"type": ChatEventType.STREAMING_END, "data": {"id": "s1"}})
+
+        assert [event for _, event in fake.published] == [
+            _chunk("think", event_type=ChatEventType.THINKING_CHUNK),
+            _chunk("ab"),
+            {"type": ChatEventType.STREAMING_END, "data": {"id": "s1"}},
+        ]
+
+    async def test_byte_threshold_flushes_early(self) -> None:
+        fake = FakeRedis()
+        publisher = RedisPublisher("c1", batch_window_ms=1000, batch_max_bytes=4, redis_client=fake)  # type: ignore[arg-type]
+
+        await publisher.publish_event(_chunk("ab"))
+        await publisher.publish_event(_chunk("cd"))
+        await publisher.publish_event(_chunk("e"))
+        await publisher.close()
+
+        assert [event for _, event in fake.published] == [_chunk("abcd"), _chunk("e")]
+
+    async def test_batching_disabled(self) -> None:
+        fake = FakeRedis()
+        publisher = RedisPublisher("c1", batch_window_ms=0, redis_client=fake)  # type: ignore[arg-type]
+
+        await publisher.publish_event(_chunk("a"))
+        await publisher.publish_event(_chunk("b"))
+
+        assert [event for _, event in fake.published] == [_chunk("a"), _chunk("b")]
+
+
+class TestChatEventReplay:
+    """Tests for replaying events from the per-connection stream."""
+
+    async def test_replays_events_after_last_event_id(self) -> None:
+        fake = FakeRedis()
+        publisher = RedisPublisher("c1", batch_window_ms=0, redis_client=fake)  # type: ignore[arg-type]
+        for name in ["a", "b", "c"]:
+            await publisher.publish_event({"type": ChatEventType.LOADING, "data": {"message": name}})
+
+        replayed = await read_chat_events_since(fake, "c1", "1-0")  # type: ignore[arg-type]
+
+        assert [event_id for event_id, _ in replayed] == ["1-1", "1-2"]
+        assert json.loads(replayed[0][1]) == {"type": "loading", "data": {"message": "b"}, "event_id": "1-1"}
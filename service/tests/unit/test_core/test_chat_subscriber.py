@@ -0,0 +1,78 @@
+"""Tests for the multiplexed chat event subscriber."""
+
+import asyncio
+
+import pytest
+
+from app.core.chat.subscriber import ChatEventHub, ChatSubscription, SlowConsumerError
+
+
+def _message(channel: str, data: str) -> dict[str, str]:
+    return {"type": "message", "channel": channel, "data": data}
+
+
+class TestChatEventHub:
+    """Tests for fan-out and slow-consumer eviction."""
+
+    async def test_fans_out_to_channel_subscribers_only(self) -> None:
+        hub = ChatEventHub(max_queue_size=10)
+        first = ChatSubscription("chat:a", 10)
+        second = ChatSubscription("chat:a", 10)
+        other = ChatSubscription("chat:b", 10)
+        hub._subscribers = {"chat:a": {first, second}, "chat:b": {other}}
+
+        hub.dispatch(_message("chat:a", "hello"))
+
+        assert await first.get() == "hello"
+        assert await second.get() == "hello"
+        assert other.qsize() == 0
+        await hub.close()
+
+    async def test_slow_consumer_is_evicted(self) -> None:
+        hub = ChatEventHub(max_queue_size=2)
+        slow = ChatSubscription("chat:a", 2)
+        hub._subscribers = {"chat:a": {slow}}
+
+        for i in range(3):
+            hub.dispatch(_message("chat:a", str(i)))
+
+        assert slow.evicted
+        assert hub.get_stats()["evictions"] == 1
+        with pytest.raises(SlowConsumerError):
+            await slow.get()
+        await hub.close()
+
+    async def test_subscribe_confirmation_is_tracked(self) -> None:
+        hub = ChatEventHub()
+        hub._confirmed["chat:a"] = event = asyncio.Event()
+
+        hub.dispatch({"type": "subscribe", "channel": "chat:a", "data": 1})
+
+        assert event.is_set()
+        await hub.close()
+
+    async def test_failed_subscribe_is_retried_by_next_subscriber(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        hub = ChatEventHub()
+        subscribed: list[str] = []
+
+        async def subscribe(channel: str) -> None:
+            if not subscribed:
+                subscribed.append("failed")
+                raise ConnectionError("redis down")
+            subscribed.append(channel)
+            hub.dispatch({"type": "subscribe", "channel": channel, "data": 1})
+
+        async def get_message(timeout: float) -> None:
+            await asyncio.sleep(timeout)
+
+        monkeypatch.setattr(hub._pubsub, "subscribe", subscribe)
+        monkeypatch.setattr(hub._pubsub, "get_message", get_message)
+
+        with pytest.raises(ConnectionError):
+            async with hub.subscribe("a"):
+                pass
+        assert hub.get_stats()["channels"] == 0
+
+        async with hub.subscribe("a"):
+            assert subscribed == ["failed", "chat:a"]
+        await hub.close()
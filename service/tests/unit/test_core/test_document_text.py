@@ -0,0 +1,109 @@
+"""Tests for the extracted document text cache."""
+
+import asyncio
+from typing import BinaryIO
+from uuid import uuid4
+
+import pytest
+
+from app.core import attachment_render, document_text
+from app.core.attachment_render import AttachmentRenderPool
+from app.core.document_text import ExtractedTextCache, document_text_key, get_document_pages
+from app.models.file import File
+
+
+class FakeStorage:
+    def __init__(self, objects: dict[str, bytes]) -> None:
+        self.objects = objects
+        self.downloads = 0
+
+    async def download_file(self, storage_key: str, destination: BinaryIO) -> None:
+        self.downloads += 1
+        destination.write(self.objects[storage_key])
+
+
+def _file(file_hash: str | None = "abc", filename: str = "notes.txt") -> File:
+    return File(
+        id=uuid4(),
+        user_id="u1",
+        storage_key=f"private/documents/u1/{filename}",
+        original_filename=filename,
+        content_type="text/plain",
+        file_size=5,
+        category="documents",
+        scope="private",
+        file_hash=file_hash,
+    )
+
+
+class TestExtractedTextCache:
+    """Tests for ExtractedTextCache."""
+
+    async def test_lru_is_bounded_by_size(self) -> None:
+        cache = ExtractedTextCache(max_bytes=20, use_storage=False)
+
+        await cache.set("a", ["x" * 10])
+        await cache.set("b", ["y" * 10])
+        await cache.get("a")
+        await cache.set("c", ["z" * 10])
+
+        assert await cache.get("a") == ["x" * 10]
+        assert await cache.get("b") is None
+        assert cache.get_stats()["size_bytes"] == 20
+
+    def test_key_depends_on_content_and_extension(self) -> None:
+        file = _file()
+        key = document_text_key(file)
+
+        assert key.startswith("abc/txt-v")
+        assert key == document_text_key(_file())
+        assert key != document_text_key(_file(filename="notes.md"))
+        assert key != document_text_key(_file(file_hash="def"))
+
+
+class TestGetDocumentPages:
+    """Tests for get_document_pages."""
+
+    @pytest.fixture(autouse=True)
+    def local_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(attachment_render, "_render_pool", AttachmentRenderPool(max_workers=0))
+        monkeypatch.setattr(document_text, "_text_cache", ExtractedTextCache(use_storage=False))
+
+    async def test_parses_once_per_content(self) -> None:
+        file = _file()
+        storage = FakeStorage({file.storage_key: b"hello"})
+
+        first, second = await asyncio.gather(
+            get_document_pages(file, storage),  # type: ignore[arg-type]
+            get_document_pages(file, storage),  # type: ignore[arg-type]
+        )
+        third = await get_document_pages(_file(), storage)  # type: ignore[arg-type]
+
+        assert first == second == third == ["hello"]
+        assert storage.downloads == 1
+
+    async def test_given_data_skips_download(self) -> None:
+        storage = FakeStorage({})
+
+        pages = await get_document_pages(_file(), storage, data=b"inline")  # type: ignore[arg-type]
+
+        assert pages == ["inline"]
+        assert storage.downloads == 0
+
+    async def test_file_without_hash_stays_out_of_storage_tier(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        stored: list[str] = []
+
+        async def fake_get_storage(self: ExtractedTextCache, key: str) -> None:
+            return None
+
+        async def fake_set_storage(self: ExtractedTextCache, key: str, pages: list[str]) -> None:
+            stored.append(key)
+
+        monkeypatch.setattr(ExtractedTextCache, "_get_storage", fake_get_storage)
+        monkeypatch.setattr(ExtractedTextCache, "_set_storage", fake_set_storage)
+        monkeypatch.setattr(document_text, "_text_cache", ExtractedTextCache(use_storage=True))
+
+        await get_document_pages(_file(None), FakeStorage({}), data=b"local")  # type: ignore[arg-type]
+        await get_document_pages(_file("abc"), FakeStorage({}), data=b"shared")  # type: ignore[arg-type]
+
+        assert stored == [document_text_key(_file("abc"))]
@@ -0,0 +1,19 @@
+"""Tests for the knowledge set content index helpers."""
+
+from app.core.knowledge_index import build_chunks, chunk_text
+
+
+class TestChunkText:
+    """Tests for chunk_text and build_chunks."""
+
+    def test_merges_short_paragraphs(self) -> None:
+        assert chunk_text("one\n\ntwo\n\n\nthree", max_chars=100) == ["one\n\ntwo\n\nthree"]
+
+    def test_splits_long_paragraphs_on_whitespace(self) -> None:
+        chunks = chunk_text("word " * 50, max_chars=40)
+
+        assert all(len(chunk) <= 40 for chunk in chunks)
+        assert " ".join(chunks).split() == ["word"] * 50
+
+    def test_build_chunks_skips_chunks_without_tokens(self) -> None:
+        assert build_chunks("Alpha beta\n\n---") == [("Alpha beta\n\n---", "alpha beta", 2)]
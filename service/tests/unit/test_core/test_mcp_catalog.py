@@ -0,0 +1,115 @@
+"""Tests for the MCP tool catalog cache."""
+
+import asyncio
+import datetime
+import time
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core.mcp_catalog import McpCatalogCache, McpToolCatalog
+from app.models.mcp import McpServer
+
+
+def _server(status: str = "online", tools: list[dict] | None = None) -> McpServer:
+    return McpServer(
+        id=uuid4(),
+        user_id="u1",
+        name="srv",
+        url="http://mcp",
+        token="",
+        status=status,
+        tools=tools,
+        last_checked_at=datetime.datetime.now(),
+    )
+
+
+@pytest.fixture
+def refreshed(monkeypatch: pytest.MonkeyPatch) -> list[UUID]:
+    """Record background refreshes instead of probing servers."""
+    calls: list[UUID] = []
+
+    async def fake_check(server_id: UUID) -> None:
+        calls.append(server_id)
+
+    monkeypatch.setattr("app.core.mcp.async_check_mcp_server_status", fake_check)
+    return calls
+
+
+class FakeRedis:
+    """Just enough of the Redis client for the refresh lock."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+class TestMcpCatalogCache:
+    """Tests for McpCatalogCache stale-while-revalidate behaviour."""
+
+    async def test_missing_entry_uses_server_row_and_refreshes(self, refreshed: list[UUID]) -> None:
+        cache = McpCatalogCache(use_redis=False)
+        server = _server(tools=[{"name": "t1"}])
+
+        catalogs = await cache.get_catalogs([server])
+        await asyncio.sleep(0)
+
+        assert catalogs[0].tools == [{"name": "t1"}]
+        assert catalogs[0].status == "online"
+        assert refreshed == [server.id]
+
+    async def test_fresh_entry_is_served_without_refresh(self, refreshed: list[UUID]) -> None:
+        cache = McpCatalogCache(use_redis=False)
+        server = _server(tools=[{"name": "old"}])
+        await cache.set(McpToolCatalog(str(server.id), "online", [{"name": "new"}], time.time()))
+
+        catalogs = await cache.get_catalogs([server])
+        await asyncio.sleep(0)
+
+        assert catalogs[0].tools == [{"name": "new"}]
+        assert refreshed == []
+
+    async def test_stale_entry_is_served_and_refreshed_once(self, refreshed: list[UUID]) -> None:
+        cache = McpCatalogCache(fresh_ttl=60, use_redis=False)
+        server = _server()
+        await cache.set(McpToolCatalog(str(server.id), "online", [{"name": "t"}], time.time() - 120))
+
+        first = await cache.get_catalogs([server])
+        second = await cache.get_catalogs([server])
+        await asyncio.sleep(0)
+
+        assert first[0].tools == [{"name": "t"}]
+        assert second[0].tools == [{"name": "t"}]
+        assert refreshed == [server.id]
+
+    async def test_invalidate(self, refreshed: list[UUID]) -> None:
+        cache = McpCatalogCache(use_redis=False)
+        server = _server(status="offline")
+        await cache.set(McpToolCatalog(str(server.id), "online", [{"name": "t"}], time.time()))
+        await cache.invalidate(server.id)
+
+        assert await cache.get_many([server.id]) == {}
+
+    async def test_refresh_releases_redis_lock(self, refreshed: list[UUID], monkeypatch: pytest.MonkeyPatch) -> None:
+        cache = McpCatalogCache(use_redis=True)
+        redis = FakeRedis()
+        monkeypatch.setattr(cache, "_get_redis", lambda: redis)
+        server_id = uuid4()
+
+        await cache._refresh(server_id)
+        await cache._refresh(server_id)
+
+        assert refreshed == [server_id, server_id]
+        assert redis.values == {}
+
+    def test_catalog_json_roundtrip(self) -> None:
+        catalog = McpToolCatalog("abc", "online", [{"name": "t", "inputSchema": {}}], 123.0)
+        assert McpToolCatalog.from_json(catalog.to_json()) == catalog
@@ -0,0 +1,131 @@
+"""Tests for cached office document previews."""
+
+import asyncio
+from io import BytesIO
+from typing import Any, BinaryIO
+from uuid import uuid4
+
+import pytest
+
+from app.core import attachment_render
+from app.core import office_preview
+from app.core.attachment_render import AttachmentRenderPool
+from app.core.office_preview import (
+    InvalidOfficeFileError,
+    office_preview_kind,
+    open_office_preview,
+    preview_storage_key,
+)
+from app.models.file import File
+
+
+class FakeStorage:
+    def __init__(self, objects: dict[str, bytes]) -> None:
+        self.objects = objects
+        self.downloads = 0
+
+    async def file_exists(self, storage_key: str) -> bool:
+        return storage_key in self.objects
+
+    async def download_file(self, storage_key: str, destination: BinaryIO) -> None:
+        self.downloads += 1
+        destination.write(self.objects[storage_key])
+
+    async def upload_file(self, file_data: BinaryIO, storage_key: str, **kwargs: Any) -> str:
+        self.objects[storage_key] = file_data.read()
+        return storage_key
+
+    async def open_download_stream(self, storage_key: str, byte_range: tuple[int, int] | None = None) -> Any:
+        data = self.objects[storage_key]
+
+        async def body():
+            yield data
+
+        return {"body": body(), "content_length": len(data), "content_type": "application/pdf", "etag": None}
+
+
+def _file(file_hash: str | None = "abc") -> File:
+    return File(
+        id=uuid4(),
+        user_id="u1",
+        storage_key="private/documents/u1/report.docx",
+        original_filename="report.docx",
+        content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        file_size=4,
+        category="documents",
+        scope="private",
+        file_hash=file_hash,
+    )
+
+
+async def _read(stream: Any) -> bytes:
+    return b"".join([chunk async for chunk in stream["body"]])
+
+
+class TestOfficePreview:
+    @pytest.fixture(autouse=True)
+    def converters(self, monkeypatch: pytest.MonkeyPatch) -> list[bytes]:
+        calls: list[bytes] = []
+
+        def fake_convert(data: bytes) -> BytesIO:
+            calls.append(data)
+            return BytesIO(b"%PDF " + data)
+
+        monkeypatch.setattr(attachment_render, "_render_pool", AttachmentRenderPool(max_workers=0))
+        monkeypatch.setitem(office_preview.PREVIEW_CONVERTERS, "docx", fake_convert)
+        return calls
+
+    async def test_converts_once_then_serves_from_storage(self, converters: list[bytes]) -> None:
+        file = _file()
+        storage = FakeStorage({file.storage_key: b"docx"})
+
+        first = await open_office_preview(file, "docx", storage)  # type: ignore[arg-type]
+        second = await open_office_preview(file, "docx", storage)  # type: ignore[arg-type]
+
+        assert await _read(first) == b"%PDF docx"
+        assert await _read(second) == b"%PDF docx"
+        assert converters == [b"docx"]
+        assert storage.downloads == 1
+        key = preview_storage_key(file, "docx")
+        assert key is not None
+        assert storage.objects[key] == b"%PDF docx"
+
+    async def test_file_without_hash_is_not_cached_in_storage(self, converters: list[bytes]) -> None:
+        file = _file(None)
+        storage = FakeStorage({file.storage_key: b"docx"})
+
+        first = await open_office_preview(file, "docx", storage)  # type: ignore[arg-type]
+        second = await open_office_preview(file, "docx", storage)  # type: ignore[arg-type]
+
+        assert await _read(first) == await _read(second) == b"%PDF docx"
+        assert converters == [b"docx", b"docx"]
+        assert list(storage.objects) == [file.storage_key]
+
+    async def test_concurrent_opens_convert_once(self, converters: list[bytes]) -> None:
+        file = _file()
+        storage = FakeStorage({file.storage_key: b"docx"})
+
+        streams = await asyncio.gather(*(open_office_preview(file, "docx", storage) for _ in range(3)))  # type: ignore[arg-type]
+
+        assert [await _read(stream) for stream in streams] == [b"%PDF docx"] * 3
+        assert converters == [b"docx"]
+
+    def test_key_is_shared_by_identical_content(self) -> None:
+        assert preview_storage_key(_file("abc"), "docx") == preview_storage_key(_file("abc"), "docx")
+        assert preview_storage_key(_file("abc"), "docx") != preview_storage_key(_file("def"), "docx")
+        key = preview_storage_key(_file("abc"), "docx")
+        assert key is not None and key.endswith(f"docx-v{office_preview.CONVERTER_VERSION}.pdf")
+        assert preview_storage_key(_file(None), "docx") is None
+
+    def test_preview_kind(self) -> None:
+        assert office_preview_kind("Slides.PPTX") == "pptx"
+        assert office_preview_kind("notes.txt") is None
+
+    def test_unreadable_presentation_is_an_invalid_file(self) -> None:
+        from pptx import Presentation
+
+        empty = BytesIO()
+        Presentation().save(empty)
+
+        with pytest.raises(InvalidOfficeFileError, match="no slides"):
+            office_preview.convert_pptx_to_pdf_bytes(empty.getvalue())
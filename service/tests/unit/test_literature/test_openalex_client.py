@@ -1,12 +1,13 @@
 """Tests for OpenAlex API client."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
 from app.utils.literature.models import SearchRequest
-from app.utils.literature.openalex_client import OpenAlexClient
+from app.utils.literature.openalex_client import OpenAlexClient, close_openalex_clients, get_openalex_client
 
 
 class TestOpenAlexClientInit:
@@ -442,6 +443,131 @@ class TestOpenAlexClientRequestWithRetry:
             assert mock_get.call_count == 2
 
 
+class TestOpenAlexClientPagingAndCaching:
+    """Test OpenAlex client pagination and caches."""
+
+    @pytest.fixture
+    def client(self) -> OpenAlexClient:
+        """Create an OpenAlex client for testing."""
+        return OpenAlexClient(email="test@example.com")
+
+    @staticmethod
+    def _page(start: int, size: int, count: int) -> dict:
+        return {
+            "meta": {"count": count},
+            "results": [{"id": f"https://openalex.org/W{i}", "title": f"Work {i}"} for i in range(start, start + size)],
+        }
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_pages_requests_remaining_pages_concurrently(self, client: OpenAlexClient) -> None:
+        """Test that pages after the first are all requested once the count is known."""
+
+        async def fake_request(url: str, params: dict[str, str]) -> dict:
+            page = int(params["page"])
+            return self._page((page - 1) * 200, 200 if page < 3 else 50, 450)
+
+        with patch.object(client, "_request_with_retry", side_effect=fake_request) as mock_request:
+            works, complete = await client._fetch_all_pages({"search": "test"}, 1000)
+
+        assert complete
+        assert [w["id"] for w in works] == [f"https://openalex.org/W{i}" for i in range(450)]
+        assert sorted(call[0][1]["page"] for call in mock_request.call_args_list) == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_pages_limits_page_size_to_max_results(self, client: OpenAlexClient) -> None:
+        """Test that small searches don't download full pages."""
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = self._page(0, 10, 5000)
+
+            works, complete = await client._fetch_all_pages({"per-page": "200"}, 10)
+
+        assert complete
+        assert len(works) == 10
+        mock_request.assert_called_once()
+        assert mock_request.call_args[0][1]["per-page"] == "10"
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_pages_reports_partial_results(self, client: OpenAlexClient) -> None:
+        """Test that a failed page returns the pages before it, flagged incomplete."""
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [self._page(0, 200, 600), Exception("boom"), self._page(400, 200, 600)]
+
+            works, complete = await client._fetch_all_pages({}, 600)
+
+        assert not complete
+        assert len(works) == 200
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_pages_uses_cursor_beyond_page_limit(
+        self, client: OpenAlexClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test cursor paging for result sets beyond the page-number limit."""
+        monkeypatch.setattr(client, "PAGE_PAGING_LIMIT", 300)
+        responses = [
+            {**self._page(0, 200, 1000), "meta": {"count": 1000, "next_cursor": "c2"}},
+            {**self._page(200, 200, 1000), "meta": {"count": 1000, "next_cursor": None}},
+        ]
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = responses
+
+            works, complete = await client._fetch_all_pages({}, 1000)
+
+        assert complete
+        assert len(works) == 400
+        assert [call[0][1]["cursor"] for call in mock_request.call_args_list] == ["*", "c2"]
+
+    @pytest.mark.asyncio
+    async def test_resolve_author_id_is_cached(self, client: OpenAlexClient) -> None:
+        """Test that name -> ID lookups are cached by normalized name."""
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = {
+                "results": [{"id": "https://openalex.org/A5023888391", "display_name": "Jane Smith"}]
+            }
+
+            first = await client._resolve_author_id("Jane Smith")
+            second = await client._resolve_author_id("  jane   SMITH ")
+
+        assert first[0] == second[0] == "A5023888391"
+        mock_request.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_resolve_failure_is_not_cached(self, client: OpenAlexClient) -> None:
+        """Test that failed lookups are retried on the next search."""
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = [Exception("boom"), {"results": []}]
+
+            failed = await client._resolve_source_id("Nature")
+            not_found = await client._resolve_source_id("Nature")
+
+        assert failed[1] is False and "Failed" in failed[2]
+        assert not_found[1] is False and "not found" in not_found[2]
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_results_are_cached_by_normalized_query(self, client: OpenAlexClient) -> None:
+        """Test that repeated searches on the same topic don't hit the network."""
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = self._page(0, 1, 1)
+
+            first, _ = await client.search(SearchRequest(query="Machine Learning", max_results=10))
+            second, _ = await client.search(SearchRequest(query="machine  learning", max_results=10))
+            await client.search(SearchRequest(query="machine learning", max_results=10, year_from=2020))
+
+        assert [w.id for w in first] == [w.id for w in second] == ["W0"]
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_share_one_request(self, client: OpenAlexClient) -> None:
+        """Test that concurrent identical searches are coalesced."""
+        with patch.object(client, "_request_with_retry", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = self._page(0, 1, 1)
+
+            results = await asyncio.gather(*(client.search(SearchRequest(query="graphene")) for _ in range(3)))
+
+        assert all(len(works) == 1 for works, _ in results)
+        mock_request.assert_called_once()
+
+
 class TestOpenAlexClientContextManager:
     """Test OpenAlex client context manager."""
 
@@ -459,3 +585,45 @@ class TestOpenAlexClientContextManager:
         with patch.object(client.client, "aclose", new_callable=AsyncMock) as mock_close:
             await client.close()
             mock_close.assert_called_once()
+
+
+class TestGetOpenAlexClient:
+    """Test the shared OpenAlex clients."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared_per_email(self) -> None:
+        """Test that searches with the same email reuse one client."""
+        assert get_openalex_client("a@example.com") is get_openalex_client("a@example.com")
+        assert get_openalex_client("a@example.com") is not get_openalex_client(None)
+
+    @pytest.mark.asyncio
+    async def test_evicted_client_is_closed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the least recently used client is closed beyond the cap."""
+        monkeypatch.setattr("app.utils.literature.openalex_client._MAX_SHARED_CLIENTS", 2)
+        first = get_openalex_client("evict-1@example.com")
+        get_openalex_client("evict-2@example.com")
+        get_openalex_client("evict-3@example.com")
+
+        await close_openalex_clients()
+
+        assert first.client.is_closed
+        assert get_openalex_client("evict-1@example.com") is not first
+        await close_openalex_clients()
+
+    def test_clients_of_finished_loops_are_closed(self) -> None:
+        """Test that a client left by a finished event loop is closed by the next one."""
+
+        async def get_client() -> OpenAlexClient:
+            return get_openalex_client("loop@example.com")
+
+        async def get_client_and_shutdown() -> OpenAlexClient:
+            client = await get_client()
+            await close_openalex_clients()
+            return client
+
+        stale = asyncio.run(get_client())
+        fresh = asyncio.run(get_client_and_shutdown())
+
+        assert fresh is not stale
+        assert stale.client.is_closed
+        assert fresh.client.is_closed
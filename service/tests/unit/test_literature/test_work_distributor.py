@@ -391,7 +391,7 @@ class TestWorkDistributorContextManager:
     @pytest.mark.asyncio
     async def test_close_method(self) -> None:
         """Test close method."""
-        distributor = WorkDistributor(openalex_email="test@example.com")
+        distributor = WorkDistributor(openalex_email="test@example.com", owns_client=True)
 
         # Replace the actual client with a mock
         mock_client = MagicMock()
@@ -402,6 +402,16 @@ class TestWorkDistributorContextManager:
 
         mock_client.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_close_leaves_shared_openalex_client_open(self) -> None:
+        """Test that the long-lived OpenAlex client outlives the distributor."""
+        async with WorkDistributor(openalex_email="test@example.com") as distributor:
+            openalex_client = distributor.clients["openalex"]
+
+        assert not openalex_client.client.is_closed
+        async with WorkDistributor(openalex_email="test@example.com") as distributor:
+            assert distributor.clients["openalex"] is openalex_client
+
     @pytest.mark.asyncio
     async def test_close_with_sync_close(self) -> None:
         """Test close method with synchronous close."""
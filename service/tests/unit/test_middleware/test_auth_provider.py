@@ -0,0 +1,130 @@
+"""Tests for async token validation and JWKS caching in BaseAuthProvider."""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.configs.auth import CasdoorAuthConfig
+from app.middleware.auth import AuthResult, BaseAuthProvider, UserInfo
+from app.middleware.auth import cache as cache_module
+from app.middleware.auth.cache import TokenCache
+
+ISSUER = "https://auth.example.com"
+AUDIENCE = "client-id"
+JWKS_URI = f"{ISSUER}/.well-known/jwks"
+
+
+class FakeProvider(BaseAuthProvider):
+    def __init__(self) -> None:
+        super().__init__(CasdoorAuthConfig(Issuer=ISSUER, Audience=AUDIENCE, JwksUri=JWKS_URI))
+        self.upstream_calls = 0
+
+    def get_provider_name(self) -> str:
+        return "fake"
+
+    async def _validate_token(self, access_token: str) -> AuthResult:
+        self.upstream_calls += 1
+        await asyncio.sleep(0.05)
+        if access_token == "bad":
+            return AuthResult(success=False, error_code="INVALID_TOKEN")
+        return AuthResult(success=True, user_info=UserInfo(id=f"user-{access_token}", username="u"))
+
+    def parse_user_info(self, token_payload: dict[str, Any]) -> UserInfo:
+        return UserInfo(id=token_payload["sub"], username="u")
+
+    def parse_userinfo_response(self, userinfo_data: dict[str, Any]) -> UserInfo:
+        return UserInfo(id=userinfo_data["id"], username="u")
+
+
+@pytest.fixture
+async def token_cache(monkeypatch: pytest.MonkeyPatch) -> TokenCache:
+    cache = TokenCache()
+    monkeypatch.setattr(cache_module, "_token_cache", cache)
+    return cache
+
+
+def _rsa_jwk(kid: str) -> tuple[Any, dict[str, Any]]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk["kid"] = kid
+    return private_key, jwk
+
+
+def _sign(private_key: Any, kid: str) -> str:
+    claims = {"sub": "u1", "iss": ISSUER, "aud": AUDIENCE, "exp": int(time.time()) + 60}
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})  # pyright: ignore[reportReturnType]
+
+
+class TestValidateToken:
+    async def test_concurrent_validations_share_one_call(self, token_cache: TokenCache) -> None:
+        provider = FakeProvider()
+
+        results = await asyncio.gather(*(provider.validate_token("t1") for _ in range(5)))
+
+        assert provider.upstream_calls == 1
+        assert all(result.user_info and result.user_info.id == "user-t1" for result in results)
+        assert provider._inflight == {}
+
+    async def test_success_is_cached_failure_is_not(self, token_cache: TokenCache) -> None:
+        provider = FakeProvider()
+
+        await provider.validate_token("t1")
+        await provider.validate_token("t1")
+        assert provider.upstream_calls == 1
+
+        await provider.validate_token("bad")
+        await provider.validate_token("bad")
+        assert provider.upstream_calls == 3
+
+
+class TestJwksCache:
+    def _provider(self, jwks: dict[str, Any]) -> tuple[FakeProvider, list[str]]:
+        provider = FakeProvider()
+        provider.jwks_min_refresh_interval = 0
+        requests: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(str(request.url))
+            return httpx.Response(200, json=jwks)
+
+        provider._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return provider, requests
+
+    async def test_keys_are_cached(self) -> None:
+        private_key, jwk = _rsa_jwk("k1")
+        provider, requests = self._provider({"keys": [jwk]})
+
+        assert (await provider.decode_jwt_token(_sign(private_key, "k1")) or {}).get("sub") == "u1"
+        assert (await provider.decode_jwt_token(_sign(private_key, "k1")) or {}).get("sub") == "u1"
+        assert requests == [JWKS_URI]
+        await provider.aclose()
+
+    async def test_unknown_kid_triggers_refresh(self) -> None:
+        old_key, old_jwk = _rsa_jwk("k1")
+        new_key, new_jwk = _rsa_jwk("k2")
+        jwks: dict[str, Any] = {"keys": [old_jwk]}
+        provider, requests = self._provider(jwks)
+
+        assert await provider.decode_jwt_token(_sign(old_key, "k1")) is not None
+
+        # Key rotation: the provider starts signing with a kid we haven't seen
+        jwks["keys"] = [old_jwk, new_jwk]
+        assert await provider.decode_jwt_token(_sign(new_key, "k2")) is not None
+        assert len(requests) == 2
+        await provider.aclose()
+
+    async def test_unknown_kid_refresh_is_throttled(self) -> None:
+        private_key, jwk = _rsa_jwk("k1")
+        provider, requests = self._provider({"keys": [jwk]})
+        provider.jwks_min_refresh_interval = 60
+
+        assert await provider.decode_jwt_token(_sign(private_key, "k1")) is not None
+        assert await provider.decode_jwt_token(_sign(private_key, "unknown")) is None
+        assert len(requests) == 1
+        await provider.aclose()
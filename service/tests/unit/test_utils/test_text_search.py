@@ -0,0 +1,56 @@
+"""Tests for full-text search normalization and ranking."""
+
+from app.utils.text_search import bm25_scores, highlight, make_snippet, query_phrases, tokenize
+
+
+class TestTokenize:
+    """Tests for tokenize and query_phrases."""
+
+    def test_lowercases_and_drops_punctuation(self) -> None:
+        assert tokenize("Hello, World! snake_case 42") == ["hello", "world", "snake", "case", "42"]
+
+    def test_splits_cjk_into_characters(self) -> None:
+        assert tokenize("知识库search") == ["知", "识", "库", "search"]
+
+    def test_query_phrases_keep_cjk_runs_together(self) -> None:
+        assert query_phrases("Solar 知识库 solar") == [["solar"], ["知", "识", "库"]]
+
+
+class TestBm25:
+    """Tests for bm25_scores, make_snippet and highlight."""
+
+    def test_rare_terms_and_frequency_rank_higher(self) -> None:
+        documents = [
+            ["common", "rare", "rare"],
+            ["common", "rare"],
+            ["common", "filler", "filler"],
+        ]
+        scores = bm25_scores(["common", "rare"], documents, total_documents=10, average_length=3)
+
+        assert scores[0] > scores[1] > scores[2] > 0
+
+    def test_shorter_documents_rank_higher_for_same_frequency(self) -> None:
+        documents = [["term", "a", "b", "c", "d", "e"], ["term"]]
+        scores = bm25_scores(["term"], documents, total_documents=2, average_length=3.5)
+
+        assert scores[1] > scores[0]
+
+    def test_corpus_document_frequencies_override_candidates(self) -> None:
+        documents = [["common", "filler"], ["rare", "filler"]]
+        scores = bm25_scores(
+            ["common", "rare"], documents, total_documents=100, average_length=2, document_frequencies={"common": 90}
+        )
+
+        assert scores[1] > scores[0]
+
+    def test_snippet_is_centered_on_first_match(self) -> None:
+        content = "x " * 200 + "needle in the haystack"
+        snippet = make_snippet(content, ["needle"], width=60)
+
+        assert snippet.startswith("…")
+        assert "needle in the haystack" in snippet
+
+    def test_highlight_matches_whole_words_and_cjk(self) -> None:
+        text = "Solar cells, not solaris. 知识库很好"
+
+        assert highlight(text, ["solar", "知识"]) == "**Solar** cells, not solaris. **知识**库很好"
@@ -0,0 +1,86 @@
+"""Tests for version-stamped dynamic tool refreshes."""
+
+from typing import Any
+
+import pytest
+
+from app.tools.dynamic.loader import DatabaseToolLoader, ToolRegistryVersions
+
+
+class FakeToolManager:
+    def __init__(self) -> None:
+        self._tools: dict[str, Any] = {}
+
+
+class FakeMCP:
+    def __init__(self) -> None:
+        self._tool_manager = FakeToolManager()
+
+    def remove_tool(self, name: str) -> None:
+        self._tool_manager._tools.pop(name)
+
+
+class FakeLoader(DatabaseToolLoader):
+    """Serves tools from ``db_tools`` ({name: fingerprint}) and counts database scans."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.versions = ToolRegistryVersions(use_redis=False)
+        self.db_tools: dict[str, tuple[str, str]] = {"pkg-run": ("v1", "f1")}
+        self.scans = 0
+
+    async def scan_and_load_tools(
+        self, user_id: str | None = None, request_tool_name: str | None = None
+    ) -> dict[str, Any]:
+        self.scans += 1
+        return {name: {"fingerprint": fingerprint} for name, fingerprint in self.db_tools.items()}
+
+    def register_tools_to_mcp(
+        self, mcp: Any, tools: dict[str, Any], user_id: str, request_tool_name: str | None = None
+    ) -> dict[str, Any]:
+        for name, info in tools.items():
+            mcp._tool_manager._tools[name] = info
+            self._tool_ownership[name] = user_id
+            self._tool_fingerprints[name] = info["fingerprint"]
+        return {"added": list(tools)}
+
+
+class TestRefreshTools:
+    @pytest.fixture
+    def loader(self) -> FakeLoader:
+        return FakeLoader()
+
+    async def test_unchanged_version_skips_database(self, loader: FakeLoader) -> None:
+        mcp = FakeMCP()
+
+        first = await loader.refresh_tools(mcp, "u1")  # type: ignore[arg-type]
+        second = await loader.refresh_tools(mcp, "u1")  # type: ignore[arg-type]
+
+        assert first["added"] == ["pkg-run"]
+        assert second["unchanged"] is True
+        assert loader.scans == 1
+
+    async def test_change_reregisters_only_changed_tools(self, loader: FakeLoader) -> None:
+        mcp = FakeMCP()
+        loader.db_tools = {"pkg-run": ("v1", "f1"), "pkg-stop": ("v1", "f2")}
+        await loader.refresh_tools(mcp, "u1")  # type: ignore[arg-type]
+
+        loader.db_tools = {"pkg-run": ("v2", "f3"), "pkg-stop": ("v1", "f2"), "pkg-new": ("v2", "f4")}
+        result = await loader.notify_changed(mcp, "u1")  # type: ignore[arg-type]
+
+        assert result["updated"] == ["pkg-run"]
+        assert result["added"] == ["pkg-new"]
+        assert result["removed"] == []
+        assert loader.scans == 2
+
+    async def test_unreadable_version_always_reloads(self, loader: FakeLoader) -> None:
+        async def unavailable(user_id: str) -> None:
+            return None
+
+        loader.versions.get = unavailable  # type: ignore[method-assign]
+        mcp = FakeMCP()
+
+        await loader.refresh_tools(mcp, "u1")  # type: ignore[arg-type]
+        await loader.refresh_tools(mcp, "u1")  # type: ignore[arg-type]
+
+        assert loader.scans == 2
@@ -0,0 +1,47 @@
+"""Tests for scheduling knowledge file indexing from knowledge_search."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.models.file import File
+from app.tasks import knowledge as knowledge_tasks
+from app.tools.builtin.knowledge import operations
+
+
+def _file() -> File:
+    return File(
+        id=uuid4(),
+        user_id="u1",
+        storage_key="private/documents/u1/notes.txt",
+        original_filename="notes.txt",
+        content_type="text/plain",
+        file_size=4,
+        category="documents",
+        scope="private",
+    )
+
+
+class TestScheduleIndexing:
+    def test_stale_files_are_scheduled_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        scheduled: list[str] = []
+        monkeypatch.setattr(knowledge_tasks.index_knowledge_file, "delay", scheduled.append)
+        monkeypatch.setattr(operations, "_index_scheduled_at", {})
+        first, second = _file(), _file()
+
+        operations._schedule_indexing([first])
+        operations._schedule_indexing([first, second])
+
+        assert scheduled == [str(first.id), str(second.id)]
+
+    def test_rescheduled_after_interval(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        scheduled: list[str] = []
+        monkeypatch.setattr(knowledge_tasks.index_knowledge_file, "delay", scheduled.append)
+        monkeypatch.setattr(operations, "_index_scheduled_at", {})
+        monkeypatch.setattr(operations, "INDEX_RESCHEDULE_SECONDS", 0.0)
+        file = _file()
+
+        operations._schedule_indexing([file])
+        operations._schedule_indexing([file])
+
+        assert scheduled == [str(file.id)] * 2
@@ -0,0 +1,118 @@
+"""Tests for MCP tool index resolution and bound tool execution."""
+
+import time
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.core.chat.tool_progress import reset_tool_progress_reporter, set_tool_progress_reporter
+from app.core.mcp_catalog import McpCatalogCache, McpToolCatalog
+from app.models.mcp import McpServer
+from app.tools import mcp as mcp_tools
+from app.tools.mcp import McpToolBinding, execute_bound_tool_call, load_mcp_tool_index
+
+
+def _server(name: str) -> McpServer:
+    return McpServer(id=uuid4(), user_id="u1", name=name, url=f"http://{name}", token=f"{name}-token")
+
+
+@pytest.fixture
+def catalog_cache(monkeypatch: pytest.MonkeyPatch) -> McpCatalogCache:
+    cache = McpCatalogCache(use_redis=False)
+    monkeypatch.setattr(mcp_tools, "get_mcp_catalog_cache", lambda: cache)
+    return cache
+
+
+class TestLoadMcpToolIndex:
+    """Tests for load_mcp_tool_index."""
+
+    async def test_agent_servers_take_precedence(
+        self, monkeypatch: pytest.MonkeyPatch, catalog_cache: McpCatalogCache
+    ) -> None:
+        agent_server = _server("agent")
+        session_server = _server("session")
+        offline_server = _server("offline")
+        now = time.time()
+        await catalog_cache.set(
+            McpToolCatalog(str(agent_server.id), "online", [{"name": "search", "inputSchema": {}}], now)
+        )
+        await catalog_cache.set(
+            McpToolCatalog(
+                str(session_server.id),
+                "online",
+                [{"name": "search"}, {"name": "fetch", "description": "Fetch"}],
+                now,
+            )
+        )
+        await catalog_cache.set(McpToolCatalog(str(offline_server.id), "offline", [{"name": "gone"}], now))
+
+        async def fake_load(*args: Any) -> list[McpServer]:
+            return [agent_server, session_server, offline_server, agent_server]
+
+        monkeypatch.setattr(mcp_tools, "_load_mcp_servers", fake_load)
+
+        index = await load_mcp_tool_index(None, None, None)  # type: ignore[arg-type]
+
+        assert set(index) == {"search", "fetch"}
+        assert index["search"].server_url == "http://agent"
+        assert index["fetch"].server_token == "session-token"
+        assert index["fetch"].description == "Fetch"
+
+
+class TestExecuteBoundToolCall:
+    """Tests for execute_bound_tool_call."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str | None, str, dict[str, Any]]]:
+        recorded: list[tuple[str, str | None, str, dict[str, Any]]] = []
+
+        async def fake_call(
+            url: str, token: str | None, tool_name: str, args: dict[str, Any], progress_handler: Any = None
+        ) -> str:
+            recorded.append((url, token, tool_name, args))
+            return "ok"
+
+        monkeypatch.setattr(mcp_tools, "call_mcp_tool_at", fake_call)
+        return recorded
+
+    async def test_calls_bound_server(self, calls: list[Any]) -> None:
+        binding = McpToolBinding("t", "", {}, uuid4(), "http://srv", "tok")
+
+        assert await execute_bound_tool_call(binding, {"q": 1}) == "ok"
+        assert calls == [("http://srv", "tok", "t", {"q": 1})]
+
+    async def test_injects_knowledge_set_id(self, calls: list[Any]) -> None:
+        class FakeAgent:
+            id = uuid4()
+            knowledge_set_id = uuid4()
+
+        agent = FakeAgent()
+        schema = {"properties": {"knowledge_set_id": {"type": "string"}}}
+        binding = McpToolBinding("t", "", schema, uuid4(), "http://srv", None)
+
+        await execute_bound_tool_call(binding, {}, agent)
+        assert calls[0][3] == {"knowledge_set_id": str(agent.knowledge_set_id)}
+
+    async def test_forwards_tool_progress_while_a_reporter_is_set(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        reported: list[tuple[str, float, float | None, str | None]] = []
+
+        async def reporter(tool_name: str, progress: float, total: float | None, message: str | None) -> None:
+            reported.append((tool_name, progress, total, message))
+
+        async def fake_call(
+            url: str, token: str | None, tool_name: str, args: dict[str, Any], progress_handler: Any = None
+        ) -> str:
+            assert progress_handler is not None
+            await progress_handler(50, 100, "halfway")
+            return "ok"
+
+        monkeypatch.setattr(mcp_tools, "call_mcp_tool_at", fake_call)
+        binding = McpToolBinding("t", "", {}, uuid4(), "http://srv", None)
+
+        token = set_tool_progress_reporter(reporter)
+        try:
+            assert await execute_bound_tool_call(binding, {}) == "ok"
+        finally:
+            reset_tool_progress_reporter(token)
+        assert reported == [("t", 50, 100, "halfway")]
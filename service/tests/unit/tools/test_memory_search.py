@@ -0,0 +1,52 @@
+"""Tests for memory search ranking."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.tools.builtin.memory import _format_memory_result, _rank_memory_results
+from app.utils.text_search import tokenize
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _candidate(content: str, days_ago: float) -> dict[str, Any]:
+    return {
+        "content": content,
+        "search_tokens": " ".join(tokenize(content)),
+        "role": "user",
+        "topic_name": "t",
+        "created_at": NOW - timedelta(days=days_ago),
+    }
+
+
+class TestMemoryRanking:
+    """Tests for _rank_memory_results and _format_memory_result."""
+
+    def test_relevance_ranks_above_recency_for_strong_matches(self) -> None:
+        strong = _candidate("perovskite stability and perovskite degradation", days_ago=60)
+        weak = _candidate("a long message that only mentions stability once among many other words", days_ago=0)
+
+        ranked = _rank_memory_results("perovskite stability", [weak, strong], limit=10, now=NOW)
+
+        assert [candidate for _, candidate in ranked] == [strong, weak]
+
+    def test_recency_breaks_ties(self) -> None:
+        old = _candidate("solar cells", days_ago=90)
+        new = _candidate("solar cells", days_ago=1)
+
+        ranked = _rank_memory_results("solar", [old, new], limit=1, now=NOW)
+
+        assert [candidate for _, candidate in ranked] == [new]
+
+    def test_result_snippet_is_highlighted(self) -> None:
+        result = _format_memory_result(
+            content="We discussed Solar panels",
+            role="user",
+            topic_name="t",
+            created_at=NOW,
+            query="solar",
+            score=1.23456,
+        )
+
+        assert result["content_snippet"] == "We discussed **Solar** panels"
+        assert result["score"] == 1.2346
@@ -0,0 +1,129 @@
+"""Tests for the warm dynamic tool sandbox pool."""
+
+import asyncio
+
+import pytest
+
+from app.infra.loop_local import LoopLocal
+from app.tools.dynamic import sandbox as sandbox_module
+from app.tools.dynamic.sandbox import LocalSubprocessBackend, SandboxPool, SandboxResult
+
+
+class FakeSandbox:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.runs = 0
+        self.closed = False
+
+    def check_safety(self, code: str) -> list[str]:
+        return ["System command execution"] if "os.system" in code else []
+
+    async def run(self, code: str) -> SandboxResult:
+        self.runs += 1
+        await asyncio.sleep(self.delay)
+        return SandboxResult(0, code, "")
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.created: list[tuple[list[str], FakeSandbox]] = []
+
+    async def create(self, requirements: list[str]) -> FakeSandbox:
+        sandbox = FakeSandbox(self.delay)
+        self.created.append((requirements, sandbox))
+        return sandbox
+
+
+class TestSandboxPool:
+    async def test_reuses_warm_sandbox_per_owner_and_requirements(self) -> None:
+        backend = FakeBackend()
+        pool = SandboxPool(backend)  # type: ignore[arg-type]
+
+        await pool.execute("a", ["numpy"], owner="u1")
+        await pool.execute("b", ["NumPy "], owner="u1")
+        await pool.execute("c", ["numpy"], owner="u2")
+        await pool.close()
+
+        assert len(backend.created) == 2
+        assert backend.created[0][1].runs == 2
+
+    async def test_retires_sandbox_after_max_uses(self) -> None:
+        backend = FakeBackend()
+        pool = SandboxPool(backend, max_uses=2, max_idle_per_key=1)  # type: ignore[arg-type]
+
+        for _ in range(3):
+            await pool.execute("x", [], owner="u1")
+            await asyncio.sleep(0.01)
+        await pool.close()
+
+        first, replacement = (sandbox for _, sandbox in backend.created)
+        assert first.runs == 2
+        assert first.closed
+        # The replacement was warmed in the background and served the third call
+        assert replacement.runs == 1
+
+    async def test_timeout_discards_sandbox(self) -> None:
+        backend = FakeBackend(delay=1.0)
+        pool = SandboxPool(backend, call_timeout=0.05)  # type: ignore[arg-type]
+
+        with pytest.raises(TimeoutError):
+            await pool.execute("slow", [], owner="u1")
+        await pool.close()
+
+        assert backend.created[0][1].closed
+
+    async def test_refuses_unsafe_code(self) -> None:
+        pool = SandboxPool(FakeBackend())  # type: ignore[arg-type]
+
+        with pytest.raises(PermissionError):
+            await pool.execute("import os; os.system('ls')", [], owner="u1")
+        await pool.close()
+
+    async def test_concurrency_cap(self) -> None:
+        backend = FakeBackend(delay=0.05)
+        pool = SandboxPool(backend, max_concurrency=1)  # type: ignore[arg-type]
+
+        await asyncio.gather(*(pool.execute(str(i), [], owner="u1") for i in range(3)))
+        await pool.close()
+
+        # Calls ran one at a time, so a single sandbox served them all
+        assert len(backend.created) == 1
+
+    async def test_local_backend_runs_code(self) -> None:
+        pool = SandboxPool(LocalSubprocessBackend())  # type: ignore[arg-type]
+
+        result = await pool.execute("print(6 * 7)", [], owner="u1")
+        await pool.close()
+
+        assert result.exit_code == 0
+        assert result.stdout.strip() == "42"
+
+
+class TestSandboxPoolPerLoop:
+    def test_pool_of_finished_loop_is_closed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        backend = FakeBackend()
+        pools = LoopLocal(lambda: SandboxPool(backend), SandboxPool.close, "sandbox pool")  # type: ignore[arg-type]
+        monkeypatch.setattr(sandbox_module, "_pools", pools)
+
+        async def run_tool() -> None:
+            await sandbox_module.get_sandbox_pool().execute("x", [], owner="u1")
+
+        # The loop ends with a warm sandbox left in its pool
+        asyncio.run(run_tool())
+        assert not backend.created[0][1].closed
+
+        async def next_loop() -> None:
+            await run_tool()
+            await sandbox_module.close_sandbox_pool()
+
+        asyncio.run(next_loop())
+
+        assert len(backend.created) == 2
+        assert all(sandbox.closed for _, sandbox in backend.created)
+        assert pools.instances() == []
@@ -4,7 +4,7 @@ Tests for ImageFetcher service.
 
 import base64
 import io
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 from app.tools.utils.documents.image_fetcher import (
@@ -299,6 +299,7 @@ class TestImageFetcherStorage:
             output_buffer.write(png_bytes)
 
         mock_storage.download_file = mock_download
+        mock_storage.close = AsyncMock()
         mock_get_storage.return_value = mock_storage
 
         fetcher = ImageFetcher()
@@ -307,6 +308,8 @@ class TestImageFetcherStorage:
         assert result.success
         assert result.width == 50
         assert result.height == 50
+        # The client of the throwaway event loop is closed with it
+        mock_storage.close.assert_awaited_once()
 
     @patch("app.core.storage.get_storage_service")
     def test_fetch_from_storage_failure(self, mock_get_storage: MagicMock) -> None:
@@ -316,6 +319,7 @@ class TestImageFetcherStorage:
             raise FileNotFoundError("File not found")
 
         mock_storage.download_file = mock_download
+        mock_storage.close = AsyncMock()
         mock_get_storage.return_value = mock_storage
 
         fetcher = ImageFetcher()
@@ -323,6 +327,7 @@ class TestImageFetcherStorage:
 
         assert not result.success
         assert "Storage fetch failed" in (result.error or "")
+        mock_storage.close.assert_awaited_once()
 
 
 class TestImageFetcherByImageId:
@@ -58,6 +58,8 @@ class XyzenService {
   private retryTimeout: NodeJS.Timeout | null = null;
   private lastSessionId: string | null = null;
   private lastTopicId: string | null = null;
+  // Id of the last streamed event, sent on reconnect to replay missed events
+  private lastEventId: string | null = null;
 
   public setBackendUrl(url: string) {
     this.backendUrl = url;
@@ -85,6 +87,7 @@ class XyzenService {
     // or if we are forcing a new connection (e.g. manual reconnect)
     if (this.lastSessionId !== sessionId || this.lastTopicId !== topicId) {
       this.retryCount = 0;
+      this.lastEventId = null;
     }
 
     // Clear any pending retry timer
@@ -120,10 +123,13 @@ class XyzenService {
     }
 
     // Build WebSocket URL with token as query parameter
-    const wsUrl = `${this.backendUrl.replace(
+    let wsUrl = `${this.backendUrl.replace(
       /^http(s?):\/\//,
       "ws$1://",
     )}/xyzen/ws/v1/chat/sessions/${sessionId}/topics/${topicId}?token=${encodeURIComponent(token)}`;
+    if (this.lastEventId) {
+      wsUrl += `&last_event_id=${encodeURIComponent(this.lastEventId)}`;
+    }
 
     this.ws = new WebSocket(wsUrl);
 
@@ -137,6 +143,9 @@ class XyzenService {
     this.ws.onmessage = (event) => {
       try {
         const eventData = JSON.parse(event.data);
+        if (typeof eventData.event_id === "string") {
+          this.lastEventId = eventData.event_id;
+        }
 
         // Handle different message types
         if (eventData.type && this.onMessageEventCallback) {